@@ -0,0 +1,57 @@
+"""DoctoPi generates documentation from source code. Use the CLI
+(`python -m doctopi`), or generate documentation in memory with
+`doctopi.generate()`.
+"""
+# Built-in imports
+import os
+from typing import (Any, Iterator, Union, TYPE_CHECKING)
+
+if TYPE_CHECKING:
+    from doctopi.types import (DocDir, DocFile)
+
+
+def generate(src: Union[str, bytes, os.PathLike, "DocFile", "DocDir"],
+             config: Union[str, os.PathLike] = None,
+             stream: bool = False,
+             **options: Any) -> Union[str, Iterator[str]]:
+    """Generate Markdown documentation in memory, configured like the
+    markdown command. Nothing is written to disk.
+
+        >>> markdown = doctopi.generate("src/my_package", title="My Package")
+
+    Args:
+        src (Union[str, bytes, os.PathLike, DocFile, DocDir]): Source
+            file/dir to parse, or already parsed documentation.
+        config (Union[str, os.PathLike], optional): INI config file.
+            Defaults to None, using only the default INI config.
+        stream (bool, optional): Return an iterator of Markdown chunks
+            rather than a string. Defaults to False.
+        **options (Any): markdown command options, named like the CLI
+            arguments, e.g. title="My Package", public_only=True or
+            recursive_all_in_one=True.
+
+    Raises:
+        TypeError: If an option isn't a markdown command option
+
+    Returns:
+        Union[str, Iterator[str]]: the Markdown document, or its chunks
+    """
+    # Only import the CLI helpers, and the Markdown formatter, when used
+    # pylint: disable-next = import-outside-toplevel
+    from doctopi.cli import cli, parse_settings
+    # pylint: disable-next = import-outside-toplevel
+    from doctopi.cli.markdown import configure_markdown
+
+    # Start from the markdown command's defaults, then apply the options
+    args = cli(["markdown", "--input", os.curdir])
+    args.config = [] if config is None else config
+    for name, value in options.items():
+        if name in ("input", "output", "config") or not hasattr(args, name):
+            raise TypeError(f"generate() got an unexpected option '{name}'")
+        setattr(args, name, value)
+
+    builder = configure_markdown(parse_settings(args))
+    return builder.iter_render(src) if stream else builder.render(src)
+
+
+__all__ = ["generate"]
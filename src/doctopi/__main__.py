@@ -1,32 +1,41 @@
-"""DoctoPi main entrypoint"""
+"""DoctoPi main entrypoint. Modules which import the heavy third-party
+dependencies (docspec, docstring_parser, mdutils) are imported by the
+subcommands which need them, so the CLI starts quickly.
+"""
 # Built-in imports
+from __future__ import annotations
 import argparse
 import importlib
 import importlib.resources
+import json
+import logging
 import os
 import shutil
 import sys
-from typing import Dict, List, Type
+from typing import (Any, Callable, Collection, Dict, Iterator, List, Optional, Set, Tuple,
+                    TYPE_CHECKING)
 
 # This package imports
-from doctopi.cli import cli, parse_settings, DoctoPiConfigError
-from doctopi.formatter.markdown.markdown_builder import MarkdownBuilder
-from doctopi.formatter.markdown.cmd import *  # pylint: disable = wildcard-import # noqa F403
-
-
-MARKDOWN_CMDS: Dict[str, Type] = {
-    "classes": MarkdownClassCommand,  # noqa: F405
-    "functions": MarkdownFunctionCommand,  # noqa: F405
-    "constructor": MarkdownConstructorCommand,  # noqa: F405
-    "inner_classes": MarkdownInnerClassCommand,  # noqa: F405
-    "class_variables": MarkdownClassVarCommand,  # noqa: F405
-    "instance_variables": MarkdownInstanceVarCommand,  # noqa: F405
-    "methods": MarkdownMethodsCommand,  # noqa: F405
-    "arguments": MarkdownArgsCommand,  # noqa: F405
-    "raises": MarkdownRaisesCommand,  # noqa: F405
-    "returns": MarkdownReturnsCommand  # noqa: F405
-}
-"""Map INI config strings for commands to MarkdownCommand types"""
+from doctopi.cli import cli, parse_settings, parse_src_settings, DoctoPiConfigError
+from doctopi.cli.markdown import (configure_html, configure_markdown, configure_rest,
+                                  linked_pages, symbol_index)
+from doctopi.cli.server import DocServer, send_request
+from doctopi.cli.stamp import StaleDocsError, is_stale, stamp
+from doctopi.ir import SnapshotCache, dump_json, dump_jsonl, dump_snapshot
+from doctopi.parser.archive import is_archive
+from doctopi.parser.cache import MemoryParseCache, ParseCache
+from doctopi.parser.changes import changed_since
+from doctopi.parser.parser_factory import ParserFactory
+from doctopi.parser.scheduler import WorkerPools
+from doctopi.parser.walker import DirectoryWalker
+from doctopi.parser.watcher import SourceWatcher
+
+if TYPE_CHECKING:
+    from doctopi.formatter.doc_builder import DocBuilder
+    from doctopi.formatter.markdown.search_index import SearchIndex
+    from doctopi.formatter.markdown.shard import ShardArtifact
+    from doctopi.formatter.markdown.symbol_index import SymbolIndex
+    from doctopi.ir.coverage import CoverageReport
 
 
 def main(raw_args: List[str]):
@@ -41,24 +50,15 @@ def main(raw_args: List[str]):
     args = cli(raw_args)
 
     if args.command == "markdown":
-        # Combine args with ini config
-        args = parse_settings(args)
-
-        if args.recursive:
-            # Disable the all-in-one recursion style
-            args.recursive_all_in_one = False
+        # Forward the request to a daemon, if one is listening
+        if args.server and forward(args.server, raw_args):
+            return
 
-            # Walk through the directories and generate a readme for each
-            for dirpath, _, _ in os.walk(args.input):
-                args.title = os.path.basename(dirpath)
-                args.input = dirpath
-                # Modify output to point to a file in the dirpath
-                args.output = os.path.join(dirpath, os.path.basename(args.output))
+        run_markdown(args)
 
-                markdown(args)
-
-        else:
-            markdown(args)
+    # Stream reStructuredText or HTML
+    elif args.command in ("rest", "html"):
+        stream(parse_settings(args), configure_rest if args.command == "rest" else configure_html)
 
     # Generate a default INI file
     elif args.command == "generate-ini":
@@ -66,59 +66,676 @@ def main(raw_args: List[str]):
         # Copy default.ini to destination
         shutil.copy(importlib.resources.files("doctopi.cli") / "default.ini", args.output)
 
+    # Dump the parsed source code
+    elif args.command == "dump":
+        dump(parse_src_settings(args))
+
+    # Run a daemon handling forwarded markdown requests
+    elif args.command == "serve":
+        serve(args)
+
+    # Merge the artifacts of sharded markdown runs
+    elif args.command == "merge":
+        # pylint: disable-next = import-outside-toplevel
+        from doctopi.formatter.markdown.shard import ShardArtifact, merge
+
+        for document in merge([ShardArtifact.load(path) for path in args.artifacts]):
+            document.create_md_file()
+
+    # Run the markdown jobs of a manifest
+    elif args.command == "batch":
+        batch(args)
+
+    # Look up symbols in a database written by dump
+    elif args.command == "query":
+        query(args)
+
+    # Compare the public API of two versions
+    elif args.command == "diff":
+        diff(parse_src_settings(args))
+
     else:
         raise NotImplementedError(args.command)
 
 
-def markdown(args: argparse.Namespace):
-    """Build and execute a MarkdownBuilder
+def forward(path: str, raw_args: List[str]) -> bool:
+    """Forward a request to a daemon started by the serve command
+
+    Args:
+        path (str): Unix socket path of the daemon
+        raw_args (List[str]): System args
+
+    Raises:
+        ServerError: If the daemon failed to handle the request
+
+    Returns:
+        bool: True if the daemon handled the request, False if no
+            daemon is listening
+    """
+    try:
+        send_request(path, raw_args)
+    except (ConnectionError, FileNotFoundError):
+        logging.warning("No DoctoPi daemon is listening on '%s', running locally", path)
+        return False
+    return True
+
+
+def serve(args: argparse.Namespace):
+    """Run a daemon handling markdown requests forwarded by `forward`.
+    Parsed source files are cached in memory between requests, keyed by
+    the digest of their contents, so changed files are parsed again. The
+    worker processes of `--jobs` requests are kept alive between them.
+
+    Args:
+        args (argparse.Namespace): CLI arguments
+    """
+    cache = MemoryParseCache()
+
+    def handle(raw_args: List[str], cwd: str):
+        request = cli(raw_args)
+        if request.command != "markdown" or request.watch:
+            raise DoctoPiConfigError("The daemon only runs markdown requests, without --watch")
+
+        # Resolve paths against the client's working directory, and don't forward again.
+        # An input which isn't a path there is the name of an installed distribution.
+        for attr in ["input", "output", "config", "cache", "shard_artifact", "parse_history",
+                     "profile", "coverage", "search_index"]:
+            path = getattr(request, attr, None)
+            if path and (attr != "input" or os.path.exists(os.path.join(cwd, path))):
+                setattr(request, attr, os.path.join(cwd, path))
+        request.server = None
+
+        # Write the default shard artifact in the client's directory too
+        if request.shard and not request.shard_artifact:
+            # pylint: disable-next = import-outside-toplevel
+            from doctopi.formatter.markdown.shard import artifact_name, parse_shard
+            request.shard_artifact = os.path.join(cwd, artifact_name(*parse_shard(request.shard)))
+
+        run_markdown(request, cache)
+
+    with WorkerPools(), DocServer(args.socket, handle, args.max_requests,
+                                  args.idle_timeout) as server:
+        logging.info("Listening on '%s'", args.socket)
+        server.serve()
+
+
+def batch(args: argparse.Namespace):
+    """Run the markdown jobs of a manifest in a shared worker pool,
+    sharing parsed source files in memory, and the worker processes of
+    `--jobs` jobs, and write a report of each job's result and timing
 
     Args:
         args (argparse.Namespace): CLI arguments
 
     Raises:
-        DoctoPiConfigError: If a command from the ini doesn't exist
-    """
-    # Instantiate a MarkdownBuilder
-    builder = MarkdownBuilder() \
-        .configure_metadata(args.title, args.author) \
-        .align_tables(args.table_align) \
-        .configure_src(args.src_language, args.docstring_style) \
-        .configure_io(args.input, args.output, args.recursive_all_in_one)
-
-    # Toggle markdown settings
-    for config in ["constructors", "class_vars", "instance_vars", "methods",
-                   "inner_classes", "file_overview", "public_only"]:
-        if not getattr(args, config, True):
-            builder.toggle(config)
-
-    # Toggle a table of contents
-    if args.table_of_contents:
-        builder.enable_toc(args.toc_depth, args.toc_title)
-
-    # Add commands to the Builder to organize documentation for files
-    for cmd in args.file_cmds.split(","):
-        try:
-            builder.add_file_command(MARKDOWN_CMDS[cmd])
-        except KeyError as exc:
-            raise DoctoPiConfigError from exc
+        BatchError: If the manifest is invalid, or jobs failed
+    """
+    # pylint: disable-next = import-outside-toplevel
+    from doctopi.cli.batch import BatchError, load_manifest, run_batch
 
-    # Add commands to the Builder to organize documentation for classes
-    for cmd in args.class_cmds.split(","):
-        try:
-            builder.add_class_commands(MARKDOWN_CMDS[cmd])
-        except KeyError as exc:
-            raise DoctoPiConfigError from exc
+    cache = MemoryParseCache()
+    jobs = load_manifest(args.manifest)
+
+    # Jobs with the same --jobs and parser settings share their worker processes
+    with WorkerPools():
+        report = run_batch(jobs, lambda job: run_markdown(job, cache), args.workers)
+
+    with open(args.report, "w", encoding="utf-8") as report_file:
+        json.dump(report, report_file, indent=2)
+
+    if report["failed"]:
+        raise BatchError(f"{report['failed']} of {len(jobs)} jobs failed, see '{args.report}'")
+
+
+def run_markdown(args: argparse.Namespace, cache: ParseCache = None):
+    """Generate Markdown for the markdown command, writing a Markdown
+    file for each directory when recursive, or a partial artifact when
+    sharded.
+
+    Args:
+        args (argparse.Namespace): CLI arguments
+        cache (ParseCache, optional): Cache of parsed source files, used
+            unless a snapshot is provided by --cache. Defaults to None.
+
+    Raises:
+        DoctoPiConfigError: If the arguments can't be used together
+        GitError: If the files changed since a git ref can't be listed
+    """
+    # Keep the CLI arguments to combine with the ini config again if it changes
+    cli_args = argparse.Namespace(**vars(args))
+
+    # Combine args with ini config
+    args = parse_settings(args)
+
+    _check_markdown_args(args)
+
+    # Share parsed files between runs with a snapshot, or between
+    # the markdown files generated by this run in memory
+    if args.cache:
+        cache = SnapshotCache(args.cache)
+    elif cache is None:
+        cache = MemoryParseCache()
+
+    if args.watch:
+        watch_markdown(cli_args, args, cache)
+        return
+
+    if args.check:
+        check_markdown(args, cache)
+        return
+
+    # Select this shard's files, split the same way by every shard
+    artifact, selected = _select_shard(args) if args.shard else (None, None)
+
+    # Trust git to tell which source files changed, and only regenerate the affected files
+    changed = _changed_sources(args) if args.changed_since else None
+
+    # Index every directory's symbols once, so their Markdown files link to each other
+    symbols = symbol_index(args, cache)
+
+    report, search = _new_reports(args)
+
+    # Regenerate the Markdown files linking to the changed files' symbols too
+    linked = linked_pages(symbols, changed) if changed and symbols is not None else None
+
+    profile = {}
+    for job in markdown_jobs(args):
+        metrics = None
+        if changed is None:
+            metrics = markdown(job, cache=cache, artifact=artifact, selected=selected,
+                               symbols=symbols, coverage=report, search=search)
+        elif _affected(job, changed, linked) or not os.path.exists(job.output):
+            metrics = markdown(job, cache=cache, symbols=symbols)
+        if metrics is not None:
+            profile[job.output] = metrics
+
+    _write_reports(args, profile, report, search)
+
+    if args.cache:
+        cache.save()
+
+    if artifact is not None:
+        # pylint: disable-next = import-outside-toplevel
+        from doctopi.formatter.markdown.shard import artifact_name
+
+        with open(args.shard_artifact or artifact_name(artifact.index, artifact.count),
+                  "w", encoding="utf-8") as artifact_file:
+            artifact.dump(artifact_file)
+
+
+def check_markdown(args: argparse.Namespace, cache: ParseCache):
+    """Check the Markdown files are up to date, without writing them
+
+    Args:
+        args (argparse.Namespace): CLI arguments, combined with the ini
+            config
+        cache (ParseCache): Cache of parsed source files
+
+    Raises:
+        StaleDocsError: If Markdown files are missing or out of date
+    """
+    symbols = symbol_index(args, cache)
+    stale = [job.output for job in markdown_jobs(args) if is_stale(job, cache, symbols)]
+    if stale:
+        raise StaleDocsError(f"{len(stale)} Markdown files are out of date: {', '.join(stale)}")
+
+
+def _new_reports(
+        args: argparse.Namespace) -> Tuple[Optional[CoverageReport], Optional[SearchIndex]]:
+    """Create the --coverage and --search-index reports of a markdown
+    run, which are filled in while rendering the Markdown files
+
+    Args:
+        args (argparse.Namespace): CLI arguments, combined with the ini
+            config
+
+    Returns:
+        Tuple[Optional[CoverageReport], Optional[SearchIndex]]: the
+            documentation coverage of the parsed files, and the search
+            index of the documented symbols, or None if not requested
+    """
+    # Measure the documentation coverage of the files parsed for the Markdown
+    report = None
+    if args.coverage:
+        # pylint: disable-next = import-outside-toplevel
+        from doctopi.ir.coverage import CoverageReport
+        report = CoverageReport()
+
+    # Index the documented symbols for client-side search while rendering them
+    search = None
+    if args.search_index:
+        # pylint: disable-next = import-outside-toplevel
+        from doctopi.formatter.markdown.search_index import SearchIndex
+        search = SearchIndex()
+
+    return report, search
+
+
+def _write_reports(args: argparse.Namespace, profile: Dict[str, Dict[str, Any]],
+                   report: Optional[CoverageReport], search: Optional[SearchIndex] = None):
+    """Write the --profile, --coverage and --search-index reports of a
+    markdown run
+
+    Args:
+        args (argparse.Namespace): CLI arguments, combined with the ini
+            config
+        profile (Dict[str, Dict[str, Any]]): pipeline stage metrics and
+            worker utilization of each Markdown file
+        report (Optional[CoverageReport]): documentation coverage of the
+            parsed files
+        search (Optional[SearchIndex], optional): search index of the
+            documented symbols. Defaults to None.
+    """
+    if args.profile:
+        with open(args.profile, "w", encoding="utf-8") as profile_file:
+            json.dump({"outputs": profile}, profile_file, indent=2)
+
+    if report is not None:
+        with open(args.coverage, "w", encoding="utf-8") as coverage_file:
+            report.write(coverage_file, "json" if args.coverage.endswith(".json") else "markdown")
+
+    if search is not None:
+        search.write(args.search_index)
+
+
+def _changed_sources(args: argparse.Namespace) -> Set[str]:
+    """List the source files changed since the git ref given by
+    --changed-since
+
+    Args:
+        args (argparse.Namespace): CLI arguments, combined with the ini
+            config
+
+    Raises:
+        GitError: If the changed files can't be listed
+
+    Returns:
+        Set[str]: absolute paths of the changed source files
+    """
+    parser = ParserFactory(args.src_language, args.docstring_style)
+    changed = {path for path in changed_since(args.changed_since, args.input)
+               if parser.accepts(path)}
+    logging.info("%d source files changed since %s", len(changed), args.changed_since)
+    return changed
+
+
+def _select_shard(args: argparse.Namespace) -> Tuple[ShardArtifact, Set[str]]:
+    """Select the source files of the shard given by --shard. Every shard
+    splits the files the same way.
+
+    Args:
+        args (argparse.Namespace): CLI arguments, combined with the ini
+            config
+
+    Returns:
+        Tuple[ShardArtifact, Set[str]]: an empty artifact for the shard,
+            and the absolute paths of its source files
+    """
+    # pylint: disable-next = import-outside-toplevel
+    from doctopi.formatter.markdown.shard import ShardArtifact, parse_shard, partition
+
+    index, count = parse_shard(args.shard)
+    walker = DirectoryWalker(ParserFactory(args.src_language, args.docstring_style))
+    selected = set(partition(list(walker.iter_sources(args.input)), count,
+                             root=args.input, strategy=args.shard_strategy)[index - 1])
+    return ShardArtifact(index, count), selected
+
+
+def _check_markdown_args(args: argparse.Namespace):
+    """Check the markdown command's arguments can be used together
 
-    # Add commands to the Builder to organize documentation for functions
-    for cmd in args.func_cmds.split(","):
+    Args:
+        args (argparse.Namespace): CLI arguments, combined with the ini
+            config
+
+    Raises:
+        DoctoPiConfigError: If a dump is rendered recursively, sharded
+            or watched, a sharded build is watched, --changed-since is
+            used with a dump, shards or --watch, --check is used with
+            shards, --watch or --changed-since, --search-index or
+            --coverage is used with shards, --watch or --changed-since,
+            --profile is used without --pipeline or --jobs, symbols are
+            linked in shards, or an archive is rendered recursively,
+            sharded, watched or with --changed-since
+    """
+    if args.recursive and args.from_dump:
+        raise DoctoPiConfigError("--recursive can't be used with --from-dump")
+
+    if args.shard and args.from_dump:
+        raise DoctoPiConfigError("--shard can't be used with --from-dump")
+
+    if args.watch and (args.from_dump or args.shard):
+        raise DoctoPiConfigError("--watch can't be used with --from-dump or --shard")
+
+    if args.changed_since and (args.from_dump or args.shard or args.watch):
+        raise DoctoPiConfigError("--changed-since can't be used with --from-dump, --shard "
+                                 "or --watch")
+
+    if args.check and (args.shard or args.watch or args.changed_since):
+        raise DoctoPiConfigError("--check can't be used with --shard, --watch or "
+                                 "--changed-since")
+
+    # The index or report would only cover the files rendered by this run
+    if args.search_index and (args.shard or args.watch or args.changed_since):
+        raise DoctoPiConfigError("--search-index can't be used with --shard, --watch or "
+                                 "--changed-since")
+
+    if args.coverage and (args.shard or args.watch or args.changed_since):
+        raise DoctoPiConfigError("--coverage can't be used with --shard, --watch or "
+                                 "--changed-since")
+
+    # Only a pipeline or worker processes record anything to profile
+    if args.profile and not (args.pipeline or args.jobs > 1):
+        raise DoctoPiConfigError("--profile needs --pipeline or --jobs")
+
+    # A shard only indexes its own files, so its links would differ from a single run
+    if args.shard and (args.link_symbols or args.inherited_members):
+        raise DoctoPiConfigError("--link-symbols and --inherited-members can't be used with "
+                                 "--shard")
+
+    if (args.recursive or args.shard or args.watch or args.changed_since) \
+            and is_archive(args.input):
+        raise DoctoPiConfigError("--recursive, --shard, --watch and --changed-since can't be "
+                                 "used with an archive or installed distribution")
+
+
+def watch_markdown(cli_args: argparse.Namespace, args: argparse.Namespace,
+                   cache: ParseCache, stop: Callable[[], bool] = None):
+    """Generate Markdown, then keep the parsed source files in memory and
+    regenerate the affected Markdown files whenever source files or the
+    ini config change. Only changed source files are parsed again, and
+    Markdown files are written atomically.
+
+    Args:
+        cli_args (argparse.Namespace): CLI arguments, before being
+            combined with the ini config
+        args (argparse.Namespace): CLI arguments, combined with the ini
+            config
+        cache (ParseCache): Cache of parsed source files
+        stop (Callable[[], bool], optional): Checked between polls. Stop
+            watching when it returns True. Defaults to None.
+    """
+    parser = ParserFactory(args.src_language, args.docstring_style)
+    watcher = SourceWatcher(args.input, parser.extensions, files=[args.config],
+                            interval=args.watch_interval)
+    changed = None
+
+    while True:
         try:
-            builder.add_function_commands(MARKDOWN_CMDS[cmd])
-        except KeyError as exc:
-            raise DoctoPiConfigError from exc
+            # Combine the args with the changed ini config, and regenerate everything
+            if changed is not None and os.path.abspath(args.config) in changed:
+                args = parse_settings(argparse.Namespace(**vars(cli_args)))
+                changed = None
+
+            symbols = symbol_index(args, cache)
+            linked = linked_pages(symbols, changed) if changed and symbols is not None else None
+            for job in markdown_jobs(args):
+                if changed is None or _affected(job, changed, linked):
+                    builder = configure_markdown(job, cache, symbols=symbols)
+                    builder.configure_header(stamp(job, builder.parser))
+                    builder.build_document().write_md_file()
+
+            if args.cache:
+                cache.save()
+
+        # Keep watching when a file being edited can't be parsed
+        except Exception:  # pylint: disable = broad-exception-caught
+            logging.exception("Failed to generate Markdown")
+
+        changed = watcher.wait(stop)
+        if not changed:
+            return
+
+
+def _affected(job: argparse.Namespace, changed: Set[str],
+              linked: Callable[[str], bool] = None) -> bool:
+    """Check if changed source files affect a Markdown file
+
+    Args:
+        job (argparse.Namespace): CLI arguments for the Markdown file
+        changed (Set[str]): absolute paths of changed source files
+        linked (Callable[[str], bool], optional): Checks if a Markdown
+            file links to symbols of the changed files. Defaults to
+            None, for Markdown files which don't link to each other.
+
+    Returns:
+        bool: True if the Markdown file should be regenerated
+    """
+    src = os.path.abspath(job.input)
+    if not os.path.isdir(src):
+        return src in changed
+
+    # Only a directory's own files are rendered, unless recursing all in one
+    if job.recursive_all_in_one:
+        affected = any(path.startswith(src + os.sep) for path in changed)
+    else:
+        affected = any(os.path.dirname(path) == src for path in changed)
+    return affected or (linked is not None and linked(job.output))
+
+
+def markdown_jobs(args: argparse.Namespace) -> Iterator[argparse.Namespace]:
+    """List the Markdown files to generate. With --recursive, there's
+    one for each directory with source files.
+
+    Args:
+        args (argparse.Namespace): CLI arguments, combined with the ini
+            config
+
+    Yields:
+        argparse.Namespace: CLI arguments for each Markdown file
+    """
+    if not args.recursive:
+        yield args
+        return
+
+    # Walk through the directories in sorted order and generate a readme for each
+    parser = ParserFactory(args.src_language, args.docstring_style)
+    for dirpath, dirnames, filenames in os.walk(args.input):
+        dirnames.sort()
+
+        # Skip directories without source files, e.g. __pycache__
+        if not any(parser.accepts(os.path.join(dirpath, name)) for name in filenames):
+            continue
+
+        # Disable the all-in-one recursion style
+        job = argparse.Namespace(**vars(args))
+        job.recursive_all_in_one = False
+        job.title = os.path.basename(dirpath)
+        job.input = dirpath
+        # Modify output to point to a file in the dirpath
+        job.output = os.path.join(dirpath, os.path.basename(args.output))
+
+        yield job
+
+
+# pylint: disable-next = too-many-arguments
+def markdown(args: argparse.Namespace, *, cache: ParseCache = None,
+             artifact: ShardArtifact = None, selected: Collection[str] = None,
+             symbols: SymbolIndex = None,
+             coverage: CoverageReport = None,
+             search: SearchIndex = None) -> Optional[Dict[str, Any]]:
+    """Build and execute a MarkdownBuilder
+
+    Args:
+        args (argparse.Namespace): CLI arguments
+        cache (ParseCache, optional): Cache of parsed source files.
+            Defaults to None.
+        artifact (ShardArtifact, optional): Shard artifact to add the
+            document to, instead of writing the Markdown file. Defaults
+            to None.
+        selected (Collection[str], optional): Absolute paths of the
+            source files rendered by the shard. Defaults to None.
+        symbols (SymbolIndex, optional): Index of the symbols to link
+            to. Defaults to None, indexing the documentation being
+            rendered.
+        coverage (CoverageReport, optional): Report the documentation
+            coverage of the parsed files is added to. Defaults to None.
+        search (SearchIndex, optional): Index the documented symbols are
+            added to. Defaults to None.
+
+    Returns:
+        Optional[Dict[str, Any]]: profile of the Markdown file, with the
+            pipeline's stage metrics and the worker utilization of the
+            "scheduler", if it was built by a pipeline or parsed by
+            worker processes
+    """
+    builder = configure_markdown(args, cache, symbols)
+    if coverage is not None:
+        builder.configure_coverage(coverage)
+    if search is not None:
+        builder.configure_search(search)
+
+    # Stamp the documentation with its sources and settings for --check
+    builder.configure_header(stamp(args, builder.parser))
 
     # Generate the documentation
-    builder.build()
+    if artifact is None:
+        builder.build()
+        profile = builder.pipeline_stats.to_dict() if builder.pipeline_stats else {}
+        if builder.scheduler_stats is not None:
+            profile["scheduler"] = builder.scheduler_stats.to_dict()
+        return profile or None
+
+    # Render only the shard's files, leaving the table of contents for the merge
+    builder.configure_select(selected.__contains__)
+    artifact.add(builder.build_document(), selected, builder.toc_title,
+                 builder.toc_depth if builder.table_of_contents else 0)
+    return None
+
+
+def stream(args: argparse.Namespace,
+           configure: Callable[[argparse.Namespace, ParseCache], DocBuilder]):
+    """Stream reStructuredText or HTML for the rest and html commands,
+    writing a file for each directory when recursive. Parsed files are
+    shared with the markdown command through the --cache snapshot.
+
+    Args:
+        args (argparse.Namespace): CLI arguments, combined with the ini
+            config
+        configure (Callable[[argparse.Namespace, ParseCache],
+            DocBuilder]): Configure the builder of each file from
+            its arguments and the cache, e.g. configure_rest
+
+    Raises:
+        DoctoPiConfigError: If a dump or an archive is rendered
+            recursively, or pages are written recursively
+    """
+    if args.recursive and (args.from_dump or is_archive(args.input)):
+        raise DoctoPiConfigError("--recursive can't be used with --from-dump, an archive or "
+                                 "an installed distribution")
+
+    if args.recursive and args.pages:
+        raise DoctoPiConfigError("--recursive can't be used with --pages, which already "
+                                 "writes a page for each module")
+
+    cache = SnapshotCache(args.cache) if args.cache else None
+    for job in markdown_jobs(args):
+        configure(job, cache).build()
+
+    if cache is not None:
+        cache.save()
+
+
+def dump(args: argparse.Namespace):
+    """Parse source code and write it as JSON, JSON Lines, a snapshot, or
+    a SQLite symbol database
+
+    Args:
+        args (argparse.Namespace): CLI arguments
+
+    Raises:
+        DoctoPiConfigError: If an archive is written to a symbol database
+    """
+    parser = ParserFactory(language=args.src_language, style=args.docstring_style)
+
+    # Only parse the files which changed since the database was last updated
+    if args.format == "sqlite":
+        if is_archive(args.input):
+            raise DoctoPiConfigError("Archives and installed distributions can't be written to "
+                                     "a symbol database")
+
+        # pylint: disable-next = import-outside-toplevel
+        from doctopi.ir.database import SymbolDatabase
+
+        with SymbolDatabase(args.output or "doctopi.db") as database:
+            parsed, deleted = database.update(args.input, parser)
+        logging.info("Parsed %d changed files, deleted %d files", parsed, deleted)
+        return
+
+    path = args.output or "doctopi.json"
+
+    # Parse the provided source path
+    if is_archive(args.input):
+        parsed_docs = DirectoryWalker(parser).parse(args.input)
+    else:
+        parsed_docs = parser.parse_file(args.input) \
+            if os.path.isfile(args.input) else parser.parse_dir(args.input)
+
+    if args.format == "snapshot":
+        with open(path, "wb") as output:
+            dump_snapshot(parsed_docs, output)
+        return
+
+    with open(path, "w", encoding="utf-8") as output:
+        if args.format == "jsonl":
+            dump_jsonl(parsed_docs, output)
+        else:
+            dump_json(parsed_docs, output)
+
+
+def diff(args: argparse.Namespace):
+    """Write the public API changes between two versions of source code
+    or dumps. Files whose contents didn't change aren't parsed.
+
+    Args:
+        args (argparse.Namespace): CLI arguments
+
+    Raises:
+        DoctoPiConfigError: If the newer version is left out without
+            --git
+    """
+    # pylint: disable-next = import-outside-toplevel
+    from doctopi.ir.diff import diff_trees, open_tree
+
+    if not args.new and args.git is None:
+        raise DoctoPiConfigError("diff needs the newer version, unless --git compares a ref "
+                                 "with the working tree")
+
+    parser = ParserFactory(language=args.src_language, style=args.docstring_style)
+    cache = SnapshotCache(args.cache) if args.cache else None
+    api_diff = diff_trees(open_tree(args.old, parser, args.git, cache),
+                          open_tree(args.new, parser, args.git, cache))
+    if cache is not None:
+        cache.save()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            api_diff.write(output, args.format)
+    else:
+        api_diff.write(sys.stdout, args.format)
+
+
+def query(args: argparse.Namespace):
+    """Print the symbols of a database written by `dump -f sqlite` which
+    match the query, one per line with their kind and source file
+
+    Args:
+        args (argparse.Namespace): CLI arguments
+
+    Raises:
+        DoctoPiConfigError: If the database doesn't exist
+    """
+    # pylint: disable-next = import-outside-toplevel
+    from doctopi.ir.database import SymbolDatabase
+
+    if not os.path.isfile(args.database):
+        raise DoctoPiConfigError(f"No symbol database '{args.database}', write one with "
+                                 "dump -f sqlite")
+
+    with SymbolDatabase(args.database) as database:
+        for symbol in database.find(args.pattern, args.kind, args.access, args.path,
+                                    args.missing):
+            print(f"{symbol.qualname}\t{symbol.kind}\t{symbol.path}")
 
 
 if __name__ == "__main__":
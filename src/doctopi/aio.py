@@ -0,0 +1,141 @@
+"""Generate Markdown documentation from asyncio code without blocking the
+event loop. Parsing and rendering run in an executor's threads, and the
+Markdown is handed back in chunks, so a task can be cancelled between
+source files:
+
+    markdown = await doctopi.aio.generate("src/my_package", title="My Package")
+
+    async for chunk in doctopi.aio.stream("src/my_package"):
+        await response.write(chunk)
+
+    readmes = await doctopi.aio.generate_all(["src/a", "src/b", "src/c"], limit=2)
+"""
+# Built-in imports
+import asyncio
+from concurrent.futures import Executor
+import functools
+import os
+from typing import (Any, AsyncIterator, Iterable, List, Union, TYPE_CHECKING)
+
+# This package imports
+import doctopi
+
+if TYPE_CHECKING:
+    from doctopi.types import (DocDir, DocFile)
+
+_DONE = object()
+"""Returned by next() once all the chunks are rendered"""
+
+
+async def stream(src: Union[str, bytes, os.PathLike, "DocFile", "DocDir"],
+                 config: Union[str, os.PathLike] = None,
+                 executor: Executor = None,
+                 **options: Any) -> AsyncIterator[str]:
+    """Generate Markdown documentation in an executor, as an async
+    iterator of chunks. Nothing is written to disk.
+
+    Args:
+        src (Union[str, bytes, os.PathLike, DocFile, DocDir]): Source
+            file/dir to parse, or already parsed documentation.
+        config (Union[str, os.PathLike], optional): INI config file.
+            Defaults to None, using only the default INI config.
+        executor (Executor, optional): Thread pool to parse and render
+            in. Defaults to None, using the event loop's default
+            executor.
+        **options (Any): markdown command options, as for
+            doctopi.generate()
+
+    Raises:
+        TypeError: If an option isn't a markdown command option
+
+    Yields:
+        str: consecutive pieces of the Markdown document
+    """
+    loop = asyncio.get_running_loop()
+    chunks = await loop.run_in_executor(
+        executor, functools.partial(doctopi.generate, src, config, stream=True, **options))
+
+    future = None
+    try:
+        while True:
+            # The chunk keeps rendering if the task is cancelled, so shield it
+            # and only close the generator once the executor is done with it
+            future = loop.run_in_executor(executor, next, chunks, _DONE)
+            chunk = await asyncio.shield(future)
+            if chunk is _DONE:
+                return
+            yield chunk
+    finally:
+        if future is None or future.done():
+            chunks.close()
+        else:
+            future.add_done_callback(lambda _: chunks.close())
+
+
+async def generate(src: Union[str, bytes, os.PathLike, "DocFile", "DocDir"],
+                   config: Union[str, os.PathLike] = None,
+                   executor: Executor = None,
+                   **options: Any) -> str:
+    """Generate Markdown documentation in an executor. Nothing is
+    written to disk.
+
+    Args:
+        src (Union[str, bytes, os.PathLike, DocFile, DocDir]): Source
+            file/dir to parse, or already parsed documentation.
+        config (Union[str, os.PathLike], optional): INI config file.
+            Defaults to None, using only the default INI config.
+        executor (Executor, optional): Thread pool to parse and render
+            in. Defaults to None, using the event loop's default
+            executor.
+        **options (Any): markdown command options, as for
+            doctopi.generate()
+
+    Raises:
+        TypeError: If an option isn't a markdown command option
+
+    Returns:
+        str: the Markdown document
+    """
+    return "".join([chunk async for chunk in stream(src, config, executor, **options)])
+
+
+async def generate_all(sources: Iterable[Union[str, bytes, os.PathLike, "DocFile", "DocDir"]],
+                       limit: int = 4,
+                       config: Union[str, os.PathLike] = None,
+                       executor: Executor = None,
+                       **options: Any) -> List[str]:
+    """Generate Markdown documentation for many sources concurrently.
+    If one fails, or the task is cancelled, the others are cancelled.
+
+    Args:
+        sources (Iterable[Union[str, bytes, os.PathLike, DocFile,
+            DocDir]]): Source files/dirs to parse, or already parsed
+            documentation.
+        limit (int, optional): Maximum sources generated at once.
+            Defaults to 4.
+        config (Union[str, os.PathLike], optional): INI config file.
+            Defaults to None, using only the default INI config.
+        executor (Executor, optional): Thread pool to parse and render
+            in. Defaults to None, using the event loop's default
+            executor.
+        **options (Any): markdown command options, as for
+            doctopi.generate()
+
+    Raises:
+        TypeError: If an option isn't a markdown command option
+
+    Returns:
+        List[str]: the Markdown document of each source, in order
+    """
+    slots = asyncio.Semaphore(limit)
+
+    async def generate_one(src):
+        async with slots:
+            return await generate(src, config, executor, **options)
+
+    tasks = [asyncio.ensure_future(generate_one(src)) for src in sources]
+    try:
+        return list(await asyncio.gather(*tasks))
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -5,6 +5,9 @@ import configparser
 import os
 from typing import List
 
+# This package imports
+from doctopi.cli.server import default_socket
+
 
 class DoctoPiConfigError(Exception):
     """Error occurred while configuration DoctoPi"""
@@ -33,35 +36,299 @@ def cli(sys_args: List[str]) -> argparse.Namespace:
     markdown_parser = subparsers.add_parser("markdown", help="Generate Markdown documentation")
 
     markdown_parser.add_argument("-i", "--input", required=True,
-                                 help="Source file or directory to parse")
+                                 help="Source file or directory, wheel/zip/tar archive, or "
+                                      "installed distribution name to parse")
     markdown_parser.add_argument("-o", "--output", default="README.md",
                                  help="Output Markdown file")
-    markdown_parser.add_argument("-c", "--config", default="./doctopi.ini",
-                                 help="Path to doctopi ini configuration file.")
-    markdown_parser.add_argument("-l", "--src-language", choices=["python", "java", "cpp"],
-                                 required=False,
-                                 help="Programming language of source code")
-    markdown_parser.add_argument("-d", "--docstring-style", required=False,
-                                 help="Docstring flavor (E.g. Sphinx, Google, JavaDoc)")
+    add_src_arguments(markdown_parser)
+    markdown_parser.add_argument("--from-dump", action="store_true",
+                                 help="Render the JSON/JSON Lines dump provided by --input "
+                                      "instead of parsing source code")
+    markdown_parser.add_argument("--cache", required=False,
+                                 help="Snapshot file caching parsed source files between runs. "
+                                      "Unchanged files aren't parsed again.")
+    markdown_parser.add_argument("--changed-since", required=False, metavar="REF",
+                                 help="Only regenerate the Markdown files affected by source "
+                                      "files changed since a git ref, reusing the other parsed "
+                                      "files from --cache")
+    markdown_parser.add_argument("-j", "--jobs", type=int, default=1,
+                                 help="Parse source files in this many worker processes, most "
+                                      "expensive first")
+    markdown_parser.add_argument("--parse-history", required=False,
+                                 help="JSON file of parse timings from previous runs, used by "
+                                      "--jobs to estimate the cost of each file")
+    markdown_parser.add_argument("--check", action="store_true",
+                                 help="Don't write anything, but list the Markdown files which "
+                                      "are missing or out of date and fail if there are any")
+    markdown_parser.add_argument("--pipeline", action="store_true",
+                                 help="Overlap reading, parsing, rendering and writing the "
+                                      "source files, in threads connected by bounded queues")
+    add_report_arguments(markdown_parser)
+    markdown_parser.add_argument("--server", nargs="?", const=default_socket(), metavar="SOCKET",
+                                 help="Forward the request to a daemon started by the serve "
+                                      "command, or run it here if no daemon is listening")
+    markdown_parser.add_argument("--watch", action="store_true",
+                                 help="Keep running, regenerating the affected Markdown files "
+                                      "when source files or the INI config change")
+    markdown_parser.add_argument("--watch-interval", type=float, default=0.5,
+                                 help="Seconds between polls for changes with --watch")
+    markdown_parser.add_argument("--shard", required=False, metavar="I/N",
+                                 help="Only parse and render shard I of N, writing a partial "
+                                      "artifact for the merge command")
+    markdown_parser.add_argument("--shard-strategy", choices=["hash", "size"], default="hash",
+                                 help="Split files between shards by a hash of their path, or "
+                                      "balance shards by file size")
+    markdown_parser.add_argument("--shard-artifact", required=False,
+                                 help="Partial artifact written by --shard. Defaults to "
+                                      "doctopi-shard-I-of-N.json")
     markdown_parser.add_argument("-r", "--recursive", action="store_true",
                                  help="Recursively create a markdown file in each parsed directory")
     markdown_parser.add_argument("--recursive-all-in-one", action="store_true",
                                  help="Create a single markdown file with contents of files and "
                                       "directories parsed recursively.")
-    markdown_parser.add_argument("-t", "--title", required=False,
-                                 help="Title of the Markdown document")
-    markdown_parser.add_argument("-a", "--author", required=False,
-                                 help="Author of the Markdown document")
-    markdown_parser.add_argument("--toc-depth", type=int, required=False,
-                                 help="Heading depth of the table of contents")
-    markdown_parser.add_argument("--toc-title", required=False,
-                                 help="Title for the table of contents")
+    add_metadata_arguments(markdown_parser, "Markdown")
     markdown_parser.add_argument("--table-align", choices=["left", "center", "right"],
                                  required=False,
                                  help="Text alignment for all markdown tables")
 
     # Enable content toggles
-    toggle_group = markdown_parser.add_argument_group("Content Toggles")
+    add_toggle_arguments(markdown_parser)
+
+    # reStructuredText command
+    add_stream_arguments(subparsers.add_parser(
+        "rest", help="Generate reStructuredText documentation"), "reStructuredText", "index.rst")
+
+    # HTML command
+    add_html_arguments(subparsers.add_parser(
+        "html", help="Generate static HTML documentation, with no external assets"))
+
+    # Dump command
+    dump_parser = subparsers.add_parser(
+        "dump",
+        help="Dump parsed source code as JSON, JSON Lines, a snapshot or a SQLite symbol "
+             "database")
+
+    dump_parser.add_argument("-i", "--input", required=True,
+                             help="Source file or directory, wheel/zip/tar archive, or "
+                                  "installed distribution name to parse")
+    dump_parser.add_argument("-o", "--output", required=False,
+                             help="Output dump file. Defaults to doctopi.json, or doctopi.db "
+                                  "for a symbol database.")
+    dump_parser.add_argument("-f", "--format", choices=["json", "jsonl", "snapshot", "sqlite"],
+                             default="json",
+                             help="Dump a single JSON document, JSON Lines with one record per "
+                                  "file, a binary snapshot which is loaded lazily, or a SQLite "
+                                  "database of the symbols for the query command, updated "
+                                  "with only the changed files")
+    add_src_arguments(dump_parser)
+
+    # Serve command
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Run a daemon which keeps parsed source files warm for markdown --server requests")
+
+    serve_parser.add_argument("-s", "--socket", default=default_socket(),
+                              help="Unix socket to listen on")
+    serve_parser.add_argument("--max-requests", type=int, default=os.cpu_count() or 1,
+                              help="Maximum requests handled at once. Extra requests wait.")
+    serve_parser.add_argument("--idle-timeout", type=float, default=600,
+                              help="Seconds without requests before shutting down, or 0 to "
+                                   "never shut down")
+
+    # Merge command
+    merge_parser = subparsers.add_parser(
+        "merge",
+        help="Merge the partial artifacts of markdown --shard runs into Markdown files")
+
+    merge_parser.add_argument("artifacts", nargs="+",
+                              help="Partial artifact written by each shard")
+
+    # Query command
+    query_parser = subparsers.add_parser(
+        "query",
+        help="Look up symbols in a database written by dump -f sqlite")
+
+    add_query_arguments(query_parser)
+
+    # Diff command
+    add_diff_arguments(subparsers.add_parser(
+        "diff",
+        help="Report the public API changes between two versions of source code or dumps"))
+
+    # Batch command
+    batch_parser = subparsers.add_parser(
+        "batch",
+        help="Run the markdown jobs of a TOML manifest in one process, largest first")
+
+    batch_parser.add_argument("manifest",
+                              help="TOML manifest with a [[job]] entry of markdown options for "
+                                   "each job")
+    batch_parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                              help="Jobs run at once")
+    batch_parser.add_argument("--report", default="doctopi-batch-report.json",
+                              help="JSON report of each job's result and timing")
+
+    return parser.parse_args(sys_args)
+
+
+def add_src_arguments(parser: argparse.ArgumentParser):
+    """Add the arguments shared by commands which parse source code
+
+    Args:
+        parser (argparse.ArgumentParser): subcommand parser
+    """
+    parser.add_argument("-c", "--config", default="./doctopi.ini",
+                        help="Path to doctopi ini configuration file.")
+    parser.add_argument("-l", "--src-language", required=False,
+                        help="Programming language of source code (E.g. python, or a "
+                             "language added by a plugin)")
+    parser.add_argument("-d", "--docstring-style", required=False,
+                        help="Docstring flavor (E.g. Sphinx, Google, JavaDoc)")
+
+
+def add_query_arguments(parser: argparse.ArgumentParser):
+    """Add the arguments of the query command
+
+    Args:
+        parser (argparse.ArgumentParser): subcommand parser
+    """
+    parser.add_argument("database", help="SQLite symbol database")
+    parser.add_argument("pattern", nargs="?",
+                        help="Glob pattern of the name, the qualified name or its "
+                             "end, e.g. 'Parser.parse_*'")
+    parser.add_argument("-k", "--kind", choices=["module", "class", "function", "method"],
+                        help="Only find symbols of this kind")
+    parser.add_argument("-a", "--access", choices=["public", "protected", "private"],
+                        help="Only find functions and methods with this access")
+    parser.add_argument("-p", "--path",
+                        help="Only find symbols declared in this file or directory")
+    parser.add_argument("-m", "--missing", choices=["summary", "args", "returns", "raises"],
+                        help="Only find symbols whose docstring lacks this section")
+
+
+def add_report_arguments(parser: argparse.ArgumentParser):
+    """Add the arguments of the reports written by the markdown command
+    from the files it parses and renders
+
+    Args:
+        parser (argparse.ArgumentParser): subcommand parser
+    """
+    parser.add_argument("--profile", required=False, metavar="FILE",
+                        help="Write the throughput and queue depth of each --pipeline "
+                             "stage, and the utilization of the --jobs worker processes, "
+                             "to a JSON file. Needs --pipeline or --jobs.")
+    parser.add_argument("--coverage", required=False, metavar="FILE",
+                        help="Write a report of the public symbols missing docstrings "
+                             "or docstring sections, measured from the same parse. JSON "
+                             "if FILE ends with .json, otherwise Markdown.")
+    parser.add_argument("--search-index", required=False, metavar="DIR",
+                        help="Write an index of the documented symbols' names, "
+                             "signatures and summaries to DIR, as JSON shards for "
+                             "client-side search")
+
+
+def add_diff_arguments(parser: argparse.ArgumentParser):
+    """Add the arguments of the diff command
+
+    Args:
+        parser (argparse.ArgumentParser): subcommand parser
+    """
+    parser.add_argument("old", help="Older source file or directory, or dump, or git ref with "
+                                    "--git")
+    parser.add_argument("new", nargs="?", default="",
+                        help="Newer source file or directory, or dump, or git ref with --git. "
+                             "With --git, WORKTREE or leaving it out compares OLD with the "
+                             "working tree.")
+    parser.add_argument("--git", required=False, metavar="SRC",
+                        help="Compare this source file or directory at the git refs OLD and "
+                             "NEW, without checking them out")
+    parser.add_argument("-o", "--output", required=False,
+                        help="Output report file. Defaults to stdout.")
+    parser.add_argument("-f", "--format", choices=["markdown", "json"], default="markdown",
+                        help="Write the report as Markdown release notes or JSON")
+    parser.add_argument("--cache", required=False,
+                        help="Snapshot file caching parsed source files between runs")
+    add_src_arguments(parser)
+
+
+def add_stream_arguments(parser: argparse.ArgumentParser, language: str, output: str):
+    """Add the arguments of the commands streaming the Markdown commands'
+    documentation in other languages, e.g. rest and html
+
+    Args:
+        parser (argparse.ArgumentParser): subcommand parser
+        language (str): output language, e.g. "HTML"
+        output (str): default output file
+    """
+    parser.add_argument("-i", "--input", required=True,
+                        help="Source file or directory, wheel/zip/tar archive, or installed "
+                             "distribution name to parse")
+    parser.add_argument("-o", "--output", default=output,
+                        help=f"Output {language} file")
+    add_src_arguments(parser)
+    parser.add_argument("--from-dump", action="store_true",
+                        help="Render the JSON/JSON Lines dump provided by --input instead of "
+                             "parsing source code")
+    parser.add_argument("--cache", required=False,
+                        help="Snapshot file caching parsed source files between runs, shared "
+                             "with the markdown command")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Parse source files in this many worker processes up front, "
+                             "rather than each file as it's written")
+    parser.add_argument("--parse-history", required=False,
+                        help="JSON file of parse timings from previous runs, used by --jobs "
+                             "to estimate the cost of each file")
+    parser.add_argument("-r", "--recursive", action="store_true",
+                        help=f"Recursively create a {language} file in each parsed directory")
+    parser.add_argument("--recursive-all-in-one", action="store_true",
+                        help=f"Create a single {language} file with contents of files and "
+                             "directories parsed recursively.")
+    add_metadata_arguments(parser, language)
+    parser.set_defaults(table_align=None, pages=False)
+    add_toggle_arguments(parser, links=False)
+
+
+def add_metadata_arguments(parser: argparse.ArgumentParser, language: str):
+    """Add the title, author and table of contents arguments of the
+    commands generating documentation
+
+    Args:
+        parser (argparse.ArgumentParser): subcommand parser
+        language (str): output language, e.g. "Markdown"
+    """
+    parser.add_argument("-t", "--title", required=False,
+                        help=f"Title of the {language} document")
+    parser.add_argument("-a", "--author", required=False,
+                        help=f"Author of the {language} document")
+    parser.add_argument("--toc-depth", type=int, required=False,
+                        help="Heading depth of the table of contents")
+    parser.add_argument("--toc-title", required=False,
+                        help="Title for the table of contents")
+
+
+def add_html_arguments(parser: argparse.ArgumentParser):
+    """Add the arguments of the html command
+
+    Args:
+        parser (argparse.ArgumentParser): subcommand parser
+    """
+    add_stream_arguments(parser, "HTML", "index.html")
+    parser.add_argument("--pages", action="store_true",
+                        help="Write a page for each module, including subdirectories' modules, "
+                             "and an index page linking them to --output")
+    parser.add_argument("--table-align", choices=["left", "center", "right"], required=False,
+                        help="Text alignment for all HTML tables")
+
+
+def add_toggle_arguments(parser: argparse.ArgumentParser, links: bool = True):
+    """Add the content toggles of the markdown, rest and html commands
+
+    Args:
+        parser (argparse.ArgumentParser): subcommand parser
+        links (bool, optional): Add the toggles linking symbols, which
+            are Markdown-only. Defaults to True.
+    """
+    toggle_group = parser.add_argument_group("Content Toggles")
 
     toggle_group.add_argument("--no-table-of-contents", action="store_false",
                               dest="table_of_contents",
@@ -80,20 +347,28 @@ def cli(sys_args: List[str]) -> argparse.Namespace:
                               help="Do not document file overview")
     toggle_group.add_argument("--public-only", action="store_true",
                               help="Document only public class methods")
+    if not links:
+        parser.set_defaults(link_symbols=False, inherited_members=False)
+        return
 
-    return parser.parse_args(sys_args)
+    toggle_group.add_argument("--link-symbols", action="store_true",
+                              help="Link base classes and the types in tables to the classes "
+                                   "they name, across Markdown files with --recursive")
+    toggle_group.add_argument("--inherited-members", action="store_true",
+                              help="List the methods each class inherits from linked base "
+                                   "classes. Implies --link-symbols.")
 
 
-def parse_settings(cli_args: argparse.Namespace) -> argparse.Namespace:
-    """Combine INI config settings with parsed arguments from CLI
+def load_config(cli_args: argparse.Namespace) -> configparser.ConfigParser:
+    """Read the INI config provided by the CLI and combine it with the
+    default INI config
 
     Args:
         cli_args (argparse.Namespace): Parsed CLI arguments
 
     Returns:
-        argparse.Namespace: Combined INI config and CLI arguments
+        configparser.ConfigParser: Combined INI config
     """
-
     # Read the default configuration
     default_config = configparser.ConfigParser()
     default_config.read(os.path.join(os.path.dirname(__file__), "default.ini"))
@@ -106,7 +381,23 @@ def parse_settings(cli_args: argparse.Namespace) -> argparse.Namespace:
         pass
 
     # Combine provided config with defaults
-    config = combine_configs(default_config, config)
+    return combine_configs(default_config, config)
+
+
+def parse_src_settings(cli_args: argparse.Namespace,
+                       config: configparser.ConfigParser = None) -> argparse.Namespace:
+    """Combine the source code settings from the INI config with parsed
+    arguments from CLI
+
+    Args:
+        cli_args (argparse.Namespace): Parsed CLI arguments
+        config (configparser.ConfigParser, optional): Combined INI
+            config. Read from `cli_args.config` if not provided.
+
+    Returns:
+        argparse.Namespace: Combined INI config and CLI arguments
+    """
+    config = load_config(cli_args) if config is None else config
 
     # Set source language
     cli_args.src_language = cli_args.src_language \
@@ -116,6 +407,24 @@ def parse_settings(cli_args: argparse.Namespace) -> argparse.Namespace:
     cli_args.docstring_style = cli_args.docstring_style \
         if cli_args.docstring_style else config["MAIN"]["docstring_style"]
 
+    return cli_args
+
+
+def parse_settings(cli_args: argparse.Namespace) -> argparse.Namespace:
+    """Combine INI config settings with parsed arguments from CLI
+
+    Args:
+        cli_args (argparse.Namespace): Parsed CLI arguments
+
+    Returns:
+        argparse.Namespace: Combined INI config and CLI arguments
+    """
+    # Read the provided configuration, combined with the defaults
+    config = load_config(cli_args)
+
+    # Set source language and docstring style
+    parse_src_settings(cli_args, config)
+
     # Set file commands
     setattr(cli_args, "file_cmds", config["ORGANIZATION"]["file_docs"])
 
@@ -170,6 +479,14 @@ def parse_settings(cli_args: argparse.Namespace) -> argparse.Namespace:
     # Toggle content for public methods only
     cli_args.public_only = cli_args.public_only or ini_to_bool(config["CONTENT"]["public_only"])
 
+    # Toggle links to the classes named by base classes and types
+    cli_args.link_symbols = \
+        cli_args.link_symbols or ini_to_bool(config["CONTENT"]["link_symbols"])
+
+    # Toggle lists of inherited methods
+    cli_args.inherited_members = \
+        cli_args.inherited_members or ini_to_bool(config["CONTENT"]["inherited_members"])
+
     return cli_args
 
 
@@ -0,0 +1,199 @@
+"""Run many markdown jobs, e.g. one per repository, in a single process
+from a TOML manifest. Jobs share a worker pool, the parsed source file
+cache and the imports, and the largest jobs are started first so the
+pool isn't left waiting on one large job at the end.
+
+    [defaults]
+    recursive = true
+
+    [[job]]
+    name = "service-a"
+    input = "repos/service-a/src"
+    output = "README.md"
+    config = "repos/service-a/doctopi.ini"
+
+Each job takes the markdown command's options, named like the CLI
+arguments. Paths are relative to the manifest.
+"""
+# Built-in imports
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import logging
+import os
+import time
+from typing import (Any, Callable, Dict, List)
+
+# This package imports
+from doctopi.cli import cli, parse_src_settings, DoctoPiConfigError
+
+PATH_OPTIONS = ("input", "output", "config", "cache", "parse_history", "profile",
+                "coverage", "search_index")
+"""Job options which are paths, relative to the manifest"""
+
+UNSUPPORTED_OPTIONS = ("watch", "watch_interval", "server", "shard", "shard_strategy",
+                       "shard_artifact")
+"""markdown command options which can't be used in a batch"""
+
+
+class BatchError(Exception):
+    """The manifest is invalid, or jobs failed"""
+
+
+@dataclass
+class BatchJob:
+    """A markdown job from a manifest
+
+    Attributes:
+        name (str): name of the job in the report
+        args (argparse.Namespace): markdown command arguments
+        size (int): total size of the job's source files, in bytes
+    """
+    name: str
+    args: argparse.Namespace
+    size: int = 0
+
+
+def load_manifest(path: str) -> List[BatchJob]:
+    """Read the jobs of a TOML manifest
+
+    Args:
+        path (str): manifest file
+
+    Raises:
+        BatchError: If the manifest is invalid
+
+    Returns:
+        List[BatchJob]: the jobs, in manifest order
+    """
+    try:
+        # pylint: disable-next = import-outside-toplevel
+        import tomllib
+    except ImportError:  # Python < 3.11
+        # pylint: disable-next = import-outside-toplevel
+        import tomli as tomllib
+
+    try:
+        with open(path, "rb") as manifest_file:
+            manifest = tomllib.load(manifest_file)
+    except (OSError, tomllib.TOMLDecodeError) as exc:
+        raise BatchError(f"Can't read manifest '{path}': {exc}") from exc
+
+    root = os.path.dirname(os.path.abspath(path))
+    defaults = manifest.get("defaults", {})
+    jobs = []
+    for index, entry in enumerate(manifest.get("job", []), start=1):
+        options = {**defaults, **entry}
+        name = str(options.pop("name", options.get("input", f"job {index}")))
+        jobs.append(BatchJob(name, job_args(options, root)))
+
+    if not jobs:
+        raise BatchError(f"Manifest '{path}' has no [[job]] entries")
+    return jobs
+
+
+def job_args(options: Dict[str, Any], root: str) -> argparse.Namespace:
+    """Create the markdown command arguments of a job
+
+    Args:
+        options (Dict[str, Any]): job options, named like the CLI
+            arguments
+        root (str): directory the paths are relative to
+
+    Raises:
+        BatchError: If an option doesn't exist, or can't be used in a
+            batch
+
+    Returns:
+        argparse.Namespace: markdown command arguments
+    """
+    if "input" not in options:
+        raise BatchError(f"Job {options} has no input")
+
+    # Start from the markdown command's defaults, without the default INI config
+    args = cli(["markdown", "--input", os.curdir])
+    args.config = []
+    for key, value in options.items():
+        name = key.replace("-", "_")
+        if name in UNSUPPORTED_OPTIONS or name == "command" or not hasattr(args, name):
+            raise BatchError(f"Unsupported job option '{key}'")
+        setattr(args, name, value)
+
+    # Resolve the paths, including the default output, against the manifest. An input
+    # which isn't a path there is the name of an installed distribution.
+    for name in PATH_OPTIONS:
+        path = getattr(args, name)
+        if isinstance(path, str) and (name != "input" or os.path.exists(os.path.join(root, path))):
+            setattr(args, name, os.path.join(root, path))
+    return args
+
+
+def measure(job: BatchJob) -> int:
+    """Measure the total size of a job's source files, to schedule the
+    largest jobs first
+
+    Args:
+        job (BatchJob): the job
+
+    Returns:
+        int: size in bytes, or 0 if it can't be measured
+    """
+    # pylint: disable-next = import-outside-toplevel
+    from doctopi.parser.parser_factory import ParserFactory
+    # pylint: disable-next = import-outside-toplevel
+    from doctopi.parser.walker import DirectoryWalker
+
+    if not os.path.isdir(job.args.input):
+        return os.path.getsize(job.args.input) if os.path.isfile(job.args.input) else 0
+
+    settings = parse_src_settings(argparse.Namespace(**vars(job.args)))
+    walker = DirectoryWalker(ParserFactory(settings.src_language, settings.docstring_style))
+    return sum(os.path.getsize(path) for path in walker.iter_sources(job.args.input))
+
+
+def run_batch(jobs: List[BatchJob], run: Callable[[argparse.Namespace], None],
+              workers: int = None) -> Dict[str, Any]:
+    """Run jobs in a shared worker pool, largest first. A failing job
+    doesn't stop the others.
+
+    Args:
+        jobs (List[BatchJob]): the jobs
+        run (Callable[[argparse.Namespace], None]): runs the markdown
+            command arguments of a job
+        workers (int, optional): Jobs run at once. Defaults to None,
+            the number of CPUs.
+
+    Returns:
+        Dict[str, Any]: the report, with the "name", "input", "output",
+            "size", "seconds", "ok" and "error" of each job in manifest
+            order, the "failed" job count and the total "seconds"
+    """
+    start = time.perf_counter()
+    for job in jobs:
+        try:
+            job.size = measure(job)
+        except (OSError, ValueError, DoctoPiConfigError):
+            job.size = 0
+
+    def run_job(job: BatchJob) -> Dict[str, Any]:
+        result = {"name": job.name, "input": job.args.input, "output": job.args.output,
+                  "size": job.size, "ok": True, "error": None}
+        job_start = time.perf_counter()
+        try:
+            run(argparse.Namespace(**vars(job.args)))
+        except Exception as exc:  # pylint: disable = broad-exception-caught
+            logging.exception("Job '%s' failed", job.name)
+            result.update(ok=False, error=f"{type(exc).__name__}: {exc}")
+        result["seconds"] = round(time.perf_counter() - job_start, 3)
+        logging.info("Job '%s' finished in %ss", job.name, result["seconds"])
+        return result
+
+    # The pool starts jobs in the order they're submitted
+    with ThreadPoolExecutor(workers or os.cpu_count() or 1) as pool:
+        futures = {id(job): pool.submit(run_job, job)
+                   for job in sorted(jobs, key=lambda job: job.size, reverse=True)}
+        results = [futures[id(job)].result() for job in jobs]
+
+    return {"jobs": results,
+            "failed": sum(not result["ok"] for result in results),
+            "seconds": round(time.perf_counter() - start, 3)}
@@ -0,0 +1,234 @@
+"""Configure a MarkdownBuilder from the markdown command's arguments, or
+a RestBuilder or HtmlBuilder from the rest or html command's, combined
+with the INI config. The builders and their commands are imported when
+they're first needed, so the CLI starts quickly.
+"""
+# Built-in imports
+from __future__ import annotations
+import argparse
+import os
+import re
+from typing import (Callable, Collection, Optional, Type, TYPE_CHECKING)
+
+# This package imports
+from doctopi.cli import DoctoPiConfigError
+from doctopi.ir import load
+from doctopi.parser.cache import ParseCache
+from doctopi.parser.parser_factory import ParserFactory
+from doctopi.parser.walker import DirectoryWalker
+
+if TYPE_CHECKING:
+    from doctopi.formatter.doc_builder import DocBuilder
+    from doctopi.formatter.html.html_builder import HtmlBuilder
+    from doctopi.formatter.rest.rest_builder import RestBuilder
+    from doctopi.formatter.markdown.symbol_index import SymbolIndex
+
+# The anchor of a link to another Markdown file, e.g. `[Base](../README.md#pkg.base.Base)`
+_LINK_ANCHOR = re.compile(r"\]\([^)#\s]+#([^)\s]+)\)")
+
+
+def markdown_command(name: str) -> Type:
+    """Get the MarkdownCommand type for an INI config command string
+    from the doctopi.registry, importing it on first use
+
+    Args:
+        name (str): command from the INI config, e.g. "classes"
+
+    Raises:
+        DoctoPiConfigError: If the command doesn't exist
+
+    Returns:
+        Type: MarkdownCommand type
+    """
+    # pylint: disable-next = import-outside-toplevel
+    from doctopi.registry import registry
+
+    try:
+        return registry().markdown_command(name)
+    except KeyError as exc:
+        raise DoctoPiConfigError(f"Unknown Markdown command '{name}'") from exc
+
+
+def configure_markdown(args: argparse.Namespace, cache: ParseCache = None,
+                       symbols: SymbolIndex = None,
+                       builder: DocBuilder = None) -> DocBuilder:
+    """Configure a MarkdownBuilder from the CLI arguments, or another
+    DocBuilder with the arguments its command shares
+
+    Args:
+        args (argparse.Namespace): CLI arguments
+        cache (ParseCache, optional): Cache of parsed source files.
+            Defaults to None.
+        symbols (SymbolIndex, optional): Index of the symbols to link
+            to. Defaults to None, indexing the documentation being
+            rendered.
+        builder (DocBuilder, optional): Builder to configure, e.g. a
+            RestBuilder. Defaults to None, a new MarkdownBuilder.
+
+    Raises:
+        DoctoPiConfigError: If a command from the ini doesn't exist
+
+    Returns:
+        DocBuilder: the configured builder
+    """
+    if builder is None:
+        # pylint: disable-next = import-outside-toplevel
+        from doctopi.formatter.markdown.markdown_builder import MarkdownBuilder
+        builder = MarkdownBuilder()
+
+    builder = builder \
+        .configure_metadata(args.title, args.author) \
+        .align_tables(args.table_align) \
+        .configure_src(args.src_language, args.docstring_style) \
+        .configure_io(args.input, args.output, args.recursive_all_in_one)
+
+    # Parse in worker processes
+    if getattr(args, "jobs", 1) > 1:
+        builder.configure_workers(args.jobs, args.parse_history)
+
+    # Overlap reading, parsing, rendering and writing
+    if getattr(args, "pipeline", False):
+        builder.configure_pipeline()
+
+    # Render a dump rather than parsing source code
+    if args.from_dump:
+        builder.configure_docs(load(args.input))
+    elif cache is not None:
+        builder.configure_cache(cache)
+
+    # Toggle markdown settings
+    for config in ["constructors", "class_vars", "instance_vars", "methods",
+                   "inner_classes", "file_overview", "public_only"]:
+        if not getattr(args, config, True):
+            builder.toggle(config)
+
+    # Link base classes and types to the classes they name
+    if getattr(args, "link_symbols", False) or getattr(args, "inherited_members", False):
+        builder.configure_symbols(symbols, args.inherited_members)
+
+    # Toggle a table of contents
+    if args.table_of_contents:
+        builder.enable_toc(args.toc_depth, args.toc_title)
+
+    # Add commands to the Builder to organize documentation for files
+    for cmd in args.file_cmds.split(","):
+        builder.add_file_command(markdown_command(cmd))
+
+    # Add commands to the Builder to organize documentation for classes
+    for cmd in args.class_cmds.split(","):
+        builder.add_class_commands(markdown_command(cmd))
+
+    # Add commands to the Builder to organize documentation for functions
+    for cmd in args.func_cmds.split(","):
+        builder.add_function_commands(markdown_command(cmd))
+
+    return builder
+
+
+def configure_rest(args: argparse.Namespace, cache: ParseCache = None) -> RestBuilder:
+    """Configure a RestBuilder from the CLI arguments, with the same
+    commands and toggles as the markdown command
+
+    Args:
+        args (argparse.Namespace): CLI arguments
+        cache (ParseCache, optional): Cache of parsed source files.
+            Defaults to None.
+
+    Raises:
+        DoctoPiConfigError: If a command from the ini doesn't exist
+
+    Returns:
+        RestBuilder: the configured RestBuilder
+    """
+    # pylint: disable-next = import-outside-toplevel
+    from doctopi.formatter.rest.rest_builder import RestBuilder
+
+    return configure_markdown(args, cache, builder=RestBuilder())
+
+
+def configure_html(args: argparse.Namespace, cache: ParseCache = None) -> HtmlBuilder:
+    """Configure an HtmlBuilder from the CLI arguments, with the same
+    commands and toggles as the markdown command
+
+    Args:
+        args (argparse.Namespace): CLI arguments
+        cache (ParseCache, optional): Cache of parsed source files.
+            Defaults to None.
+
+    Raises:
+        DoctoPiConfigError: If a command from the ini doesn't exist
+
+    Returns:
+        HtmlBuilder: the configured HtmlBuilder
+    """
+    # pylint: disable-next = import-outside-toplevel
+    from doctopi.formatter.html.html_builder import HtmlBuilder
+
+    return configure_markdown(args, cache, builder=HtmlBuilder()).configure_pages(args.pages)
+
+
+def symbol_index(args: argparse.Namespace, cache: ParseCache = None) -> Optional[SymbolIndex]:
+    """Index the symbols of every directory documented by a recursive
+    run in one pass, so each directory's Markdown file can link to the
+    classes documented by the others. The parsed files are cached for
+    the directories' Markdown files.
+
+    Args:
+        args (argparse.Namespace): CLI arguments, combined with the ini
+            config
+        cache (ParseCache, optional): Cache of parsed source files.
+            Defaults to None.
+
+    Returns:
+        Optional[SymbolIndex]: the index, or None if symbols aren't
+            linked across Markdown files
+    """
+    if not args.recursive or not (args.link_symbols or args.inherited_members):
+        return None
+
+    # pylint: disable-next = import-outside-toplevel
+    from doctopi.formatter.markdown.symbol_index import SymbolIndex
+
+    # Each directory's source files are documented in its own Markdown file
+    output = os.path.basename(args.output)
+    output = output if output.endswith(".md") else f"{output}.md"
+    parser = ParserFactory(args.src_language, args.docstring_style)
+    return SymbolIndex().add(
+        DirectoryWalker(parser, cache).parse(args.input),
+        page=lambda doc_file: os.path.join(os.path.dirname(os.path.abspath(doc_file.path)),
+                                           output))
+
+
+def linked_pages(symbols: SymbolIndex, changed: Collection[str]) -> Callable[[str], bool]:
+    """Find the Markdown files linking to symbols of changed source
+    files, so they're regenerated with them. Links are checked both as
+    the sources declare them now, and as the Markdown files were written
+    before the sources changed, e.g. to a class which was removed.
+
+    Args:
+        symbols (SymbolIndex): index of the changed sources
+        changed (Collection[str]): absolute paths of changed source
+            files
+
+    Returns:
+        Callable[[str], bool]: checks if a Markdown file links to them
+    """
+    modules = {symbols.module(path) for path in changed} - {""}
+    pages = symbols.dependents(modules)
+
+    def linked(output: str) -> bool:
+        page = os.path.abspath(output if output.endswith(".md") else f"{output}.md")
+        if page in pages:
+            return True
+
+        try:
+            with open(page, encoding="utf-8") as md_file:
+                anchors = _LINK_ANCHOR.findall(md_file.read())
+        except OSError:
+            return False
+
+        # A symbol is only missing from the index if its source file changed
+        return any(symbols.get(anchor) is None or symbols.get(anchor).module in modules
+                   for anchor in anchors)
+
+    return linked
@@ -0,0 +1,226 @@
+"""A DoctoPi daemon, which handles CLI requests forwarded over a Unix
+socket. The daemon stays warm between requests: its imports, parsers
+and parsed source files are reused, so a request only pays for the
+files that changed.
+
+Requests and responses are single lines of JSON:
+
+    {"args": ["markdown", "-i", "src"], "cwd": "/path/to/repo"}
+    {"ok": true}
+    {"ok": false, "error": "..."}
+"""
+# Built-in imports
+import json
+import logging
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from typing import (Callable, List)
+
+
+def default_socket() -> str:
+    """Get the default socket path of the daemon for the current user:
+    in the user's runtime directory, or else in a directory of the temp
+    directory only the user may access, created by the daemon
+
+    Returns:
+        str: Unix socket path
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "doctopi.sock")
+
+    user = os.getuid() if hasattr(os, "getuid") else os.getpid()
+    return os.path.join(tempfile.gettempdir(), f"doctopi-{user}", "daemon.sock")
+
+
+class ServerError(Exception):
+    """The daemon couldn't start, or failed to handle a request"""
+
+
+class DocServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Daemon handling CLI requests forwarded over a Unix socket. Each
+    request runs in its own thread, and a limited number run at once.
+    The daemon shuts down after being idle for a while.
+
+    Attributes:
+        handler (Callable[[List[str], str], None]): Called with the CLI
+            arguments and working directory of each request.
+        idle_timeout (float): Seconds without requests before shutting
+            down. 0 never shuts down.
+        slots (threading.BoundedSemaphore): Limits the requests running
+            at once. Extra requests wait for a slot.
+        active (int): Number of requests being handled.
+        last_request (float): time.monotonic() of the last request.
+    """
+    daemon_threads = True
+
+    def __init__(self, path: str, handler: Callable[[List[str], str], None],
+                 max_requests: int = 4, idle_timeout: float = 600):
+        """Constructor. Binds the socket, replacing a stale socket file
+        left by a daemon that didn't shut down cleanly.
+
+        Args:
+            path (str): Unix socket path
+            handler (Callable[[List[str], str], None]): Called with the
+                CLI arguments and working directory of each request.
+            max_requests (int, optional): Maximum requests running at
+                once. Defaults to 4.
+            idle_timeout (float, optional): Seconds without requests
+                before shutting down, or 0 to never shut down. Defaults
+                to 600.
+
+        Raises:
+            ServerError: If a daemon is already listening on the socket,
+                or its directory belongs to another user
+        """
+        # Other users mustn't be able to replace the socket, or connect to it
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        if not _owned(directory):
+            raise ServerError(f"The socket directory '{directory}' belongs to another user")
+
+        if os.path.exists(path):
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                    client.connect(path)
+                raise ServerError(f"A daemon is already listening on '{path}'")
+            except ConnectionRefusedError:
+                os.remove(path)
+
+        self.handler = handler
+        self.idle_timeout = idle_timeout
+        self.slots = threading.BoundedSemaphore(max_requests)
+        self.active = 0
+        self.last_request = time.monotonic()
+        self._lock = threading.Lock()
+        super().__init__(path, _RequestHandler)
+        os.chmod(path, 0o600)
+
+    def serve(self, poll_interval: float = 0.5):
+        """Handle requests until shut down or idle for `idle_timeout`
+
+        Args:
+            poll_interval (float, optional): Seconds between checks for
+                shutdown and idleness. Defaults to 0.5.
+        """
+        watchdog = threading.Thread(target=self._shutdown_when_idle, args=(poll_interval,),
+                                    daemon=True)
+        watchdog.start()
+        try:
+            self.serve_forever(poll_interval)
+        finally:
+            self.server_close()
+            if os.path.exists(self.server_address):
+                os.remove(self.server_address)
+
+    def handle_json(self, request: dict) -> dict:
+        """Handle one decoded request, waiting for a free slot
+
+        Args:
+            request (dict): "args" and "cwd" of the request
+
+        Returns:
+            dict: the response
+        """
+        with self._lock:
+            self.active += 1
+            self.last_request = time.monotonic()
+
+        try:
+            with self.slots:
+                self.handler(list(request["args"]), request["cwd"])
+            return {"ok": True}
+        except Exception as exc:  # pylint: disable = broad-exception-caught
+            logging.exception("Request %s failed", request.get("args"))
+            return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.last_request = time.monotonic()
+
+    def _shutdown_when_idle(self, poll_interval: float):
+        """Shut the daemon down once it has been idle for `idle_timeout`
+
+        Args:
+            poll_interval (float): Seconds between checks
+        """
+        while self.idle_timeout:
+            time.sleep(poll_interval)
+            with self._lock:
+                idle = not self.active \
+                    and time.monotonic() - self.last_request >= self.idle_timeout
+            if idle:
+                logging.info("Idle for %s seconds, shutting down", self.idle_timeout)
+                self.shutdown()
+                return
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Read a request line, and reply with a response line"""
+
+    def handle(self):
+        """Handle a request forwarded by `send_request`"""
+        try:
+            request = json.loads(self.rfile.readline())
+            response = self.server.handle_json(request)
+        except (ValueError, KeyError, TypeError) as exc:
+            response = {"ok": False, "error": f"Malformed request: {exc}"}
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+def send_request(path: str, args: List[str], cwd: str = None, timeout: float = None):
+    """Forward CLI arguments to a daemon and wait for it to finish
+
+    Args:
+        path (str): Unix socket path of the daemon
+        args (List[str]): CLI arguments
+        cwd (str, optional): Working directory relative paths are
+            resolved against. Defaults to the current directory.
+        timeout (float, optional): Seconds to wait for the response.
+            Defaults to None, waiting forever.
+
+    Raises:
+        OSError: If the daemon isn't running
+        ServerError: If the socket belongs to another user, or the
+            daemon failed to handle the request
+    """
+    # Don't send arguments and paths to a socket planted by another user
+    if not _owned(path):
+        raise ServerError(f"The socket '{path}' belongs to another user")
+
+    request = {"args": list(args), "cwd": cwd or os.getcwd()}
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(path)
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with client.makefile("rb") as response_file:
+            line = response_file.readline()
+
+    try:
+        response = json.loads(line)
+    except ValueError as exc:
+        raise ServerError("The daemon closed the connection without responding") from exc
+
+    if not response.get("ok"):
+        raise ServerError(response.get("error", "Unknown error"))
+
+
+def _owned(path: str) -> bool:
+    """Check whether a file belongs to the current user
+
+    Args:
+        path (str): path of the file
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+
+    Returns:
+        bool: True if the current user owns the file, or the platform
+            has no file owners
+    """
+    return not hasattr(os, "getuid") or os.stat(path).st_uid == os.getuid()
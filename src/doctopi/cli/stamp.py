@@ -0,0 +1,196 @@
+"""Stamp generated Markdown files with a header comment holding digests
+of the source files and settings they were generated from, so
+`markdown --check` can tell an up-to-date file apart without parsing or
+rendering anything.
+
+    <!-- doctopi sources=3f2a... settings=9c41... -->
+"""
+# Built-in imports
+from __future__ import annotations
+import argparse
+import hashlib
+import json
+import os
+import re
+from typing import (List, Optional, TYPE_CHECKING)
+
+# This package imports
+from doctopi.cli.markdown import configure_markdown
+from doctopi.parser import Parser
+from doctopi.parser.archive import is_archive
+from doctopi.parser.cache import ParseCache, file_digest
+
+if TYPE_CHECKING:
+    from doctopi.formatter.markdown.symbol_index import SymbolIndex
+
+STAMP = re.compile(r"<!-- doctopi sources=([0-9a-f]+) settings=([0-9a-f]+) -->\n")
+"""Header comment of a generated Markdown file"""
+
+RUN_OPTIONS = ("command", "input", "output", "config", "cache", "changed_since", "check", "jobs",
+               "parse_history", "pipeline", "profile", "coverage", "server", "watch",
+               "watch_interval", "shard", "shard_strategy", "shard_artifact", "recursive")
+"""markdown command options which don't change the generated Markdown"""
+
+
+class StaleDocsError(Exception):
+    """Generated Markdown files are out of date"""
+
+
+def stamp(args: argparse.Namespace, parser: Parser) -> str:
+    """Create the header comment of a Markdown file
+
+    Args:
+        args (argparse.Namespace): CLI arguments of the Markdown file,
+            combined with the ini config
+        parser (Parser): Parser of the source files
+
+    Returns:
+        str: the header, or "" if the sources can't be hashed, e.g. an
+            installed distribution
+    """
+    sources = sources_digest(args, parser)
+    if sources is None:
+        return ""
+    return f"<!-- doctopi sources={sources} settings={settings_digest(args)} -->\n"
+
+
+def sources_digest(args: argparse.Namespace, parser: Parser) -> Optional[str]:
+    """Hash the source files rendered into a Markdown file: the file,
+    dump or archive given by --input, or the source files of a directory,
+    including its subdirectories' when rendering them all in one.
+
+    Args:
+        args (argparse.Namespace): CLI arguments of the Markdown file
+        parser (Parser): Parser of the source files
+
+    Returns:
+        Optional[str]: hex digest of the source file names and contents,
+            or None if --input isn't a file or directory
+    """
+    if os.path.isfile(args.input):
+        root, paths = os.path.dirname(os.path.abspath(args.input)), [args.input]
+    elif os.path.isdir(args.input) and not is_archive(args.input):
+        root, paths = args.input, _iter_sources(args.input, parser, args.recursive_all_in_one)
+    else:
+        return None
+
+    # Names are relative, so the digest is the same wherever the tree is checked out
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.relpath(path, root).replace(os.sep, "/").encode("utf-8"))
+        digest.update(b"\0" + file_digest(path).encode("ascii") + b"\0")
+    return digest.hexdigest()
+
+
+def settings_digest(args: argparse.Namespace) -> str:
+    """Hash the settings which change the generated Markdown, and the
+    DoctoPi version generating it
+
+    Args:
+        args (argparse.Namespace): CLI arguments, combined with the ini
+            config
+
+    Returns:
+        str: hex digest of the settings
+    """
+    settings = {name: value for name, value in vars(args).items() if name not in RUN_OPTIONS}
+    # Writing a search index anchors the headings, wherever the index is written
+    if "search_index" in settings:
+        settings["search_index"] = bool(settings["search_index"])
+    settings["version"] = _version()
+    return hashlib.sha256(json.dumps(settings, sort_keys=True, default=str)
+                          .encode("utf-8")).hexdigest()
+
+
+def is_stale(args: argparse.Namespace, cache: ParseCache = None,
+             symbols: SymbolIndex = None) -> bool:
+    """Check if a Markdown file is out of date, without writing it. A
+    file whose stamp matches its sources and settings is up to date
+    without parsing or rendering anything; otherwise the Markdown is
+    rendered in memory and compared. Files linking to the symbols of
+    other directories are always rendered, since their stamp doesn't
+    cover the other directories' sources.
+
+    Args:
+        args (argparse.Namespace): CLI arguments of the Markdown file,
+            combined with the ini config
+        cache (ParseCache, optional): Cache of parsed source files.
+            Defaults to None.
+        symbols (SymbolIndex, optional): Index of the symbols to link
+            to. Defaults to None, indexing the documentation being
+            rendered.
+
+    Returns:
+        bool: True if the Markdown file is missing or would change
+    """
+    file_name = args.output if args.output.endswith(".md") else f"{args.output}.md"
+    try:
+        with open(file_name, "r", encoding="utf-8") as md_file:
+            text = md_file.read()
+    except OSError:
+        return True
+
+    builder = configure_markdown(args, cache, symbols=symbols)
+    if getattr(args, "search_index", None):
+        # pylint: disable-next = import-outside-toplevel
+        from doctopi.formatter.markdown.search_index import SearchIndex
+
+        # Render the headings anchored for search, without writing the index
+        builder.configure_search(SearchIndex())
+    header = stamp(args, builder.parser)
+    if header and text.startswith(header) and symbols is None:
+        return False
+
+    # The sources or settings changed, but the Markdown may not have
+    return strip_stamp(builder.render()) != strip_stamp(text)
+
+
+def strip_stamp(text: str) -> str:
+    """Remove the header comment of a generated Markdown file
+
+    Args:
+        text (str): Markdown file contents
+
+    Returns:
+        str: the Markdown without the header comment
+    """
+    match = STAMP.match(text)
+    return text[match.end():] if match else text
+
+
+def _iter_sources(root: str, parser: Parser, recursive: bool) -> List[str]:
+    """List the source files of a directory the parser accepts, in the
+    order they're walked
+
+    Args:
+        root (str): source directory
+        parser (Parser): Parser of the source files
+        recursive (bool): include the subdirectories' source files
+
+    Returns:
+        List[str]: paths of the source files
+    """
+    paths = []
+    for entry in sorted(os.listdir(root)):
+        path = os.path.join(root, entry)
+        if os.path.isdir(path):
+            if recursive:
+                paths.extend(_iter_sources(path, parser, recursive))
+        elif os.path.isfile(path) and parser.accepts(path):
+            paths.append(path)
+    return paths
+
+
+def _version() -> str:
+    """Get the installed DoctoPi version
+
+    Returns:
+        str: the version, or "" if DoctoPi isn't installed
+    """
+    # pylint: disable-next = import-outside-toplevel
+    import importlib.metadata
+
+    try:
+        return importlib.metadata.version("doctopi")
+    except importlib.metadata.PackageNotFoundError:
+        return ""
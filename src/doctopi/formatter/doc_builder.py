@@ -0,0 +1,698 @@
+"""The DocBuilder configures the formatters and generates documentation
+in any format, leaving the document to its subclasses: the
+MarkdownBuilder, RestBuilder and HtmlBuilder
+"""
+# Built-in imports
+from __future__ import annotations
+import abc
+import os
+from typing import (Any, Callable, Iterator, List, Optional, Tuple, Type, Union)
+
+# This package imports
+from doctopi.formatter.markdown.cmd.class_command import (MarkdownClassCommand,
+                                                          MarkdownClassAttrCommand)
+from doctopi.formatter.markdown.cmd.function_command import (MarkdownDocstringCommand,
+                                                             MarkdownFunctionCommand)
+from doctopi.parser import Parser
+from doctopi.parser.archive import is_archive
+from doctopi.parser.cache import ParseCache
+from doctopi.parser.parser_factory import ParserFactory
+from doctopi.parser.scheduler import CostHistory, ParallelParser, SchedulerStats
+from doctopi.parser.walker import DirectoryWalker
+from doctopi.types import Command, DocDir, DocFile, MarkdownSettings
+
+
+# pylint: disable-next = too-many-instance-attributes, too-many-public-methods
+class DocBuilder(abc.ABC):
+    """Build a formatter and generate documentation. Uses the builder
+    pattern to handle large amounts of configuration, and the command
+    pattern to allow users to customize/organize documentation. This is
+    an abstract base class, extended for each output format: the
+    Markdown commands write to a document of the format through the
+    MdUtils methods they use.
+
+    The document is streamed: a source directory is walked without
+    parsing it, then each file is parsed just before it's generated and
+    its text is handed over as soon as it's generated.
+
+    Attributes:
+        extensions (Tuple[str, ...]): File extensions of the output
+            file, the first added to an output file without one.
+        src_language (str): Programming language of source code. Should
+            be one of "python", "java", "cpp".
+        parser (Parser): DoctoPi source code parser.
+        src (Union[str, bytes, os.PathLike]): Source file/dir to parse.
+        docs (Union[DocFile, DocDir]): Already parsed documentation to
+            render instead of parsing `src`. Default is None.
+        cache (ParseCache): Cache of parsed source files, reused if
+            unchanged. Default is None.
+        select (Callable[[str], bool]): Filter of absolute source file
+            paths to parse and render, e.g. the files of one shard.
+            Default is None.
+        workers (int): Worker processes to parse source files in.
+            Default is 1, parsing in this process.
+        history (CostHistory): Parse timings from previous runs, used to
+            schedule the most expensive files first. Default is None.
+        scheduler_stats (SchedulerStats): Worker utilization of the
+            last parse by worker processes. Default is None.
+        output (Union[str, bytes, os.PathLike]): Output file.
+        header (str): Text written before the title of the output file,
+            e.g. a comment stamping its sources. Default is "".
+        commands (List[Command]): List of markdon commands to execute
+            using the Command pattern. These commands dictate how the
+            documentation should be organized.
+        recursive (bool): Toggle if the parser should stop at the root
+            source directory provided or parse subdirectories. Default
+            is False.
+        title (str): Title of the document to create. Default is None.
+        author (str): Author of the document to create. Default is None.
+        toc_depth (int): Heading depth of the table of contents. Value
+            should be [1,6]. Default is 1.
+        toc_title (str): Title for the table of contents. Default is
+            "Contents".
+        table_align (str): Text alignment for all tables. Value should
+            be one of "left", "center", or "right. Default is "left".
+        table_of_contents (bool): Toggle a table of contents to be
+            generated. Default is False.
+        constructors (bool): Toggle constructors to be documented.
+            Default is True.
+        class_vars (bool): Toggle class variables to be documented.
+            Default is True.
+        instance_vars (bool): Toggle instance variables to be
+            documented. Default is True.
+        inner_classes (bool): Toggle inner classes to be documented.
+            Default is True.
+        methods (bool): Toggle member functions to be
+            documented. Default is True.
+        file_overview (bool): Toggle file overview to be documented.
+            Default is True.
+        public_only (bool): If enabled, only public class
+            methods will be documented.
+    """
+    extensions: Tuple[str, ...] = ()
+
+    def __init__(self):
+        """Constructor"""
+        # Generic
+        self.src_language: str = ""  # python, java, or cpp
+        self.parser: Parser = None
+        self.src: Union[str, bytes, os.PathLike] = ""
+        self.docs: Union[DocFile, DocDir] = None
+        self.cache: ParseCache = None
+        self.select: Callable[[str], bool] = None
+        self.workers: int = 1
+        self.history: CostHistory = None
+        self.scheduler_stats: SchedulerStats = None
+        self.output: str = ""
+        self.header: str = ""
+        self.recursive: bool = False
+
+        # Metadata
+        self.title: str = ""
+        self.author: str = ""
+
+        # Command pattern
+        self.file_commands: List[Type[Command]] = []
+        self.class_commands: List[Type[MarkdownClassAttrCommand]] = []
+        self.function_commands: List[Type[MarkdownDocstringCommand]] = []
+
+        # Table of contents
+        self.toc_depth: int = 1  # Should be 1-6
+        self.toc_title: str = "Contents"
+
+        # Tables
+        self.table_align: str = "left"  # left, center, or right
+
+        # Enabled content
+        self.table_of_contents: bool = False
+        self.constructors: bool = True
+        self.class_vars: bool = True
+        self.instance_vars: bool = True
+        self.inner_classes: bool = True
+        self.methods: bool = True
+        self.file_overview: bool = True
+        self.public_only: bool = True
+
+    @abc.abstractmethod
+    def new_document(self) -> Any:
+        """To be overridden by the child classes. Create the document
+        the commands write to.
+
+        Returns:
+            Any: a document with the MdUtils methods used by the Markdown
+                commands, and the text generated since it was last handed
+                over in `file_data_text`
+        """
+
+    def opening(self, document: Any) -> str:
+        """Generate the text before the first file, e.g. the title
+
+        Args:
+            document (Any): document created by new_document()
+
+        Returns:
+            str: the text
+        """
+        return document.title
+
+    def closing(self, document: Any) -> str:
+        """Generate the text after the last file, e.g. the references
+        collected while generating the files
+
+        Args:
+            document (Any): document created by new_document()
+
+        Returns:
+            str: the text
+        """
+        del document
+        return ""
+
+    def build(self):
+        """Generate the documentation by executing the provided
+        commands, writing each file's text as it's generated. The output
+        file is replaced once it's complete, so readers never see a
+        partial file.
+        """
+        write_chunks(self.page(), self.iter_render())
+
+    def render(self, src: Union[str, bytes, os.PathLike, DocFile, DocDir] = None) -> str:
+        """Generate the documentation in memory, without writing the
+        output file. The builder can render any number of sources.
+
+        Args:
+            src (Union[str, bytes, os.PathLike, DocFile, DocDir],
+                optional): Source file/dir to parse, or already parsed
+                documentation. Defaults to the configured source.
+
+        Returns:
+            str: the document
+        """
+        return "".join(self.iter_render(src))
+
+    def iter_render(self,
+                    src: Union[str, bytes, os.PathLike, DocFile, DocDir] = None) -> Iterator[str]:
+        """Generate the documentation as chunks, one for each source
+        file, as soon as each file is parsed and generated
+
+        Args:
+            src (Union[str, bytes, os.PathLike, DocFile, DocDir],
+                optional): Source file/dir to parse, or already parsed
+                documentation. Defaults to the configured source.
+
+        Yields:
+            str: consecutive pieces of the document
+        """
+        document = self.new_document()
+        yield self.header + self.opening(document)
+
+        for _ in self.iter_build(document, *self.stream(src)):
+            # Hand each file's text over rather than keeping the whole document
+            yield document.file_data_text
+            document.file_data_text = ""
+
+        yield document.file_data_text + self.closing(document)
+
+    def parse(self,
+              src: Union[str, bytes, os.PathLike, DocFile, DocDir] = None
+              ) -> Union[DocFile, DocDir]:
+        """Parse the provided source path, unless the docs were already
+        parsed
+
+        Args:
+            src (Union[str, bytes, os.PathLike, DocFile, DocDir],
+                optional): Source file/dir to parse, or already parsed
+                documentation. Defaults to the configured source.
+
+        Returns:
+            Union[DocFile, DocDir]: parsed source file or directory
+        """
+        if isinstance(src, (DocFile, DocDir)):
+            return src
+
+        if src is None and self.docs is not None:
+            return self.docs
+
+        src = self.src if src is None else src
+        pool = ParallelParser(self.parser, self.workers, self.history) \
+            if self.workers > 1 else None
+        if self.cache is not None or self.select is not None or pool is not None \
+                or is_archive(src):
+            parsed = DirectoryWalker(self.parser, self.cache, self.select, pool).parse(src)
+            if pool is not None:
+                self.scheduler_stats = pool.stats
+            return parsed
+
+        return self.parser.parse_file(src) if os.path.isfile(src) else self.parser.parse_dir(src)
+
+    def stream(self, src: Union[str, bytes, os.PathLike, DocFile, DocDir] = None
+               ) -> Tuple[Union[DocFile, DocDir], Optional[Callable[[DocFile], DocFile]]]:
+        """Lay out a source directory without parsing it, so a builder
+        streaming its output can parse each file just before it's
+        generated. Anything else is parsed up front: single files,
+        archives, already parsed documentation, selected files, and
+        directories parsed by worker processes.
+
+        Args:
+            src (Union[str, bytes, os.PathLike, DocFile, DocDir],
+                optional): Source file/dir to parse, or already parsed
+                documentation. Defaults to the configured source.
+
+        Returns:
+            Tuple[Union[DocFile, DocDir], Optional[Callable[[DocFile],
+                DocFile]]]: the parsed docs or the directory's layout of
+                placeholders, and the function parsing each placeholder
+                or None if the docs are already parsed
+        """
+        if isinstance(src, (DocFile, DocDir)) or (src is None and self.docs is not None):
+            return self.parse(src), None
+
+        src = self.src if src is None else src
+        if is_archive(src) or os.path.isfile(src) or self.workers > 1 \
+                or self.select is not None:
+            return self.parse(src), None
+
+        # Files are parsed through the cache, sharing it with the markdown command
+        walker = DirectoryWalker(self.parser, self.cache)
+        layout = DirectoryWalker(self.parser, select=lambda _: False).walk(src)
+        return layout, lambda doc: walker.parse_file(doc.path)
+
+    def iter_build(self, md_utils: Any, parsed_docs: Union[DocFile, DocDir],
+                   load: Callable[[DocFile], DocFile] = None) -> Iterator[str]:
+        """Generate the documentation of a file or directory, one file
+        at a time
+
+        Args:
+            md_utils (Any): document created by new_document()
+            parsed_docs (Union[DocFile, DocDir]): parsed source file or
+                directory, or a directory's layout of placeholders
+            load (Callable[[DocFile], DocFile], optional): Replaces each
+                placeholder as it's reached. Defaults to None.
+
+        Yields:
+            str: path of each file, after its documentation is generated
+        """
+        # Build a single file if it's a single file
+        if isinstance(parsed_docs, DocFile):
+            with md_utils.section(os.fsdecode(parsed_docs.path)):
+                self.build_single_file(md_utils=md_utils, level=1, parsed_file=parsed_docs)
+            yield os.fsdecode(parsed_docs.path)
+
+        # Build for multiple files if it's a dir
+        else:
+            yield from self.iter_build_dir(md_utils=md_utils, level=1, parsed_dir=parsed_docs,
+                                           load=load)
+
+    def iter_build_dir(self, md_utils: Any, level: int, parsed_dir: DocDir,
+                       load: Callable[[DocFile], DocFile] = None) -> Iterator[str]:
+        """Generate the documentation of a directory one file at a time.
+        Each file is generated in its own section.
+
+        Args:
+            md_utils (Any): document created by new_document()
+            level (int): Starting heading level to build the provided
+                file's documentation
+            parsed_dir (DocDir): parsed source directory
+            load (Callable[[DocFile], DocFile], optional): Replaces each
+                file as it's reached, e.g. a placeholder with the file
+                parsed by a MarkdownPipeline. Defaults to None.
+
+        Yields:
+            str: path of each file, after its documentation is generated
+        """
+        # If using recursion, need an extra level for the directory header
+        file_level = level + 1
+        if self.recursive:
+            file_level = level + 2
+            md_utils.new_header(level=level, title=f"{parsed_dir.name}/")
+
+        for doc in parsed_dir.files:
+            if load is not None:
+                doc = load(doc)
+            with md_utils.section(os.fsdecode(doc.path)):
+                # Create a header for the name of the individual file
+                md_utils.new_header(level=file_level-1, title=doc.name.replace('_', '\\_'))
+                # Build each individual file
+                self.build_single_file(md_utils=md_utils, level=file_level, parsed_file=doc)
+            yield os.fsdecode(doc.path)
+
+        if self.recursive:
+            # If set to recursive mode, build a directory one level lower for each subdir.
+            for subdir in parsed_dir.subdirs:
+                yield from self.iter_build_dir(md_utils=md_utils, level=level+1, parsed_dir=subdir,
+                                               load=load)
+
+    def build_single_file(self, md_utils: Any, level: int, parsed_file: DocFile):
+        """Generate the documentation of a single file by executing the
+        provided commands
+
+        Args:
+            md_utils (Any): document created by new_document()
+            level (int): Starting heading level to build the provided
+                file's documentation
+            parsed_file (DocFile): parsed source file
+        """
+        # Create an overview section
+        if self.file_overview and parsed_file.docstring.summary:
+            md_utils.new_header(level=level, title='Overview')
+            md_utils.new_paragraph(parsed_file.docstring.summary)
+            md_utils.new_paragraph()
+
+        settings = self.settings(parsed_file)
+
+        # Generate sections in order of the provided commands
+        for command in self.file_commands:
+            # Create a "Classes" section
+            if issubclass(command, MarkdownClassCommand):
+                if parsed_file.classes:
+                    md_utils.new_header(level=level, title='Classes')
+
+                # Pass configuration to the command and execute
+                for class_ in parsed_file.classes:
+                    command(md_utils=md_utils,
+                            settings=settings,
+                            level=level+1,
+                            class_=class_,
+                            class_cmds=self.class_commands,
+                            function_cmds=self.function_commands).execute()
+
+            # Create a "Functions" section
+            elif issubclass(command, MarkdownFunctionCommand):
+                if parsed_file.functions:
+                    md_utils.new_header(level=level, title='Functions')
+
+                # Pass configuration to the command and execute
+                for function in parsed_file.functions:
+                    command(md_utils=md_utils,
+                            settings=settings,
+                            level=level+1,
+                            func=function,
+                            cmds=self.function_commands).execute()
+
+    def settings(self, parsed_file: DocFile) -> MarkdownSettings:
+        """Get the settings the commands generate a file with
+
+        Args:
+            parsed_file (DocFile): parsed source file
+
+        Returns:
+            MarkdownSettings: the configured settings
+        """
+        del parsed_file
+        return MarkdownSettings(
+            src_language=self.src_language,
+            table_align=self.table_align,
+            table_of_contents=self.table_of_contents,
+            constructors=self.constructors,
+            class_vars=self.class_vars,
+            instance_vars=self.instance_vars,
+            inner_classes=self.inner_classes,
+            methods=self.methods,
+            file_overview=self.file_overview,
+            public_only=self.public_only,
+            page=self.page()
+        )
+
+    def add_file_command(self, command: Type[Command]) -> DocBuilder:
+        """Add a Markdown generation command. Upon calling
+        DocBuilder.build(), commands will be executed one by one
+        to format and generate documentation.
+
+        Args:
+            command (Type[Command]): Commands to execute at the file
+                level
+
+        Returns:
+            DocBuilder: This DocBuilder
+        """
+        self.file_commands.append(command)
+        return self
+
+    def add_class_commands(self, command: Type[MarkdownClassAttrCommand]) -> DocBuilder:
+        """Add a Markdown generation command. Upon calling
+        DocBuilder.build(), commands will be executed one by one
+        to format and generate documentation.
+
+        Args:
+            command (Type[Command]): Commands to execute at the class
+                level
+
+        Returns:
+            DocBuilder: This DocBuilder
+        """
+        self.class_commands.append(command)
+        return self
+
+    def add_function_commands(self, command: Type[MarkdownDocstringCommand]) -> DocBuilder:
+        """Add a Markdown generation command. Upon calling
+        DocBuilder.build(), commands will be executed one by one
+        to format and generate documentation.
+
+        Args:
+            command (Type[Command]): Commands to execute at the function
+                level
+
+        Returns:
+            DocBuilder: This DocBuilder
+        """
+        self.function_commands.append(command)
+        return self
+
+    def configure_metadata(self, title: str = "", author: str = "") -> DocBuilder:
+        """Configure the document metadata
+
+        Args:
+            title (str, optional): Title of the document to create.
+                Defaults to "".
+            author (str, optional): Author of the document to create.
+                Defaults to "".
+
+        Returns:
+            DocBuilder: This DocBuilder
+        """
+        self.title = title
+        self.author = author
+        return self
+
+    def configure_src(self, language: str = "python", style: str = "google") -> DocBuilder:
+        """Configure the source progammming language and documentation
+        style
+
+        Args:
+            language (str, optional): programming language.
+                Defaults to "python".
+            style (str, optional): source code docstring style/flavor.
+                Defaults to "google".
+
+        Returns:
+            DocBuilder: This DocBuilder object.
+        """
+        self.src_language = language
+        self.parser = ParserFactory(language=language, style=style)
+
+        return self
+
+    def configure_io(self,
+                     src: Union[str, bytes, os.PathLike],
+                     output: str = "README.md",
+                     recursive: bool = False) -> DocBuilder:
+        """Configure the builder to process a provided source file or
+        directory, recursive or not, and set the output file path/name.
+
+        Args:
+            src (Union[str, bytes, os.PathLike]): Source file/dir to
+                parse, or archive/installed distribution name.
+            output (Union[str, bytes, os.PathLike], optional): Output
+                file. Defaults to "README.md".
+            recursive (bool): Toggle if the parser should stop at the
+                root source directory provided or parse subdirectories.
+                Defaults to False.
+
+         Raises:
+            ValueError: If the src directory/file doesn't exist.
+
+        Returns:
+            DocBuilder: This DocBuilder object.
+        """
+        if not os.path.exists(src) and not is_archive(src):
+            raise ValueError(f'"{src}" path does not exist.')
+
+        self.src = src
+        self.output = output
+        self.recursive = recursive
+
+        return self
+
+    def configure_header(self, header: str) -> DocBuilder:
+        """Write a header before the title of the output file, e.g. a
+        comment stamping the sources and settings it was generated from.
+
+        Args:
+            header (str): text in the output format
+
+        Returns:
+            DocBuilder: This DocBuilder object.
+        """
+        self.header = header
+        return self
+
+    def configure_docs(self, docs: Union[DocFile, DocDir]) -> DocBuilder:
+        """Render documentation that was already parsed, e.g. loaded from
+        a dump with doctopi.ir.load(), instead of parsing the configured
+        source file or directory.
+
+        Args:
+            docs (Union[DocFile, DocDir]): parsed source file or
+                directory
+
+        Returns:
+            DocBuilder: This DocBuilder object.
+        """
+        self.docs = docs
+        return self
+
+    def configure_cache(self, cache: ParseCache) -> DocBuilder:
+        """Reuse previously parsed source files from a cache, as long as
+        they haven't changed. Newly parsed files are added to the cache.
+
+        Args:
+            cache (ParseCache): Cache of parsed source files, e.g. a
+                MemoryParseCache or a doctopi.ir.SnapshotCache.
+
+        Returns:
+            DocBuilder: This DocBuilder object.
+        """
+        self.cache = cache
+        return self
+
+    def configure_select(self, select: Callable[[str], bool]) -> DocBuilder:
+        """Only parse and render the selected source files, e.g. the
+        files of one shard. The rest are left as empty sections, to be
+        filled in by doctopi.formatter.markdown.shard.merge().
+
+        Args:
+            select (Callable[[str], bool]): Filter of absolute source
+                file paths
+
+        Returns:
+            DocBuilder: This DocBuilder object.
+        """
+        self.select = select
+        return self
+
+    def configure_workers(self, workers: int,
+                          history: Union[str, bytes, os.PathLike] = None) -> DocBuilder:
+        """Parse source files in worker processes, scheduling the most
+        expensive files first
+
+        Args:
+            workers (int): Number of worker processes. 1 parses in this
+                process.
+            history (Union[str, bytes, os.PathLike], optional): File of
+                parse timings from previous runs, updated by each parse,
+                to estimate the cost of each file. Defaults to None,
+                estimating the cost from the file size.
+
+        Returns:
+            DocBuilder: This DocBuilder object.
+        """
+        self.workers = workers
+        self.history = CostHistory(history)
+        return self
+
+    def page(self) -> str:
+        """Get the absolute path of the output file, which links to other
+        files are relative to
+
+        Returns:
+            str: path of the output file, or "" if there's no output file
+        """
+        if not self.output:
+            return ""
+        output = os.fsdecode(self.output)
+        return os.path.abspath(output if output.endswith(self.extensions)
+                               else f"{output}{self.extensions[0]}")
+
+    def enable_toc(self, toc_depth: int = 1, title: str = "Contents") -> DocBuilder:
+        """Enable a table of contents for the generted documentation.
+        Configure the heading depth for the table and the title.
+
+        Args:
+            toc_depth (int, optional): Heading depth of the table of
+                contents. Value should be [1,6]. Defaults to 1.
+            title (str, optional): Title for the table of contents.
+                Defaults to "Contents".
+
+        Raises:
+            ValueError: If the toc_depth isn't between [1,6]
+
+        Returns:
+            DocBuilder: This DocBuilder.
+        """
+        if not 1 <= toc_depth <= 6:
+            raise ValueError("Table of contents depth must be between 1 & 6.")
+
+        self.table_of_contents = True
+        self.toc_depth = toc_depth
+        self.toc_title = title
+
+        return self
+
+    def toggle(self, attr: str) -> DocBuilder:
+        """Toggle one of the many instance variables. See DocBuilder for
+        list of all boolean variables to toggle. By default, all are set
+        to True except Table of Contents. To enable the Table of
+        contents, use DocBuilder.enable_toc()
+
+        Args:
+            attr (str): Instance variable in the DocBuilder class
+
+        Raises:
+            ValueError: If the provided attribute does exist but isn't
+                a boolean.
+            AttributeError: If the provided attribute does not exist.
+
+        Returns:
+            DocBuilder: This DocBuilder
+        """
+        if hasattr(self, attr):
+            current_value = getattr(self, attr)
+            if isinstance(current_value, bool):
+                setattr(self, attr, not current_value)
+            else:
+                raise ValueError(f"The variable '{attr}' is not a boolean.")
+        else:
+            raise AttributeError(f"The variable '{attr}' does not exist.")
+
+        return self
+
+    def align_tables(self, alignment: str) -> DocBuilder:
+        """Set text inside tables to align left, center, or right.
+
+        Args:
+            alignment (str): Align text 'left', 'center', or 'right'.
+
+        Raises:
+            ValueError: Invalid alignment string provided.
+
+        Returns:
+            DocBuilder: This DocBuilder
+        """
+        if alignment not in ["left", "center", "right"]:
+            raise ValueError("alignment must be one of 'left', 'center', or 'right'.")
+        self.table_align = alignment
+        return self
+
+
+def write_chunks(path: str, chunks: Iterator[str]):
+    """Write chunks of text to a file, replacing it once complete, so
+    readers never see a partial file
+
+    Args:
+        path (str): path of the file
+        chunks (Iterator[str]): consecutive pieces of the file
+    """
+    with open(f"{path}.tmp", "w", encoding="utf-8") as out_file:
+        for chunk in chunks:
+            out_file.write(chunk)
+    os.replace(f"{path}.tmp", path)
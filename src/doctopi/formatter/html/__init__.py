@@ -0,0 +1,5 @@
+"""HTML formatter, reusing the Markdown commands"""
+from doctopi.formatter.html.html_builder import HtmlBuilder
+from doctopi.formatter.html.html_document import HtmlDocument, inline
+
+__all__ = ["HtmlBuilder", "HtmlDocument", "inline"]
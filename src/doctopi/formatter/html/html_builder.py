@@ -0,0 +1,145 @@
+"""The HtmlBuilder configures and generates documentation as static HTML
+pages, streaming them to disk
+"""
+# Built-in imports
+from __future__ import annotations
+import html
+import os
+from typing import (Iterator, List, Tuple, Union)
+
+# This package imports
+from doctopi.formatter.doc_builder import DocBuilder, write_chunks
+from doctopi.formatter.html.html_document import HtmlDocument, inline
+from doctopi.ir.symbols import module_path_name
+from doctopi.types import DocDir, DocFile
+
+
+class HtmlBuilder(DocBuilder):
+    """Build an HTML formatter and generate documentation as static
+    pages. Every page is self-contained, with an inline stylesheet and no
+    scripts, and navigates its headers from a sidebar.
+
+    Attributes:
+        pages (bool): Write a page for each module and an index page
+            linking them, instead of a single page. Default is False.
+    """
+    extensions = (".html", ".htm")
+
+    def __init__(self):
+        """Constructor"""
+        super().__init__()
+        self.pages: bool = False
+
+    def new_document(self) -> HtmlDocument:
+        """Create the HTML page the commands write to
+
+        Returns:
+            HtmlDocument: the page
+        """
+        return HtmlDocument(file_name=self.page(), title=self.title, author=self.author)
+
+    def opening(self, document: HtmlDocument) -> str:
+        """Generate the head of the page, up to its title
+
+        Args:
+            document (HtmlDocument): page created by new_document()
+
+        Returns:
+            str: the HTML
+        """
+        return document.head()
+
+    def closing(self, document: HtmlDocument) -> str:
+        """Generate the sidebar navigation from the headers of the page,
+        and close the page
+
+        Args:
+            document (HtmlDocument): page created by new_document()
+
+        Returns:
+            str: the HTML
+        """
+        return document.tail(self.toc_depth if self.table_of_contents else 0,
+                             title=self.toc_title)
+
+    def build(self):
+        """Generate the HTML by executing the provided commands, writing
+        each file's HTML as it's generated. Each page is replaced once
+        it's complete, so readers never see a partial page.
+        """
+        if not self.pages:
+            super().build()
+            return
+
+        # One page for each module, next to the index page
+        directory = os.path.dirname(self.page())
+        os.makedirs(directory, exist_ok=True)
+        docs, load = self.stream()
+        modules = list(_iter_modules(docs))
+        links = [(f"{name}.html", name) for name, _ in modules]
+        index_name = os.path.basename(self.page())
+
+        summaries = []
+        for (name, doc), (href, _) in zip(modules, links):
+            doc = load(doc) if load is not None else doc
+            summaries.append((href, name, doc.docstring.summary or ""))
+            write_chunks(os.path.join(directory, href), self.iter_render_module(
+                doc, name, [(index_name, self.title or "Index")] + links))
+
+        # The index lists every module with its summary
+        document = self.new_document()
+        document.write("<dl>\n" + "".join(
+            f'<dt><a href="{html.escape(href)}">{inline(name)}</a></dt>\n'
+            f"<dd>{inline(summary)}</dd>\n" for href, name, summary in summaries) + "</dl>\n")
+        write_chunks(self.page(), [self.header, document.head(), document.file_data_text,
+                                   document.tail(pages=[(index_name, self.title or "Index")]
+                                                 + links, current=index_name)])
+
+    def iter_render_module(self, doc: DocFile, name: str,
+                           pages: List[Tuple[str, str]]) -> Iterator[str]:
+        """Generate the HTML page of a module as chunks
+
+        Args:
+            doc (DocFile): parsed source file
+            name (str): qualified name of the module, the page's title
+            pages (List[Tuple[str, str]]): link and name of every page,
+                listed by the sidebar navigation
+
+        Yields:
+            str: consecutive pieces of the HTML page
+        """
+        document = HtmlDocument(file_name=f"{name}.html", title=name, author=self.author)
+        yield self.header + document.head()
+
+        self.build_single_file(md_utils=document, level=2, parsed_file=doc)
+        depth = self.toc_depth + 1 if self.table_of_contents else 1
+        yield document.file_data_text + document.tail(depth, pages, f"{name}.html")
+
+    def configure_pages(self, pages: bool = True) -> HtmlBuilder:
+        """Write a page for each module, named after the module's
+        qualified name, and an index page linking them to the output
+        file. Subdirectories' modules are included.
+
+        Args:
+            pages (bool, optional): Write a page for each module.
+                Defaults to True.
+
+        Returns:
+            HtmlBuilder: This HtmlBuilder.
+        """
+        self.pages = pages
+        return self
+
+
+def _iter_modules(docs: Union[DocFile, DocDir], parent: str = "") -> Iterator[Tuple[str, DocFile]]:
+    """Iterate over every file of parsed documentation, or a layout of
+    placeholders, with the qualified module name from its path"""
+    if isinstance(docs, DocFile):
+        yield docs.name, docs
+        return
+
+    prefix = f"{parent}/{docs.name}" if parent else docs.name
+    for doc in docs.files:
+        yield module_path_name(f"{prefix}/{os.path.basename(os.fsdecode(doc.path))}"), doc
+    for subdir in docs.subdirs:
+        yield from _iter_modules(subdir, prefix)
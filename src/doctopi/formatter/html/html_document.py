@@ -0,0 +1,304 @@
+"""The HtmlDocument generates a self-contained HTML page through the same
+methods as MdUtils, so the Markdown commands document files, classes and
+functions in HTML unchanged. Like MdUtils, the generated text is kept in
+`file_data_text`, which a builder streaming the page hands over and
+clears as each source file is generated.
+
+The sidebar navigation is generated from the headers recorded while the
+page is written, so it follows the main content in the page and is
+placed beside it by the inline stylesheet. Each header's ID is the path
+of titles leading to it, e.g. `module.Classes.Parser.Methods.parse`,
+which only changes when the documented code does.
+"""
+# Built-in imports
+from __future__ import annotations
+import contextlib
+import html
+import re
+import textwrap
+from typing import (Iterator, List, Set, Tuple)
+
+STYLE = """
+body { margin: 0; font: 16px/1.5 system-ui, sans-serif; color: #1f2328; }
+main { margin-left: 18rem; padding: 1rem 2rem; max-width: 60rem; }
+nav { position: fixed; top: 0; bottom: 0; left: 0; width: 16rem; overflow-y: auto;
+      padding: 1rem; box-sizing: border-box; background: #f6f8fa; font-size: 14px; }
+nav ul { list-style: none; padding-left: 1rem; margin: 0; }
+nav > ul { padding-left: 0; }
+nav a { color: inherit; text-decoration: none; }
+nav a:hover, nav .current > a { text-decoration: underline; }
+pre { background: #f6f8fa; padding: 0.75rem; overflow-x: auto; }
+code { font: 14px ui-monospace, monospace; }
+table { border-collapse: collapse; margin: 0.5rem 0; }
+th, td { border: 1px solid #d0d7de; padding: 0.25rem 0.75rem; vertical-align: top; }
+table.left th, table.left td { text-align: left; }
+table.center th, table.center td { text-align: center; }
+table.right th, table.right td { text-align: right; }
+@media (max-width: 50rem) {
+  main { margin-left: 0; }
+  nav { position: static; width: auto; }
+}
+""".strip()
+"""Inline stylesheet of every page"""
+
+_INLINE_CODE = re.compile(r"`([^`]+)`")
+_MD_ESCAPE = re.compile(r"\\([_<>])")
+_UNSAFE_ID = re.compile(r"[^\w.-]+")
+
+
+class HtmlDocument:
+    """HTML page generator with the MdUtils methods used by the Markdown
+    commands
+
+    Attributes:
+        file_name (str): HTML output file
+        title (str): title of the page
+        author (str): author of the page
+        file_data_text (str): HTML generated since it was last handed
+            over
+        headers (List[Tuple[int, str, str]]): level, title and ID of each
+            header added to the navigation, in order
+    """
+
+    def __init__(self, file_name: str, title: str = "", author: str = ""):
+        """Constructor
+
+        Args:
+            file_name (str): HTML output file
+            title (str, optional): Title of the page. Defaults to "".
+            author (str, optional): Author of the page. Defaults to "".
+        """
+        self.file_name = file_name
+        self.title = title
+        self.author = author
+        self.file_data_text = ""
+        self.headers: List[Tuple[int, str, str]] = []
+        self._path: List[str] = []
+        self._ids: Set[str] = set()
+
+    def head(self) -> str:
+        """Get the start of the page, up to its title
+
+        Returns:
+            str: HTML
+        """
+        author = f'<meta name="author" content="{html.escape(self.author)}">\n' \
+            if self.author else ""
+        title = f'<h1 id="top">{html.escape(self.title)}</h1>\n' if self.title else ""
+        return ('<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+                '<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+                f"{author}<title>{html.escape(self.title or 'Documentation')}</title>\n"
+                f"<style>\n{STYLE}\n</style>\n</head>\n<body>\n<main>\n{title}")
+
+    def tail(self, depth: int = 0, pages: List[Tuple[str, str]] = None,
+             current: str = "", title: str = "") -> str:
+        """Get the end of the page: the sidebar navigation, listing the
+        headers recorded while the page was written
+
+        Args:
+            depth (int, optional): Deepest header level listed. Defaults
+                to 0, no navigation.
+            pages (List[Tuple[str, str]], optional): link and name of
+                every page of the site, listed around the headers of the
+                current page. Defaults to None, only listing the headers.
+            current (str, optional): link of the current page. Defaults
+                to "".
+            title (str, optional): Title of the navigation. Defaults to
+                "".
+
+        Returns:
+            str: HTML
+        """
+        nav = ""
+        if depth or pages:
+            links = _nav_list([header for header in self.headers if header[0] <= depth])
+            if pages is not None:
+                links = "<ul>\n" + "".join(
+                    f'<li class="current"><a href="{html.escape(href)}">{html.escape(name)}</a>'
+                    f"{links}</li>\n" if href == current else
+                    f'<li><a href="{html.escape(href)}">{html.escape(name)}</a></li>\n'
+                    for href, name in pages) + "</ul>\n"
+            heading = f"<strong>{html.escape(title)}</strong>\n" if title else ""
+            nav = f"<nav>\n{heading}{links}</nav>\n"
+        return f"</main>\n{nav}</body>\n</html>\n"
+
+    # pylint: disable-next = too-many-arguments, too-many-positional-arguments
+    def new_header(self, level: int, title: str, style: str = "atx",
+                   add_table_of_contents: str = "y", header_id: str = "") -> str:
+        """Add a header, with an ID from the titles of the headers
+        containing it
+
+        Args:
+            level (int): Header level, 1 through 6
+            title (str): Header title, possibly escaped for Markdown
+            style (str, optional): Unused, for compatibility with MdUtils
+            add_table_of_contents (str, optional): 'y' to add the header
+                to the navigation. Defaults to "y".
+            header_id (str, optional): ID of the header. Defaults to "",
+                an ID from the path of titles.
+
+        Returns:
+            str: the header
+        """
+        del style
+        title = title.replace("\\_", "_")
+        header_id = header_id or self.anchor(level, title)
+        if add_table_of_contents == "y":
+            self.headers.append((level, title, header_id))
+
+        tag = f"h{min(max(level, 1), 6)}"
+        return self.write(f'<{tag} id="{html.escape(header_id)}">{html.escape(title)}</{tag}>\n')
+
+    def anchor(self, level: int, title: str) -> str:
+        """Get a unique ID for a header, joining the titles of the headers
+        containing it. A repeated path is numbered, e.g. for overloads.
+
+        Args:
+            level (int): Header level
+            title (str): Header title
+
+        Returns:
+            str: the ID
+        """
+        del self._path[max(level, 1) - 1:]
+        self._path.extend([""] * (max(level, 1) - 1 - len(self._path)))
+        self._path.append(_UNSAFE_ID.sub("-", title).strip("-") or "section")
+
+        anchor = ".".join(part for part in self._path if part)
+        unique, count = anchor, 1
+        while unique in self._ids:
+            count += 1
+            unique = f"{anchor}-{count}"
+        self._ids.add(unique)
+        return unique
+
+    def new_paragraph(self, text: str = "", **kwargs) -> str:
+        """Add paragraphs, separated by blank lines. Code blocks indented
+        after a blank line are kept as preformatted text.
+
+        Args:
+            text (str, optional): Paragraph text. Defaults to "", adding
+                nothing.
+            **kwargs: Unused, for compatibility with MdUtils
+
+        Returns:
+            str: the paragraphs
+        """
+        del kwargs
+        blocks = []
+        for block in re.split(r"\n\s*\n", text.strip("\n")):
+            if not block.strip():
+                continue
+            if all(line.startswith("    ") for line in block.splitlines() if line.strip()):
+                blocks.append(f"<pre><code>{html.escape(textwrap.dedent(block))}</code></pre>\n")
+            else:
+                blocks.append(f"<p>{inline(block)}</p>\n")
+        return self.write("".join(blocks))
+
+    def insert_code(self, code: str, language: str = "") -> str:
+        """Add a code block
+
+        Args:
+            code (str): source code
+            language (str, optional): Language of the code. Defaults to
+                "".
+
+        Returns:
+            str: the code block
+        """
+        css_class = f' class="language-{html.escape(language)}"' if language else ""
+        return self.write(f"<pre><code{css_class}>{html.escape(code)}</code></pre>\n")
+
+    def new_table(self, columns: int, rows: int, text: List[str],
+                  text_align: str = "center") -> str:
+        """Add a table, the first row being the header row
+
+        Args:
+            columns (int): Number of columns
+            rows (int): Number of rows, including the header row
+            text (List[str]): Text of each cell, row by row
+            text_align (str, optional): Align the text 'left', 'center'
+                or 'right'. Defaults to "center".
+
+        Returns:
+            str: the table
+        """
+        cells = [inline(cell or "") for cell in text[:rows * columns]]
+        header = "".join(f"<th>{cell}</th>" for cell in cells[:columns])
+        body = "".join("<tr>" + "".join(f"<td>{cell}</td>" for cell in cells[start:start + columns])
+                       + "</tr>\n" for start in range(columns, len(cells), columns))
+        return self.write(f'<table class="{html.escape(text_align)}">\n<thead><tr>{header}</tr>'
+                          f"</thead>\n<tbody>\n{body}</tbody>\n</table>\n")
+
+    def new_list(self, items: List[str], marked_with: str = "-") -> str:
+        """Add a bullet list
+
+        Args:
+            items (List[str]): Text of each item
+            marked_with (str, optional): Unused, for compatibility with
+                MdUtils
+
+        Returns:
+            str: the list
+        """
+        del marked_with
+        return self.write("<ul>\n" + "".join(f"<li>{inline(item)}</li>\n" for item in items)
+                          + "</ul>\n")
+
+    def write(self, text: str) -> str:
+        """Add HTML as is
+
+        Args:
+            text (str): HTML
+
+        Returns:
+            str: the HTML
+        """
+        self.file_data_text += text
+        return text
+
+    @contextlib.contextmanager
+    def section(self, key: str) -> Iterator[HtmlDocument]:
+        """Generate the section of a source file. Sections aren't
+        recorded, since the HTML is handed over as it's generated.
+
+        Args:
+            key (str): identifies the section, e.g. a source file path
+
+        Yields:
+            HtmlDocument: This HtmlDocument
+        """
+        del key
+        yield self
+
+
+def inline(text: str) -> str:
+    """Escape text generated for Markdown as HTML. Markdown's escaped
+    underscores and angle brackets are unescaped, and inline code is kept
+    as code.
+
+    Args:
+        text (str): text, e.g. a docstring summary
+
+    Returns:
+        str: HTML
+    """
+    pieces = _INLINE_CODE.split(_MD_ESCAPE.sub(r"\1", text))
+    return "".join(f"<code>{html.escape(piece)}</code>" if index % 2 else html.escape(piece)
+                   for index, piece in enumerate(pieces))
+
+
+def _nav_list(headers: List[Tuple[int, str, str]]) -> str:
+    """Nest the level, title and ID of headers in lists of links"""
+    if not headers:
+        return ""
+
+    top = min(level for level, _, _ in headers)
+    items, start = [], 0
+    for index in range(1, len(headers) + 1):
+        if index == len(headers) or headers[index][0] <= top:
+            _, title, header_id = headers[start]
+            items.append(f'<li><a href="#{html.escape(header_id)}">{html.escape(title)}</a>'
+                         f"{_nav_list(headers[start + 1:index])}</li>\n")
+            start = index
+    return "<ul>\n" + "".join(items) + "</ul>\n"
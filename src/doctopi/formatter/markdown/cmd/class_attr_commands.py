@@ -6,13 +6,15 @@ various attributes of a class."""
 
 # Built-in imports
 from __future__ import annotations
-from typing import (List, Type)
+import dataclasses
+from typing import (List, Tuple, Type)
 
 # Third-party imports
 from mdutils.mdutils import MdUtils
 
 # This package imports
-from doctopi.types import (Command, ClassDeclaration, MarkdownSettings)
+from doctopi.types import (AccessType, Command, ClassDeclaration, MarkdownSettings)
+from doctopi.formatter.markdown.symbol_index import SymbolEntry
 from doctopi.formatter.markdown.cmd.param_table_command import MarkdownParamTableCommand
 from doctopi.formatter.markdown.cmd.function_command import MarkdownFunctionCommand
 from doctopi.formatter.markdown.cmd.docstring_commands import MarkdownDocstringCommand
@@ -95,18 +97,19 @@ class MarkdownConstructorCommand(MarkdownClassAttrCommand):
         if not self.settings.constructors or not self.class_.constructor:
             return
 
-        constructor = self.class_.constructor
-        constructor.name = "Constructor"
-
         # Python constructor signature is different from other languages.
         # Update the signature to look like it would in use rather than
-        # in the source.
+        # in the source. Use a copy, so the parsed class can be rendered
+        # again.
         #
         # e.g. convert `def __init__(self, arg1, arg2)` of class MyClass ->
         #              `MyClass(arg1, arg2)`
-        constructor.signature = constructor.signature \
-            .replace("def __init__(self, ", f"{self.class_.name}(") \
-            .replace("def __init__(self)", f"{self.class_.name}()")
+        constructor = dataclasses.replace(
+            self.class_.constructor,
+            name="Constructor",
+            signature=self.class_.constructor.signature
+            .replace("def __init__(self, ", f"{self.class_.name}(")
+            .replace("def __init__(self)", f"{self.class_.name}()"))
 
         MarkdownFunctionCommand(md_utils=self.md_utils,
                                 settings=self.settings,
@@ -183,7 +186,8 @@ class MarkdownMethodsCommand(MarkdownClassAttrCommand):
     """
     def execute(self):
         """Add class method documentation to the markdown generator"""
-        if self.class_.methods and self.settings.methods:
+        inherited = self._inherited() if self.settings.methods else []
+        if (self.class_.methods or inherited) and self.settings.methods:
             self.md_utils.new_header(level=self.level, title="Methods")
             for member_function in self.class_.methods:
                 MarkdownFunctionCommand(md_utils=self.md_utils,
@@ -191,3 +195,31 @@ class MarkdownMethodsCommand(MarkdownClassAttrCommand):
                                         level=self.level+1,
                                         func=member_function,
                                         cmds=self.function_cmds).execute()
+
+        # List the inherited methods, linking to where they're documented
+        symbols = self.settings.symbols
+        for base, methods in inherited:
+            self.md_utils.new_header(level=min(self.level+1, 6),
+                                     title=f"Inherited from {base.name}".replace("_", "\\_"),
+                                     add_table_of_contents="n")
+            self.md_utils.new_list([symbols.link(method, self.settings.page)
+                                    for method in methods])
+
+    def _inherited(self) -> List[Tuple[SymbolEntry, List[SymbolEntry]]]:
+        """Find the documented methods the class inherits
+
+        Returns:
+            List[Tuple[SymbolEntry, List[SymbolEntry]]]: each base class
+                and the methods inherited from it
+        """
+        if not self.settings.inherited_members or self.settings.symbols is None:
+            return []
+
+        inherited = []
+        for base, methods in self.settings.symbols.inherited(self.settings.scope):
+            if self.settings.public_only:
+                methods = [method for method in methods
+                           if method.declaration.access == AccessType.PUBLIC]
+            if methods:
+                inherited.append((base, methods))
+        return inherited
@@ -6,6 +6,9 @@ etc.
 """
 # pylint: disable = too-few-public-methods
 
+# Built-in imports
+import dataclasses
+
 # This package imports
 from doctopi.formatter.markdown.cmd.class_attr_commands import MarkdownClassAttrCommand
 
@@ -29,16 +32,29 @@ class MarkdownClassCommand(MarkdownClassAttrCommand):
     """
     def execute(self):
         """Add class documentation to the markdown generator"""
+        symbols = self.settings.symbols
+        qualname = f"{self.settings.scope}.{self.class_.name}" \
+            if self.settings.scope else self.class_.name
+
+        # Anchor the heading, so other classes, types and searches can link to it
+        if self.settings.anchors and self.settings.scope:
+            self.md_utils.write(f'\n<a name="{qualname}"></a>\n')
+
         # Overview
         self.md_utils.new_header(level=self.level, title=self.class_.name)
         self.md_utils.insert_code(self.class_.signature, language=self.settings.src_language)
+        if symbols is not None and symbols.bases(qualname):
+            bases = [f"`{base}`" if entry is None else symbols.link(entry, self.settings.page)
+                     for base, entry in symbols.bases(qualname)]
+            self.md_utils.new_paragraph(f"Bases: {', '.join(bases)}")
         if self.class_.docstring.summary:
             self.md_utils.new_paragraph(self.class_.docstring.summary)
 
-        # Execute all the sub-commands in the order provided.
+        # Execute all the sub-commands in the order provided, within the class' scope
+        settings = dataclasses.replace(self.settings, scope=qualname)
         for cmd in self.class_cmds:
             cmd(md_utils=self.md_utils,
-                settings=self.settings,
+                settings=settings,
                 level=self.level+1,
                 class_=self.class_,
                 class_cmds=self.class_cmds,
@@ -52,6 +52,10 @@ class MarkdownFunctionCommand(Command):
         if self.settings.public_only and self.func.access != AccessType.PUBLIC:
             return
 
+        # Anchor the heading, so inherited methods and searches can link to it
+        if self.settings.anchors and self.settings.scope:
+            self.md_utils.write(f'\n<a name="{self.settings.scope}.{self.func.name}"></a>\n')
+
         # Header with function signature
         self.md_utils.new_header(level=self.level, title=self.func.name.replace('_', '\\_'))
         self.md_utils.insert_code(
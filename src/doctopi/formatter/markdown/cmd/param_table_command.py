@@ -41,13 +41,22 @@ class MarkdownParamTableCommand(Command):
 
         # Flatten the table rows into the contents array
         for row in self.table_rows:
+            # Link the types to the classes they name
+            type_ = row.type
+            if self.settings.symbols is not None:
+                type_ = self.settings.symbols.link_types(type_, self.settings.scope,
+                                                         self.settings.page)
+
+            # Generic types, e.g. `Map<String, List<T>>`, aren't HTML tags
+            type_ = _escape_brackets(type_)
+
             if name_col:
                 contents.extend([
-                    row.name, row.type, row.description
+                    _escape_brackets(row.name), type_, row.description
                 ])
             else:
                 contents.extend([
-                    row.type, row.description
+                    type_, row.description
                 ])
 
         # Create the table in markdown
@@ -55,3 +64,16 @@ class MarkdownParamTableCommand(Command):
                                 rows=len(self.table_rows)+1,
                                 text=contents,
                                 text_align=self.settings.table_align)
+
+
+def _escape_brackets(text: str) -> str:
+    """Escape the angle brackets in text, which Markdown would otherwise
+    read as HTML, e.g. in C++ and Java generic types
+
+    Args:
+        text (str): table cell, e.g. a type
+
+    Returns:
+        str: the escaped text
+    """
+    return text.replace("<", "\\<").replace(">", "\\>") if text else text
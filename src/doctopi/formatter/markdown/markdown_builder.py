@@ -4,389 +4,316 @@ Markdown
 # Built-in imports
 from __future__ import annotations
 import os
-from typing import (List, Type, Union)
-
-# Third-party imports
-from mdutils import MdUtils
+from typing import (Callable, Iterator, Optional, Tuple, Union)
 
 # This package imports
-from doctopi.formatter.markdown.cmd.class_command import (MarkdownClassCommand,
-                                                          MarkdownClassAttrCommand)
-from doctopi.formatter.markdown.cmd.function_command import (MarkdownDocstringCommand,
-                                                             MarkdownFunctionCommand)
-from doctopi.parser import Parser
-from doctopi.parser.parser_factory import ParserFactory
-from doctopi.types import Command, DocDir, DocFile, MarkdownSettings
-
-
-class MarkdownBuilder:  # pylint: disable = too-many-instance-attributes
-    """Build a Markdown formatter and generate documentation. Uses the
-    builder pattern to handle large amounts of configuration, and the
-    command pattern to allow users to customize/organize documentation.
+from doctopi.formatter.doc_builder import DocBuilder
+from doctopi.formatter.markdown.markdown_document import MarkdownDocument
+from doctopi.formatter.markdown.pipeline import MarkdownPipeline, PipelineStats
+from doctopi.formatter.markdown.search_index import SearchIndex
+from doctopi.formatter.markdown.symbol_index import SymbolIndex
+from doctopi.ir.coverage import CoverageReport
+from doctopi.types import DocDir, DocFile, MarkdownSettings
+
+
+class MarkdownBuilder(DocBuilder):  # pylint: disable = too-many-instance-attributes
+    """Build a Markdown formatter and generate documentation. It's
+    configured like any DocBuilder, and adds the features only Markdown
+    supports: symbol links, coverage, search indexes, shards and
+    pipelines. A table of contents or any of those features need the
+    whole document or directory before the first file is written.
 
     Attributes:
-        src_language (str): Programming language of source code. Should
-            be one of "python", "java", "cpp".
-        parser (Parser): DoctoPi source code parser.
-        src (Union[str, bytes, os.PathLike]): Source file/dir to parse.
-        output (Union[str, bytes, os.PathLike]): Markdown output file.
-        commands (List[Command]): List of markdon commands to execute
-            using the Command pattern. These commands dictate how the
-            markdown documentation should be organized.
-        recursive (bool): Toggle if the parser should stop at the root
-            source directory provided or parse subdirectories. Default
-            is False.
-        title (str): Title of the markdown document to create. Default
-            is None.
-        author (str): Author of the markdown document to create. Default
-             is None.
-        toc_depth (int): Heading depth of the table of contents. Value
-            should be [1,6]. Default is 1.
-        toc_title (str): Title for the table of contents. Default is
-            "Contents".
-        table_align (str): Text alignment for all markdown tables. Value
-            should be one of "left", "center", or "right. Default is
-            "left".
-        table_of_contents (bool): Toggle a table of contents to be
-            generated. Default is False.
-        constructors (bool): Toggle constructors to be documented.
-            Default is True.
-        class_vars (bool): Toggle class variables to be documented.
-            Default is True.
-        instance_vars (bool): Toggle instance variables to be
-            documented. Default is True.
-        inner_classes (bool): Toggle inner classes to be documented.
-            Default is True.
-        methods (bool): Toggle member functions to be
-            documented. Default is True.
-        file_overview (bool): Toggle file overview to be documented.
-            Default is True.
-        public_only (bool): If enabled, only public class
-            methods will be documented.
+        readers (int): Reader threads of a MarkdownPipeline building a
+            source directory. Default is 0, building without a pipeline.
+        queue_depth (int): Capacity of the queues between the pipeline
+            stages. Default is 16.
+        pipeline_stats (PipelineStats): Stage metrics of the last build
+            by a pipeline. Default is None.
+        symbols (SymbolIndex): Index of the symbols to link to, e.g. of
+            every directory documented by a recursive run. Default is
+            None, indexing the documentation being rendered.
+        coverage (CoverageReport): Report the documentation coverage of
+            each parsed file is added to. Default is None.
+        search (SearchIndex): Index the documented symbols are added to
+            for client-side search, with a link to their heading.
+            Default is None.
+        link_symbols (bool): Toggle base classes and types to be linked
+            to the classes they name. Default is False.
+        inherited_members (bool): Toggle the methods inherited from
+            linked base classes to be listed. Default is False.
     """
+    extensions = (".md",)
+
     def __init__(self):
         """Constructor"""
-        # Generic
-        self.src_language: str = ""  # python, java, or cpp
-        self.parser: Parser = None
-        self.src: Union[str, bytes, os.PathLike] = ""
-        self.output: str = ""
-        self.recursive: bool = False
-
-        # Metadata
-        self.title: str = ""
-        self.author: str = ""
-
-        # Command pattern
-        self.file_commands: List[Type[Command]] = []
-        self.class_commands: List[Type[MarkdownClassAttrCommand]] = []
-        self.function_commands: List[Type[MarkdownDocstringCommand]] = []
-
-        # Table of contents
-        self.toc_depth: int = 1  # Should be 1-6
-        self.toc_title: str = "Contents"
-
-        # Tables
-        self.table_align: str = "left"  # left, center, or right
-
-        # Enabled content
-        self.table_of_contents: bool = False
-        self.constructors: bool = True
-        self.class_vars: bool = True
-        self.instance_vars: bool = True
-        self.inner_classes: bool = True
-        self.methods: bool = True
-        self.file_overview: bool = True
-        self.public_only: bool = True
+        super().__init__()
+        self.readers: int = 0
+        self.queue_depth: int = 16
+        self.pipeline_stats: PipelineStats = None
+        self.symbols: SymbolIndex = None
+        self._index: SymbolIndex = None
+        self.coverage: CoverageReport = None
+        self.search: SearchIndex = None
+        self.link_symbols: bool = False
+        self.inherited_members: bool = False
+
+    def new_document(self) -> MarkdownDocument:
+        """Create the Markdown document the commands write to
 
-    def build(self):
-        """Generate the markdown by executing the provided commands
+        Returns:
+            MarkdownDocument: the document
         """
-        # Initialize the md file
-        md_utils = MdUtils(file_name=self.output, title=self.title, author=self.author)
+        return MarkdownDocument(file_name=self.output, title=self.title, author=self.author)
 
-        # Parse the provided source path
-        parsed_docs: Union[DocFile, DocDir] = self.parser.parse_file(self.src) \
-            if os.path.isfile(self.src) else self.parser.parse_dir(self.src)
+    def closing(self, document: MarkdownDocument) -> str:
+        """Generate the references collected while generating the files
 
-        # Build a single file if it's a single file
-        if isinstance(parsed_docs, DocFile):
-            self.build_single_file(md_utils=md_utils, level=1, parsed_file=parsed_docs)
+        Args:
+            document (MarkdownDocument): document created by
+                new_document()
 
-        # Build for multiple files if it's a dir
-        else:
-            self.build_dir(md_utils=md_utils, level=1, parsed_dir=parsed_docs)
+        Returns:
+            str: the references, in Markdown
+        """
+        return document.reference.get_references_as_markdown()
 
-        # Create a table of contents
-        if self.table_of_contents:
-            md_utils.new_table_of_contents(table_title=self.toc_title, depth=self.toc_depth)
+    def build(self):
+        """Generate the markdown by executing the provided commands
+        """
+        # Overlap reading, parsing, rendering and writing a directory's files
+        if self.readers and self.docs is None and self.select is None \
+                and os.path.isdir(self.src) and not self._upfront():
+            self._index = self.symbols
+            self.pipeline_stats = MarkdownPipeline(self, self.readers, self.queue_depth).run()
+            return
 
         # Output the file.
-        md_utils.create_md_file()
+        self.build_document().create_md_file()
 
-    def build_dir(self, md_utils: MdUtils, level: int, parsed_dir: DocDir):
-        """Generate the markdown of a directory by executing the
-        provided commands
+    def render(self, src: Union[str, bytes, os.PathLike, DocFile, DocDir] = None) -> str:
+        """Generate the markdown in memory, without writing the output
+        file. The builder can render any number of sources.
 
         Args:
-            md_utils (MdUtils): Markdown file generator
-            level (int): Starting heading level to build the provided
-                file's documentation
-            parsed_dir (DocDir): parsed source directory
-        """
-        # If using recursion, need an extra level for the directory header
-        file_level = level + 1
-        if self.recursive:
-            file_level = level + 2
-            md_utils.new_header(level=level, title=f"{parsed_dir.name}/")
-
-        for doc in parsed_dir.files:
-            # Create a header for the name of the individual file
-            md_utils.new_header(level=file_level-1, title=doc.name.replace('_', '\\_'))
-            # Build each individual file
-            self.build_single_file(md_utils=md_utils, level=file_level, parsed_file=doc)
-
-        if self.recursive:
-            # If set to recursive mode, build a directory one level lower for each subdir.
-            for subdir in parsed_dir.subdirs:
-                self.build_dir(md_utils=md_utils, level=level+1, parsed_dir=subdir)
-
-    def build_single_file(self, md_utils: MdUtils, level: int, parsed_file: DocFile):
-        """Generate the markdown of a single file by executing the
-        provided commands
+            src (Union[str, bytes, os.PathLike, DocFile, DocDir],
+                optional): Source file/dir to parse, or already parsed
+                documentation. Defaults to the configured source.
 
-        Args:
-            md_utils (MdUtils): Markdown file generator
-            level (int): Starting heading level to build the provided
-                file's documentation
-            parsed_file (DocFile): parsed source file
+        Returns:
+            str: the Markdown document
         """
-        # Create an overview section
-        if self.file_overview and parsed_file.docstring.summary:
-            md_utils.new_header(level=level, title='Overview')
-            md_utils.new_paragraph(parsed_file.docstring.summary)
-            md_utils.new_paragraph()
-
-        settings = MarkdownSettings(
-            src_language=self.src_language,
-            table_align=self.table_align,
-            table_of_contents=self.table_of_contents,
-            constructors=self.constructors,
-            class_vars=self.class_vars,
-            instance_vars=self.instance_vars,
-            inner_classes=self.inner_classes,
-            methods=self.methods,
-            file_overview=self.file_overview,
-            public_only=self.public_only
-        )
-
-        # Generate sections in order of the provided commands
-        for command in self.file_commands:
-            # Create a "Classes" section
-            if issubclass(command, MarkdownClassCommand):
-                if parsed_file.classes:
-                    md_utils.new_header(level=level, title='Classes')
-
-                # Pass configuration to the command and execute
-                for class_ in parsed_file.classes:
-                    command(md_utils=md_utils,
-                            settings=settings,
-                            level=level+1,
-                            class_=class_,
-                            class_cmds=self.class_commands,
-                            function_cmds=self.function_commands).execute()
-
-            # Create a "Functions" section
-            elif issubclass(command, MarkdownFunctionCommand):
-                if parsed_file.functions:
-                    md_utils.new_header(level=level, title='Functions')
-
-                # Pass configuration to the command and execute
-                for function in parsed_file.functions:
-                    command(md_utils=md_utils,
-                            settings=settings,
-                            level=level+1,
-                            func=function,
-                            cmds=self.function_commands).execute()
-
-    def add_file_command(self, command: Type[Command]) -> MarkdownBuilder:
-        """Add a Markdown generation command. Upon calling
-        MarkdownBuild.build(), commands will be executed one by one
-        to format and generate documentation in markdown.
+        return self.build_document(src).get_md_text()
+
+    def iter_render(self,
+                    src: Union[str, bytes, os.PathLike, DocFile, DocDir] = None) -> Iterator[str]:
+        """Generate the markdown in memory as chunks, without writing the
+        output file. Without a table of contents, a source directory is
+        streamed like any DocBuilder's; with one, the whole document is
+        generated before the first chunk.
 
         Args:
-            command (Type[Command]): Commands to execute at the file
-                level
+            src (Union[str, bytes, os.PathLike, DocFile, DocDir],
+                optional): Source file/dir to parse, or already parsed
+                documentation. Defaults to the configured source.
 
-        Returns:
-            MarkdownBuilder: This MarkdownBuilder
+        Yields:
+            str: consecutive pieces of the Markdown document
         """
-        self.file_commands.append(command)
-        return self
+        if self.table_of_contents:
+            document = self.build_document(src)
+            yield document.header + document.title + document.table_of_contents
+            yield from document.chunks()
+            yield self.closing(document)
+            return
+
+        yield from super().iter_render(src)
 
-    def add_class_commands(self, command: Type[MarkdownClassAttrCommand]) -> MarkdownBuilder:
-        """Add a Markdown generation command. Upon calling
-        MarkdownBuild.build(), commands will be executed one by one
-        to format and generate documentation in markdown.
+    def stream(self, src: Union[str, bytes, os.PathLike, DocFile, DocDir] = None
+               ) -> Tuple[Union[DocFile, DocDir], Optional[Callable[[DocFile], DocFile]]]:
+        """Lay out a source directory without parsing it, unless symbols
+        are indexed from it, or it's measured for coverage or search,
+        which need every file up front
 
         Args:
-            command (Type[Command]): Commands to execute at the class
-                level
+            src (Union[str, bytes, os.PathLike, DocFile, DocDir],
+                optional): Source file/dir to parse, or already parsed
+                documentation. Defaults to the configured source.
 
         Returns:
-            MarkdownBuilder: This MarkdownBuilder
+            Tuple[Union[DocFile, DocDir], Optional[Callable[[DocFile],
+                DocFile]]]: the parsed docs or the directory's layout of
+                placeholders, and the function parsing each placeholder
+                or None if the docs are already parsed
         """
-        self.class_commands.append(command)
-        return self
-
-    def add_function_commands(self, command: Type[MarkdownDocstringCommand]) -> MarkdownBuilder:
-        """Add a Markdown generation command. Upon calling
-        MarkdownBuild.build(), commands will be executed one by one
-        to format and generate documentation in markdown.
+        if self._upfront():
+            return self.parse(src), None
+        return super().stream(src)
 
-        Args:
-            command (Type[Command]): Commands to execute at the function
-                level
+    def _upfront(self) -> bool:
+        """Check whether the whole source directory is needed before its
+        first file is generated: to index its symbols for links, or to
+        measure it for coverage or search
 
         Returns:
-            MarkdownBuilder: This MarkdownBuilder
+            bool: True if the directory can't be streamed
         """
-        self.function_commands.append(command)
-        return self
+        return (self.link_symbols and self.symbols is None) or self.coverage is not None \
+            or self.search is not None
 
-    def configure_metadata(self, title: str = "", author: str = "") -> MarkdownBuilder:
-        """Configure Markdown file metadata
+    def build_document(self,
+                       src: Union[str, bytes, os.PathLike, DocFile, DocDir] = None
+                       ) -> MarkdownDocument:
+        """Generate the markdown by executing the provided commands,
+        without writing it to the output file
 
         Args:
-            title (str, optional): Title of the markdown document to
-                create. Defaults to "".
-            author (str, optional): Author of the markdown document to
-                create. Defaults to "".
+            src (Union[str, bytes, os.PathLike, DocFile, DocDir],
+                optional): Source file/dir to parse, or already parsed
+                documentation. Defaults to the configured source.
 
         Returns:
-            MarkdownBuilder: This MarkdownBuilder
+            MarkdownDocument: the generated Markdown document
         """
-        self.title = title
-        self.author = author
-        return self
+        # Initialize the md file
+        md_utils = self.new_document()
+        md_utils.header = self.header
 
-    def configure_src(self, language: str = "python", style: str = "google") -> MarkdownBuilder:
-        """Configure the source progammming language and documentation
-        style
+        for _ in self.iter_build(md_utils, self.parse(src)):
+            pass
 
-        Args:
-            language (str, optional): programming language.
-                Defaults to "python".
-            style (str, optional): source code docstring style/flavor.
-                Defaults to "google".
+        # Create a table of contents
+        if self.table_of_contents:
+            md_utils.new_table_of_contents(table_title=self.toc_title, depth=self.toc_depth)
 
-        Returns:
-            MarkdownBuilder: This MarkdownBuilder object.
+        return md_utils
+
+    def iter_build(self, md_utils: MarkdownDocument, parsed_docs: Union[DocFile, DocDir],
+                   load: Callable[[DocFile], DocFile] = None) -> Iterator[str]:
+        """Generate the markdown of a file or directory, one file at a
+        time, indexing its symbols first
+
+        Args:
+            md_utils (MarkdownDocument): Markdown file generator
+            parsed_docs (Union[DocFile, DocDir]): parsed source file or
+                directory, or a directory's layout of placeholders when
+                nothing is indexed up front
+            load (Callable[[DocFile], DocFile], optional): Replaces each
+                placeholder as it's reached. Defaults to None.
+
+        Yields:
+            str: path of each file, after its markdown is generated
         """
-        self.src_language = language
-        self.parser = ParserFactory(language=language, style=style)
+        # Index the symbols in one pass, so each link is a lookup
+        self._index = self.symbols
+        if (self.link_symbols or self.search is not None) and self._index is None:
+            self._index = SymbolIndex().add(parsed_docs)
 
-        return self
+        # Measure the coverage of the same parsed files
+        if self.coverage is not None:
+            self.coverage.add(parsed_docs)
 
-    def configure_io(self,
-                     src: Union[str, bytes, os.PathLike],
-                     output: str = "README.md",
-                     recursive: bool = False) -> MarkdownBuilder:
-        """Configure the Markdown builder to process a provided source
-        file or directory, recursive or not, and set the output markdown
-        file path/name.
+        # Index the rendered files for search, linking to the headings anchored below
+        if self.search is not None:
+            rendered = parsed_docs if self.recursive or isinstance(parsed_docs, DocFile) \
+                else DocDir(parsed_docs.name, parsed_docs.path, parsed_docs.files)
+            self.search.add(rendered, self.page(), self._index.module, self.public_only)
+
+        yield from super().iter_build(md_utils, parsed_docs, load)
+
+    def build_dir(self, md_utils: MarkdownDocument, level: int, parsed_dir: DocDir):
+        """Generate the markdown of a directory by executing the
+        provided commands. Each file is generated in its own section.
 
         Args:
-            src (Union[str, bytes, os.PathLike]): Source file/dir to
-                parse.
-            output (Union[str, bytes, os.PathLike], optional): Markdown
-                output file. Defaults to "README.md".
-            recursive (bool): Toggle if the parser should stop at the
-                root source directory provided or parse subdirectories.
-                Defaults to False.
+            md_utils (MarkdownDocument): Markdown file generator
+            level (int): Starting heading level to build the provided
+                file's documentation
+            parsed_dir (DocDir): parsed source directory
+        """
+        for _ in self.iter_build_dir(md_utils, level, parsed_dir):
+            pass
 
-         Raises:
-            ValueError: If the src directory/file doesn't exist.
+    def settings(self, parsed_file: DocFile) -> MarkdownSettings:
+        """Get the settings the commands generate a file with, linking
+        and anchoring its symbols through the index
+
+        Args:
+            parsed_file (DocFile): parsed source file
 
         Returns:
-            MarkdownBuilder: This MarkdownBuilder object.
+            MarkdownSettings: the configured settings
         """
-        if not os.path.exists(src):
-            raise ValueError(f'"{src}" path does not exist.')
+        settings = super().settings(parsed_file)
+        settings.inherited_members = self.inherited_members
+        settings.symbols = self._index if self.link_symbols else None
+        settings.anchors = self.link_symbols or self.search is not None
+        settings.scope = self._index.module(parsed_file.path) if self._index else ""
+        return settings
+
+    def configure_pipeline(self, readers: int = 4, queue_depth: int = 16) -> MarkdownBuilder:
+        """Build a source directory in overlapping stages: reader
+        threads read the source files while they're parsed, rendered and
+        written, connected by bounded queues. Source files are parsed by
+        the configured workers, or a parser thread.
 
-        self.src = src
-        self.output = output
-        self.recursive = recursive
+        Args:
+            readers (int, optional): Number of reader threads. Defaults
+                to 4.
+            queue_depth (int, optional): Capacity of the queues between
+                the stages, bounding the files in flight. Defaults to 16.
 
+        Returns:
+            MarkdownBuilder: This MarkdownBuilder object.
+        """
+        self.readers = readers
+        self.queue_depth = queue_depth
         return self
 
-    def enable_toc(self, toc_depth: int = 1, title: str = "Contents") -> MarkdownBuilder:
-        """Enable a table of contents for the generted markdown.
-        Configure the heading depth for the table and the title.
+    def configure_symbols(self, symbols: SymbolIndex = None,
+                          inherited_members: bool = False) -> MarkdownBuilder:
+        """Link base classes and the types in tables to the classes they
+        name, and optionally list the methods inherited from them
 
         Args:
-            toc_depth (int, optional): Heading depth of the table of
-                contents. Value should be [1,6]. Defaults to 1.
-            title (str, optional): Title for the table of contents.
-                Defaults to "Contents".
-
-        Raises:
-            ValueError: If the toc_depth isn't between [1,6]
+            symbols (SymbolIndex, optional): Index of the symbols to link
+                to, e.g. of every directory documented by a recursive
+                run. Defaults to None, indexing the documentation being
+                rendered.
+            inherited_members (bool, optional): List the methods
+                inherited from linked base classes. Defaults to False.
 
         Returns:
             MarkdownBuilder: This MarkdownBuilder.
         """
-        if not 1 <= toc_depth <= 6:
-            raise ValueError("Table of contents depth must be between 1 & 6.")
-
-        self.table_of_contents = True
-        self.toc_depth = toc_depth
-        self.toc_title = title
-
+        self.link_symbols = True
+        self.symbols = symbols
+        self.inherited_members = inherited_members
         return self
 
-    def toggle(self, attr: str) -> MarkdownBuilder:
-        """Toggle one of the many instance variables. See
-        MarkdownBuilder for list of all boolean variables to toggle. By
-        default, all are set to True except Table of Contents. To enable
-        the Table of contents, use MarkdownBuilder.enable_toc()
+    def configure_coverage(self, coverage: CoverageReport) -> MarkdownBuilder:
+        """Measure the documentation coverage of the parsed files while
+        building, without parsing them again
 
         Args:
-            attr (str): Instance variable in the MarkdownBuilder class
-
-        Raises:
-            ValueError: If the provided attribute does exist but isn't
-                a boolean.
-            AttributeError: If the provided attribute does not exist.
+            coverage (CoverageReport): Report each parsed file is added
+                to
 
         Returns:
-            MarkdownBuilder: This MarkdownBuilder
+            MarkdownBuilder: This MarkdownBuilder.
         """
-        if hasattr(self, attr):
-            current_value = getattr(self, attr)
-            if isinstance(current_value, bool):
-                setattr(self, attr, not current_value)
-            else:
-                raise ValueError(f"The variable '{attr}' is not a boolean.")
-        else:
-            raise AttributeError(f"The variable '{attr}' does not exist.")
-
+        self.coverage = coverage
         return self
 
-    def align_tables(self, alignment: str) -> MarkdownBuilder:
-        """Set text inside markdown tables to align left, center, or
-        right.
+    def configure_search(self, search: SearchIndex) -> MarkdownBuilder:
+        """Index the documented symbols for client-side search while
+        building, anchoring their headings so the index can link to them
 
         Args:
-            alignment (str): Align text 'left', 'center', or 'right'.
-
-        Raises:
-            ValueError: Invalid alignment string provided.
+            search (SearchIndex): Index each documented symbol is added to
 
         Returns:
-            MarkdownBuilder: This MarkdownBuilder
+            MarkdownBuilder: This MarkdownBuilder.
         """
-        if alignment not in ["left", "center", "right"]:
-            raise ValueError("alignment must be one of 'left', 'center', or 'right'.")
-        self.table_align = alignment
+        self.search = search
         return self
@@ -0,0 +1,199 @@
+"""The MarkdownDocument extends MdUtils to record each header and the
+section of the document generated for each source file, so documents
+can be rendered in pieces, e.g. by separate shards, and stitched back
+together with the same table of contents.
+"""
+# Built-in imports
+from __future__ import annotations
+import contextlib
+import os
+from typing import (Iterator, List, Tuple)
+
+# Third-party imports
+from mdutils import MdUtils
+from mdutils.fileutils import MarkDownFile
+
+
+class MarkdownDocument(MdUtils):
+    """Markdown file generator which records its headers and the section
+    generated for each source file.
+
+    Attributes:
+        header (str): text written before the title, e.g. a comment
+            stamping the sources the document was generated from
+        headers (List[Tuple[int, str]]): level and title of each header
+            added to the table of contents, in order
+        sections (List[Tuple[str, int, int, int, int]]): key, text start,
+            text end, first header and last header of each section
+    """
+
+    def __init__(self, file_name: str, title: str = "", author: str = ""):
+        """Constructor
+
+        Args:
+            file_name (str): Markdown output file
+            title (str, optional): Title of the markdown document.
+                Defaults to "".
+            author (str, optional): Author of the markdown document.
+                Defaults to "".
+        """
+        super().__init__(file_name=file_name, title=title, author=author)
+        self.header: str = ""
+        self.headers: List[Tuple[int, str]] = []
+        self.sections: List[Tuple[str, int, int, int, int]] = []
+
+    # pylint: disable-next = too-many-arguments, too-many-positional-arguments
+    def new_header(self, level: int, title: str, style: str = "atx",
+                   add_table_of_contents: str = "y", header_id: str = "") -> str:
+        """Add a new header to the Markdown file, recording it for the
+        table of contents
+
+        Args:
+            level (int): Header level, 1 through 6
+            title (str): Header title
+            style (str, optional): 'atx' or 'setext'. Defaults to "atx".
+            add_table_of_contents (str, optional): 'y' to add the header
+                to the table of contents. Defaults to "y".
+            header_id (str, optional): ID of the header for extended
+                Markdown syntax. Defaults to "".
+
+        Returns:
+            str: the header
+        """
+        if add_table_of_contents == "y":
+            self.headers.append((level, title))
+        return super().new_header(level=level, title=title, style=style,
+                                  add_table_of_contents="n", header_id=header_id)
+
+    def new_table_of_contents(self, table_title: str = "Table of contents", depth: int = 1,
+                              marker: str = "") -> str:
+        """Create a table of contents from the recorded headers
+
+        Args:
+            table_title (str, optional): Title of the table of contents.
+                Defaults to "Table of contents".
+            depth (int, optional): Heading depth of the table of
+                contents, 1 through 6. Defaults to 1.
+            marker (str, optional): Place the table of contents using a
+                marker. Defaults to "".
+
+        Returns:
+            str: the table of contents
+        """
+        # Nest the headers the same way MdUtils does as they're added
+        self._table_titles = []
+        for level, title in self.headers:
+            current = self._table_titles
+            for _ in range(level - 1):
+                current = current[-1]
+            current.append(title)
+            if level < 6:
+                current.append([])
+
+        return super().new_table_of_contents(table_title=table_title, depth=depth, marker=marker)
+
+    @contextlib.contextmanager
+    def section(self, key: str) -> Iterator[MarkdownDocument]:
+        """Record everything generated inside the context as a section
+
+        Args:
+            key (str): identifies the section, e.g. a source file path
+
+        Yields:
+            MarkdownDocument: This MarkdownDocument
+        """
+        text_start, headers_start = len(self.file_data_text), len(self.headers)
+        yield self
+        self.sections.append((key, text_start, len(self.file_data_text),
+                              headers_start, len(self.headers)))
+
+    def split(self) -> Tuple[List[Tuple[str, List[Tuple[int, str]]]],
+                             List[Tuple[str, str, List[Tuple[int, str]]]]]:
+        """Split the document into the text and headers surrounding the
+        sections, and the sections themselves. The document is the first
+        surrounding piece, followed by each section and the next
+        surrounding piece in turn.
+
+        Returns:
+            Tuple: the text and headers of each surrounding piece, and
+                the key, text and headers of each section
+        """
+        frames = []
+        sections = []
+        text_end, headers_end = 0, 0
+
+        for key, text_start, section_text_end, headers_start, section_headers_end \
+                in self.sections:
+            frames.append((self.file_data_text[text_end:text_start],
+                           self.headers[headers_end:headers_start]))
+            sections.append((key,
+                             self.file_data_text[text_start:section_text_end],
+                             self.headers[headers_start:section_headers_end]))
+            text_end, headers_end = section_text_end, section_headers_end
+
+        frames.append((self.file_data_text[text_end:], self.headers[headers_end:]))
+        return frames, sections
+
+    def chunks(self) -> Iterator[str]:
+        """Split the document's text at the section boundaries
+
+        Yields:
+            str: consecutive pieces of the text, excluding the title and
+                table of contents
+        """
+        frames, sections = self.split()
+        for (frame, _), (_, text, _) in zip(frames, sections):
+            yield frame
+            yield text
+        yield frames[-1][0]
+
+    def get_md_text(self) -> str:
+        """Get the Markdown text, starting with the header
+
+        Returns:
+            str: the Markdown document
+        """
+        return self.header + super().get_md_text()
+
+    def create_md_file(self) -> MarkDownFile:
+        """Write the Markdown file, starting with the header
+
+        Returns:
+            MarkDownFile: the written file
+        """
+        md_file = MarkDownFile(self.file_name)
+        md_file.rewrite_all_file(data=self.get_md_text())
+        return md_file
+
+    def write_md_file(self) -> bool:
+        """Write the Markdown file atomically, so readers never see a
+        partially written file. An unchanged file isn't rewritten.
+
+        Returns:
+            bool: True if the file was written
+        """
+        file_name = self.file_name if self.file_name.endswith(".md") else f"{self.file_name}.md"
+        text = self.get_md_text()
+
+        try:
+            with open(file_name, "r", encoding="utf-8") as md_file:
+                if md_file.read() == text:
+                    return False
+        except OSError:
+            pass
+
+        with open(f"{file_name}.tmp", "w", encoding="utf-8") as md_file:
+            md_file.write(text)
+        os.replace(f"{file_name}.tmp", file_name)
+        return True
+
+    def append(self, text: str, headers: List[Tuple[int, str]]):
+        """Append previously generated text and its headers
+
+        Args:
+            text (str): Markdown text
+            headers (List[Tuple[int, str]]): level and title of each
+                header in the text
+        """
+        self.file_data_text += text
+        self.headers.extend(headers)
@@ -0,0 +1,431 @@
+"""The MarkdownPipeline overlaps the stages of generating Markdown from a
+source directory, rather than reading, parsing, rendering and writing
+one after the other. Reader threads read the source files, a parser pool
+parses them, the calling thread renders them in order and a writer
+thread writes each rendered section out, so waiting on a slow file
+system overlaps with parsing and rendering.
+
+The stages are connected by bounded queues. A stage which falls behind
+blocks the stages feeding it, so only a few files are in flight at once
+however large the tree is.
+"""
+# Built-in imports
+from __future__ import annotations
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+import functools
+import logging
+import os
+import queue
+import threading
+import time
+from typing import (Any, Callable, Dict, Iterator, List, Union, TYPE_CHECKING)
+
+# This package imports
+from doctopi.formatter.markdown.markdown_document import MarkdownDocument
+from doctopi.parser.cache import data_digest
+from doctopi.parser.scheduler import parse_source, worker_pool
+from doctopi.parser.walker import DirectoryWalker
+from doctopi.types import DocDir, DocFile
+
+if TYPE_CHECKING:
+    from doctopi.formatter.markdown.markdown_builder import MarkdownBuilder
+
+STAGES = ("read", "parse", "render", "write")
+"""Names of the pipeline stages, in order"""
+
+_DONE = object()
+"""Marks the end of a queue"""
+
+
+class PipelineError(Exception):
+    """The pipeline was stopped because another stage failed"""
+
+
+@dataclass
+class StageStats:
+    """Throughput and input queue depth of a pipeline stage
+
+    Attributes:
+        items (int): number of items the stage handled
+        busy (float): seconds the stage spent working, summed over its
+            threads or processes
+        samples (int): number of items handed to the stage
+        max_depth (int): most items waiting in the stage's input queue
+        total_depth (int): items waiting in the stage's input queue,
+            summed over each item handed to the stage
+    """
+    items: int = 0
+    busy: float = 0.0
+    samples: int = 0
+    max_depth: int = 0
+    total_depth: int = 0
+
+    def sample(self, depth: int):
+        """Record the depth of the stage's input queue as an item is
+        handed to the stage
+
+        Args:
+            depth (int): items waiting in the queue
+        """
+        self.samples += 1
+        self.max_depth = max(self.max_depth, depth)
+        self.total_depth += depth
+
+    def mean_depth(self) -> float:
+        """Get the average number of items waiting for the stage
+
+        Returns:
+            float: mean input queue depth
+        """
+        return self.total_depth / self.samples if self.samples else 0.0
+
+
+@dataclass
+class PipelineStats:
+    """Stage metrics of a pipeline run
+
+    Attributes:
+        seconds (float): wall time of the run
+        stages (Dict[str, StageStats]): metrics of each stage, by name
+    """
+    seconds: float = 0.0
+    stages: Dict[str, StageStats] = field(
+        default_factory=lambda: {name: StageStats() for name in STAGES})
+
+    def throughput(self, stage: str) -> float:
+        """Get the rate a stage handled its items over the run
+
+        Args:
+            stage (str): stage name
+
+        Returns:
+            float: items per second
+        """
+        return self.stages[stage].items / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the metrics to JSON-serializable data, e.g. for a
+        profile
+
+        Returns:
+            Dict[str, Any]: the "seconds" of the run, and the "items",
+                "busy" seconds, "throughput" per second, "mean_depth" and
+                "max_depth" of each stage
+        """
+        return {"seconds": round(self.seconds, 6),
+                "stages": {name: {"items": stats.items,
+                                  "busy": round(stats.busy, 6),
+                                  "throughput": round(self.throughput(name), 3),
+                                  "mean_depth": round(stats.mean_depth(), 3),
+                                  "max_depth": stats.max_depth}
+                           for name, stats in self.stages.items()}}
+
+
+class MarkdownPipeline:  # pylint: disable = too-many-instance-attributes, too-few-public-methods
+    """Generate the Markdown file of a MarkdownBuilder's source directory
+    in overlapping stages connected by bounded queues
+
+    Attributes:
+        builder (MarkdownBuilder): configured builder, rendering the
+            parsed files
+        readers (int): number of threads reading source files
+        depth (int): capacity of each queue between the stages
+        stats (PipelineStats): stage metrics of the last run
+    """
+
+    def __init__(self, builder: MarkdownBuilder, readers: int = 4, depth: int = 16):
+        """Constructor
+
+        Args:
+            builder (MarkdownBuilder): configured builder. Its workers
+                parse the source files in processes; otherwise a parser
+                thread does.
+            readers (int, optional): number of threads reading source
+                files. Defaults to 4.
+            depth (int, optional): capacity of each queue between the
+                stages. Defaults to 16.
+        """
+        self.builder = builder
+        self.readers = readers
+        self.depth = depth
+        self.stats = PipelineStats()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._reads: queue.Queue = None
+        self._parses: queue.Queue = None
+        self._writes: queue.Queue = None
+
+    def run(self, src: Union[str, bytes, os.PathLike] = None) -> PipelineStats:
+        """Generate and write the Markdown file
+
+        Args:
+            src (Union[str, bytes, os.PathLike], optional): Source
+                directory. Defaults to the builder's source.
+
+        Raises:
+            OSError: If a source file can't be read, or the Markdown
+                file can't be written
+
+        Returns:
+            PipelineStats: stage metrics of the run
+        """
+        builder = self.builder
+        src = builder.src if src is None else src
+        file_name = builder.output if builder.output.endswith(".md") else f"{builder.output}.md"
+        self.stats = PipelineStats()
+        self._stop.clear()
+        self._reads, self._parses, self._writes = (queue.Queue(self.depth) for _ in range(3))
+        start = time.perf_counter()
+
+        # Walk the tree without parsing, to know the order the files are rendered in
+        layout = DirectoryWalker(builder.parser, select=lambda _: False).walk(src)
+
+        parse_pool: Executor = worker_pool(builder.parser, builder.workers) \
+            if builder.workers > 1 else ThreadPoolExecutor(1, thread_name_prefix="doctopi-parse")
+        read_pool = ThreadPoolExecutor(self.readers, thread_name_prefix="doctopi-read")
+        errors: List[BaseException] = []
+        threads = [threading.Thread(target=self._guard, args=(target, errors), daemon=True)
+                   for target in [lambda: self._feed_reads(read_pool, self._iter_paths(layout)),
+                                  lambda: self._feed_parses(parse_pool),
+                                  lambda: self._write(file_name)]]
+
+        try:
+            for thread in threads:
+                thread.start()
+            self._render(layout)
+        except PipelineError:
+            pass  # Stopped by a failing stage, raised below
+        except BaseException:
+            self._stop.set()
+            raise
+        finally:
+            for thread in threads:
+                thread.join()
+            read_pool.shutdown(cancel_futures=True)
+            parse_pool.shutdown(cancel_futures=True)
+            if errors or self._stop.is_set():
+                _remove(f"{file_name}.tmp")
+
+        if errors:
+            raise errors[0]
+
+        self.stats.seconds = time.perf_counter() - start
+        logging.info("Generated '%s' in %.2fs: %s", file_name, self.stats.seconds, ", ".join(
+            f"{name} {self.stats.throughput(name):.1f}/s "
+            f"(queue {self.stats.stages[name].mean_depth():.1f}, "
+            f"max {self.stats.stages[name].max_depth})" for name in STAGES))
+        return self.stats
+
+    def _iter_paths(self, layout: DocDir) -> Iterator[str]:
+        """List the source files in the order they're rendered
+
+        Args:
+            layout (DocDir): the source directory, with placeholder files
+
+        Yields:
+            str: absolute path of each rendered source file
+        """
+        for doc_file in layout.files:
+            yield os.fsdecode(doc_file.path)
+
+        # Only the files of the root are rendered, unless recursing
+        if self.builder.recursive:
+            for subdir in layout.subdirs:
+                yield from self._iter_paths(subdir)
+
+    def _guard(self, target: Callable[[], None], errors: List[BaseException]):
+        """Run a stage thread, stopping the other stages if it fails
+
+        Args:
+            target (Callable[[], None]): the stage
+            errors (List[BaseException]): failures of the stage threads
+        """
+        try:
+            target()
+        except BaseException as exc:  # pylint: disable = broad-exception-caught
+            errors.append(exc)
+            self._stop.set()
+
+    def _put(self, stage: str, items: queue.Queue, item: Any):
+        """Hand an item to the next stage, waiting while its queue is
+        full unless the pipeline is stopped
+
+        Args:
+            stage (str): name of the stage the queue feeds
+            items (queue.Queue): the stage's input queue
+            item (Any): the item
+
+        Raises:
+            PipelineError: If the pipeline is stopped
+        """
+        while True:
+            if self._stop.is_set():
+                raise PipelineError("The pipeline was stopped")
+            try:
+                items.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+
+        if item is not _DONE:
+            with self._lock:
+                self.stats.stages[stage].sample(items.qsize())
+
+    def _get(self, items: queue.Queue) -> Any:
+        """Take the next item from a stage's input queue, waiting while
+        it's empty unless the pipeline is stopped
+
+        Args:
+            items (queue.Queue): the stage's input queue
+
+        Raises:
+            PipelineError: If the pipeline is stopped
+
+        Returns:
+            Any: the item
+        """
+        while True:
+            if self._stop.is_set():
+                raise PipelineError("The pipeline was stopped")
+            try:
+                return items.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+    def _feed_reads(self, pool: Executor, paths: Iterator[str]):
+        """Read stage: read each source file in the reader pool
+
+        Args:
+            pool (Executor): reader threads
+            paths (Iterator[str]): absolute paths of the source files, in
+                render order
+        """
+        for path in paths:
+            self._put("parse", self._reads, (path, pool.submit(self._read, path)))
+        self._put("parse", self._reads, _DONE)
+
+    def _read(self, path: str) -> bytes:
+        """Read a source file in a reader thread
+
+        Args:
+            path (str): absolute path of the source file
+
+        Returns:
+            bytes: the file contents
+        """
+        start = time.perf_counter()
+        with open(path, "rb") as source:
+            data = source.read()
+        with self._lock:
+            self.stats.stages["read"].items += 1
+            self.stats.stages["read"].busy += time.perf_counter() - start
+        return data
+
+    def _feed_parses(self, pool: Executor):
+        """Parse stage: hand each file which isn't cached to the parser
+        pool, in render order
+
+        Args:
+            pool (Executor): parser thread or worker processes
+        """
+        builder = self.builder
+        salt = builder.parser.configuration()
+        # Worker processes keep their own parser
+        parse = parse_source if builder.workers > 1 \
+            else functools.partial(parse_source, parser=builder.parser)
+
+        while (item := self._get(self._reads)) is not _DONE:
+            path, read = item
+            parsed: Future = Future()
+            data = read.result()
+            digest = data_digest(data, salt) if builder.cache is not None else None
+
+            with self._lock:
+                doc_file = builder.cache.get(path, digest) if digest is not None else None
+
+            if doc_file is not None:
+                parsed.set_result((doc_file, 0.0))
+            else:
+                parsed = pool.submit(parse, path, data)
+            self._put("render", self._parses, (path, digest, doc_file is None, parsed))
+
+        self._put("render", self._parses, _DONE)
+
+    def _render(self, layout: DocDir):
+        """Render stage: render each parsed file in order, handing its
+        section to the writer as soon as it's rendered. With a table of
+        contents, the whole document is handed over at the end.
+
+        Args:
+            layout (DocDir): the source directory, with placeholder files
+        """
+        builder = self.builder
+        document = MarkdownDocument(file_name=builder.output, title=builder.title,
+                                    author=builder.author)
+        document.header = builder.header
+        stats = self.stats.stages["render"]
+        waited = 0.0
+
+        def load(_: DocFile) -> DocFile:
+            nonlocal waited
+            wait_start = time.perf_counter()
+            path, digest, fresh, parsed = self._get(self._parses)
+            doc_file, seconds = parsed.result()
+            waited += time.perf_counter() - wait_start
+
+            if fresh:
+                self.stats.stages["parse"].items += 1
+                self.stats.stages["parse"].busy += seconds
+                if builder.cache is not None:
+                    with self._lock:
+                        builder.cache.put(path, digest, doc_file)
+            return doc_file
+
+        start = time.perf_counter()
+        if not builder.table_of_contents:
+            self._put("write", self._writes, document.header + document.title)
+
+        for _ in builder.iter_build_dir(document, 1, layout, load=load):
+            stats.items += 1
+            if not builder.table_of_contents:
+                self._put("write", self._writes, document.file_data_text)
+                document.file_data_text = ""
+
+        if builder.table_of_contents:
+            document.new_table_of_contents(table_title=builder.toc_title,
+                                           depth=builder.toc_depth)
+            self._put("write", self._writes, document.get_md_text())
+        else:
+            self._put("write", self._writes, document.file_data_text +
+                      document.reference.get_references_as_markdown())
+        stats.busy = time.perf_counter() - start - waited
+        self._put("write", self._writes, _DONE)
+
+    def _write(self, file_name: str):
+        """Write stage: write each rendered piece of the document to a
+        temporary file, replacing the Markdown file once it's complete
+
+        Args:
+            file_name (str): Markdown output file
+        """
+        stats = self.stats.stages["write"]
+        with open(f"{file_name}.tmp", "w", encoding="utf-8") as md_file:
+            while (text := self._get(self._writes)) is not _DONE:
+                start = time.perf_counter()
+                md_file.write(text)
+                stats.items += 1
+                stats.busy += time.perf_counter() - start
+        os.replace(f"{file_name}.tmp", file_name)
+
+
+def _remove(path: str):
+    """Remove a file, if it exists
+
+    Args:
+        path (str): the file
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
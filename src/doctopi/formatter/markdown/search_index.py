@@ -0,0 +1,318 @@
+"""The SearchIndex is an inverted index of the documented symbols, for
+client-side search of the generated Markdown. It's collected while the
+Markdown is rendered, from the names, signatures and docstring summaries
+of the parsed files, and written as JSON shards a browser fetches when a
+query needs them:
+
+    index.json          manifest: document count and shard names
+    terms/<prefix>.json postings of the terms starting with the prefix
+    docs/<n>.json       n-th block of documents: qualified name, kind,
+                        link and summary
+
+Postings list each document containing a term as pairs of document ID,
+delta-encoded from the previous pair, and weight. Every term starting
+with a query's first `prefix_length` characters is in the same shard, so
+a query matches terms by prefix with one request per word.
+"""
+# Built-in imports
+from __future__ import annotations
+import dataclasses
+import json
+import os
+import re
+from typing import (Callable, Dict, Iterator, List, Tuple, Union)
+
+# This package imports
+from doctopi.ir.symbols import iter_modules, iter_public_symbols, iter_symbols
+from doctopi.types import (ClassDeclaration, DocDir, DocFile, Docstring,
+                           FunctionDeclaration)
+
+VERSION = 1
+"""Version of the written index"""
+
+WEIGHTS = {"name": 4, "signature": 2, "summary": 1}
+"""Weight of a term in each field of a symbol"""
+
+STOP_WORDS = frozenset(["a", "an", "and", "are", "as", "be", "by", "class", "cls", "def", "for",
+                        "if", "in", "is", "it", "none", "of", "on", "or", "self", "that", "the",
+                        "this", "to", "with"])
+"""Terms which aren't indexed"""
+
+_WORD = re.compile(r"\w+", re.ASCII)
+_PART = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+
+@dataclasses.dataclass
+class SearchDocument:
+    """A module, class or function in the index
+
+    Attributes:
+        qualname (str): qualified name, e.g. `package.module.Class`
+        kind (str): "module", "class", "function" or "method"
+        page (str): Markdown file documenting the symbol, or "" for the
+            document being rendered
+        summary (str): docstring summary
+        terms (Dict[str, int]): weight of each term of the symbol
+    """
+    qualname: str
+    kind: str
+    page: str = ""
+    summary: str = ""
+    terms: Dict[str, int] = dataclasses.field(default_factory=dict)
+
+    @property
+    def anchor(self) -> str:
+        """Anchor of the symbol's heading, or "" for modules"""
+        return "" if self.kind == "module" else self.qualname
+
+    def href(self, start: str = "") -> str:
+        """Get the link to the symbol's heading
+
+        Args:
+            start (str, optional): directory the link is relative to.
+                Defaults to "", the current directory.
+
+        Returns:
+            str: the link
+        """
+        anchor = f"#{self.anchor}" if self.anchor else ""
+        if not self.page:
+            return anchor
+
+        page = os.path.relpath(self.page, start or os.curdir).replace(os.sep, "/")
+        return f"{page}{anchor}"
+
+
+class SearchIndex:
+    """Inverted index of the names, signatures and docstring summaries of
+    documented symbols
+
+    Attributes:
+        documents (List[SearchDocument]): indexed symbols, by ID
+        prefix_length (int): Length of the term prefixes the postings
+            are sharded by. Default is 2.
+        shard_size (int): Number of documents in each document shard.
+            Default is 1000.
+    """
+
+    def __init__(self, prefix_length: int = 2, shard_size: int = 1000):
+        """Constructor
+
+        Args:
+            prefix_length (int, optional): Length of the term prefixes
+                the postings are sharded by. Defaults to 2.
+            shard_size (int, optional): Number of documents in each
+                document shard. Defaults to 1000.
+        """
+        self.documents: List[SearchDocument] = []
+        self.prefix_length = prefix_length
+        self.shard_size = shard_size
+        self._ids: Dict[Tuple[str, str], int] = {}
+
+    def add(self, docs: Union[DocDir, DocFile], page: str = "",
+            module: Callable[[str], str] = None, public_only: bool = True) -> SearchIndex:
+        """Index the modules, classes and functions of parsed
+        documentation. A symbol added again for the same page replaces
+        the previous one.
+
+        Args:
+            docs (Union[DocDir, DocFile]): parsed source directory or file
+            page (str, optional): Markdown file documenting `docs`.
+                Defaults to "", the document being rendered.
+            module (Callable[[str], str], optional): Get the qualified
+                module name of a source file, as it's anchored in the
+                Markdown. Defaults to None, naming modules from the root
+                directory.
+            public_only (bool, optional): Only index public classes and
+                functions. Defaults to True.
+
+        Returns:
+            SearchIndex: This SearchIndex
+        """
+        for module_name, doc_file in iter_modules(docs):
+            if module is not None:
+                module_name = module(doc_file.path) or module_name
+
+            self.add_symbol(SearchDocument(module_name, "module", page),
+                            doc_file.docstring)
+            for qualname, kind, declaration in _iter_symbols(module_name, doc_file, public_only):
+                self.add_symbol(SearchDocument(qualname, kind, page), declaration.docstring,
+                                declaration.signature)
+
+        return self
+
+    def add_symbol(self, document: SearchDocument, docstring: Docstring = None,
+                   signature: str = "") -> SearchDocument:
+        """Index a symbol by its name, signature and docstring summary
+
+        Args:
+            document (SearchDocument): the symbol, without its summary and
+                terms
+            docstring (Docstring, optional): the symbol's docstring.
+                Defaults to None.
+            signature (str, optional): the symbol's signature. Defaults
+                to "".
+
+        Returns:
+            SearchDocument: the indexed symbol
+        """
+        document.summary = (docstring.summary or "") if docstring is not None else ""
+        for field, text in [("name", document.qualname.rpartition(".")[2]),
+                            ("signature", signature), ("summary", document.summary)]:
+            for term in tokenize(text):
+                document.terms[term] = document.terms.get(term, 0) + WEIGHTS[field]
+
+        key = (document.page, document.qualname)
+        if key in self._ids:
+            self.documents[self._ids[key]] = document
+        else:
+            self._ids[key] = len(self.documents)
+            self.documents.append(document)
+        return document
+
+    def postings(self) -> Dict[str, List[Tuple[int, int]]]:
+        """Invert the index
+
+        Returns:
+            Dict[str, List[Tuple[int, int]]]: map of each term, in sorted
+                order, to the ID and weight of the documents containing
+                it, in ID order
+        """
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        for doc_id, document in enumerate(self.documents):
+            for term, weight in document.terms.items():
+                postings.setdefault(term, []).append((doc_id, weight))
+        return dict(sorted(postings.items()))
+
+    def search(self, query: str, limit: int = 10) -> List[SearchDocument]:
+        """Find the documents matching every word of a query, the way a
+        browser searches the written index. Words at least
+        `prefix_length` long match terms by prefix.
+
+        Args:
+            query (str): words to search for, e.g. "parse file"
+            limit (int, optional): Maximum number of results. Defaults
+                to 10.
+
+        Returns:
+            List[SearchDocument]: the best matches first
+        """
+        postings = self.postings()
+        scores = None
+        for word in dict.fromkeys(_query_words(query)):
+            matches: Dict[int, int] = {}
+            for term, term_postings in postings.items():
+                if term == word or (len(word) >= self.prefix_length and term.startswith(word)):
+                    for doc_id, weight in term_postings:
+                        matches[doc_id] = max(matches.get(doc_id, 0), weight)
+
+            scores = matches if scores is None else \
+                {doc_id: score + matches[doc_id] for doc_id, score in scores.items()
+                 if doc_id in matches}
+
+        ranked = sorted((scores or {}).items(), key=lambda item: (-item[1], item[0]))
+        return [self.documents[doc_id] for doc_id, _ in ranked[:limit]]
+
+    def shards(self) -> Dict[str, Dict[str, List[int]]]:
+        """Split the postings by term prefix, encoding each term's
+        postings as a flat list of delta-encoded document IDs and weights
+
+        Returns:
+            Dict[str, Dict[str, List[int]]]: map of prefix to the
+                encoded postings of each term starting with it
+        """
+        shards: Dict[str, Dict[str, List[int]]] = {}
+        for term, term_postings in self.postings().items():
+            encoded, previous = [], 0
+            for doc_id, weight in term_postings:
+                encoded.extend([doc_id - previous, weight])
+                previous = doc_id
+            shards.setdefault(term[:self.prefix_length], {})[term] = encoded
+        return shards
+
+    def write(self, directory: Union[str, bytes, os.PathLike]):
+        """Write the index as JSON shards, replacing any shards left from
+        a previous index in the directory
+
+        Args:
+            directory (Union[str, bytes, os.PathLike]): output directory
+        """
+        directory = os.path.abspath(os.fsdecode(directory))
+        shards = self.shards()
+        blocks = [self.documents[start:start + self.shard_size]
+                  for start in range(0, len(self.documents), self.shard_size)]
+
+        written = {"terms": {f"{prefix}.json" for prefix in shards},
+                   "docs": {f"{index}.json" for index in range(len(blocks))}}
+        for subdir, names in written.items():
+            os.makedirs(os.path.join(directory, subdir), exist_ok=True)
+            for name in os.listdir(os.path.join(directory, subdir)):
+                if name.endswith(".json") and name not in names:
+                    os.remove(os.path.join(directory, subdir, name))
+
+        for prefix, terms in shards.items():
+            _write_json(os.path.join(directory, "terms", f"{prefix}.json"), terms)
+        for index, block in enumerate(blocks):
+            _write_json(os.path.join(directory, "docs", f"{index}.json"),
+                        [[document.qualname, document.kind, document.href(directory),
+                          document.summary] for document in block])
+
+        _write_json(os.path.join(directory, "index.json"), {
+            "version": VERSION,
+            "documents": len(self.documents),
+            "prefix_length": self.prefix_length,
+            "shard_size": self.shard_size,
+            "shards": sorted(shards)
+        })
+
+
+def tokenize(text: str) -> Iterator[str]:
+    """Split text into lowercase terms. Identifiers are indexed whole and
+    split into their snake_case and CamelCase words, e.g. `parse_file`,
+    `parse` and `file`.
+
+    Args:
+        text (str): name, signature or summary
+
+    Yields:
+        str: each term, possibly more than once
+    """
+    for word in _WORD.findall(text or ""):
+        whole = word.strip("_").lower()
+        if whole and whole not in STOP_WORDS:
+            yield whole
+
+        for part in _PART.findall(word):
+            part = part.lower()
+            if part != whole and part not in STOP_WORDS:
+                yield part
+
+
+def _query_words(query: str) -> List[str]:
+    """Split a query into lowercase words, keeping stop words which are
+    part of longer terms, e.g. `is` in `is_public`"""
+    return [word.strip("_").lower() for word in _WORD.findall(query) if word.strip("_")]
+
+
+def _iter_symbols(
+        module: str, doc_file: DocFile,
+        public_only: bool) -> Iterator[Tuple[str, str, Union[ClassDeclaration,
+                                                             FunctionDeclaration]]]:
+    """Iterate over the classes, methods and functions of a parsed file
+    with their kind, optionally only the public ones"""
+    if public_only:
+        yield from iter_public_symbols(module, doc_file)
+        return
+
+    for qualname, declaration in iter_symbols(module, doc_file):
+        if isinstance(declaration, ClassDeclaration):
+            yield qualname, "class", declaration
+        else:
+            scope = qualname.rpartition(".")[0]
+            yield qualname, "function" if scope == module else "method", declaration
+
+
+def _write_json(path: str, data: object):
+    """Write compact JSON"""
+    with open(path, "w", encoding="utf-8") as json_file:
+        json.dump(data, json_file, separators=(",", ":"))
@@ -0,0 +1,274 @@
+"""Split a Markdown build into shards that run independently, e.g. on
+separate machines, and merge their partial results into the same
+Markdown files a single run would have created.
+
+Each shard walks the whole source tree, but only parses and renders its
+own files. The rest of each document (title and directory headers) is
+rendered by every shard, so the merge takes it from any of them and fills
+in each file's section from the shard that owns it. A shard writes its
+results as a JSON artifact:
+
+    {"doctopi-shard": 1, "index": 1, "count": 4, "documents": [...]}
+"""
+# Built-in imports
+import hashlib
+import json
+import os
+from typing import (Any, Collection, Dict, IO, List, Tuple, Union)
+
+# This package imports
+from doctopi.formatter.markdown.markdown_document import MarkdownDocument
+
+ARTIFACT_VERSION = 1
+"""Version of the shard artifact format. Incremented on incompatible
+changes."""
+
+STRATEGIES = ("hash", "size")
+"""Supported ways to partition source files between shards"""
+
+
+class ShardError(Exception):
+    """Shards couldn't be created or merged"""
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse a shard specification
+
+    Args:
+        spec (str): "i/N" selects shard i of N, counting from 1
+
+    Raises:
+        ShardError: If the specification is malformed or out of range
+
+    Returns:
+        Tuple[int, int]: shard index and number of shards
+    """
+    try:
+        index, count = (int(value) for value in spec.split("/"))
+    except ValueError as exc:
+        raise ShardError(f"Shard '{spec}' should look like 'i/N'") from exc
+
+    if not 1 <= index <= count:
+        raise ShardError(f"Shard '{spec}' must be between 1/{count} and {count}/{count}")
+
+    return index, count
+
+
+def artifact_name(index: int, count: int) -> str:
+    """Name the artifact a shard writes when --shard-artifact is left out
+
+    Args:
+        index (int): shard index, counting from 1
+        count (int): number of shards
+
+    Returns:
+        str: file name, e.g. "doctopi-shard-1-of-4.json"
+    """
+    return f"doctopi-shard-{index}-of-{count}.json"
+
+
+def partition(files: List[str], count: int, root: str = "",
+              strategy: str = "hash") -> List[List[str]]:
+    """Deterministically split source files between shards. The same
+    files are split the same way on every machine.
+
+    Args:
+        files (List[str]): absolute source file paths
+        count (int): number of shards
+        root (str, optional): source root the files are hashed relative
+            to, so the split doesn't depend on where the tree is checked
+            out. Defaults to "".
+        strategy (str, optional): "hash" assigns each file by a hash of
+            its path. "size" balances the total file size of each shard,
+            largest files first. Defaults to "hash".
+
+    Raises:
+        ShardError: If the strategy isn't supported
+
+    Returns:
+        List[List[str]]: files of each shard, in the order provided
+    """
+    shards: List[List[str]] = [[] for _ in range(count)]
+    root = os.path.abspath(root) if root else ""
+
+    if strategy == "hash":
+        for file in files:
+            key = os.path.relpath(file, root).replace(os.sep, "/") if root else file
+            digest = hashlib.sha256(key.encode("utf-8")).digest()
+            shards[int.from_bytes(digest[:8], "big") % count].append(file)
+
+    elif strategy == "size":
+        # Longest processing time first: each file goes to the least loaded shard
+        loads = [0] * count
+        order = {file: position for position, file in enumerate(files)}
+        for file in sorted(files, key=lambda file: (-os.path.getsize(file), order[file])):
+            shard = loads.index(min(loads))
+            loads[shard] += os.path.getsize(file)
+            shards[shard].append(file)
+        for shard in shards:
+            shard.sort(key=order.__getitem__)
+
+    else:
+        raise ShardError(f"Unknown shard strategy '{strategy}'")
+
+    return shards
+
+
+class ShardArtifact:
+    """Markdown documents partially rendered by one shard
+
+    Attributes:
+        index (int): shard index, counting from 1
+        count (int): number of shards
+        documents (List[Dict[str, Any]]): each partially rendered
+            document
+    """
+
+    def __init__(self, index: int, count: int):
+        """Constructor
+
+        Args:
+            index (int): shard index, counting from 1
+            count (int): number of shards
+        """
+        self.index = index
+        self.count = count
+        self.documents: List[Dict[str, Any]] = []
+
+    def add(self, document: MarkdownDocument, owned: Collection[str],
+            toc_title: str = "", toc_depth: int = 0):
+        """Add a partially rendered document. The table of contents is
+        created when the shards are merged.
+
+        Args:
+            document (MarkdownDocument): Markdown document rendered
+                without a table of contents
+            owned (Collection[str]): absolute paths of the source files
+                rendered by this shard
+            toc_title (str, optional): Title of the table of contents.
+                Defaults to "".
+            toc_depth (int, optional): Heading depth of the table of
+                contents, or 0 for none. Defaults to 0.
+        """
+        frames, sections = document.split()
+        self.documents.append({
+            "output": os.fsdecode(document.file_name),
+            "title": document.title,
+            "header": document.header,
+            "toc": {"title": toc_title, "depth": toc_depth} if toc_depth else None,
+            "frames": [{"text": text, "headers": headers} for text, headers in frames],
+            "sections": [{"key": key, "text": text, "headers": headers}
+                         if os.path.abspath(key) in owned else {"key": key}
+                         for key, text, headers in sections]
+        })
+
+    def dump(self, fp: IO[str]):
+        """Write the artifact as JSON
+
+        Args:
+            fp (IO[str]): writable text stream
+        """
+        json.dump({"doctopi-shard": ARTIFACT_VERSION, "index": self.index,
+                   "count": self.count, "documents": self.documents}, fp)
+
+    @classmethod
+    def load(cls, path: Union[str, bytes, os.PathLike]) -> "ShardArtifact":
+        """Load an artifact written by `ShardArtifact.dump`
+
+        Args:
+            path (Union[str, bytes, os.PathLike]): artifact file
+
+        Raises:
+            ShardError: If the file isn't a shard artifact
+
+        Returns:
+            ShardArtifact: the loaded artifact
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as artifact_file:
+                data = json.load(artifact_file)
+        except json.JSONDecodeError as exc:
+            raise ShardError(f"'{os.fsdecode(path)}' isn't a shard artifact") from exc
+
+        if not isinstance(data, dict) or data.get("doctopi-shard") != ARTIFACT_VERSION:
+            raise ShardError(f"'{os.fsdecode(path)}' isn't a version {ARTIFACT_VERSION} "
+                             "shard artifact")
+
+        artifact = cls(data["index"], data["count"])
+        artifact.documents = data["documents"]
+        return artifact
+
+
+def merge(artifacts: List[ShardArtifact]) -> List[MarkdownDocument]:
+    """Merge the artifacts of every shard into complete Markdown
+    documents
+
+    Args:
+        artifacts (List[ShardArtifact]): one artifact per shard, in any
+            order
+
+    Raises:
+        ShardError: If a shard is missing or duplicated, or the shards
+            rendered different source trees
+
+    Returns:
+        List[MarkdownDocument]: complete documents, ready to be written
+            with `create_md_file()`
+    """
+    if not artifacts:
+        raise ShardError("No shard artifacts to merge")
+
+    count = artifacts[0].count
+    indexes = sorted(artifact.index for artifact in artifacts)
+    if any(artifact.count != count for artifact in artifacts) \
+            or indexes != list(range(1, count + 1)):
+        raise ShardError(f"Expected one artifact for each of {count} shards, got shards "
+                         f"{', '.join(str(index) for index in indexes)}")
+
+    return [_merge_document([artifact.documents[position] for artifact in artifacts])
+            for position in range(len(artifacts[0].documents))]
+
+
+def _merge_document(parts: List[Dict[str, Any]]) -> MarkdownDocument:
+    """Merge one document rendered partially by each shard
+
+    Args:
+        parts (List[Dict[str, Any]]): the document from each artifact
+
+    Raises:
+        ShardError: If the shards rendered different documents, or a
+            section wasn't rendered by exactly one shard
+
+    Returns:
+        MarkdownDocument: the complete document
+    """
+    first = parts[0]
+    for part in parts[1:]:
+        if any(part.get(key) != first.get(key)
+               for key in ("output", "title", "header", "toc", "frames")) \
+                or [section["key"] for section in part["sections"]] \
+                != [section["key"] for section in first["sections"]]:
+            raise ShardError(f"Shards rendered different versions of '{first['output']}'")
+
+    document = MarkdownDocument(file_name=first["output"])
+    document.title = first["title"]
+    document.header = first.get("header", "")
+
+    for position, frame in enumerate(first["frames"]):
+        document.append(frame["text"], [tuple(header) for header in frame["headers"]])
+        if position == len(first["sections"]):
+            break
+
+        rendered = [part["sections"][position] for part in parts
+                    if "text" in part["sections"][position]]
+        if len(rendered) != 1:
+            raise ShardError(f"'{first['sections'][position]['key']}' was rendered by "
+                             f"{len(rendered)} shards, expected 1")
+        document.append(rendered[0]["text"],
+                        [tuple(header) for header in rendered[0]["headers"]])
+
+    if first["toc"]:
+        document.new_table_of_contents(table_title=first["toc"]["title"],
+                                       depth=first["toc"]["depth"])
+
+    return document
@@ -0,0 +1,315 @@
+"""The SymbolIndex maps the qualified name of every class and function
+in the rendered documentation to its declaration and the anchor of its
+heading. It's built in a single pass over the parsed documentation, so
+base classes, inherited methods and type names can be resolved from any
+module with dictionary lookups instead of searching or parsing again.
+"""
+# Built-in imports
+from __future__ import annotations
+import dataclasses
+import os
+import re
+from typing import (Callable, Collection, Dict, Iterator, List, Optional, Set, Tuple,
+                    Union)
+
+# This package imports
+from doctopi.ir.symbols import class_bases, iter_modules, iter_symbols
+from doctopi.types import ClassDeclaration, DocDir, DocFile, FunctionDeclaration
+
+_NAME = re.compile(r"[A-Za-z_][\w.]*")
+
+
+@dataclasses.dataclass
+class SymbolEntry:
+    """A class or function in the index
+
+    Attributes:
+        qualname (str): qualified name, e.g. `package.module.Class`
+        declaration (Union[ClassDeclaration, FunctionDeclaration]): the
+            parsed class or function
+        page (str): Markdown file documenting the symbol, or "" for the
+            document being rendered
+        module (str): qualified name of the module declaring the symbol
+    """
+    qualname: str
+    declaration: Union[ClassDeclaration, FunctionDeclaration]
+    page: str = ""
+    module: str = ""
+
+    @property
+    def anchor(self) -> str:
+        """Anchor of the symbol's heading"""
+        return self.qualname
+
+    @property
+    def name(self) -> str:
+        """Unqualified name of the symbol"""
+        return self.qualname.rpartition(".")[2]
+
+
+class SymbolIndex:
+    """Index of the classes and functions of parsed documentation
+
+    Attributes:
+        symbols (Dict[str, SymbolEntry]): map of qualified name to symbol
+        classes (Dict[str, Optional[SymbolEntry]]): map of unqualified
+            class name to class, or None if the name is ambiguous
+        modules (Dict[str, str]): map of absolute source file path to
+            qualified module name
+    """
+
+    def __init__(self):
+        """Constructor"""
+        self.symbols: Dict[str, SymbolEntry] = {}
+        self.classes: Dict[str, Optional[SymbolEntry]] = {}
+        self.modules: Dict[str, str] = {}
+
+    def add(self, docs: Union[DocDir, DocFile],
+            page: Callable[[DocFile], str] = None) -> SymbolIndex:
+        """Index every class and function of parsed documentation
+
+        Args:
+            docs (Union[DocDir, DocFile]): parsed source directory or file
+            page (Callable[[DocFile], str], optional): Markdown file
+                documenting a parsed source file. Defaults to None, for
+                documentation rendered in a single document.
+
+        Returns:
+            SymbolIndex: This SymbolIndex
+        """
+        for module, doc_file in iter_modules(docs):
+            self.modules[os.path.abspath(os.fsdecode(doc_file.path))] = module
+            doc_page = page(doc_file) if page is not None else ""
+
+            for qualname, declaration in iter_symbols(module, doc_file):
+                entry = SymbolEntry(qualname, declaration, doc_page, module)
+                self.symbols[qualname] = entry
+                if isinstance(declaration, ClassDeclaration):
+                    # A name declared twice can't be resolved without its module
+                    self.classes[entry.name] = None if entry.name in self.classes else entry
+
+        return self
+
+    def module(self, path: Union[str, bytes, os.PathLike]) -> str:
+        """Get the qualified name of an indexed source file's module
+
+        Args:
+            path (Union[str, bytes, os.PathLike]): source file path
+
+        Returns:
+            str: qualified module name, or "" if the file isn't indexed
+        """
+        return self.modules.get(os.path.abspath(os.fsdecode(path)), "")
+
+    def get(self, qualname: str) -> Optional[SymbolEntry]:
+        """Get a symbol by its qualified name
+
+        Args:
+            qualname (str): qualified name, e.g. `package.module.Class`
+
+        Returns:
+            Optional[SymbolEntry]: the symbol, or None if it isn't indexed
+        """
+        return self.symbols.get(qualname)
+
+    def resolve(self, name: str, scope: str = "") -> Optional[SymbolEntry]:
+        """Resolve a name the way it's written in the source code: as a
+        qualified name, relative to the enclosing scopes, or as a class
+        name which is declared only once
+
+        Args:
+            name (str): name to resolve, e.g. `Class` or `module.Class`
+            scope (str, optional): qualified name of the class or module
+                the name is used in. Defaults to "".
+
+        Returns:
+            Optional[SymbolEntry]: the symbol, or None if it can't be
+                resolved
+        """
+        entry = self.symbols.get(name)
+        while entry is None and scope:
+            entry = self.symbols.get(f"{scope}.{name}")
+            scope = scope.rpartition(".")[0]
+
+        if entry is None:
+            # e.g. `module.Class` imported from another package
+            entry = self.classes.get(name.rpartition(".")[2])
+            if entry is not None and not f".{entry.qualname}".endswith(f".{name}"):
+                entry = None
+
+        return entry
+
+    def href(self, entry: SymbolEntry, page: str = "") -> str:
+        """Get the link target of a symbol's heading
+
+        Args:
+            entry (SymbolEntry): the symbol
+            page (str, optional): Markdown file the link is written in.
+                Defaults to "", the document being rendered.
+
+        Returns:
+            str: the anchor, relative to `page`
+        """
+        if not entry.page or entry.page == page:
+            return f"#{entry.anchor}"
+
+        start = os.path.dirname(page) if page else os.curdir
+        return f"{os.path.relpath(entry.page, start).replace(os.sep, '/')}#{entry.anchor}"
+
+    def link(self, entry: SymbolEntry, page: str = "", text: str = None) -> str:
+        """Create a Markdown link to a symbol's heading
+
+        Args:
+            entry (SymbolEntry): the symbol
+            page (str, optional): Markdown file the link is written in.
+                Defaults to "", the document being rendered.
+            text (str, optional): Text of the link. Defaults to the
+                symbol's name.
+
+        Returns:
+            str: the Markdown link
+        """
+        text = (entry.name if text is None else text).replace("_", "\\_")
+        return f"[{text}]({self.href(entry, page)})"
+
+    def link_types(self, text: str, scope: str = "", page: str = "") -> str:
+        """Link the indexed classes named in a type, e.g.
+        `List[Example]`
+
+        Args:
+            text (str): type annotation or docstring type
+            scope (str, optional): qualified name of the class or module
+                the type is used in. Defaults to "".
+            page (str, optional): Markdown file the links are written in.
+                Defaults to "", the document being rendered.
+
+        Returns:
+            str: the type, with links to the classes it names
+        """
+        def replace(match: re.Match) -> str:
+            entry = self.resolve(match.group(0), scope)
+            if entry is None or not isinstance(entry.declaration, ClassDeclaration):
+                return match.group(0)
+            return self.link(entry, page, match.group(0))
+
+        return _NAME.sub(replace, text) if text else text
+
+    def bases(self, qualname: str) -> List[Tuple[str, Optional[SymbolEntry]]]:
+        """Resolve the base classes of an indexed class
+
+        Args:
+            qualname (str): qualified name of the class
+
+        Returns:
+            List[Tuple[str, Optional[SymbolEntry]]]: each base class as
+                written in the source code, and the indexed class it
+                resolves to, or None
+        """
+        entry = self.symbols.get(qualname)
+        if entry is None or not isinstance(entry.declaration, ClassDeclaration):
+            return []
+
+        scope = qualname.rpartition(".")[0]
+        resolved = []
+        for base in class_bases(entry.declaration):
+            # Generic bases, e.g. `Base[T]`, resolve to the class
+            base_entry = self.resolve(base.split("[", 1)[0].strip(), scope)
+            if base_entry is not None and not isinstance(base_entry.declaration,
+                                                         ClassDeclaration):
+                base_entry = None
+            resolved.append((base, base_entry))
+        return resolved
+
+    def inherited(self, qualname: str) -> List[Tuple[SymbolEntry, List[SymbolEntry]]]:
+        """Find the methods an indexed class inherits from indexed base
+        classes, in the order Python looks them up for single
+        inheritance. Methods the class or a nearer base overrides are
+        excluded.
+
+        Args:
+            qualname (str): qualified name of the class
+
+        Returns:
+            List[Tuple[SymbolEntry, List[SymbolEntry]]]: each base class
+                and the methods inherited from it
+        """
+        entry = self.symbols.get(qualname)
+        if entry is None or not isinstance(entry.declaration, ClassDeclaration):
+            return []
+
+        defined = {method.name for method in entry.declaration.methods}
+        if entry.declaration.constructor:
+            defined.add(entry.declaration.constructor.name)
+
+        inherited = []
+        visited = {qualname}
+        pending = [base for _, base in reversed(self.bases(qualname)) if base is not None]
+        while pending:
+            base = pending.pop()
+            if base.qualname in visited:
+                continue
+            visited.add(base.qualname)
+
+            methods = [self.symbols[f"{base.qualname}.{method.name}"]
+                       for method in base.declaration.methods if method.name not in defined]
+            defined.update(method.name for method in base.declaration.methods)
+            if methods:
+                inherited.append((base, methods))
+
+            pending.extend(nested for _, nested in reversed(self.bases(base.qualname))
+                           if nested is not None)
+
+        return inherited
+
+    def dependents(self, modules: Collection[str]) -> Set[str]:
+        """Find the Markdown files linking to the symbols of modules: to
+        their base classes, inherited methods or the classes named in
+        their types
+
+        Args:
+            modules (Collection[str]): qualified module names
+
+        Returns:
+            Set[str]: Markdown files documenting symbols which link to
+                the modules' symbols
+        """
+        pages = set()
+        for qualname, entry in self.symbols.items():
+            if entry.page not in pages and any(
+                    target.module in modules for target in self._targets(qualname)):
+                pages.add(entry.page)
+        return pages
+
+    def _targets(self, qualname: str) -> Iterator[SymbolEntry]:
+        """Iterate over the indexed symbols a symbol's documentation
+        links to
+
+        Args:
+            qualname (str): qualified name of the symbol
+
+        Yields:
+            SymbolEntry: each linked symbol
+        """
+        declaration = self.symbols[qualname].declaration
+        scope = qualname.rpartition(".")[0]
+        types = []
+        if declaration.docstring is not None:
+            types.extend(row.type for row in declaration.docstring.args)
+            types.extend(row.type for row in declaration.docstring.raises)
+            if declaration.docstring.returns is not None:
+                types.append(declaration.docstring.returns.type)
+
+        if isinstance(declaration, ClassDeclaration):
+            scope = qualname
+            types.extend(row.type for row in declaration.class_variables)
+            types.extend(row.type for row in declaration.member_variables)
+            yield from (base for _, base in self.bases(qualname) if base is not None)
+            for base, methods in self.inherited(qualname):
+                yield base
+                yield from methods
+
+        for type_ in types:
+            for match in _NAME.finditer(type_ or ""):
+                entry = self.resolve(match.group(0), scope)
+                if entry is not None and isinstance(entry.declaration, ClassDeclaration):
+                    yield entry
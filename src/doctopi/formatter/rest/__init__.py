@@ -0,0 +1,5 @@
+"""reStructuredText formatter, reusing the Markdown commands"""
+from doctopi.formatter.rest.rest_builder import RestBuilder
+from doctopi.formatter.rest.rest_document import RestDocument, escape
+
+__all__ = ["RestBuilder", "RestDocument", "escape"]
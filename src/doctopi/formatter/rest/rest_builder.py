@@ -0,0 +1,38 @@
+"""The RestBuilder configures and generates documentation in
+reStructuredText, streaming it to the output file
+"""
+# Built-in imports
+from __future__ import annotations
+
+# This package imports
+from doctopi.formatter.doc_builder import DocBuilder
+from doctopi.formatter.rest.rest_document import RestDocument
+
+
+class RestBuilder(DocBuilder):
+    """Build a reStructuredText formatter and generate documentation,
+    e.g. for Sphinx. The table of contents is a directive, so it doesn't
+    wait for the whole document.
+    """
+    extensions = (".rst",)
+
+    def new_document(self) -> RestDocument:
+        """Create the reST document the commands write to
+
+        Returns:
+            RestDocument: the document
+        """
+        return RestDocument(file_name=self.page(), title=self.title, author=self.author)
+
+    def opening(self, document: RestDocument) -> str:
+        """Generate the title, followed by the contents directive
+
+        Args:
+            document (RestDocument): document created by new_document()
+
+        Returns:
+            str: the title
+        """
+        if self.table_of_contents:
+            document.new_table_of_contents(self.toc_title, self.toc_depth)
+        return document.title
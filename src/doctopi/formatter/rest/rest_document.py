@@ -0,0 +1,226 @@
+"""The RestDocument generates reStructuredText through the same methods
+as MdUtils, so the Markdown commands document files, classes and
+functions in reST unchanged. Like MdUtils, the generated text is kept in
+`file_data_text`, which a builder streaming the document hands over and
+clears as each source file is generated.
+"""
+# Built-in imports
+from __future__ import annotations
+import contextlib
+import re
+from typing import (Iterator, List)
+
+ADORNMENTS = "=-~^\"'"
+"""Characters underlining section titles, by heading level"""
+
+_INLINE_CODE = re.compile(r"`([^`]+)`")
+_MD_ESCAPE = re.compile(r"\\([_<>])")
+_MARKUP = re.compile(r"([\\*`|_])")
+_ADORNMENT = re.compile(r"([^\w\s])\1+")
+
+
+class RestDocument:
+    """reStructuredText generator with the MdUtils methods used by the
+    Markdown commands
+
+    Attributes:
+        file_name (str): reST output file
+        title (str): document title, with its adornment
+        author (str): author of the document
+        file_data_text (str): text generated since it was last handed
+            over
+    """
+
+    def __init__(self, file_name: str, title: str = "", author: str = ""):
+        """Constructor
+
+        Args:
+            file_name (str): reST output file
+            title (str, optional): Title of the reST document. Defaults
+                to "".
+            author (str, optional): Author of the reST document. Defaults
+                to "".
+        """
+        self.file_name = file_name
+        self.author = author
+        self.title = ""
+        self.file_data_text = ""
+
+        # The title is adorned above and below, so it's distinct from every section
+        if title:
+            title = escape(title)
+            self.title = f"{'=' * len(title)}\n{title}\n{'=' * len(title)}\n"
+        if author:
+            self.title += f"\n:Author: {escape(author)}\n"
+
+    # pylint: disable-next = too-many-arguments, too-many-positional-arguments
+    def new_header(self, level: int, title: str, style: str = "atx",
+                   add_table_of_contents: str = "y", header_id: str = "") -> str:
+        """Add a section title, underlined by the level's adornment
+
+        Args:
+            level (int): Header level, 1 through 6
+            title (str): Header title, possibly escaped for Markdown
+            style (str, optional): Unused, for compatibility with MdUtils
+            add_table_of_contents (str, optional): Unused, the contents
+                directive lists every section
+            header_id (str, optional): Unused, for compatibility with
+                MdUtils
+
+        Returns:
+            str: the header
+        """
+        del style, add_table_of_contents, header_id
+        title = escape(title)
+        adornment = ADORNMENTS[min(level, len(ADORNMENTS)) - 1]
+        return self.write(f"\n{title}\n{adornment * len(title)}\n")
+
+    def new_paragraph(self, text: str = "", **kwargs) -> str:
+        """Add a paragraph
+
+        Args:
+            text (str, optional): Paragraph text. Defaults to "", adding
+                nothing.
+            **kwargs: Unused, for compatibility with MdUtils
+
+        Returns:
+            str: the paragraph
+        """
+        del kwargs
+        return self.write(f"\n{_paragraph(text)}\n" if text else "")
+
+    def insert_code(self, code: str, language: str = "") -> str:
+        """Add a code block
+
+        Args:
+            code (str): source code
+            language (str, optional): Language to highlight the code as.
+                Defaults to "", a literal block.
+
+        Returns:
+            str: the code block
+        """
+        directive = f".. code-block:: {language}" if language else "::"
+        return self.write(f"\n{directive}\n\n{_indent(code, 3)}\n")
+
+    def new_table(self, columns: int, rows: int, text: List[str],
+                  text_align: str = "center") -> str:
+        """Add a list table, the first row being the header row
+
+        Args:
+            columns (int): Number of columns
+            rows (int): Number of rows, including the header row
+            text (List[str]): Text of each cell, row by row
+            text_align (str, optional): Unused, cells are aligned by the
+                theme
+
+        Returns:
+            str: the table
+        """
+        del text_align
+        lines = [".. list-table::", "   :header-rows: 1", ""]
+        for index, cell in enumerate(text[:rows * columns]):
+            # Each row is a bullet of cells, continuation lines indented under the cell
+            bullet = "   * - " if index % columns == 0 else "     - "
+            lines.append(f"{bullet}{_indent(escape(cell or ''), 7).lstrip()}".rstrip())
+        return self.write("\n" + "\n".join(lines) + "\n")
+
+    def new_list(self, items: List[str], marked_with: str = "-") -> str:
+        """Add a bullet list
+
+        Args:
+            items (List[str]): Text of each item
+            marked_with (str, optional): Bullet character. Defaults to
+                "-".
+
+        Returns:
+            str: the list
+        """
+        return self.write("\n" + "".join(f"{marked_with} {escape(item)}\n" for item in items))
+
+    def new_table_of_contents(self, table_title: str = "Contents", depth: int = 1) -> str:
+        """Add a contents directive, listing the sections below it
+
+        Args:
+            table_title (str, optional): Title of the table of contents.
+                Defaults to "Contents".
+            depth (int, optional): Heading depth of the table of
+                contents. Defaults to 1.
+
+        Returns:
+            str: the directive
+        """
+        return self.write(f"\n.. contents:: {escape(table_title)}\n   :depth: {depth}\n")
+
+    def write(self, text: str) -> str:
+        """Add text as is
+
+        Args:
+            text (str): reST text
+
+        Returns:
+            str: the text
+        """
+        self.file_data_text += text
+        return text
+
+    @contextlib.contextmanager
+    def section(self, key: str) -> Iterator[RestDocument]:
+        """Generate the section of a source file. Sections aren't
+        recorded, since the text is handed over as it's generated.
+
+        Args:
+            key (str): identifies the section, e.g. a source file path
+
+        Yields:
+            RestDocument: This RestDocument
+        """
+        del key
+        yield self
+
+
+def escape(text: str) -> str:
+    """Escape inline markup in text generated for Markdown. Markdown's
+    escaped underscores and angle brackets are unescaped, and inline code
+    is kept as an inline literal.
+
+    Args:
+        text (str): text, e.g. a title or a docstring summary
+
+    Returns:
+        str: reST text
+    """
+    pieces = _INLINE_CODE.split(_MD_ESCAPE.sub(r"\1", text))
+    return "".join(f"``{piece}``" if index % 2 else _MARKUP.sub(r"\\\1", piece)
+                   for index, piece in enumerate(pieces))
+
+
+def _paragraph(text: str) -> str:
+    """Escape a paragraph, keeping its Markdown code blocks, indented
+    after a blank line, as literal blocks. Other lines are unindented,
+    continuing the paragraph like they do in Markdown, and underlines
+    are escaped."""
+    lines, code = [], False
+    for line in text.splitlines():
+        if line.strip() and not line.startswith("    "):
+            # A literal block ends with a blank line
+            if code and lines[-1].strip():
+                lines.append("")
+            code = False
+        elif line.strip() and not code and (not lines or not lines[-1].strip()):
+            code = True
+            lines.extend(["::", ""])
+
+        if code:
+            lines.append(line)
+        # Underlines, e.g. of NumPy docstring sections, would start a section
+        elif _ADORNMENT.fullmatch(line.strip()):
+            lines.append(f"\\{line.strip()}")
+        else:
+            lines.append(escape(line.lstrip()))
+    return "\n".join(lines)
+
+
+def _indent(text: str, width: int) -> str:
+    """Indent every non-blank line of text"""
+    return "\n".join(" " * width + line if line.strip() else "" for line in text.splitlines())
@@ -0,0 +1,11 @@
+"""The doctopi.ir package persists the doctopi types, the intermediate
+representation (IR) between the parsers and the formatters. Source code
+can be parsed once, dumped, and rendered elsewhere or consumed by other
+tools."""
+from doctopi.ir.loader import load
+from doctopi.ir.serialization import (DumpFormatError, dump_json, dump_jsonl, from_dict,
+                                      load_json, to_dict)
+from doctopi.ir.snapshot import Snapshot, SnapshotCache, SnapshotWriter, dump_snapshot
+
+__all__ = ["load", "DumpFormatError", "dump_json", "dump_jsonl", "from_dict", "load_json",
+           "to_dict", "Snapshot", "SnapshotCache", "SnapshotWriter", "dump_snapshot"]
@@ -0,0 +1,309 @@
+"""Measure how well parsed documentation is documented: which public
+modules, classes, functions and methods have a docstring, and which
+functions' docstrings disagree with their signatures. The report is
+collected from the documentation already parsed for the Markdown, so it
+costs a walk over the parsed files rather than a second parse.
+
+    missing     public symbol without a docstring summary
+    args        argument in the signature, missing from the docstring
+    unknown     argument in the docstring, missing from the signature
+    returns     annotated return type, but no Returns section
+"""
+# Built-in imports
+from __future__ import annotations
+import ast
+from dataclasses import dataclass, field
+import json
+import os
+from typing import (Any, Dict, List, Optional, TextIO, Tuple, Union)
+
+# This package imports
+from doctopi.ir.symbols import iter_modules, iter_public_symbols
+from doctopi.types import (DocDir, DocFile, Docstring, FunctionDeclaration)
+
+KINDS = ("module", "class", "function", "method")
+"""Kinds of symbols"""
+
+_IMPLICIT_ARGS = ("self", "cls")
+
+
+@dataclass
+class CoverageIssue:
+    """A public symbol which isn't fully documented
+
+    Attributes:
+        symbol (str): qualified name of the symbol
+        issue (str): one of "missing", "args", "unknown" or "returns"
+        detail (str): the arguments or return type, if any
+    """
+    symbol: str
+    issue: str
+    detail: str = ""
+
+
+@dataclass
+class FileCoverage:
+    """Documentation coverage of a source file
+
+    Attributes:
+        path (str): source file path
+        module (str): qualified module name
+        documented (Dict[str, int]): number of documented public
+            symbols of each kind
+        symbols (Dict[str, int]): number of public symbols of each kind
+        issues (List[CoverageIssue]): symbols which aren't fully
+            documented
+    """
+    path: str
+    module: str
+    documented: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(KINDS, 0))
+    symbols: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(KINDS, 0))
+    issues: List[CoverageIssue] = field(default_factory=list)
+
+    @property
+    def package(self) -> str:
+        """Qualified name of the package containing the file"""
+        return self.module.rpartition(".")[0]
+
+    def add(self, kind: str, qualname: str, docstring: Optional[Docstring]):
+        """Count a public symbol, recording an issue if it has no
+        docstring summary
+
+        Args:
+            kind (str): one of KINDS
+            qualname (str): qualified name of the symbol
+            docstring (Optional[Docstring]): the symbol's docstring
+        """
+        self.symbols[kind] += 1
+        if docstring is not None and docstring.summary:
+            self.documented[kind] += 1
+        else:
+            self.issues.append(CoverageIssue(qualname, "missing"))
+
+
+class CoverageReport:
+    """Documentation coverage of parsed source files, by file and package
+
+    Attributes:
+        files (Dict[str, FileCoverage]): map of source file path to its
+            coverage, in the order the files were added
+    """
+
+    def __init__(self):
+        """Constructor"""
+        self.files: Dict[str, FileCoverage] = {}
+
+    def add(self, docs: Union[DocDir, DocFile], package: str = None) -> CoverageReport:
+        """Measure the coverage of each file in parsed documentation. A
+        file added again replaces its previous coverage.
+
+        Args:
+            docs (Union[DocDir, DocFile]): parsed source directory or file
+            package (str, optional): qualified name of the package
+                containing `docs`. Defaults to the root directory name.
+
+        Returns:
+            CoverageReport: This CoverageReport
+        """
+        for module, doc_file in iter_modules(docs, package):
+            self.add_file(doc_file, module)
+        return self
+
+    def add_file(self, doc_file: DocFile, module: str) -> FileCoverage:
+        """Measure the coverage of a parsed file
+
+        Args:
+            doc_file (DocFile): parsed source file
+            module (str): qualified module name
+
+        Returns:
+            FileCoverage: the file's coverage
+        """
+        coverage = FileCoverage(os.fsdecode(doc_file.path), module)
+        coverage.add("module", module, doc_file.docstring)
+
+        for qualname, kind, declaration in iter_public_symbols(module, doc_file):
+            coverage.add(kind, qualname, declaration.docstring)
+            if kind != "class":
+                coverage.issues.extend(function_issues(qualname, declaration))
+
+        self.files[coverage.path] = coverage
+        return coverage
+
+    def packages(self) -> Dict[str, Dict[str, int]]:
+        """Sum the coverage of each package's files
+
+        Returns:
+            Dict[str, Dict[str, int]]: map of qualified package name to
+                its number of documented and public symbols
+        """
+        packages = {}
+        for coverage in self.files.values():
+            totals = packages.setdefault(coverage.package, {"documented": 0, "symbols": 0})
+            totals["documented"] += sum(coverage.documented.values())
+            totals["symbols"] += sum(coverage.symbols.values())
+        return dict(sorted(packages.items()))
+
+    def totals(self) -> Dict[str, Dict[str, int]]:
+        """Sum the coverage of every file, by kind of symbol
+
+        Returns:
+            Dict[str, Dict[str, int]]: map of kind to its number of
+                documented and public symbols
+        """
+        return {kind: {"documented": sum(coverage.documented[kind]
+                                         for coverage in self.files.values()),
+                       "symbols": sum(coverage.symbols[kind] for coverage in self.files.values())}
+                for kind in KINDS}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the report to plain JSON-compatible python objects
+
+        Returns:
+            Dict[str, Any]: totals by kind, packages and files
+        """
+        return {
+            "totals": {kind: dict(counts, coverage=_ratio(counts))
+                       for kind, counts in self.totals().items()},
+            "packages": {package: dict(counts, coverage=_ratio(counts))
+                         for package, counts in self.packages().items()},
+            "files": [{"path": coverage.path,
+                       "module": coverage.module,
+                       "documented": coverage.documented,
+                       "symbols": coverage.symbols,
+                       "issues": [vars(issue) for issue in coverage.issues]}
+                      for coverage in self.files.values()]
+        }
+
+    def to_markdown(self) -> str:
+        """Render the report as Markdown: coverage by kind and package,
+        then each file's issues
+
+        Returns:
+            str: the Markdown report
+        """
+        lines = ["# Documentation Coverage", "",
+                 "|Kind|Documented|Public|Coverage|", "| :--- | ---: | ---: | ---: |"]
+        lines.extend(f"|{kind}|{counts['documented']}|{counts['symbols']}|{_percent(counts)}|"
+                     for kind, counts in self.totals().items())
+
+        lines.extend(["", "## Packages", "",
+                      "|Package|Documented|Public|Coverage|", "| :--- | ---: | ---: | ---: |"])
+        lines.extend(f"|{package or '-'}|{counts['documented']}|{counts['symbols']}|"
+                     f"{_percent(counts)}|" for package, counts in self.packages().items())
+
+        lines.extend(["", "## Issues"])
+        for coverage in self.files.values():
+            if coverage.issues:
+                lines.extend(["", f"### {coverage.module}", ""])
+                lines.extend(f"- `{issue.symbol}` {_describe(issue)}" for issue in coverage.issues)
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, fp: TextIO, fmt: str = "json"):
+        """Write the report
+
+        Args:
+            fp (TextIO): file-like object to write to
+            fmt (str, optional): "json" or "markdown". Defaults to "json".
+        """
+        if fmt == "json":
+            json.dump(self.to_dict(), fp, indent=2)
+        else:
+            fp.write(self.to_markdown())
+
+
+def function_issues(qualname: str, function: FunctionDeclaration) -> List[CoverageIssue]:
+    """Compare a documented function's docstring with its signature.
+    Only Python signatures are compared.
+
+    Args:
+        qualname (str): qualified name of the function
+        function (FunctionDeclaration): parsed function
+
+    Returns:
+        List[CoverageIssue]: the undocumented and unknown arguments, and
+            the undocumented return type
+    """
+    docstring = function.docstring
+    parts = signature_parts(qualname, function.signature)
+    if not docstring or not docstring.summary or parts is None:
+        return []
+
+    issues = []
+    args, returns = parts
+    documented = [arg.name.lstrip("*") for arg in docstring.args if arg.name]
+    missing = [arg for arg in args if arg not in documented]
+    unknown = [arg for arg in documented if arg not in args]
+    if missing:
+        issues.append(CoverageIssue(qualname, "args", ", ".join(missing)))
+    if unknown:
+        issues.append(CoverageIssue(qualname, "unknown", ", ".join(unknown)))
+
+    if returns not in ("", "None") and not docstring.returns \
+            and function.name != "__init__":
+        issues.append(CoverageIssue(qualname, "returns", returns))
+
+    return issues
+
+
+def signature_parts(qualname: str, signature: str) -> Optional[Tuple[List[str], str]]:
+    """Get the arguments and return annotation of a Python function
+    signature, e.g. `def f(a: int) -> str:`
+
+    Args:
+        qualname (str): qualified name of the function
+        signature (str): function signature
+
+    Returns:
+        Optional[Tuple[List[str], str]]: names of the arguments, without
+            the implicit `self` or `cls` of a method, and the return
+            annotation or "", or None if it isn't a Python signature
+    """
+    node = _parse_signature(signature)
+    if node is None:
+        return None
+
+    args = [arg.arg for arg in node.args.posonlyargs + node.args.args + node.args.kwonlyargs]
+    if args and args[0] in _IMPLICIT_ARGS and "." in qualname:
+        args = args[1:]
+    args.extend(arg.arg for arg in (node.args.vararg, node.args.kwarg) if arg)
+    return args, ast.unparse(node.returns) if node.returns else ""
+
+
+def _parse_signature(signature: str) -> Optional[ast.FunctionDef]:
+    """Parse a Python function signature, e.g. `def f(a: int) -> str:`
+
+    Args:
+        signature (str): function signature
+
+    Returns:
+        Optional[ast.FunctionDef]: the parsed function, or None if it
+            isn't a Python signature
+    """
+    try:
+        node = ast.parse(f"{signature.strip()}\n    pass").body[0]
+    except (SyntaxError, IndexError, ValueError):
+        return None
+    return node if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) else None
+
+
+def _ratio(counts: Dict[str, int]) -> float:
+    """Get the documented fraction of symbols, 1.0 if there are none"""
+    return round(counts["documented"] / counts["symbols"], 4) if counts["symbols"] else 1.0
+
+
+def _percent(counts: Dict[str, int]) -> str:
+    """Format the documented fraction of symbols as a percentage"""
+    return f"{_ratio(counts):.0%}"
+
+
+def _describe(issue: CoverageIssue) -> str:
+    """Describe an issue in the Markdown report"""
+    if issue.issue == "missing":
+        return "has no docstring"
+    if issue.issue == "args":
+        return f"doesn't document {issue.detail}"
+    if issue.issue == "unknown":
+        return f"documents {issue.detail}, which aren't arguments"
+    return f"doesn't document its return ({issue.detail})"
@@ -0,0 +1,374 @@
+"""Persistent SQLite database of the symbols in parsed documentation,
+for quick lookups without parsing the source code again, e.g. "which
+public functions have no Returns section" or "where is class X
+declared". Each module, class, function, argument and raise is a row.
+
+    files      path, qualified module name and digest of each source file
+    symbols    qualified name, name, kind, access, signature, summary and
+               return of each module, class and function, and the return
+               annotation of Python functions, indexed by qualified name,
+               name, file and access
+    parameters name of each argument in a Python function's signature
+    arguments  name, type and description of each documented argument
+    raises     type and description of each documented raise
+
+Updates are incremental: source files are hashed, and only the rows of
+files which changed since the last update are replaced.
+"""
+# Built-in imports
+from __future__ import annotations
+from dataclasses import dataclass
+import os
+import sqlite3
+from typing import (Dict, Iterator, Tuple, Union)
+
+# This package imports
+from doctopi.ir.coverage import signature_parts
+from doctopi.ir.symbols import iter_symbols, module_name
+from doctopi.parser import Parser
+from doctopi.parser.cache import file_digest
+from doctopi.types import (ClassDeclaration, DocFile, Docstring)
+
+SCHEMA_VERSION = 2
+"""Version of the database schema. Incremented on incompatible changes."""
+
+KINDS = ("module", "class", "function", "method")
+"""Kinds of symbols"""
+
+MISSING = ("summary", "args", "returns", "raises")
+"""Docstring sections which can be queried for being missing"""
+
+_SCHEMA = """
+CREATE TABLE files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    module TEXT NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE TABLE symbols (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    qualname TEXT NOT NULL,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    access TEXT,
+    signature TEXT,
+    summary TEXT NOT NULL,
+    returns_type TEXT,
+    returns_description TEXT,
+    returns_annotation TEXT
+);
+CREATE TABLE parameters (
+    symbol_id INTEGER NOT NULL REFERENCES symbols(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE TABLE arguments (
+    symbol_id INTEGER NOT NULL REFERENCES symbols(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    description TEXT NOT NULL
+);
+CREATE TABLE raises (
+    symbol_id INTEGER NOT NULL REFERENCES symbols(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    description TEXT NOT NULL
+);
+CREATE INDEX symbols_qualname ON symbols(qualname);
+CREATE INDEX symbols_name ON symbols(name);
+CREATE INDEX symbols_file ON symbols(file_id);
+CREATE INDEX symbols_access ON symbols(access, kind);
+CREATE INDEX parameters_symbol ON parameters(symbol_id);
+CREATE INDEX arguments_symbol ON arguments(symbol_id);
+CREATE INDEX raises_symbol ON raises(symbol_id);
+"""
+
+
+@dataclass
+class Symbol:
+    """A symbol found in a SymbolDatabase
+
+    Attributes:
+        qualname (str): qualified name, e.g. `package.module.Class`
+        kind (str): "module", "class", "function" or "method"
+        access (str): "public", "protected" or "private", or None for
+            modules and classes
+        path (str): absolute path of the source file declaring it
+        signature (str): declaration signature, or None for modules
+        summary (str): docstring summary
+    """
+    qualname: str
+    kind: str
+    access: str
+    path: str
+    signature: str
+    summary: str
+
+
+class SymbolDatabase:
+    """SQLite database of the symbols in parsed source files
+
+    Attributes:
+        path (Union[str, bytes, os.PathLike]): database file, created if
+            it doesn't exist
+        connection (sqlite3.Connection): open connection to the database
+    """
+
+    def __init__(self, path: Union[str, bytes, os.PathLike]):
+        """Constructor. Opens the database, creating it if it doesn't
+        exist.
+
+        Args:
+            path (Union[str, bytes, os.PathLike]): database file
+
+        Raises:
+            ValueError: If the file is a database of another schema
+                version
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version == 0:
+            with self.connection:
+                self.connection.executescript(_SCHEMA)
+                self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        elif version != SCHEMA_VERSION:
+            self.connection.close()
+            raise ValueError(f"'{os.fsdecode(path)}' is a version {version} symbol database, "
+                             f"expected version {SCHEMA_VERSION}")
+
+    def __enter__(self) -> SymbolDatabase:
+        """Use the database as a context manager, closing it on exit"""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the database"""
+        self.close()
+
+    def close(self):
+        """Close the connection to the database"""
+        self.connection.close()
+
+    def update(self, src: Union[str, bytes, os.PathLike], parser: Parser) -> Tuple[int, int]:
+        """Bring the database up to date with a source file or directory.
+        Only files which changed since the last update are parsed, and
+        the rows of files which no longer exist are deleted.
+
+        Args:
+            src (Union[str, bytes, os.PathLike]): Source file or
+                directory
+            parser (Parser): Parser of the source files
+
+        Returns:
+            Tuple[int, int]: number of files parsed, and of files deleted
+        """
+        # pylint: disable-next = import-outside-toplevel
+        from doctopi.parser.walker import DirectoryWalker
+
+        root = os.path.abspath(src)
+        stored = self.digests(root)
+        salt = parser.configuration()
+        parsed = 0
+
+        with self.connection:
+            for path in DirectoryWalker(parser).iter_sources(src):
+                digest = file_digest(path, salt)
+                if stored.pop(path, None) != digest:
+                    self.add_file(parser.parse_file(path), _package(root, path), digest)
+                    parsed += 1
+
+            # Whatever wasn't walked was deleted
+            self.connection.executemany("DELETE FROM files WHERE path = ?",
+                                        [(path,) for path in stored])
+
+        return parsed, len(stored)
+
+    def digests(self, root: str) -> Dict[str, str]:
+        """Get the digests of the stored source files under a directory
+
+        Args:
+            root (str): absolute path of a source file or directory
+
+        Returns:
+            Dict[str, str]: map of source file path to digest
+        """
+        prefix = root.rstrip(os.sep) + os.sep
+        return dict(self.connection.execute(
+            "SELECT path, digest FROM files WHERE path = ? OR substr(path, 1, ?) = ?",
+            (root, len(prefix), prefix)))
+
+    def add_file(self, doc_file: DocFile, package: str = "", digest: str = ""):
+        """Add the symbols of a parsed file, replacing the file's previous
+        rows. Call within a transaction, e.g. `with database.connection`.
+
+        Args:
+            doc_file (DocFile): parsed source file
+            package (str, optional): qualified name of the package
+                containing the file. Defaults to "".
+            digest (str, optional): digest of the source file contents.
+                Defaults to "".
+        """
+        path = os.fsdecode(doc_file.path)
+        module = module_name(doc_file, package)
+        self.connection.execute("DELETE FROM files WHERE path = ?", (path,))
+        file_id = self.connection.execute(
+            "INSERT INTO files (path, module, digest) VALUES (?, ?, ?)",
+            (path, module, digest)).lastrowid
+
+        self._add_symbol(file_id, module, "module", None, None, doc_file.docstring)
+        for qualname, declaration in iter_symbols(module, doc_file):
+            if isinstance(declaration, ClassDeclaration):
+                self._add_symbol(file_id, qualname, "class", None, declaration.signature,
+                                 declaration.docstring)
+            else:
+                kind = "function" if qualname.rsplit(".", 1)[0] == module else "method"
+                self._add_symbol(file_id, qualname, kind, declaration.access.name.lower(),
+                                 declaration.signature, declaration.docstring)
+
+    # pylint: disable-next = too-many-arguments, too-many-positional-arguments
+    def find(self, pattern: str = None, kind: str = None, access: str = None,
+             path: str = None, missing: str = None) -> Iterator[Symbol]:
+        """Find symbols, ordered by qualified name
+
+        Args:
+            pattern (str, optional): glob pattern of the name, the
+                qualified name or its end, e.g. `Parser.parse_*`.
+                Defaults to None, any name.
+            kind (str, optional): one of KINDS. Defaults to None, any
+                kind.
+            access (str, optional): "public", "protected" or "private".
+                Defaults to None, any access.
+            path (str, optional): source file path, or a directory
+                containing it. Defaults to None, any file.
+            missing (str, optional): one of MISSING, to only find
+                functions and methods (or for "summary", any symbol)
+                whose docstring lacks it. Arguments and returns are only
+                missing from Python functions whose signature has them,
+                like in a coverage report. Defaults to None.
+
+        Raises:
+            ValueError: If the kind or missing section doesn't exist
+
+        Yields:
+            Symbol: each matching symbol
+        """
+        clauses, params = [], []
+        if pattern is not None:
+            clauses.append("(symbols.name GLOB ? OR symbols.qualname GLOB ? "
+                           "OR symbols.qualname GLOB '*.' || ?)")
+            params.extend([pattern, pattern, pattern])
+        if kind is not None:
+            if kind not in KINDS:
+                raise ValueError(f"Unknown kind '{kind}', expected one of {', '.join(KINDS)}")
+            clauses.append("symbols.kind = ?")
+            params.append(kind)
+        if access is not None:
+            clauses.append("symbols.access = ?")
+            params.append(access)
+        if path is not None:
+            root = os.path.abspath(path)
+            prefix = root.rstrip(os.sep) + os.sep
+            clauses.append("(files.path = ? OR substr(files.path, 1, ?) = ?)")
+            params.extend([root, len(prefix), prefix])
+        if missing is not None:
+            clauses.append(_missing_clause(missing))
+
+        query = "SELECT symbols.qualname, symbols.kind, symbols.access, files.path, " \
+                "symbols.signature, symbols.summary " \
+                "FROM symbols JOIN files ON files.id = symbols.file_id"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        for row in self.connection.execute(query + " ORDER BY symbols.qualname", params):
+            yield Symbol(*row)
+
+    # pylint: disable-next = too-many-arguments, too-many-positional-arguments
+    def _add_symbol(self, file_id: int, qualname: str, kind: str, access: str,
+                    signature: str, docstring: Docstring):
+        """Add a symbol with its documented arguments and raises
+
+        Args:
+            file_id (int): row of the source file
+            qualname (str): qualified name
+            kind (str): one of KINDS
+            access (str): access of a function, or None
+            signature (str): declaration signature, or None for modules
+            docstring (Docstring): parsed docstring, or None
+        """
+        docstring = docstring or Docstring()
+        returns = docstring.returns
+        parts = signature_parts(qualname, signature) if kind in ("function", "method") else None
+        parameters, annotation = parts if parts is not None else ([], None)
+        symbol_id = self.connection.execute(
+            "INSERT INTO symbols (file_id, qualname, name, kind, access, signature, summary, "
+            "returns_type, returns_description, returns_annotation) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (file_id, qualname, qualname.rsplit(".", 1)[-1], kind, access, signature,
+             docstring.summary or "", returns.type if returns else None,
+             returns.description if returns else None, annotation)).lastrowid
+
+        self.connection.executemany(
+            "INSERT INTO parameters (symbol_id, position, name) VALUES (?, ?, ?)",
+            [(symbol_id, position, name) for position, name in enumerate(parameters)])
+        self.connection.executemany(
+            "INSERT INTO arguments (symbol_id, position, name, type, description) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(symbol_id, position, arg.name, arg.type or "", arg.description or "")
+             for position, arg in enumerate(docstring.args)])
+        self.connection.executemany(
+            "INSERT INTO raises (symbol_id, position, type, description) VALUES (?, ?, ?, ?)",
+            [(symbol_id, position, raise_.type or raise_.name or "", raise_.description or "")
+             for position, raise_ in enumerate(docstring.raises)])
+
+
+def _missing_clause(missing: str) -> str:
+    """Get the SQL condition of a symbol whose docstring lacks a section
+
+    Args:
+        missing (str): one of MISSING
+
+    Raises:
+        ValueError: If the section doesn't exist
+
+    Returns:
+        str: SQL condition
+    """
+    functions = "symbols.kind IN ('function', 'method')"
+    if missing == "summary":
+        return "symbols.summary = ''"
+    # Like doctopi.ir.coverage.function_issues, only annotated returns and arguments in the
+    # signature are missing
+    if missing == "returns":
+        return f"{functions} AND symbols.returns_type IS NULL " \
+               "AND symbols.returns_annotation NOT IN ('', 'None') AND symbols.name != '__init__'"
+    if missing == "args":
+        return f"{functions} AND EXISTS (SELECT 1 FROM parameters " \
+               "WHERE parameters.symbol_id = symbols.id AND parameters.name NOT IN " \
+               "(SELECT ltrim(arguments.name, '*') FROM arguments " \
+               "WHERE arguments.symbol_id = symbols.id))"
+    if missing == "raises":
+        return f"{functions} AND NOT EXISTS (SELECT 1 FROM raises WHERE symbol_id = symbols.id)"
+    raise ValueError(f"Unknown section '{missing}', expected one of {', '.join(MISSING)}")
+
+
+def _package(root: str, path: str) -> str:
+    """Get the qualified name of the package containing a source file,
+    named after the directories from the root down
+
+    Args:
+        root (str): absolute path of the root source file or directory
+        path (str): absolute path of the source file
+
+    Returns:
+        str: qualified package name, or "" for a single source file
+    """
+    if not os.path.isdir(root):
+        return ""
+    relative = os.path.relpath(os.path.dirname(path), root)
+    parts = [os.path.basename(os.path.normpath(root))]
+    if relative != os.curdir:
+        parts.extend(relative.split(os.sep))
+    return ".".join(parts)
@@ -0,0 +1,494 @@
+"""Compare the public API of two versions of parsed documentation by
+qualified name: the classes, functions and methods added, removed, or
+whose signature or docstring changed. Either version can be a source
+tree, a git ref of one, or a dump. A git ref can be compared with the
+working tree it's read from, named WORKTREE.
+
+Files are matched by their path relative to the root of each version,
+and files whose contents hash the same in both are skipped before
+they're parsed or decoded. Source trees and git refs are both hashed as
+git blobs, so a working tree is compared with a ref without parsing its
+unchanged files.
+"""
+# Built-in imports
+from __future__ import annotations
+import abc
+from dataclasses import dataclass, field
+import hashlib
+import io
+import json
+import os
+from typing import (Any, Dict, Iterator, List, Optional, TextIO, Tuple, Union)
+
+# This package imports
+from doctopi.ir.loader import load
+from doctopi.ir.snapshot import MAGIC, Snapshot
+from doctopi.ir.symbols import iter_public_symbols, module_path_name
+from doctopi.parser import Parser
+from doctopi.parser.cache import ParseCache
+from doctopi.parser.changes import list_blobs, read_blob
+from doctopi.parser.walker import DirectoryWalker
+from doctopi.types import (DocDir, DocFile, Docstring)
+
+# Name of the working tree, instead of a git ref
+WORKTREE = "WORKTREE"
+
+CHANGES = ("added", "removed", "changed")
+"""Kinds of API changes"""
+
+
+@dataclass
+class ApiChange:
+    """A public module, class, function or method which changed
+
+    Attributes:
+        symbol (str): qualified name, relative to the root of the version
+        kind (str): "module", "class", "function" or "method"
+        change (str): one of CHANGES
+        before (str): signature before the change, "" if it was added
+        after (str): signature after the change, "" if it was removed
+        fields (List[str]): what changed, "signature" and/or "docstring"
+    """
+    symbol: str
+    kind: str
+    change: str
+    before: str = ""
+    after: str = ""
+    fields: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ApiDiff:
+    """Changes to the public API between two versions
+
+    Attributes:
+        changes (List[ApiChange]): changed symbols, in the order of their
+            files and declarations
+        compared (int): number of files whose symbols were compared
+        skipped (int): number of files skipped because their contents
+            didn't change
+    """
+    changes: List[ApiChange] = field(default_factory=list)
+    compared: int = 0
+    skipped: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the diff to plain JSON-compatible python objects
+
+        Returns:
+            Dict[str, Any]: file counts, and the changes of each kind
+        """
+        return {"compared": self.compared,
+                "skipped": self.skipped,
+                **{change: [{key: value for key, value in vars(api_change).items()
+                             if key != "change"}
+                            for api_change in self.changes if api_change.change == change]
+                   for change in CHANGES}}
+
+    def to_markdown(self) -> str:
+        """Render the diff as Markdown release notes
+
+        Returns:
+            str: the Markdown report
+        """
+        lines = ["# API Changes", "",
+                 f"{self.compared} files compared, {self.skipped} unchanged files skipped."]
+
+        for change in CHANGES:
+            api_changes = [api_change for api_change in self.changes if api_change.change == change]
+            if not api_changes:
+                continue
+
+            lines.extend(["", f"## {change.capitalize()}", ""])
+            for api_change in api_changes:
+                lines.append(f"- `{api_change.symbol}` ({api_change.kind})")
+                if "signature" in api_change.fields and api_change.before and api_change.after:
+                    lines.extend(["", "  ```diff", f"  - {api_change.before}",
+                                  f"  + {api_change.after}", "  ```", ""])
+                elif "docstring" in api_change.fields:
+                    lines[-1] += ": docstring changed"
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, fp: TextIO, fmt: str = "markdown"):
+        """Write the diff
+
+        Args:
+            fp (TextIO): file-like object to write to
+            fmt (str, optional): "json" or "markdown". Defaults to
+                "markdown".
+        """
+        if fmt == "json":
+            json.dump(self.to_dict(), fp, indent=2)
+        else:
+            fp.write(self.to_markdown())
+
+
+class ApiTree(abc.ABC):
+    """A version of the documentation to compare: its files by relative
+    path, each with a digest of its contents, parsed only on request
+    """
+
+    @abc.abstractmethod
+    def digests(self) -> Dict[str, Optional[str]]:
+        """Get the digest of each file's contents
+
+        Returns:
+            Dict[str, Optional[str]]: map of "/" separated path relative
+                to the root to the digest, or None if it's unknown
+        """
+
+    @abc.abstractmethod
+    def get_file(self, path: str) -> DocFile:
+        """Get a parsed file
+
+        Args:
+            path (str): "/" separated path relative to the root
+
+        Returns:
+            DocFile: the parsed file
+        """
+
+
+class SourceTree(ApiTree):
+    """A source file or directory, parsed through an optional cache
+
+    Attributes:
+        src (str): absolute path of the source file or directory
+        parser (Parser): Parser of the source files
+        cache (ParseCache): Cache of parsed source files. Default is None.
+    """
+
+    def __init__(self, src: Union[str, bytes, os.PathLike], parser: Parser,
+                 cache: ParseCache = None):
+        """Constructor
+
+        Args:
+            src (Union[str, bytes, os.PathLike]): Source file or directory
+            parser (Parser): Parser of the source files
+            cache (ParseCache, optional): Cache of parsed source files.
+                Defaults to None.
+        """
+        self.src = os.path.abspath(os.fsdecode(src))
+        self.parser = parser
+        self.cache = cache
+
+    def digests(self) -> Dict[str, Optional[str]]:
+        """Hash each source file as a git blob
+
+        Returns:
+            Dict[str, Optional[str]]: map of "/" separated path relative
+                to the root to the digest
+        """
+        digests = {}
+        for path in DirectoryWalker(self.parser).iter_sources(self.src):
+            with open(path, "rb") as source:
+                digests[self._relpath(path)] = _blob_digest(source.read())
+        return digests
+
+    def get_file(self, path: str) -> DocFile:
+        """Parse a source file, unless it's cached
+
+        Args:
+            path (str): "/" separated path relative to the root
+
+        Returns:
+            DocFile: the parsed file
+        """
+        full_path = self.src if os.path.isfile(self.src) \
+            else os.path.join(self.src, *path.split("/"))
+        return DirectoryWalker(self.parser, self.cache).parse_file(full_path)
+
+    def _relpath(self, path: str) -> str:
+        """Get a source file's path relative to the root"""
+        if os.path.isfile(self.src):
+            return os.path.basename(path)
+        return os.path.relpath(path, self.src).replace(os.sep, "/")
+
+
+class GitTree(ApiTree):
+    """A source file or directory at a git ref, read without checking it
+    out. The parser must support Parser.parse_stream.
+
+    Attributes:
+        ref (str): git ref, e.g. "v1.0"
+        src (str): absolute path of the source file or directory in the
+            working tree
+        parser (Parser): Parser of the source files
+    """
+
+    def __init__(self, ref: str, src: Union[str, bytes, os.PathLike], parser: Parser):
+        """Constructor
+
+        Args:
+            ref (str): git ref, e.g. "v1.0"
+            src (Union[str, bytes, os.PathLike]): Source file or directory
+                in the working tree
+            parser (Parser): Parser of the source files
+        """
+        self.ref = ref
+        self.src = os.path.abspath(os.fsdecode(src))
+        self.parser = parser
+        self._blobs: Dict[str, str] = None
+
+    def digests(self) -> Dict[str, Optional[str]]:
+        """Get the object ID of each source file at the ref
+
+        Returns:
+            Dict[str, Optional[str]]: map of "/" separated path relative
+                to the root to the digest
+        """
+        if self._blobs is None:
+            self._blobs = {}
+            for path, blob in list_blobs(self.ref, self.src).items():
+                with io.BufferedReader(_BlobReader(self.src, blob)) as stream:
+                    if self.parser.accepts_stream(path, stream):
+                        self._blobs[path] = blob
+        return {path: f"blob:{blob}" for path, blob in self._blobs.items()}
+
+    def get_file(self, path: str) -> DocFile:
+        """Parse a source file at the ref
+
+        Args:
+            path (str): "/" separated path relative to the root
+
+        Returns:
+            DocFile: the parsed file
+        """
+        data = read_blob(self.src, self.digests()[path].split(":", 1)[1])
+        full_path = self.src if os.path.isfile(self.src) \
+            else os.path.join(self.src, *path.split("/"))
+        return self.parser.parse_stream(io.StringIO(data.decode("utf-8")), full_path)
+
+
+class _BlobReader(io.RawIOBase):
+    """A file at a git ref, only read from git once it's read, so files
+    accepted by their path alone aren't read"""
+
+    def __init__(self, src: str, blob: str):
+        """Constructor
+
+        Args:
+            src (str): Source file or directory in the git repository
+            blob (str): object ID of the file's contents
+        """
+        super().__init__()
+        self.src = src
+        self.blob = blob
+        self._data: io.BytesIO = None
+
+    def readable(self) -> bool:
+        """The file is readable"""
+        return True
+
+    def readinto(self, buffer: bytearray) -> int:
+        """Read the file from git the first time, then into the buffer"""
+        if self._data is None:
+            self._data = io.BytesIO(read_blob(self.src, self.blob))
+        return self._data.readinto(buffer)
+
+
+class DumpTree(ApiTree):
+    """A dump written by the dump command, or a snapshot written by
+    markdown --cache. Snapshots are decoded lazily, and their files are
+    compared by the digest they were cached with.
+
+    Attributes:
+        path (str): dump file
+    """
+
+    def __init__(self, path: Union[str, bytes, os.PathLike]):
+        """Constructor
+
+        Args:
+            path (Union[str, bytes, os.PathLike]): dump file
+        """
+        self.path = os.fsdecode(path)
+        self._snapshot: Snapshot = None
+        self._files: Dict[str, Union[str, DocFile]] = {}
+
+        with open(self.path, "rb") as dump_file:
+            is_snapshot = dump_file.read(len(MAGIC)) == MAGIC
+
+        if is_snapshot:
+            # Files are named by their source path, relative to the root when there is one
+            self._snapshot = Snapshot(self.path)
+            paths = list(self._snapshot.paths())
+            root = self._snapshot.root()
+            top = os.fsdecode(root.path) if isinstance(root, DocDir) else \
+                os.path.commonpath([os.path.dirname(path) for path in paths]) if paths else ""
+            self._files = {os.path.relpath(path, top).replace(os.sep, "/"): path
+                           for path in paths}
+        else:
+            self._files = dict(_iter_dump_files(load(self.path)))
+
+    def digests(self) -> Dict[str, Optional[str]]:
+        """Get the digest each file was cached with, if it's a snapshot
+
+        Returns:
+            Dict[str, Optional[str]]: map of "/" separated path relative
+                to the root to the digest, or None for JSON dumps
+        """
+        if self._snapshot is None:
+            return dict.fromkeys(self._files)
+
+        return {path: f"parse:{self._snapshot.digest(source)}"
+                if self._snapshot.digest(source) else None
+                for path, source in self._files.items()}
+
+    def get_file(self, path: str) -> DocFile:
+        """Get a file from the dump
+
+        Args:
+            path (str): "/" separated path relative to the root
+
+        Returns:
+            DocFile: the parsed file
+        """
+        if self._snapshot is None:
+            return self._files[path]
+        return self._snapshot.get_file(self._files[path])
+
+
+def open_tree(spec: str, parser: Parser, git: str = None, cache: ParseCache = None) -> ApiTree:
+    """Open a version to compare: a git ref of a source tree, a dump, or
+    a source file or directory
+
+    Args:
+        spec (str): git ref if `git` is provided, or a dump, source file
+            or directory. WORKTREE, or "", opens `git` itself.
+        parser (Parser): Parser of the source files
+        git (str, optional): Source file or directory in a git working
+            tree, whose version at the ref `spec` is opened. Defaults to
+            None.
+        cache (ParseCache, optional): Cache of parsed source files.
+            Defaults to None.
+
+    Returns:
+        ApiTree: the version to compare
+    """
+    if git is not None:
+        # The working tree is hashed like the ref's blobs, so unchanged files aren't parsed
+        if spec in ("", WORKTREE):
+            return SourceTree(git, parser, cache)
+        return GitTree(spec, git, parser)
+    if os.path.isfile(spec) and not spec.endswith(parser.extensions):
+        return DumpTree(spec)
+    return SourceTree(spec, parser, cache)
+
+
+def diff_trees(before: ApiTree, after: ApiTree) -> ApiDiff:
+    """Compare the public API of two versions by qualified name. Files
+    whose digests are the same in both versions are skipped without
+    being parsed.
+
+    Args:
+        before (ApiTree): the older version
+        after (ApiTree): the newer version
+
+    Returns:
+        ApiDiff: the changes from `before` to `after`
+    """
+    before_digests, after_digests = before.digests(), after.digests()
+    api_diff = ApiDiff()
+
+    for path in sorted(before_digests.keys() | after_digests.keys()):
+        digest = before_digests.get(path)
+        if digest is not None and digest == after_digests.get(path):
+            api_diff.skipped += 1
+            continue
+
+        module = module_path_name(path)
+        old = _public_api(module, before.get_file(path)) if path in before_digests else {}
+        new = _public_api(module, after.get_file(path)) if path in after_digests else {}
+        api_diff.changes.extend(diff_symbols(old, new))
+        api_diff.compared += 1
+
+    return api_diff
+
+
+def diff_symbols(before: Dict[str, Tuple[str, str, Optional[Docstring]]],
+                 after: Dict[str, Tuple[str, str, Optional[Docstring]]]) -> List[ApiChange]:
+    """Compare the public symbols of a file in two versions
+
+    Args:
+        before (Dict[str, Tuple[str, str, Optional[Docstring]]]): map of
+            qualified name to kind, signature and docstring of the older
+            version's symbols
+        after (Dict[str, Tuple[str, str, Optional[Docstring]]]): the
+            same, of the newer version's symbols
+
+    Returns:
+        List[ApiChange]: the removed and changed symbols in the order
+            they were declared, followed by the added symbols
+    """
+    changes = []
+    for symbol, (kind, signature, docstring) in before.items():
+        if symbol not in after:
+            changes.append(ApiChange(symbol, kind, "removed", before=signature))
+            continue
+
+        _, new_signature, new_docstring = after[symbol]
+        fields = [name for name, changed in [("signature", signature != new_signature),
+                                             ("docstring", docstring != new_docstring)]
+                  if changed]
+        if fields:
+            changes.append(ApiChange(symbol, kind, "changed", signature, new_signature, fields))
+
+    changes.extend(ApiChange(symbol, kind, "added", after=signature)
+                   for symbol, (kind, signature, _) in after.items() if symbol not in before)
+    return changes
+
+
+def _public_api(module: str,
+                doc_file: DocFile) -> Dict[str, Tuple[str, str, Optional[Docstring]]]:
+    """Collect the public symbols of a parsed file
+
+    Args:
+        module (str): qualified module name
+        doc_file (DocFile): parsed source file
+
+    Returns:
+        Dict[str, Tuple[str, str, Optional[Docstring]]]: map of qualified
+            name to kind, signature and docstring, in declaration order
+    """
+    symbols = {module: ("module", "", doc_file.docstring)}
+    for qualname, kind, declaration in iter_public_symbols(module, doc_file):
+        symbols[qualname] = (kind, declaration.signature, declaration.docstring)
+    return symbols
+
+
+def _iter_dump_files(docs: Union[DocDir, DocFile],
+                     prefix: str = "") -> Iterator[Tuple[str, DocFile]]:
+    """Iterate over the files of a loaded dump by relative path
+
+    Args:
+        docs (Union[DocDir, DocFile]): loaded dump
+        prefix (str, optional): relative path of `docs`. Defaults to "".
+
+    Yields:
+        Tuple[str, DocFile]: "/" separated path relative to the root,
+            and the parsed file
+    """
+    if isinstance(docs, DocFile):
+        yield os.path.basename(os.fsdecode(docs.path)), docs
+        return
+
+    for doc_file in docs.files:
+        yield prefix + os.path.basename(os.fsdecode(doc_file.path)), doc_file
+    for subdir in docs.subdirs:
+        yield from _iter_dump_files(subdir, f"{prefix}{subdir.name}/")
+
+
+def _blob_digest(data: bytes) -> str:
+    """Hash a file's contents the way git names a blob
+
+    Args:
+        data (bytes): file contents
+
+    Returns:
+        str: "blob:" and the object ID
+    """
+    # git's object IDs are SHA-1, not used for security here
+    return "blob:" + hashlib.sha1(b"blob %d\0" % len(data) + data,  # nosec
+                                  usedforsecurity=False).hexdigest()
@@ -0,0 +1,36 @@
+"""Load any kind of doctopi dump, detecting its format."""
+# Built-in imports
+import os
+from typing import Union
+
+# This package imports
+from doctopi.ir.serialization import DumpFormatError, load_json
+from doctopi.ir.snapshot import MAGIC, Snapshot
+from doctopi.types import (DocDir, DocFile)
+
+
+def load(path: Union[str, bytes, os.PathLike]) -> Union[DocDir, DocFile]:
+    """Load a JSON, JSON Lines, or binary snapshot dump from disk.
+    Snapshots are memory-mapped, and their files are decoded when
+    accessed.
+
+    Args:
+        path (Union[str, bytes, os.PathLike]): dump file created by
+            `dump_json`, `dump_jsonl` or `dump_snapshot`
+
+    Raises:
+        DumpFormatError: If the file isn't a doctopi dump
+
+    Returns:
+        Union[DocDir, DocFile]: root of the parsed documentation
+    """
+    with open(path, "rb") as dump_file:
+        is_snapshot = dump_file.read(len(MAGIC)) == MAGIC
+
+    if not is_snapshot:
+        return load_json(path)
+
+    root = Snapshot(path).root()
+    if root is None:
+        raise DumpFormatError(f"Snapshot '{path}' only contains cached files")
+    return root
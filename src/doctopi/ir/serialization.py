@@ -0,0 +1,303 @@
+"""Serialize the doctopi types to JSON or JSON Lines, and load them
+back. A dump lets other tools consume the parsed source code without
+scraping Markdown, and lets the formatters render documentation without
+parsing any source code.
+
+A JSON dump is a single document:
+
+    {"doctopi": 1, "root": {"kind": "dir", ...}}
+
+A JSON Lines dump starts with a header record, followed by one record
+per directory and one record per file, so it can be written and read as
+a stream:
+
+    {"kind": "header", "doctopi": 1}
+    {"kind": "dir", "name": ..., "path": ..., "parent": null}
+    {"kind": "file", "dir": ..., "name": ..., "path": ..., ...}
+"""
+# Built-in imports
+import dataclasses
+from enum import Enum
+import json
+import os
+from typing import (Any, Dict, IO, Iterator, Optional, Union)
+
+# This package imports
+from doctopi.types import (AccessType, ClassDeclaration, DocDir, DocFile, Docstring,
+                           FunctionDeclaration, NameDescriptionType)
+
+FORMAT_VERSION = 1
+"""Version of the dump format. Incremented on incompatible changes."""
+
+
+class DumpFormatError(Exception):
+    """The provided dump could not be loaded"""
+
+
+def to_dict(obj: Any) -> Any:
+    """Convert a doctopi type into plain JSON-compatible python objects
+
+    Args:
+        obj (Any): doctopi type (DocDir, DocFile, ClassDeclaration, etc.)
+            or a list of them.
+
+    Returns:
+        Any: dicts, lists, strings and None mirroring the doctopi type.
+            DocDir and DocFile dicts are tagged with a "kind" key.
+    """
+    if isinstance(obj, (DocDir, DocFile)):
+        data = {"kind": "dir" if isinstance(obj, DocDir) else "file"}
+        data.update({field.name: to_dict(getattr(obj, field.name))
+                     for field in dataclasses.fields(obj)})
+        return data
+
+    if dataclasses.is_dataclass(obj):
+        return {field.name: to_dict(getattr(obj, field.name))
+                for field in dataclasses.fields(obj)}
+
+    if isinstance(obj, Enum):
+        return obj.name
+
+    if isinstance(obj, (list, tuple)):
+        return [to_dict(item) for item in obj]
+
+    if isinstance(obj, (bytes, os.PathLike)):
+        return os.fsdecode(obj)
+
+    return obj
+
+
+def from_dict(data: Dict[str, Any]) -> Union[DocDir, DocFile]:
+    """Convert a dict created by `to_dict` back into a DocDir or DocFile
+
+    Args:
+        data (Dict[str, Any]): dict tagged with a "kind" of "dir" or
+            "file"
+
+    Raises:
+        DumpFormatError: If the dict isn't a directory or file
+
+    Returns:
+        Union[DocDir, DocFile]: doctopi representation of the dict
+    """
+    try:
+        if data["kind"] == "dir":
+            return _dir_from_dict(data)
+        if data["kind"] == "file":
+            return _file_from_dict(data)
+    except (KeyError, TypeError, ValueError) as exc:
+        raise DumpFormatError(f"Malformed {data.get('kind', 'unknown')} record") from exc
+
+    raise DumpFormatError(f"Unknown record kind '{data['kind']}'")
+
+
+def dump_json(docs: Union[DocDir, DocFile], fp: IO[str]):
+    """Write parsed documentation as a single JSON document
+
+    Args:
+        docs (Union[DocDir, DocFile]): parsed source directory or file
+        fp (IO[str]): writable text stream
+    """
+    json.dump({"doctopi": FORMAT_VERSION, "root": to_dict(docs)}, fp)
+
+
+def dump_jsonl(docs: Union[DocDir, DocFile], fp: IO[str]):
+    """Write parsed documentation as JSON Lines, one record per
+    directory and per file
+
+    Args:
+        docs (Union[DocDir, DocFile]): parsed source directory or file
+        fp (IO[str]): writable text stream
+    """
+    fp.write(json.dumps({"kind": "header", "doctopi": FORMAT_VERSION}) + "\n")
+    for record in iter_records(docs):
+        fp.write(json.dumps(record) + "\n")
+
+
+def iter_records(docs: Union[DocDir, DocFile],
+                 parent: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Flatten parsed documentation into JSON Lines records. Each
+    directory is yielded before its files and subdirectories.
+
+    Args:
+        docs (Union[DocDir, DocFile]): parsed source directory or file
+        parent (Optional[str], optional): path of the directory
+            containing `docs`. Defaults to None.
+
+    Yields:
+        Dict[str, Any]: directory and file records
+    """
+    if isinstance(docs, DocFile):
+        record = to_dict(docs)
+        record["dir"] = parent
+        yield record
+        return
+
+    yield {"kind": "dir", "name": docs.name, "path": os.fsdecode(docs.path), "parent": parent}
+    for doc_file in docs.files:
+        yield from iter_records(doc_file, os.fsdecode(docs.path))
+    for subdir in docs.subdirs:
+        yield from iter_records(subdir, os.fsdecode(docs.path))
+
+
+def load_json(path: Union[str, bytes, os.PathLike]) -> Union[DocDir, DocFile]:
+    """Load a JSON or JSON Lines dump from disk
+
+    Args:
+        path (Union[str, bytes, os.PathLike]): dump file created by
+            `dump_json` or `dump_jsonl`
+
+    Raises:
+        DumpFormatError: If the file isn't a doctopi dump
+
+    Returns:
+        Union[DocDir, DocFile]: root of the parsed documentation
+    """
+    with open(path, "r", encoding="utf-8") as fp:
+        return load_fp(fp)
+
+
+def load_fp(fp: IO[str]) -> Union[DocDir, DocFile]:
+    """Load a JSON or JSON Lines dump from a text stream
+
+    Args:
+        fp (IO[str]): readable text stream
+
+    Raises:
+        DumpFormatError: If the stream isn't a doctopi dump
+
+    Returns:
+        Union[DocDir, DocFile]: root of the parsed documentation
+    """
+    first_line = fp.readline()
+    try:
+        header = json.loads(first_line)
+    except json.JSONDecodeError:
+        header = None
+
+    # JSON Lines dumps start with a header record
+    if isinstance(header, dict) and header.get("kind") == "header":
+        _check_version(header)
+        return _load_records(json.loads(line) for line in fp if line.strip())
+
+    # Otherwise the stream is a single (possibly indented) JSON document
+    try:
+        document = header if header is not None else json.loads(first_line + fp.read())
+    except json.JSONDecodeError as exc:
+        raise DumpFormatError("Not a doctopi JSON or JSON Lines dump") from exc
+
+    if not isinstance(document, dict) or "root" not in document:
+        raise DumpFormatError("Not a doctopi JSON or JSON Lines dump")
+
+    _check_version(document)
+    return from_dict(document["root"])
+
+
+def _check_version(header: Dict[str, Any]):
+    """Verify a dump was written with a compatible format version
+
+    Args:
+        header (Dict[str, Any]): dump header
+
+    Raises:
+        DumpFormatError: If the version isn't supported
+    """
+    if header.get("doctopi") != FORMAT_VERSION:
+        raise DumpFormatError(f"Unsupported dump version '{header.get('doctopi')}'")
+
+
+def _load_records(records: Iterator[Dict[str, Any]]) -> Union[DocDir, DocFile]:
+    """Rebuild the documentation tree from JSON Lines records
+
+    Args:
+        records (Iterator[Dict[str, Any]]): directory and file records,
+            parents before children
+
+    Raises:
+        DumpFormatError: If a record references an unknown directory or
+            there are no records
+
+    Returns:
+        Union[DocDir, DocFile]: root of the parsed documentation
+    """
+    root = None
+    dirs: Dict[str, DocDir] = {}
+
+    for record in records:
+        parent = record.pop("parent", None) if record.get("kind") == "dir" \
+            else record.pop("dir", None)
+        doc = from_dict(record)
+
+        if isinstance(doc, DocDir):
+            dirs[os.fsdecode(doc.path)] = doc
+
+        if parent is None:
+            root = root or doc
+        elif parent not in dirs:
+            raise DumpFormatError(f"Record '{doc.path}' references unknown directory '{parent}'")
+        elif isinstance(doc, DocDir):
+            dirs[parent].subdirs.append(doc)
+        else:
+            dirs[parent].files.append(doc)
+
+    if root is None:
+        raise DumpFormatError("Dump contains no records")
+
+    return root
+
+
+def _dir_from_dict(data: Dict[str, Any]) -> DocDir:
+    """Convert a directory dict into a DocDir"""
+    return DocDir(name=data["name"],
+                  path=data["path"],
+                  files=[_file_from_dict(item) for item in data.get("files", [])],
+                  subdirs=[_dir_from_dict(item) for item in data.get("subdirs", [])])
+
+
+def _file_from_dict(data: Dict[str, Any]) -> DocFile:
+    """Convert a file dict into a DocFile"""
+    return DocFile(name=data["name"],
+                   path=data["path"],
+                   docstring=_docstring_from_dict(data.get("docstring")),
+                   classes=[_class_from_dict(item) for item in data.get("classes", [])],
+                   functions=[_function_from_dict(item) for item in data.get("functions", [])])
+
+
+def _class_from_dict(data: Dict[str, Any]) -> ClassDeclaration:
+    """Convert a class dict into a ClassDeclaration"""
+    return ClassDeclaration(
+        name=data["name"],
+        signature=data["signature"],
+        docstring=_docstring_from_dict(data.get("docstring")),
+        constructor=_function_from_dict(data["constructor"]) if data.get("constructor") else None,
+        class_variables=[_ndt_from_dict(item) for item in data.get("class_variables", [])],
+        member_variables=[_ndt_from_dict(item) for item in data.get("member_variables", [])],
+        methods=[_function_from_dict(item) for item in data.get("methods", [])],
+        subclasses=[_class_from_dict(item) for item in data.get("subclasses", [])]
+    )
+
+
+def _function_from_dict(data: Dict[str, Any]) -> FunctionDeclaration:
+    """Convert a function dict into a FunctionDeclaration"""
+    return FunctionDeclaration(name=data["name"],
+                               signature=data["signature"],
+                               access=AccessType[data["access"]],
+                               docstring=_docstring_from_dict(data.get("docstring")))
+
+
+def _docstring_from_dict(data: Optional[Dict[str, Any]]) -> Optional[Docstring]:
+    """Convert a docstring dict into a Docstring"""
+    if data is None:
+        return None
+
+    return Docstring(summary=data.get("summary", ""),
+                     args=[_ndt_from_dict(item) for item in data.get("args", [])],
+                     returns=_ndt_from_dict(data["returns"]) if data.get("returns") else None,
+                     raises=[_ndt_from_dict(item) for item in data.get("raises", [])])
+
+
+def _ndt_from_dict(data: Dict[str, Any]) -> NameDescriptionType:
+    """Convert a name/description/type dict into a NameDescriptionType"""
+    return NameDescriptionType(name=data.get("name", ""),
+                               description=data.get("description", ""),
+                               type=data.get("type", ""))
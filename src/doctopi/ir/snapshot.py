@@ -0,0 +1,743 @@
+"""Compact binary snapshots of parsed documentation. Unlike a JSON dump,
+a snapshot is memory-mapped when opened, and each DocFile is only
+decoded when it is accessed, so rendering a single package of a large
+tree only pays for that package.
+
+A snapshot is laid out as:
+
+    header   magic, version, root, and the offset of each section
+    records  one encoded record per DocFile
+    strings  table of every unique string, referenced by index
+    files    path, name, digest and record offset of each DocFile,
+             sorted by path
+    dirs     directory tree referencing the files table
+    symbols  qualified name and file of each class and function,
+             sorted by qualified name
+
+Snapshots also carry a digest of each source file, so they can be used
+as a persistent ParseCache with SnapshotCache.
+"""
+# Built-in imports
+from __future__ import annotations
+import bisect
+from collections.abc import Sequence
+import mmap
+import os
+import struct
+from typing import (Dict, IO, Iterator, List, Optional, Set, Tuple, Union)
+
+# This package imports
+from doctopi.ir.serialization import DumpFormatError
+from doctopi.ir.symbols import iter_modules, iter_symbols, module_name
+from doctopi.parser.cache import ParseCache
+from doctopi.types import (AccessType, ClassDeclaration, DocDir, DocFile, Docstring,
+                           FunctionDeclaration, NameDescriptionType)
+
+MAGIC = b"DOCTOPIS"
+"""First bytes of every snapshot file"""
+
+VERSION = 1
+"""Version of the snapshot format. Incremented on incompatible changes."""
+
+_NONE = 0xFFFFFFFF
+_HEADER = struct.Struct("<8sIIIQQQQ")
+_U8 = struct.Struct("<B")
+_U32 = struct.Struct("<I")
+_FILE_ENTRY = struct.Struct("<IIIQI")
+_SYMBOL_ENTRY = struct.Struct("<II")
+
+_ROOT_NONE, _ROOT_FILE, _ROOT_DIR = range(3)
+_ACCESS_TYPES = list(AccessType)
+
+
+class SnapshotWriter:
+    """Collect parsed files, and optionally the directory tree they
+    belong to, and write them as a snapshot.
+
+    Attributes:
+        files (Dict[str, Tuple[DocFile, str]]): map of source file path
+            to the parsed file and the digest of its contents
+        root (Union[DocDir, DocFile]): root of the directory tree
+    """
+
+    def __init__(self):
+        """Constructor"""
+        self.files: Dict[str, Tuple[DocFile, str]] = {}
+        self.root: Union[DocDir, DocFile] = None
+        self._strings: Dict[str, int] = {}
+
+    def add_file(self, doc_file: DocFile, digest: str = None) -> SnapshotWriter:
+        """Add a parsed file to the snapshot
+
+        Args:
+            doc_file (DocFile): parsed source file
+            digest (str, optional): digest of the source file contents.
+                Keeps the digest of a previously added file with the
+                same path if not provided.
+
+        Returns:
+            SnapshotWriter: This SnapshotWriter
+        """
+        path = os.fsdecode(doc_file.path)
+        if digest is None:
+            digest = self.files.get(path, (None, ""))[1]
+        self.files[path] = (doc_file, digest)
+        return self
+
+    def set_root(self, docs: Union[DocDir, DocFile]) -> SnapshotWriter:
+        """Add a parsed directory tree, or a single file, to the snapshot
+
+        Args:
+            docs (Union[DocDir, DocFile]): parsed source directory or
+                file
+
+        Returns:
+            SnapshotWriter: This SnapshotWriter
+        """
+        self.root = docs
+        for _, doc_file in iter_modules(docs):
+            self.add_file(doc_file)
+        return self
+
+    def write(self, fp: IO[bytes]):  # pylint: disable = too-many-locals
+        """Write the snapshot
+
+        Args:
+            fp (IO[bytes]): writable binary stream
+        """
+        self._strings = {}
+        paths = sorted(self.files)
+        file_index = {path: index for index, path in enumerate(paths)}
+
+        # Encode each file record
+        records = bytearray()
+        file_entries = bytearray(_U32.pack(len(paths)))
+        for path in paths:
+            doc_file, digest = self.files[path]
+            offset = _HEADER.size + len(records)
+            self._file(records, doc_file)
+            file_entries += _FILE_ENTRY.pack(self._sid(path), self._sid(doc_file.name),
+                                             self._sid(digest), offset,
+                                             _HEADER.size + len(records) - offset)
+
+        # Encode the directory tree and symbol index
+        root_kind, root_index = _ROOT_NONE, 0
+        if isinstance(self.root, DocFile):
+            root_kind, root_index = _ROOT_FILE, file_index[os.fsdecode(self.root.path)]
+        elif isinstance(self.root, DocDir):
+            root_kind = _ROOT_DIR
+        dir_entries = self._encode_dirs(file_index)
+        symbol_entries = self._encode_symbols(file_index)
+
+        # Encode the string table last, once every string is known
+        string_table = self._encode_strings()
+
+        strings_offset = _HEADER.size + len(records)
+        files_offset = strings_offset + len(string_table)
+        dirs_offset = files_offset + len(file_entries)
+        symbols_offset = dirs_offset + len(dir_entries)
+
+        fp.write(_HEADER.pack(MAGIC, VERSION, root_kind, root_index,
+                              strings_offset, files_offset, dirs_offset, symbols_offset))
+        for section in [records, string_table, file_entries, dir_entries, symbol_entries]:
+            fp.write(section)
+
+    def _encode_dirs(self, file_index: Dict[str, int]) -> bytearray:
+        """Encode the directory tree table, parents before children
+
+        Args:
+            file_index (Dict[str, int]): map of path to files table index
+
+        Returns:
+            bytearray: encoded table
+        """
+        dirs: List[DocDir] = []
+        if isinstance(self.root, DocDir):
+            self._collect_dirs(self.root, dirs)
+
+        dir_index = {id(doc_dir): index for index, doc_dir in enumerate(dirs)}
+        dir_entries = bytearray(_U32.pack(len(dirs)))
+        for doc_dir in dirs:
+            dir_entries += _U32.pack(self._sid(doc_dir.name))
+            dir_entries += _U32.pack(self._sid(os.fsdecode(doc_dir.path)))
+            self._indexes(dir_entries, [file_index[os.fsdecode(doc_file.path)]
+                                        for doc_file in doc_dir.files])
+            self._indexes(dir_entries, [dir_index[id(subdir)] for subdir in doc_dir.subdirs])
+        return dir_entries
+
+    def _encode_symbols(self, file_index: Dict[str, int]) -> bytearray:
+        """Encode the table of qualified names, sorted by name
+
+        Args:
+            file_index (Dict[str, int]): map of path to files table index
+
+        Returns:
+            bytearray: encoded table
+        """
+        symbols = sorted((name, file_index[os.fsdecode(doc_file.path)])
+                         for module, doc_file in self._iter_modules()
+                         for name, _ in iter_symbols(module, doc_file))
+        symbol_entries = bytearray(_U32.pack(len(symbols)))
+        for name, index in symbols:
+            symbol_entries += _SYMBOL_ENTRY.pack(self._sid(name), index)
+        return symbol_entries
+
+    def _encode_strings(self) -> bytes:
+        """Encode the string table
+
+        Returns:
+            bytes: encoded table
+        """
+        strings = [string.encode("utf-8") for string in self._strings]
+        string_offsets = [0]
+        for string in strings:
+            string_offsets.append(string_offsets[-1] + len(string))
+        return _U32.pack(len(strings)) \
+            + struct.pack(f"<{len(string_offsets)}I", *string_offsets) + b"".join(strings)
+
+    def _iter_modules(self) -> Iterator[Tuple[str, DocFile]]:
+        """Iterate over the qualified module name of every file. Files
+        outside of the directory tree are named after the file.
+
+        Yields:
+            Tuple[str, DocFile]: qualified module name and parsed file
+        """
+        in_tree = set()
+        if self.root is not None:
+            for module, doc_file in iter_modules(self.root):
+                in_tree.add(os.fsdecode(doc_file.path))
+                yield module, doc_file
+
+        for path, (doc_file, _) in self.files.items():
+            if path not in in_tree:
+                yield module_name(doc_file), doc_file
+
+    def _collect_dirs(self, doc_dir: DocDir, dirs: List[DocDir]):
+        """Flatten a directory tree, parents before children"""
+        dirs.append(doc_dir)
+        for subdir in doc_dir.subdirs:
+            self._collect_dirs(subdir, dirs)
+
+    def _sid(self, string: Optional[str]) -> int:
+        """Get the index of a string in the string table"""
+        if string is None:
+            return _NONE
+        return self._strings.setdefault(string, len(self._strings))
+
+    def _indexes(self, buf: bytearray, indexes: List[int]):
+        """Encode a list of table indexes"""
+        buf += _U32.pack(len(indexes))
+        buf += struct.pack(f"<{len(indexes)}I", *indexes)
+
+    def _str(self, buf: bytearray, string: Optional[str]):
+        """Encode a string"""
+        buf += _U32.pack(self._sid(string))
+
+    def _ndt(self, buf: bytearray, ndt: Optional[NameDescriptionType]):
+        """Encode an optional NameDescriptionType"""
+        buf += _U8.pack(ndt is not None)
+        if ndt is not None:
+            buf += struct.pack("<III", self._sid(ndt.name), self._sid(ndt.description),
+                               self._sid(ndt.type))
+
+    def _ndts(self, buf: bytearray, ndts: List[NameDescriptionType]):
+        """Encode a list of NameDescriptionTypes"""
+        buf += _U32.pack(len(ndts))
+        for ndt in ndts:
+            self._ndt(buf, ndt)
+
+    def _docstring(self, buf: bytearray, docstring: Optional[Docstring]):
+        """Encode an optional Docstring"""
+        buf += _U8.pack(docstring is not None)
+        if docstring is not None:
+            self._str(buf, docstring.summary)
+            self._ndts(buf, docstring.args)
+            self._ndt(buf, docstring.returns)
+            self._ndts(buf, docstring.raises)
+
+    def _function(self, buf: bytearray, function: Optional[FunctionDeclaration]):
+        """Encode an optional FunctionDeclaration"""
+        buf += _U8.pack(function is not None)
+        if function is not None:
+            self._str(buf, function.name)
+            self._str(buf, function.signature)
+            buf += _U8.pack(_ACCESS_TYPES.index(function.access))
+            self._docstring(buf, function.docstring)
+
+    def _class(self, buf: bytearray, class_: ClassDeclaration):
+        """Encode a ClassDeclaration"""
+        self._str(buf, class_.name)
+        self._str(buf, class_.signature)
+        self._docstring(buf, class_.docstring)
+        self._function(buf, class_.constructor)
+        self._ndts(buf, class_.class_variables)
+        self._ndts(buf, class_.member_variables)
+        buf += _U32.pack(len(class_.methods))
+        for method in class_.methods:
+            self._function(buf, method)
+        buf += _U32.pack(len(class_.subclasses))
+        for subclass in class_.subclasses:
+            self._class(buf, subclass)
+
+    def _file(self, buf: bytearray, doc_file: DocFile):
+        """Encode a DocFile"""
+        self._str(buf, doc_file.name)
+        self._str(buf, os.fsdecode(doc_file.path))
+        self._docstring(buf, doc_file.docstring)
+        buf += _U32.pack(len(doc_file.classes))
+        for class_ in doc_file.classes:
+            self._class(buf, class_)
+        buf += _U32.pack(len(doc_file.functions))
+        for function in doc_file.functions:
+            self._function(buf, function)
+
+
+class Snapshot:  # pylint: disable = too-many-instance-attributes
+    """Memory-mapped snapshot of parsed documentation. Files are decoded
+    when they are first accessed.
+
+    Attributes:
+        path (Union[str, bytes, os.PathLike]): snapshot file
+    """
+
+    def __init__(self, path: Union[str, bytes, os.PathLike]):
+        """Constructor
+
+        Args:
+            path (Union[str, bytes, os.PathLike]): snapshot file
+
+        Raises:
+            DumpFormatError: If the file isn't a snapshot
+        """
+        self.path = path
+        with open(path, "rb") as snapshot_file:
+            try:
+                self._buf = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as exc:
+                raise DumpFormatError(f"'{path}' is empty") from exc
+
+        try:
+            (magic, version, self._root_kind, self._root_index, strings_offset,
+             self._files_offset, dirs_offset, self._symbols_offset) = \
+                _HEADER.unpack_from(self._buf, 0)
+        except struct.error as exc:
+            self.close()
+            raise DumpFormatError(f"'{path}' is not a doctopi snapshot") from exc
+
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise DumpFormatError(f"'{path}' is not a version {VERSION} doctopi snapshot")
+
+        # Locate the string table, decoding strings on demand
+        self._string_count = _U32.unpack_from(self._buf, strings_offset)[0]
+        self._string_offsets = strings_offset + _U32.size
+        self._string_blob = self._string_offsets + (self._string_count + 1) * _U32.size
+        self._strings: Dict[int, str] = {}
+
+        self._file_count = _U32.unpack_from(self._buf, self._files_offset)[0]
+        self._symbol_count = _U32.unpack_from(self._buf, self._symbols_offset)[0]
+        self._doc_files: Dict[int, DocFile] = {}
+        self._dir_entries = self._read_dirs(dirs_offset)
+        self._doc_dirs: Dict[int, DocDir] = {}
+
+    def __enter__(self) -> Snapshot:
+        """Use the snapshot as a context manager, closing it on exit"""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the snapshot"""
+        self.close()
+
+    def __len__(self) -> int:
+        """Number of files in the snapshot"""
+        return self._file_count
+
+    def close(self):
+        """Unmap the snapshot file. Files which haven't been decoded yet
+        can no longer be accessed.
+        """
+        self._buf.close()
+
+    def paths(self) -> Iterator[str]:
+        """Iterate over the path of each file in the snapshot
+
+        Yields:
+            str: source file path, in sorted order
+        """
+        for index in range(self._file_count):
+            yield self._string(self._file_entry(index)[0])
+
+    def digest(self, path: str) -> Optional[str]:
+        """Get the digest of a source file's contents when it was
+        parsed
+
+        Args:
+            path (str): source file path
+
+        Returns:
+            Optional[str]: digest, or None if the file isn't in the
+                snapshot
+        """
+        index = self._find_file(path)
+        return None if index is None else self._string(self._file_entry(index)[2])
+
+    def get_file(self, path: str) -> Optional[DocFile]:
+        """Get a parsed file by its path
+
+        Args:
+            path (str): source file path
+
+        Returns:
+            Optional[DocFile]: parsed file, or None if the file isn't in
+                the snapshot
+        """
+        index = self._find_file(path)
+        return None if index is None else self._doc_file(index)
+
+    def find_symbol(self, name: str) -> Optional[DocFile]:
+        """Find the file declaring a class or function by its qualified
+        name
+
+        Args:
+            name (str): qualified name, e.g. `package.module.Class`
+
+        Returns:
+            Optional[DocFile]: parsed file, or None if nothing in the
+                snapshot has the qualified name
+        """
+        index = self._bisect(self._symbols_offset, self._symbol_count, _SYMBOL_ENTRY, name)
+        if index is None:
+            return None
+        return self._doc_file(_SYMBOL_ENTRY.unpack_from(
+            self._buf, self._symbols_offset + _U32.size + index * _SYMBOL_ENTRY.size)[1])
+
+    def root(self) -> Union[DocDir, DocFile, None]:
+        """Get the root of the parsed documentation. The files of each
+        DocDir are decoded when they are accessed.
+
+        Returns:
+            Union[DocDir, DocFile, None]: root directory or file, or
+                None if the snapshot only contains cached files
+        """
+        if self._root_kind == _ROOT_FILE:
+            return self._doc_file(self._root_index)
+        if self._root_kind == _ROOT_DIR:
+            return self._doc_dir(0)
+        return None
+
+    def subtree(self, path: str) -> Optional[DocDir]:
+        """Get a directory within the parsed documentation, e.g. to
+        render a single package
+
+        Args:
+            path (str): source directory path
+
+        Returns:
+            Optional[DocDir]: the directory, or None if the snapshot
+                doesn't contain it
+        """
+        path = os.path.normpath(path)
+        for index, entry in enumerate(self._dir_entries):
+            if os.path.normpath(self._string(entry[1])) == path:
+                return self._doc_dir(index)
+        return None
+
+    def _doc_dir(self, index: int) -> DocDir:
+        """Build a directory of the tree, with lazily decoded files"""
+        if index not in self._doc_dirs:
+            name, path, files, subdirs = self._dir_entries[index]
+            self._doc_dirs[index] = DocDir(name=self._string(name),
+                                           path=self._string(path),
+                                           files=LazyDocFiles(self, files),
+                                           subdirs=[self._doc_dir(subdir) for subdir in subdirs])
+        return self._doc_dirs[index]
+
+    def _doc_file(self, index: int) -> DocFile:
+        """Decode a file record, once"""
+        if index not in self._doc_files:
+            offset = self._file_entry(index)[3]
+            self._doc_files[index] = _RecordReader(self, offset).file()
+        return self._doc_files[index]
+
+    def _file_entry(self, index: int) -> Tuple[int, int, int, int, int]:
+        """Read an entry of the files table"""
+        return _FILE_ENTRY.unpack_from(
+            self._buf, self._files_offset + _U32.size + index * _FILE_ENTRY.size)
+
+    def _find_file(self, path: str) -> Optional[int]:
+        """Binary search the files table for a path"""
+        return self._bisect(self._files_offset, self._file_count, _FILE_ENTRY,
+                            os.fsdecode(path))
+
+    def _bisect(self, offset: int, count: int, entry: struct.Struct, key: str) -> Optional[int]:
+        """Binary search a table sorted by the string in the first
+        column of each entry"""
+        start = offset + _U32.size
+        keys = _TableKeys(self, start, count, entry)
+        index = bisect.bisect_left(keys, key)
+        return index if index < count and keys[index] == key else None
+
+    def _read_dirs(self, offset: int) -> List[Tuple[int, int, List[int], List[int]]]:
+        """Read the directory tree table"""
+        reader = _RecordReader(self, offset)
+        entries = []
+        for _ in range(reader.u32()):
+            name, path = reader.u32(), reader.u32()
+            files = [reader.u32() for _ in range(reader.u32())]
+            subdirs = [reader.u32() for _ in range(reader.u32())]
+            entries.append((name, path, files, subdirs))
+        return entries
+
+    def _string(self, sid: int) -> Optional[str]:
+        """Decode a string from the string table, once"""
+        if sid == _NONE:
+            return None
+        if sid not in self._strings:
+            start, end = struct.unpack_from("<II", self._buf,
+                                            self._string_offsets + sid * _U32.size)
+            self._strings[sid] = \
+                self._buf[self._string_blob + start:self._string_blob + end].decode("utf-8")
+        return self._strings[sid]
+
+
+class LazyDocFiles(Sequence):
+    """List of the files in a snapshot directory. Each file is decoded
+    when it is first accessed."""
+
+    def __init__(self, snapshot: Snapshot, indexes: List[int]):
+        """Constructor
+
+        Args:
+            snapshot (Snapshot): snapshot containing the files
+            indexes (List[int]): index of each file in the files table
+        """
+        self._snapshot = snapshot
+        self._indexes = indexes
+
+    def __getitem__(self, index):
+        """Decode one file, or a slice of files"""
+        if isinstance(index, slice):
+            return [self._snapshot._doc_file(i)  # pylint: disable = protected-access
+                    for i in self._indexes[index]]
+        return self._snapshot._doc_file(self._indexes[index])  # pylint: disable = protected-access
+
+    def __len__(self) -> int:
+        """Number of files"""
+        return len(self._indexes)
+
+    def __eq__(self, other) -> bool:
+        """Compare the files with another sequence of files"""
+        return isinstance(other, Sequence) and list(self) == list(other)
+
+
+class SnapshotCache(ParseCache):
+    """Persistent ParseCache backed by a snapshot file. Files are read
+    from the existing snapshot on demand, and the snapshot is rewritten
+    with any newly parsed files by `save()`. Files whose source was
+    deleted or renamed are dropped when it's rewritten.
+
+    Attributes:
+        path (Union[str, bytes, os.PathLike]): snapshot file
+        snapshot (Snapshot): the snapshot as of the last save, or None
+            if it doesn't exist yet
+        entries (Dict[str, Tuple[str, DocFile]]): map of source file path
+            to digest and parsed file, added since the last save
+        used (Set[str]): source file paths looked up since the last save
+    """
+
+    def __init__(self, path: Union[str, bytes, os.PathLike]):
+        """Constructor
+
+        Args:
+            path (Union[str, bytes, os.PathLike]): snapshot file. It is
+                created by `save()` if it doesn't exist.
+        """
+        self.path = path
+        self.snapshot: Snapshot = Snapshot(path) if os.path.exists(path) else None
+        self.entries: Dict[str, Tuple[str, DocFile]] = {}
+        self.used: Set[str] = set()
+
+    def get(self, path: str, digest: str) -> Optional[DocFile]:
+        """Get a parsed file from the cache
+
+        Args:
+            path (str): absolute path of the source file
+            digest (str): digest of the source file contents
+
+        Returns:
+            Optional[DocFile]: the parsed file, or None if the file
+                isn't cached or has changed since it was cached
+        """
+        self.used.add(path)
+        if path in self.entries:
+            cached_digest, doc_file = self.entries[path]
+            return doc_file if cached_digest == digest else None
+
+        if self.snapshot is not None and self.snapshot.digest(path) == digest:
+            return self.snapshot.get_file(path)
+
+        return None
+
+    def put(self, path: str, digest: str, doc_file: DocFile):
+        """Add a parsed file to the cache
+
+        Args:
+            path (str): absolute path of the source file
+            digest (str): digest of the source file contents
+            doc_file (DocFile): the parsed file
+        """
+        self.entries[path] = (digest, doc_file)
+
+    def save(self, docs: Union[DocDir, DocFile] = None):
+        """Rewrite the snapshot with the previously cached files and the
+        files added since the last save. Previously cached files which
+        weren't looked up since the last save are dropped if their
+        source no longer exists, e.g. it was deleted or renamed, so the
+        snapshot doesn't keep growing.
+
+        Args:
+            docs (Union[DocDir, DocFile], optional): directory tree to
+                store as the root of the snapshot, so it can also be
+                rendered. Defaults to None.
+        """
+        writer = SnapshotWriter()
+
+        # Keep the previously cached files, decoding them before unmapping
+        if self.snapshot is not None:
+            for path in self.snapshot.paths():
+                if path not in self.entries and (path in self.used or _source_exists(path)):
+                    writer.add_file(self.snapshot.get_file(path), self.snapshot.digest(path))
+            self.snapshot.close()
+
+        for digest, doc_file in self.entries.values():
+            writer.add_file(doc_file, digest)
+        if docs is not None:
+            writer.set_root(docs)
+
+        # Write to a temporary file so a failure can't corrupt the cache
+        temp_path = f"{os.fsdecode(self.path)}.tmp"
+        with open(temp_path, "wb") as snapshot_file:
+            writer.write(snapshot_file)
+        os.replace(temp_path, self.path)
+
+        self.snapshot = Snapshot(self.path)
+        self.entries = {}
+        self.used = set()
+
+
+def _source_exists(path: str) -> bool:
+    """Check if a cached source file still exists, or is a member of an
+    archive which still exists, e.g. "/dist/pkg.whl/pkg/module.py"
+
+    Args:
+        path (str): absolute path of the source file
+
+    Returns:
+        bool: True if the file or its archive exists
+    """
+    if os.path.isfile(path):
+        return True
+
+    # The nearest existing ancestor of an archive member is the archive
+    parent = os.path.dirname(path)
+    while parent != path and not os.path.exists(parent):
+        path, parent = parent, os.path.dirname(parent)
+    return parent != path and os.path.isfile(parent)
+
+
+class _TableKeys(Sequence):
+    """View of the strings in the first column of a table, used to
+    binary search it without decoding the whole table"""
+
+    def __init__(self, snapshot: Snapshot, start: int, count: int, entry: struct.Struct):
+        self._snapshot = snapshot
+        self._start = start
+        self._count = count
+        self._entry = entry
+
+    def __getitem__(self, index: int) -> str:
+        sid = _U32.unpack_from(self._snapshot._buf,  # pylint: disable = protected-access
+                               self._start + index * self._entry.size)[0]
+        return self._snapshot._string(sid)  # pylint: disable = protected-access
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class _RecordReader:
+    """Decode records from a snapshot, starting at an offset"""
+
+    def __init__(self, snapshot: Snapshot, offset: int):
+        self._snapshot = snapshot
+        self._buf = snapshot._buf  # pylint: disable = protected-access
+        self._offset = offset
+
+    def u8(self) -> int:
+        """Decode an unsigned byte"""
+        value = self._buf[self._offset]
+        self._offset += 1
+        return value
+
+    def u32(self) -> int:
+        """Decode an unsigned 32-bit integer"""
+        value = _U32.unpack_from(self._buf, self._offset)[0]
+        self._offset += _U32.size
+        return value
+
+    def string(self) -> Optional[str]:
+        """Decode a string"""
+        return self._snapshot._string(self.u32())  # pylint: disable = protected-access
+
+    def ndt(self) -> Optional[NameDescriptionType]:
+        """Decode an optional NameDescriptionType"""
+        if not self.u8():
+            return None
+        return NameDescriptionType(name=self.string(), description=self.string(),
+                                   type=self.string())
+
+    def ndts(self) -> List[NameDescriptionType]:
+        """Decode a list of NameDescriptionTypes"""
+        return [self.ndt() for _ in range(self.u32())]
+
+    def docstring(self) -> Optional[Docstring]:
+        """Decode an optional Docstring"""
+        if not self.u8():
+            return None
+        return Docstring(summary=self.string(), args=self.ndts(), returns=self.ndt(),
+                         raises=self.ndts())
+
+    def function(self) -> Optional[FunctionDeclaration]:
+        """Decode an optional FunctionDeclaration"""
+        if not self.u8():
+            return None
+        return FunctionDeclaration(name=self.string(), signature=self.string(),
+                                   access=_ACCESS_TYPES[self.u8()], docstring=self.docstring())
+
+    def class_(self) -> ClassDeclaration:
+        """Decode a ClassDeclaration"""
+        return ClassDeclaration(name=self.string(),
+                                signature=self.string(),
+                                docstring=self.docstring(),
+                                constructor=self.function(),
+                                class_variables=self.ndts(),
+                                member_variables=self.ndts(),
+                                methods=[self.function() for _ in range(self.u32())],
+                                subclasses=[self.class_() for _ in range(self.u32())])
+
+    def file(self) -> DocFile:
+        """Decode a DocFile"""
+        return DocFile(name=self.string(),
+                       path=self.string(),
+                       docstring=self.docstring(),
+                       classes=[self.class_() for _ in range(self.u32())],
+                       functions=[self.function() for _ in range(self.u32())])
+
+
+def dump_snapshot(docs: Union[DocDir, DocFile], fp: IO[bytes]):
+    """Write parsed documentation as a binary snapshot
+
+    Args:
+        docs (Union[DocDir, DocFile]): parsed source directory or file
+        fp (IO[bytes]): writable binary stream
+    """
+    SnapshotWriter().set_root(docs).write(fp)
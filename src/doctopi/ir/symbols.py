@@ -0,0 +1,189 @@
+"""Walk parsed documentation and name each module, class and function
+by its qualified (dotted) name, e.g. `package.module.Class.method`.
+"""
+# Built-in imports
+import os
+import re
+from typing import (Iterator, List, Tuple, Union)
+
+# This package imports
+from doctopi.types import (AccessType, ClassDeclaration, DocDir, DocFile, FunctionDeclaration)
+
+_CLASS_SIGNATURE = re.compile(r"^class\s+\w+\s*\((.*)\)\s*:\s*$", re.MULTILINE)
+
+
+def module_name(doc_file: DocFile, package: str = "") -> str:
+    """Get the qualified name of a module. `__init__` modules are named
+    after their package.
+
+    Args:
+        doc_file (DocFile): parsed source file
+        package (str, optional): qualified name of the package
+            containing the file. Defaults to "".
+
+    Returns:
+        str: qualified name of the module
+    """
+    if doc_file.name == "__init__" and package:
+        return package
+
+    return f"{package}.{doc_file.name}" if package else doc_file.name
+
+
+def module_path_name(path: str) -> str:
+    """Get the qualified name of a module from its relative path, e.g.
+    `pkg.module` for `pkg/module.py`. `__init__` modules are named after
+    their package.
+
+    Args:
+        path (str): "/" separated path relative to the root
+
+    Returns:
+        str: qualified module name
+    """
+    parts = os.path.splitext(path)[0].split("/")
+    if parts[-1] == "__init__" and len(parts) > 1:
+        parts.pop()
+    return ".".join(parts)
+
+
+def iter_modules(docs: Union[DocDir, DocFile],
+                 package: str = None) -> Iterator[Tuple[str, DocFile]]:
+    """Recursively iterate over each file in parsed documentation
+
+    Args:
+        docs (Union[DocDir, DocFile]): parsed source directory or file
+        package (str, optional): qualified name of the package
+            containing `docs`. Defaults to the root directory name.
+
+    Yields:
+        Tuple[str, DocFile]: qualified module name and parsed file
+    """
+    if isinstance(docs, DocFile):
+        yield module_name(docs, package or ""), docs
+        return
+
+    package = docs.name if package is None else package
+    for doc_file in docs.files:
+        yield module_name(doc_file, package), doc_file
+    for subdir in docs.subdirs:
+        yield from iter_modules(subdir, f"{package}.{subdir.name}" if package else subdir.name)
+
+
+def iter_symbols(
+        module: str,
+        doc_file: DocFile) -> Iterator[Tuple[str, Union[ClassDeclaration, FunctionDeclaration]]]:
+    """Iterate over the classes, inner classes, methods and functions
+    declared in a parsed file
+
+    Args:
+        module (str): qualified name of the module
+        doc_file (DocFile): parsed source file
+
+    Yields:
+        Tuple[str, Union[ClassDeclaration, FunctionDeclaration]]:
+            qualified name and declaration
+    """
+    for class_ in doc_file.classes:
+        yield from _iter_class_symbols(module, class_)
+    for function in doc_file.functions:
+        yield f"{module}.{function.name}", function
+
+
+def iter_public_symbols(
+        module: str,
+        doc_file: DocFile) -> Iterator[Tuple[str, str, Union[ClassDeclaration,
+                                                             FunctionDeclaration]]]:
+    """Iterate over the public classes, methods and functions declared in
+    a parsed file. Members of protected or private classes aren't public.
+
+    Args:
+        module (str): qualified name of the module
+        doc_file (DocFile): parsed source file
+
+    Yields:
+        Tuple[str, str, Union[ClassDeclaration, FunctionDeclaration]]:
+            qualified name, kind ("class", "function" or "method") and
+            declaration
+    """
+    private = set()
+    for qualname, declaration in iter_symbols(module, doc_file):
+        scope = qualname.rpartition(".")[0]
+        if scope in private or not is_public(declaration):
+            private.add(qualname)
+        elif isinstance(declaration, ClassDeclaration):
+            yield qualname, "class", declaration
+        else:
+            yield qualname, "function" if scope == module else "method", declaration
+
+
+def is_public(declaration: Union[ClassDeclaration, FunctionDeclaration]) -> bool:
+    """Check if a class or function is part of the public API. Dunder
+    methods, like `__init__`, are public.
+
+    Args:
+        declaration (Union[ClassDeclaration, FunctionDeclaration]): parsed
+            class or function
+
+    Returns:
+        bool: True if it's public
+    """
+    if isinstance(declaration, FunctionDeclaration):
+        return declaration.access == AccessType.PUBLIC
+    return not declaration.name.startswith("_")
+
+
+def _iter_class_symbols(
+        scope: str,
+        class_: ClassDeclaration) -> Iterator[Tuple[str, Union[ClassDeclaration,
+                                                               FunctionDeclaration]]]:
+    """Iterate over a class and its members
+
+    Args:
+        scope (str): qualified name of the module or class containing
+            the class
+        class_ (ClassDeclaration): parsed class
+
+    Yields:
+        Tuple[str, Union[ClassDeclaration, FunctionDeclaration]]:
+            qualified name and declaration
+    """
+    name = f"{scope}.{class_.name}"
+    yield name, class_
+
+    if class_.constructor:
+        yield f"{name}.{class_.constructor.name}", class_.constructor
+    for method in class_.methods:
+        yield f"{name}.{method.name}", method
+    for subclass in class_.subclasses:
+        yield from _iter_class_symbols(name, subclass)
+
+
+def class_bases(class_: ClassDeclaration) -> List[str]:
+    """Get the base classes of a parsed class from its signature, e.g.
+    `["Base", "Generic[T]"]` for `class Example(Base, Generic[T]):`.
+    Keyword arguments, like the metaclass, aren't bases.
+
+    Args:
+        class_ (ClassDeclaration): parsed class
+
+    Returns:
+        List[str]: base class expressions, in the order they're declared
+    """
+    match = _CLASS_SIGNATURE.search(class_.signature)
+    if match is None:
+        return []
+
+    # Split at the commas which aren't inside brackets
+    bases, depth, start = [], 0, 0
+    text = match.group(1)
+    for index, char in enumerate(text + ","):
+        if char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        elif char == "," and depth == 0:
+            bases.append(text[start:index].strip())
+            start = index + 1
+
+    return [base for base in bases if base and "=" not in base]
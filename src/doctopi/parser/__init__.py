@@ -4,8 +4,9 @@ of varying languages, and converts them into doctopi types."""
 
 # Built-in imports
 import abc
+import io
 import os
-from typing import Union
+from typing import (TextIO, Tuple, Union)
 
 # This package imports
 from doctopi.types import (DocDir, DocFile)
@@ -17,7 +18,12 @@ class Parser(abc.ABC):
     languages, and docstring flavors. The Parser will use the Adapter
     software design pattern to adapt third-party tools and libraries
     like Docspec, Doxygen, and Sphinx to a common documentation parser.
+
+    Attributes:
+        extensions (Tuple[str, ...]): File extensions of the source
+            files this parser can parse.
     """
+    extensions: Tuple[str, ...] = ()
 
     @abc.abstractmethod
     def parse_file(self, file: Union[str, bytes, os.PathLike]) -> DocFile:
@@ -46,3 +52,61 @@ class Parser(abc.ABC):
             DocDir: Collection of DocFile and DocDirs  mapping the
                 provided directory to the doctopi documentation types.
         """
+
+    def parse_stream(self, stream: TextIO, path: str) -> DocFile:
+        """Parse source code read from a stream rather than a file, e.g.
+        a member of an archive. Child classes which can parse streams
+        should override this.
+
+        Args:
+            stream (TextIO): Source code
+            path (str): Path of the source code, used to name the file
+
+        Raises:
+            NotImplementedError: If the parser can't parse streams
+
+        Returns:
+            DocFile: Representation of the file contents and docstrings.
+        """
+        raise NotImplementedError(f"{type(self).__name__} can't parse streams")
+
+    def accepts(self, path: str) -> bool:
+        """Check if a file found in a source directory is a source file
+        to parse. Child classes whose source files can't be told apart
+        by their extension should extend this.
+
+        Args:
+            path (str): path of the file
+
+        Returns:
+            bool: True if the file is parsed and documented
+        """
+        return path.endswith(self.extensions)
+
+    # pylint: disable-next = unused-argument
+    def accepts_stream(self, path: str, stream: io.BufferedReader) -> bool:
+        """Check if a file read from a stream rather than a directory,
+        e.g. a member of an archive, is a source file to parse. Child
+        classes which extend accepts() to read the file should extend
+        this too, peeking at the start of the stream so it can still be
+        parsed.
+
+        Args:
+            path (str): path of the file
+            stream (io.BufferedReader): contents of the file
+
+        Returns:
+            bool: True if the file is parsed and documented
+        """
+        return path.endswith(self.extensions)
+
+    def configuration(self) -> str:
+        """Describe the configuration of this parser. Files parsed by a
+        parser are only reused from a cache by parsers with the same
+        configuration. Child classes with settings which change the
+        parsed output should extend this.
+
+        Returns:
+            str: parser configuration
+        """
+        return type(self).__name__
@@ -0,0 +1,227 @@
+"""The ArchiveReader parses the source files of a package straight from a
+wheel, zip or tar archive, or from an installed distribution, without
+extracting anything to disk. Each member is streamed to the Parser, and
+parsed members are cached by the digest of the whole archive. The
+archive modules are imported when first used, so the CLI starts quickly.
+"""
+# Built-in imports
+import codecs
+import hashlib
+import io
+import os
+from typing import (BinaryIO, Dict, Iterator, List, Tuple, Union)
+
+# This package imports
+from doctopi.parser import Parser
+from doctopi.parser.cache import ParseCache
+from doctopi.types import (DocDir, DocFile)
+
+ZIP_EXTENSIONS = (".whl", ".zip")
+"""Extensions of zip archives, including wheels"""
+
+TAR_EXTENSIONS = (".tar.gz", ".tgz", ".tar")
+"""Extensions of tar archives, including sdists"""
+
+
+def is_archive(src: Union[str, bytes, os.PathLike]) -> bool:
+    """Check if a source is an archive, or the name of an installed
+    distribution, rather than a source file or directory
+
+    Args:
+        src (Union[str, bytes, os.PathLike]): Source to check
+
+    Returns:
+        bool: True if the ArchiveReader should parse the source
+    """
+    src = os.fsdecode(src)
+    if os.path.exists(src):
+        return os.path.isfile(src) and src.endswith(ZIP_EXTENSIONS + TAR_EXTENSIONS)
+
+    # pylint: disable-next = import-outside-toplevel
+    import importlib.metadata
+
+    try:
+        importlib.metadata.distribution(src)
+    except (importlib.metadata.PackageNotFoundError, ValueError):
+        return False
+    return True
+
+
+class ArchiveReader:
+    """Parse the source files of an archive or installed distribution,
+    streaming each member to a Parser.
+
+    Attributes:
+        parser (Parser): Parser used for each source file. It must
+            support Parser.parse_stream.
+        cache (ParseCache): Cache of parsed source files, keyed by the
+            path of each member inside the archive and the digest of the
+            archive. If None, every member is parsed.
+    """
+
+    def __init__(self, parser: Parser, cache: ParseCache = None):
+        """Constructor
+
+        Args:
+            parser (Parser): Parser used for each source file.
+            cache (ParseCache, optional): Cache of parsed source files.
+                Defaults to None.
+        """
+        self.parser = parser
+        self.cache = cache
+
+    def parse(self, src: Union[str, bytes, os.PathLike]) -> DocDir:
+        """Parse the source files of an archive or installed distribution
+
+        Args:
+            src (Union[str, bytes, os.PathLike]): wheel, zip or tar
+                archive, or the name of an installed distribution
+
+        Returns:
+            DocDir: the archive's directory tree. Members are given
+                paths inside the archive's path, e.g.
+                "/dist/pkg.whl/pkg/module.py", and installed files their
+                own path.
+        """
+        # pylint: disable-next = import-outside-toplevel
+        import importlib.metadata
+
+        src = os.fsdecode(src)
+        digest = self.digest(src)
+        root = os.path.abspath(src) if os.path.exists(src) \
+            else os.fspath(importlib.metadata.distribution(src).locate_file(""))
+        docs: Dict[str, DocFile] = {}
+
+        for member, stream in self.iter_members(src):
+            path = os.path.join(root, *member.split("/"))
+            doc_file = self.cache.get(path, digest) if self.cache is not None else None
+            if doc_file is None:
+                # A StreamReader decodes as it reads, even from tar's unseekable streams
+                doc_file = self.parser.parse_stream(codecs.getreader("utf-8")(stream), path)
+                if self.cache is not None:
+                    self.cache.put(path, digest, doc_file)
+            docs[member] = doc_file
+
+        # sdists put everything in a directory named like the archive
+        name = _archive_name(src)
+        if docs and all(member.startswith(f"{name}/") for member in docs):
+            root = os.path.join(root, name)
+            docs = {member[len(name) + 1:]: doc_file for member, doc_file in docs.items()}
+
+        return self._tree(name, root, docs)
+
+    def digest(self, src: str) -> str:
+        """Hash an archive, or the installed files of a distribution
+
+        Args:
+            src (str): archive, or the name of an installed distribution
+
+        Returns:
+            str: hex digest of the parser configuration and the archive
+        """
+        # pylint: disable-next = import-outside-toplevel
+        import importlib.metadata
+
+        digest = hashlib.sha256(self.parser.configuration().encode("utf-8"))
+
+        if not os.path.exists(src):
+            # The RECORD lists the hash of every installed file
+            distribution = importlib.metadata.distribution(src)
+            digest.update(f"{distribution.name}=={distribution.version}\n".encode("utf-8"))
+            digest.update((distribution.read_text("RECORD") or "").encode("utf-8"))
+            return digest.hexdigest()
+
+        with open(src, "rb") as archive:
+            for block in iter(lambda: archive.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def iter_members(self, src: str) -> Iterator[Tuple[str, BinaryIO]]:
+        """Stream the source file members of an archive or installed
+        distribution. Tar archives are read sequentially, so each stream
+        must be read before the next member.
+
+        Args:
+            src (str): archive, or the name of an installed distribution
+
+        Yields:
+            Tuple[str, BinaryIO]: "/" separated path of the member in the
+                archive, and a stream of its contents
+        """
+        # pylint: disable-next = import-outside-toplevel
+        import importlib.metadata
+        # pylint: disable-next = import-outside-toplevel
+        import tarfile
+        # pylint: disable-next = import-outside-toplevel
+        import zipfile
+
+        if not os.path.exists(src):
+            distribution = importlib.metadata.distribution(src)
+            for file in sorted(distribution.files or [], key=str):
+                # Installed files are on disk, so they're checked like a directory's
+                if ".." not in file.parts and self.parser.accepts(os.fspath(file.locate())):
+                    with open(file.locate(), "rb") as stream:
+                        yield file.as_posix(), stream
+
+        elif src.endswith(ZIP_EXTENSIONS):
+            with zipfile.ZipFile(src) as archive:
+                for info in archive.infolist():
+                    if not info.is_dir():
+                        with io.BufferedReader(archive.open(info)) as stream:
+                            if self.parser.accepts_stream(info.filename, stream):
+                                yield info.filename, stream
+
+        else:
+            with tarfile.open(src, mode="r|*") as archive:
+                for info in archive:
+                    if info.isfile():
+                        stream = archive.extractfile(info)
+                        if self.parser.accepts_stream(info.name, stream):
+                            yield info.name, stream
+
+    def _tree(self, name: str, path: str, docs: Dict[str, DocFile]) -> DocDir:
+        """Arrange parsed members in directories, sorted like
+        doctopi.parser.walker.DirectoryWalker
+
+        Args:
+            name (str): name of the directory
+            path (str): path of the directory
+            docs (Dict[str, DocFile]): parsed files by "/" separated path
+                relative to the directory
+
+        Returns:
+            DocDir: the directory
+        """
+        files: List[Tuple[str, DocFile]] = []
+        subdirs: Dict[str, Dict[str, DocFile]] = {}
+        for member, doc_file in docs.items():
+            head, _, tail = member.partition("/")
+            if tail:
+                subdirs.setdefault(head, {})[tail] = doc_file
+            else:
+                files.append((head, doc_file))
+
+        return DocDir(
+            name=name,
+            path=path,
+            files=[doc_file for _, doc_file in sorted(files, key=lambda item: item[0])],
+            subdirs=[self._tree(subdir, os.path.join(path, subdir), subdirs[subdir])
+                     for subdir in sorted(subdirs)]
+        )
+
+
+def _archive_name(src: str) -> str:
+    """Name an archive's root directory after the archive, without its
+    extension
+
+    Args:
+        src (str): archive, or the name of an installed distribution
+
+    Returns:
+        str: the name
+    """
+    name = os.path.basename(os.path.normpath(src))
+    for extension in ZIP_EXTENSIONS + TAR_EXTENSIONS:
+        if name.endswith(extension):
+            return name[:-len(extension)]
+    return name
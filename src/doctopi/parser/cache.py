@@ -0,0 +1,110 @@
+"""Caches of parsed source files. A cache maps a source file path and a
+digest of its contents to the DocFile parsed from it, so unchanged files
+aren't parsed again.
+"""
+# Built-in imports
+import abc
+import hashlib
+import os
+from typing import (Dict, Optional, Tuple, Union)
+
+# This package imports
+from doctopi.types import DocFile
+
+
+def file_digest(file: Union[str, bytes, os.PathLike], salt: str = "") -> str:
+    """Hash the contents of a source file
+
+    Args:
+        file (Union[str, bytes, os.PathLike]): source file
+        salt (str, optional): extra data to hash with the contents, e.g.
+            the parser configuration. Defaults to "".
+
+    Returns:
+        str: hex digest of the salt and file contents
+    """
+    with open(file, "rb") as source:
+        return data_digest(source.read(), salt)
+
+
+def data_digest(data: bytes, salt: str = "") -> str:
+    """Hash the contents of a source file which were already read
+
+    Args:
+        data (bytes): source file contents
+        salt (str, optional): extra data to hash with the contents, e.g.
+            the parser configuration. Defaults to "".
+
+    Returns:
+        str: hex digest of the salt and file contents, the same as
+            file_digest() of the file
+    """
+    digest = hashlib.sha256(salt.encode("utf-8"))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+class ParseCache(abc.ABC):
+    """Generic cache of parsed source files. This is an abstract base
+    class, intended to be extended for various storage backends.
+    """
+
+    @abc.abstractmethod
+    def get(self, path: str, digest: str) -> Optional[DocFile]:
+        """Get a parsed file from the cache
+
+        Args:
+            path (str): absolute path of the source file
+            digest (str): digest of the source file contents
+
+        Returns:
+            Optional[DocFile]: the parsed file, or None if the file
+                isn't cached or has changed since it was cached
+        """
+
+    @abc.abstractmethod
+    def put(self, path: str, digest: str, doc_file: DocFile):
+        """Add a parsed file to the cache
+
+        Args:
+            path (str): absolute path of the source file
+            digest (str): digest of the source file contents
+            doc_file (DocFile): the parsed file
+        """
+
+
+class MemoryParseCache(ParseCache):
+    """Cache parsed source files in memory for the life of the process
+
+    Attributes:
+        entries (Dict[str, Tuple[str, DocFile]]): map of source file path
+            to digest and parsed file
+    """
+
+    def __init__(self):
+        """Constructor"""
+        self.entries: Dict[str, Tuple[str, DocFile]] = {}
+
+    def get(self, path: str, digest: str) -> Optional[DocFile]:
+        """Get a parsed file from the cache
+
+        Args:
+            path (str): absolute path of the source file
+            digest (str): digest of the source file contents
+
+        Returns:
+            Optional[DocFile]: the parsed file, or None if the file
+                isn't cached or has changed since it was cached
+        """
+        cached_digest, doc_file = self.entries.get(path, (None, None))
+        return doc_file if cached_digest == digest else None
+
+    def put(self, path: str, digest: str, doc_file: DocFile):
+        """Add a parsed file to the cache
+
+        Args:
+            path (str): absolute path of the source file
+            digest (str): digest of the source file contents
+            doc_file (DocFile): the parsed file
+        """
+        self.entries[path] = (digest, doc_file)
@@ -0,0 +1,187 @@
+"""List the source files changed since a git ref, using the local git
+binary, so a run can parse only those files and reuse the previously
+parsed files for the rest of the tree. The files of a ref can also be
+listed and read without checking it out.
+"""
+# Built-in imports
+import os
+import subprocess
+from typing import (Dict, List, Set, Union)
+
+
+class GitError(Exception):
+    """git isn't installed, the source isn't in a git repository, or the
+    ref doesn't exist"""
+
+
+def changed_since(ref: str, src: Union[str, bytes, os.PathLike]) -> Set[str]:
+    """List the files modified, added, renamed or deleted since a git ref,
+    including uncommitted and untracked files
+
+    Args:
+        ref (str): git ref to compare against, e.g. "origin/main"
+        src (Union[str, bytes, os.PathLike]): Source file or directory.
+            Only changes inside it are listed.
+
+    Raises:
+        GitError: If git fails
+
+    Returns:
+        Set[str]: absolute paths of the changed files. A renamed file is
+            listed with both its old and new path.
+    """
+    src = os.path.abspath(src)
+    real_src = os.path.realpath(src)
+    top = _toplevel(real_src)
+
+    # Committed and uncommitted changes to tracked files, separated by NULs
+    # as "<status>\0<path>\0", or "<status>\0<old path>\0<new path>\0" for renames
+    fields = _git(top, "diff", "--name-status", "-z", "--find-renames", "--end-of-options",
+                  _commit(top, ref), "--", real_src).split("\0")
+    paths: List[str] = []
+    index = 0
+    while index < len(fields) - 1:
+        count = 2 if fields[index][:1] in ("R", "C") else 1
+        paths.extend(fields[index + 1:index + 1 + count])
+        index += 1 + count
+
+    # Untracked files are added files too
+    paths.extend(_git(top, "ls-files", "-z", "--others", "--exclude-standard", "--",
+                      real_src).split("\0"))
+
+    # git resolves symlinks, so map the paths back under the source as given
+    return {os.path.normpath(os.path.join(src, os.path.relpath(os.path.join(top, path),
+                                                               real_src)))
+            for path in paths if path}
+
+
+def list_blobs(ref: str, src: Union[str, bytes, os.PathLike]) -> Dict[str, str]:
+    """List the files of a source file or directory at a git ref, with
+    the object ID of their contents, without checking the ref out
+
+    Args:
+        ref (str): git ref, e.g. "v1.0"
+        src (Union[str, bytes, os.PathLike]): Source file or directory
+            in the working tree. Only files inside it are listed.
+
+    Raises:
+        GitError: If git fails
+
+    Returns:
+        Dict[str, str]: map of path relative to `src`, separated by "/",
+            to the object ID of the file's contents. A source file is
+            named after itself.
+    """
+    real_src = os.path.realpath(src)
+    top = _toplevel(real_src)
+    prefix = os.path.relpath(real_src, top).replace(os.sep, "/")
+
+    # "<mode> <type> <object>\t<path>\0" of each file, with paths relative to the top
+    blobs = {}
+    for entry in _git(top, "ls-tree", "-r", "-z", "--full-tree", "--end-of-options",
+                      _commit(top, ref), "--", prefix if prefix != "." else ".").split("\0"):
+        if entry:
+            info, path = entry.split("\t", 1)
+            if info.split(" ")[1] == "blob":
+                blobs[_posix_relpath(path, prefix)] = info.split(" ")[2]
+    return blobs
+
+
+def read_blob(src: Union[str, bytes, os.PathLike], blob: str) -> bytes:
+    """Read the contents of a file listed by list_blobs()
+
+    Args:
+        src (Union[str, bytes, os.PathLike]): Source file or directory
+            in the git repository
+        blob (str): object ID of the file's contents
+
+    Raises:
+        GitError: If git fails
+
+    Returns:
+        bytes: the file's contents
+    """
+    return _git(_toplevel(os.path.realpath(src)), "cat-file", "blob", blob, binary=True)
+
+
+def _posix_relpath(path: str, prefix: str) -> str:
+    """Get a "/" separated path relative to a "/" separated prefix. A
+    path equal to the prefix is named after its last component.
+
+    Args:
+        path (str): path, e.g. "src/pkg/module.py"
+        prefix (str): directory or file containing the path, e.g. "src",
+            or "." for the top
+
+    Returns:
+        str: the relative path, e.g. "pkg/module.py"
+    """
+    if prefix in (".", ""):
+        return path
+    if path == prefix:
+        return path.rsplit("/", 1)[-1]
+    return path[len(prefix) + 1:]
+
+
+def _toplevel(real_src: str) -> str:
+    """Get the top directory of the git repository containing a source
+
+    Args:
+        real_src (str): real path of a source file or directory
+
+    Raises:
+        GitError: If the source isn't in a git repository
+
+    Returns:
+        str: the top directory
+    """
+    return _git(os.path.dirname(real_src) if os.path.isfile(real_src) else real_src,
+                "rev-parse", "--show-toplevel").rstrip("\n")
+
+
+def _commit(top: str, ref: str) -> str:
+    """Resolve a git ref to its commit. The ref is passed after
+    --end-of-options, so a ref starting with "-" isn't read as an option.
+
+    Args:
+        top (str): top directory of the git repository
+        ref (str): git ref, e.g. "origin/main"
+
+    Raises:
+        GitError: If the ref doesn't name a commit
+
+    Returns:
+        str: the commit's object ID
+    """
+    try:
+        return _git(top, "rev-parse", "--verify", "--quiet", "--end-of-options",
+                    f"{ref}^{{commit}}").rstrip("\n")
+    except GitError as exc:
+        raise GitError(f"'{ref}' isn't a git commit") from exc
+
+
+def _git(cwd: str, *args: str, binary: bool = False) -> Union[str, bytes]:
+    """Run a git command
+
+    Args:
+        cwd (str): directory to run git in
+        *args (str): git command and arguments
+        binary (bool, optional): Return the output as bytes rather than
+            text. Defaults to False.
+
+    Raises:
+        GitError: If git isn't installed, or the command fails
+
+    Returns:
+        Union[str, bytes]: the command's output
+    """
+    try:
+        result = subprocess.run(["git", *args], cwd=cwd, capture_output=True,
+                                text=not binary, check=False)
+    except FileNotFoundError as exc:
+        raise GitError("git isn't installed") from exc
+
+    if result.returncode != 0:
+        stderr = result.stderr.decode("utf-8", "replace") if binary else result.stderr
+        raise GitError(f"git {args[0]} failed: {stderr.strip()}")
+    return result.stdout
@@ -0,0 +1,6 @@
+"""Parser of C and C++ source code and Doxygen comments, and adapter of
+Doxygen XML output."""
+from doctopi.parser.cpp.cpp_parser import DOXYGEN, CppParser, parse_doxygen
+from doctopi.parser.cpp.doxygen_xml_adapter import DoxygenXmlAdapter
+
+__all__ = ["DOXYGEN", "CppParser", "DoxygenXmlAdapter", "parse_doxygen"]
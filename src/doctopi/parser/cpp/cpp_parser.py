@@ -0,0 +1,716 @@
+"""Parser of C and C++ source code and its Doxygen comments, without
+running Doxygen. The tokens of a file are scanned in a single pass, and
+each declaration is read with the Doxygen comment preceding it, or
+following it for `///<` comments. Only declarations are parsed:
+namespaces are flattened, and function bodies, initializers and values
+are skipped by matching brackets.
+"""
+# Built-in imports
+import os
+import re
+from typing import (Dict, List, NamedTuple, Optional, TextIO, Tuple, Union)
+
+# This package imports
+from doctopi.parser import Parser
+from doctopi.parser.cpp.tokenizer import tokenize
+from doctopi.parser.scanner import CLOSING, Token, TokenReader
+from doctopi.parser.walker import DirectoryWalker
+from doctopi.types import (AccessType, ClassDeclaration, DocDir, DocFile, Docstring,
+                           FunctionDeclaration, NameDescriptionType)
+
+DOXYGEN = "doxygen"
+"""Docstring style of C and C++ source code"""
+
+TYPE_KEYWORDS = ("class", "struct", "union", "enum")
+"""Keywords declaring a type"""
+
+SPECIFIERS = frozenset(["static", "inline", "virtual", "explicit", "constexpr", "consteval",
+                        "constinit", "extern", "friend", "mutable", "thread_local", "register"])
+"""Specifiers of a declaration, preceding its type"""
+
+ACCESS = {"public": AccessType.PUBLIC, "protected": AccessType.PROTECTED,
+          "private": AccessType.PRIVATE}
+"""Access type of each access specifier"""
+
+SKIPPED = frozenset(["typedef", "using", "friend", "static_assert", "template"])
+"""Keywords of declarations which aren't documented"""
+
+_ATTRIBUTES = ("__attribute__", "__declspec", "alignas")
+_FUNDAMENTAL = frozenset(["auto", "bool", "char", "double", "float", "int", "long", "short",
+                          "signed", "unsigned", "void", "wchar_t"])
+_BLOCK_MARGIN = re.compile(r"^[ \t]*(?:\*(?!/)[ \t]?)?", re.MULTILINE)
+_LINE_MARGIN = re.compile(r"^[ \t]*//[/!]<?[ \t]?", re.MULTILINE)
+_COMMAND = re.compile(r"^[ \t]*[\\@](\w+)(?:\[[^\]]*\]|\{[^}]*\})?(?:[ \t]+|$)(.*)$")
+_INLINE_COMMANDS = frozenset(["a", "anchor", "b", "c", "e", "em", "p", "ref", "n", "link",
+                              "endlink", "copydoc", "f"])
+_STRUCTURAL = re.compile(r"(?:^|\s)[\\@](?:mainpage|page|defgroup|addtogroup|class|struct|union"
+                         r"|enum|fn|var|def|namespace|typedef)\b")
+_FILE = re.compile(r"(?:^|\s)[\\@]file\b[^\n]*")
+_CODE_INLINE = re.compile(r"[\\@][cp][ \t]+([^\s,.;:)]+)")
+_EMPHASIS = re.compile(r"[\\@](?:a|b|e|em|ref)[ \t]+")
+_ESCAPE = re.compile(r"\\([\\@&$#<>%\".|])")
+
+
+class CppParser(Parser):
+    """Parser of C and C++ source code and its Doxygen comments, a
+    lightweight alternative to running Doxygen.
+
+    Classes, structs and unions are converted to ClassDeclarations, with
+    nested types as subclasses, and enums are converted to
+    ClassDeclarations with their enumerators as class variables. The
+    first constructor is the class's constructor, and any other
+    constructors are listed with its methods. Member access follows the
+    access specifiers, and static functions of a file are private.
+    Private fields and types are left out, since variables and classes
+    have no access type, as are a file's variables and definitions of
+    members declared elsewhere, e.g. `void Parser::parse() {}`. A
+    comment with the `\\file` command is the file's docstring.
+
+    Attributes:
+        docstring_style (str): docstring style, DOXYGEN
+    """
+    extensions = (".h", ".hh", ".hpp", ".hxx", ".c", ".cc", ".cpp", ".cxx")
+
+    def __init__(self, docstring_style: str = DOXYGEN):
+        """Constructor
+
+        Args:
+            docstring_style (str, optional): docstring style. Defaults
+                to DOXYGEN, the only style of C and C++ source code.
+        """
+        self.docstring_style = docstring_style
+
+    def parse_file(self, file: Union[str, bytes, os.PathLike]) -> DocFile:
+        """Parse a C or C++ file and return a doctopi.DocFile object
+        representing the contents/docstrings.
+
+        Args:
+            file (Union[str, bytes, os.PathLike]): File to parse
+
+        Returns:
+            DocFile: Representation of the file contents and docstrings
+        """
+        with open(file, encoding="utf-8", errors="replace") as stream:
+            return self.parse_stream(stream, os.path.abspath(file))
+
+    def parse_stream(self, stream: TextIO, path: str) -> DocFile:
+        """Parse C or C++ source code read from a stream, e.g. a member
+        of an archive, and return a doctopi.DocFile object representing
+        the contents/docstrings.
+
+        Args:
+            stream (TextIO): C or C++ source code
+            path (str): Path of the source code, used to name the file
+
+        Returns:
+            DocFile: Representation of the file contents and docstrings
+        """
+        # The types and functions of the file are collected like the
+        # nested types and methods of a class
+        reader = _Reader(stream.read())
+        scope = ClassDeclaration(name="", signature="", docstring=Docstring())
+        self._members(reader, scope, "", AccessType.PUBLIC)
+
+        # Keep the extension, as a header and its source share a name
+        return DocFile(
+            name=os.path.basename(os.fsdecode(path)),
+            path=path,
+            docstring=scope.docstring,
+            classes=scope.subclasses,
+            functions=scope.methods
+        )
+
+    def parse_dir(self, root: Union[str, bytes, os.PathLike]) -> DocDir:
+        """Walk a directory and parse the contents/docstrings of each C
+        and C++ file
+
+        Args:
+            root (Union[str, bytes, os.PathLike]): Source directory to
+                walk and parse.
+
+        Returns:
+            DocDir: Collection of DocFile and DocDirs  mapping the
+                provided directory to the doctopi documentation types.
+        """
+        return DirectoryWalker(self).walk(root)
+
+    def configuration(self) -> str:
+        """Describe the configuration of this parser, including the
+        docstring style
+
+        Returns:
+            str: parser configuration
+        """
+        return f"{super().configuration()}:{self.docstring_style}"
+
+    def _members(self, reader: "_Reader", owner: ClassDeclaration, kind: str,
+                 access: AccessType):
+        """Read the declarations of a scope, up to its closing brace or the
+        end of the source, into the class or file declaring them
+
+        Args:
+            reader (_Reader): tokens following the scope's opening brace
+            owner (ClassDeclaration): class declaring the members, or a
+                placeholder collecting the types and functions of a file
+            kind (str): keyword declaring the class, e.g. "struct", or ""
+                for a file or namespace
+            access (AccessType): access of the members until an access
+                specifier
+        """
+        doc = None
+        while (token := reader.take()) is not None:
+            if token.kind == "doc":
+                doc = self._comment(owner, token)
+                continue
+
+            if token.text == "}":
+                return
+            if token.text in ACCESS and reader.peek() is not None and reader.peek().text == ":":
+                reader.take()
+                access = ACCESS[token.text]
+            elif token.text != ";":
+                tokens, end = reader.header(token)
+                if end is not None and end.text in ACCESS:
+                    # A macro without a semicolon preceded the access specifier
+                    reader.take()
+                    access = ACCESS[end.text]
+                elif not self._member(reader, owner, _Header(tokens, end, doc, kind, access)):
+                    return
+            doc = None
+
+    def _comment(self, owner: ClassDeclaration, token: Token) -> Optional[Token]:
+        """Sort out a Doxygen comment preceding a declaration: a `\\file`
+        comment is the file's docstring, and a comment which documents
+        something else by name, like `\\class`, or follows a declaration,
+        like `///<`, doesn't document the next declaration.
+
+        Args:
+            owner (ClassDeclaration): class or file containing the
+                comment
+            token (Token): Doxygen comment
+
+        Returns:
+            Optional[Token]: the comment if it documents the next
+                declaration
+        """
+        if _FILE.search(token.text):
+            if not owner.name:
+                owner.docstring = parse_doxygen(_FILE.sub("", token.text))
+            return None
+        if _STRUCTURAL.search(token.text) or _is_trailing(token):
+            return None
+        return token
+
+    def _member(self, reader: "_Reader", owner: ClassDeclaration, header: "_Header") -> bool:
+        """Read a declaration into the class or file declaring it
+
+        Args:
+            reader (_Reader): tokens following the declaration's header
+            owner (ClassDeclaration): class or file declaring the member
+            header (_Header): declaration's header
+
+        Returns:
+            bool: False if the scope ended
+        """
+        tokens, end = header.tokens, header.end
+        if end is None or end.text == "}":
+            return False
+
+        lead = _template(tokens)
+        words = [token.text for token in lead if token.kind == "word"]
+        keyword = _type_keyword(lead, end)
+        if keyword is not None:
+            declaration, ended = self._type(reader, header, keyword)
+            if declaration is not None and header.access != AccessType.PRIVATE:
+                owner.subclasses.append(declaration)
+            return not ended
+        if end.text == "{" and ("namespace" in words or words[:1] == ["extern"]):
+            # Namespaces and linkage specifications are flattened
+            self._members(reader, owner, "", AccessType.PUBLIC)
+            return True
+
+        # Undocumented declarations, e.g. forward declarations, are skipped
+        if lead and words[0] not in SKIPPED \
+                and not (words[0] in TYPE_KEYWORDS and end.text == ";"):
+            if end.text == "(" and lead[-1].kind == "word":
+                return self._function(reader, owner, header)
+            if end.text in ("=", ";", "{") and len(words) > 1:
+                return self._fields(reader, owner, header)
+        return reader.statement(end)
+
+    def _type(self, reader: "_Reader", header: "_Header",
+              keyword: Tuple[int, str]) -> Tuple[Optional[ClassDeclaration], bool]:
+        """Read a class, struct, union or enum definition
+
+        Args:
+            reader (_Reader): tokens following the { of the type's body
+            header (_Header): type's header
+            keyword (Tuple[int, str]): index of the keyword declaring
+                the type in the header, and the keyword
+
+        Returns:
+            Tuple[Optional[ClassDeclaration], bool]: the type, or None if
+                it's anonymous, and True if the scope declaring it ended
+                instead
+        """
+        tokens = header.tokens
+        index, kind = keyword
+        name = _type_name(_template(tokens)[index + 1:])
+        declaration = ClassDeclaration(
+            name=name,
+            signature=reader.text(tokens[0].start, tokens[-1].end),
+            docstring=parse_doxygen(header.doc.text) if header.doc else Docstring()
+        )
+        if kind == "enum":
+            self._enumerators(reader, declaration)
+        else:
+            self._members(reader, declaration, kind,
+                          AccessType.PRIVATE if kind == "class" else AccessType.PUBLIC)
+
+        # Variables may be declared with the type, e.g. typedef struct {} name;
+        ended = False
+        if reader.peek() is not None and reader.peek().text != ";":
+            more, end = reader.header(reader.take())
+            names = [token.text for token in more if token.kind == "word"]
+            if not declaration.name and tokens[0].text == "typedef" and names:
+                declaration.name = names[-1]
+            ended = not reader.statement(end)
+        return (declaration if declaration.name else None), ended
+
+    def _enumerators(self, reader: "_Reader", owner: ClassDeclaration):
+        """Read the enumerators of an enum as class variables
+
+        Args:
+            reader (_Reader): tokens following the { of the enum's body
+            owner (ClassDeclaration): enum
+        """
+        doc = None
+        while (token := reader.take()) is not None and token.text != "}":
+            if token.kind == "doc":
+                if _is_trailing(token) and owner.class_variables:
+                    owner.class_variables[-1].description = _summary(token)
+                else:
+                    doc = token
+            elif token.kind == "word":
+                owner.class_variables.append(NameDescriptionType(
+                    name=token.text,
+                    type=owner.name,
+                    description=_summary(doc) if doc else ""
+                ))
+                doc = None
+                if reader.peek() is not None and reader.peek().text == "=":
+                    reader.take()
+                    reader.expression(generics=False)
+            elif token.text in CLOSING:
+                reader.skip(token)
+
+    def _function(self, reader: "_Reader", owner: ClassDeclaration, header: "_Header") -> bool:
+        """Read a function declaration or definition
+
+        Args:
+            reader (_Reader): tokens following the ( of the parameters
+            owner (ClassDeclaration): class or file declaring the
+                function
+            header (_Header): function's header, up to its parameters
+
+        Returns:
+            bool: False if the scope ended
+        """
+        tokens, end = header.tokens, header.end
+        lead = _template(tokens)
+        name = lead[-1].text
+        returns = _return_type(reader, lead[:-1])
+        constructor = bool(header.kind) and name == owner.name
+        if not returns and not constructor and name != f"~{owner.name}" and "::" not in name \
+                and not name.startswith("operator"):
+            # Not a function, e.g. a macro
+            reader.skip(end)
+            return True
+
+        closing = reader.skip(end)
+        last, token = reader.qualifiers(closing)
+        if token is not None and token.text == "{":
+            reader.skip(token)
+        if "::" in name:
+            # A member defined outside of its class is documented by its declaration
+            return token is None or token.text != "}"
+
+        # Static functions of a file have internal linkage
+        access = header.access
+        if not header.kind and any(token.text == "static" for token in lead):
+            access = AccessType.PRIVATE
+        function = FunctionDeclaration(
+            name=name,
+            signature=reader.text(tokens[0].start, last.end),
+            access=access,
+            docstring=_function_docstring(reader.doc(header.doc),
+                                          reader.source[end.end:closing.start], returns)
+        )
+        if constructor and owner.constructor is None:
+            owner.constructor = function
+        else:
+            owner.methods.append(function)
+        return token is None or token.text != "}"
+
+    def _fields(self, reader: "_Reader", owner: ClassDeclaration, header: "_Header") -> bool:
+        """Read a field declaration, declaring one or more fields
+
+        Args:
+            reader (_Reader): tokens following the field's header
+            owner (ClassDeclaration): class or file declaring the fields
+            header (_Header): field's header, up to its first value or ;
+
+        Returns:
+            bool: False if the scope ended
+        """
+        tokens, end = header.tokens, header.end
+        names = _declarators(tokens)
+        type_name = _return_type(reader, _template(tokens[:tokens.index(names[0])]))
+        while end is not None and end.text in ("=", "{"):
+            if end.text == "{":
+                reader.skip(end)
+            end = reader.expression()
+            if end is not None and end.text == ",":
+                more, end = reader.header(reader.take())
+                names.extend(_declarators(more))
+
+        # A file's variables aren't documented
+        if header.kind and header.access != AccessType.PRIVATE:
+            doc = reader.doc(header.doc)
+            static = any(token.text == "static" for token in tokens)
+            for name in names:
+                (owner.class_variables if static else owner.member_variables).append(
+                    NameDescriptionType(name=name.text, type=type_name,
+                                        description=_summary(doc) if doc else ""))
+        return end is None or end.text != "}"
+
+
+def parse_doxygen(comment: str, params: Dict[str, str] = None, returns: str = "") -> Docstring:
+    """Parse a Doxygen comment. Its brief and detailed descriptions are
+    the summary, and its `\\param`, `\\return` and `\\throws` commands
+    (or `@param`, `@return` and `@throws`) are the arguments, returns and
+    raises. `\\code` blocks are kept as indented code blocks.
+
+    Args:
+        comment (str): Doxygen comment, a `/** */` or `/*! */` block or
+            `///` or `//!` lines
+        params (Dict[str, str], optional): type of each parameter of the
+            documented declaration. Defaults to None.
+        returns (str, optional): return type of the documented
+            declaration. Defaults to "".
+
+    Returns:
+        Docstring: doctopi representation of the comment
+    """
+    params = params or {}
+    if comment.startswith("/*"):
+        text = _BLOCK_MARGIN.sub("", comment[3:-2].lstrip("<"))
+    else:
+        text = _LINE_MARGIN.sub("", comment)
+
+    description, commands = _paragraphs(text)
+    docstring = Docstring(summary=_text(description).strip())
+    retvals = []
+    for command, lines in commands:
+        name, text = ("", " ".join(lines)) if command in ("return", "returns", "result") \
+            else (" ".join(lines).split(None, 1) + ["", ""])[:2]
+        text = " ".join(_text([text]).split())
+        if command == "param":
+            docstring.args.append(NameDescriptionType(name=name, type=params.get(name, ""),
+                                                      description=text))
+        elif command == "tparam":
+            docstring.args.append(NameDescriptionType(name=f"<{name}>", description=text))
+        elif command in ("return", "returns", "result"):
+            docstring.returns = NameDescriptionType(type=returns, description=text)
+        elif command == "retval":
+            retvals.append(f"`{name}` {text}".strip())
+        elif command in ("throw", "throws", "exception"):
+            docstring.raises.append(NameDescriptionType(type=name, description=text))
+
+    # Return values extend the description of the returns
+    if retvals:
+        docstring.returns = docstring.returns or NameDescriptionType(type=returns)
+        docstring.returns.description = "; ".join(
+            [docstring.returns.description] * bool(docstring.returns.description) + retvals)
+    return docstring
+
+
+def _paragraphs(text: str) -> Tuple[List[str], List[Tuple[str, List[str]]]]:
+    """Split the text of a Doxygen comment into its description and its
+    commands. `\\code` blocks are indented, and inline commands are left
+    in the text.
+
+    Args:
+        text (str): comment, without its margin
+
+    Returns:
+        Tuple[List[str], List[Tuple[str, List[str]]]]: lines of the
+            description, and each command with the lines of its paragraph
+    """
+    # Lines are added to the description, or to the last command
+    description: List[str] = []
+    commands: List[Tuple[str, List[str]]] = []
+    lines, code = description, False
+    for line in text.splitlines():
+        match = _COMMAND.match(line)
+        command = match.group(1) if match else ""
+        if code:
+            code = command != "endcode"
+            lines.append(f"    {line}" if code else "")
+        elif command == "code":
+            code = True
+            lines.append("")
+        elif command in ("brief", "short", "details"):
+            lines = description
+            lines.append(match.group(2))
+        elif command and command not in _INLINE_COMMANDS:
+            commands.append((command, [match.group(2)]))
+            lines = commands[-1][1]
+        elif not line.strip() and lines is not description:
+            # A blank line ends a command's paragraph
+            lines = description
+            lines.append("")
+        else:
+            lines.append(line)
+    return description, commands
+
+
+class _Header(NamedTuple):
+    """Tokens of a declaration up to its parameters, body, value or ;,
+    the token ending them, its Doxygen comment, the kind of class
+    declaring it and its access"""
+    tokens: List[Token]
+    end: Optional[Token]
+    doc: Optional[Token]
+    kind: str
+    access: AccessType
+
+
+class _Reader(TokenReader):
+    """Cursor over the tokens of C or C++ source code, as they're scanned"""
+
+    def __init__(self, source: str):
+        """Constructor"""
+        super().__init__(source, tokenize(source))
+
+    def header(self, token: Optional[Token]) -> Tuple[List[Token], Optional[Token]]:
+        """Read the tokens of a declaration up to the first bracket, = or
+        ; outside template arguments, or an access specifier. Attributes
+        are skipped, and an operator's symbols are part of its name.
+
+        Returns:
+            Tuple[List[Token], Optional[Token]]: the tokens, from `token`,
+                and the token ending them, or None at the end
+        """
+        tokens, angles = [], 0
+        while token is not None:
+            following = self.peek()
+            if _is_attribute(token, following):
+                self.skip(token if token.text == "[" else self.take())
+            elif token.text.rpartition("::")[2] == "operator":
+                tokens.append(self.operator(token))
+            elif not angles and (token.text in ("(", "{", "}", ";", "=") or token.text in ACCESS
+                                 and following is not None and following.text == ":"):
+                return tokens, token
+            elif token.kind != "doc":
+                angles = max(angles + (token.text == "<") - (token.text == ">"), 0)
+                tokens.append(token)
+            token = self.take()
+        return tokens, None
+
+    def doc(self, doc: Optional[Token]) -> Optional[Token]:
+        """Get the Doxygen comment of a declaration which was just read:
+        the comment preceding it, or else a trailing comment following it
+
+        Args:
+            doc (Optional[Token]): comment preceding the declaration
+
+        Returns:
+            Optional[Token]: the comment, or None if it isn't documented
+        """
+        if doc is None and self.peek() is not None and _is_trailing(self.peek()):
+            return self.take()
+        return doc
+
+    def operator(self, token: Token) -> Token:
+        """Read the symbols of an operator's name, following `operator`,
+        possibly qualified"""
+        pieces, last = [], token
+        if self.peek() is not None and self.peek().text == "(":
+            pieces, last = ["(", ")"], self.skip(self.take())
+        while self.peek() is not None and self.peek().text not in ("(", ";", "{", "}"):
+            last = self.take()
+            pieces.append(last.text)
+        name = f"{token.text} {' '.join(pieces)}" if pieces and pieces[0][0].isalpha() \
+            else f"{token.text}{''.join(pieces)}"
+        return Token("word", name, token.start, last.end)
+
+    def qualifiers(self, closing: Token) -> Tuple[Token, Optional[Token]]:
+        """Read the qualifiers following a function's parameters, e.g.
+        const, noexcept or = 0, up to its body or ;. A constructor's
+        initializer list is skipped.
+
+        Returns:
+            Tuple[Token, Optional[Token]]: the last qualifier, or the )
+                closing the parameters, and the { of the body, the ;,
+                or None at the end
+        """
+        last, token = closing, self.take()
+        while token is not None and token.text not in ("{", ";", "}"):
+            if token.text == ":":
+                previous = token
+                while (token := self.take()) is not None and token.text != ";" and not (
+                        token.text == "{" and previous.kind != "word" and previous.text != ">"):
+                    previous = self.skip(token) if token.text in CLOSING else token
+                break
+            last = self.skip(token) if token.text in CLOSING else token
+            token = self.take()
+        return last, token
+
+    def statement(self, end: Optional[Token]) -> bool:
+        """Skip the rest of a statement, following the token ending its
+        header. A block, e.g. the body following a macro, ends it.
+
+        Returns:
+            bool: False if the scope ended
+        """
+        if end is None or end.text == "}":
+            return end is None
+        if end.text in CLOSING:
+            self.skip(end)
+        if end.text in ("(", "[", "="):
+            self.expression()
+        return True
+
+
+def _function_docstring(doc: Optional[Token], parameters: str, returns: str) -> Docstring:
+    """Parse the Doxygen comment of a function, with the types of its
+    parameters and its return type
+
+    Args:
+        doc (Optional[Token]): function's comment, or None
+        parameters (str): source code of the function's parameters
+        returns (str): function's return type
+
+    Returns:
+        Docstring: doctopi representation of the comment, or an empty
+            docstring if there's no comment
+    """
+    if doc is None:
+        return Docstring()
+    return parse_doxygen(doc.text,
+                         {name: type_name for type_name, name in _parameters(parameters)},
+                         "" if returns == "void" else returns)
+
+
+def _is_attribute(token: Token, following: Optional[Token]) -> bool:
+    """Check whether a token starts an attribute, e.g. [[nodiscard]] or
+    __attribute__((packed))"""
+    if following is None:
+        return False
+    return token.text == "[" and following.text == "[" \
+        or token.text in _ATTRIBUTES and following.text == "("
+
+
+def _template(tokens: List[Token]) -> List[Token]:
+    """Get the tokens of a declaration following its template
+    parameters"""
+    index = 0
+    while index < len(tokens) and tokens[index].text == "template":
+        depth, index = 0, index + 1
+        while index < len(tokens):
+            depth += (tokens[index].text == "<") - (tokens[index].text == ">")
+            index += 1
+            if not depth:
+                break
+    return tokens[index:]
+
+
+def _type_keyword(tokens: List[Token], end: Token) -> Optional[Tuple[int, str]]:
+    """Find the keyword defining a type with a body, and its index"""
+    if end.text != "{":
+        return None
+    for index, token in enumerate(tokens):
+        if token.text in TYPE_KEYWORDS:
+            return index, token.text
+    return None
+
+
+def _type_name(tokens: List[Token]) -> str:
+    """Get the name of a type from the tokens following its keyword, or ""
+    for an anonymous type"""
+    names = []
+    for token in tokens:
+        if token.text in (":", "<"):
+            break
+        if token.kind == "word" and token.text not in ("class", "struct", "final"):
+            names.append(token.text)
+    return names[-1] if names else ""
+
+
+def _return_type(reader: _Reader, tokens: List[Token]) -> str:
+    """Get the type preceding a name, following the specifiers"""
+    tokens = [token for token in tokens if token.text not in SPECIFIERS]
+    return reader.text(tokens[0].start, tokens[-1].end) if tokens else ""
+
+
+def _declarators(tokens: List[Token]) -> List[Token]:
+    """Get the name of each field of a field declaration"""
+    names, name, angles, width = [], None, 0, False
+    for token in tokens:
+        if token.text == "," and not angles:
+            names.append(name)
+            width = False
+        elif token.text == ":" and not angles:
+            # Bit-field width
+            width = True
+        elif token.kind == "word" and not width:
+            name = token
+        angles = max(angles + (token.text == "<") - (token.text == ">"), 0)
+    return [token for token in names + [name] if token is not None]
+
+
+def _parameters(text: str) -> List[Tuple[str, str]]:
+    """Split a parameter list into the type and name of each named
+    parameter"""
+    parameters, depth, start = [], 0, 0
+    for index, char in enumerate(f"{text},"):
+        if char in "<([{":
+            depth += 1
+        elif char in ">)]}":
+            depth -= 1
+        elif char == "," and depth <= 0:
+            parameter = _parameter(text[start:index])
+            if parameter is not None:
+                parameters.append(parameter)
+            start = index + 1
+    return parameters
+
+
+def _parameter(text: str) -> Optional[Tuple[str, str]]:
+    """Get the type and name of a parameter, without its default value"""
+    text = re.sub(r"//[^\n]*|/\*.*?\*/", " ", text, flags=re.DOTALL)
+    text = " ".join(re.split(r"\s*=\s*", text, maxsplit=1)[0].split())
+    match = re.match(r"^(.*?[\w&*>\].])\s*\b([^\W\d]\w*)\s*((?:\[[^\]]*\])*)$", text)
+    if match is None or match.group(2) in _FUNDAMENTAL or not match.group(1).strip() \
+            or match.group(1).strip() in ("const", "volatile", "struct", "enum", "unsigned"):
+        return None
+    return f"{match.group(1).strip()}{match.group(3)}", match.group(2)
+
+
+def _is_trailing(token: Token) -> bool:
+    """Check if a token is a Doxygen comment documenting the preceding
+    declaration, e.g. `///<`"""
+    return token.kind == "doc" and token.text[3:4] == "<"
+
+
+def _summary(doc: Token) -> str:
+    """Get the summary of a Doxygen comment"""
+    return parse_doxygen(doc.text).summary
+
+
+def _text(lines: List[str]) -> str:
+    """Convert the inline commands and escapes of Doxygen text"""
+    text = _CODE_INLINE.sub(r"`\1`", "\n".join(lines))
+    text = _EMPHASIS.sub("", text).replace("\\n ", "\n").replace("@n ", "\n")
+    return re.sub(r"\n[ \t]*\n(?:[ \t]*\n)+", "\n\n", _ESCAPE.sub(r"\1", text))
@@ -0,0 +1,559 @@
+"""Adapter to convert Doxygen XML output to doctopi types. Used to
+document C and C++ source code which Doxygen already parsed, e.g. in a
+build, without scanning the source code again. Each compound XML file
+is read incrementally, and each element is cleared once it's converted
+or skipped, so memory stays bounded however large the XML output is.
+"""
+# Built-in imports
+from dataclasses import dataclass, field
+import io
+import os
+from typing import (BinaryIO, Dict, List, Optional, TextIO, Union)
+from xml.etree import ElementTree
+
+# This package imports
+from doctopi.parser import Parser
+from doctopi.parser.cpp.cpp_parser import DOXYGEN
+from doctopi.parser.walker import DirectoryWalker
+from doctopi.types import (AccessType, ClassDeclaration, DocDir, DocFile, Docstring,
+                           FunctionDeclaration, NameDescriptionType)
+
+CLASS_KINDS = frozenset(["class", "struct", "union", "interface", "exception"])
+"""Kinds of compounds documented as a class"""
+
+SCOPE_KINDS = frozenset(["file", "namespace"])
+"""Kinds of compounds documented as a file, with their functions and
+enums"""
+
+PEEK_SIZE = 4096
+"""Bytes peeked at the start of an archive member, enough to reach its
+compounddef"""
+
+_ACCESS = {"public": AccessType.PUBLIC, "protected": AccessType.PROTECTED,
+           "private": AccessType.PRIVATE, "package": AccessType.PROTECTED}
+_FUNCTIONS = frozenset(["function", "signal", "slot"])
+_INLINE = {"bold": ("**", "**"), "emphasis": ("*", "*"), "computeroutput": ("`", "`")}
+
+# Children of a compound which are converted once they're read. Any
+# other child is skipped, and cleared while it's read.
+_KEPT = frozenset(["compoundname", "basecompoundref", "templateparamlist", "briefdescription",
+                   "detaileddescription"])
+
+
+class DoxygenXmlAdapter(Parser):
+    """Adapter of the XML output of Doxygen to doctopi types, e.g. of a
+    build which already runs Doxygen. Each compound XML file is a
+    DocFile: a class, struct or union is a DocFile with its
+    ClassDeclaration, and a file or namespace is a DocFile with its
+    functions and enums. Nested classes are DocFiles of their own, like
+    Doxygen's compounds. Other compounds, e.g. directories and pages,
+    private nested classes and the index aren't documented, and are left
+    out of a directory walk.
+
+    Members are converted like CppParser: enums are ClassDeclarations
+    with their enumerators as class variables, the first constructor is
+    the class's constructor, and static functions of a file or namespace
+    are private. Private fields and types, a file's or namespace's
+    variables, typedefs, friends and macros are left out.
+
+    Attributes:
+        docstring_style (str): docstring style, DOXYGEN
+    """
+    extensions = (".xml",)
+
+    def __init__(self, docstring_style: str = DOXYGEN):
+        """Constructor
+
+        Args:
+            docstring_style (str, optional): docstring style. Defaults
+                to DOXYGEN, the only style of Doxygen XML output.
+        """
+        self.docstring_style = docstring_style
+
+    def parse_file(self, file: Union[str, bytes, os.PathLike]) -> DocFile:
+        """Parse a Doxygen compound XML file and return a doctopi.DocFile
+        object representing the contents/docstrings.
+
+        Args:
+            file (Union[str, bytes, os.PathLike]): File to parse
+
+        Raises:
+            xml.etree.ElementTree.ParseError: If the file isn't XML
+
+        Returns:
+            DocFile: Representation of the compound and its docstrings
+        """
+        with open(file, "rb") as stream:
+            return self._parse(stream, os.path.abspath(file))
+
+    def parse_stream(self, stream: TextIO, path: str) -> DocFile:
+        """Parse a Doxygen compound XML file read from a stream, e.g. a
+        member of an archive, and return a doctopi.DocFile object
+        representing the contents/docstrings.
+
+        Args:
+            stream (TextIO): Doxygen XML
+            path (str): Path of the XML, used to name the file
+
+        Raises:
+            xml.etree.ElementTree.ParseError: If the stream isn't XML
+
+        Returns:
+            DocFile: Representation of the compound and its docstrings
+        """
+        return self._parse(stream, path)
+
+    def parse_dir(self, root: Union[str, bytes, os.PathLike]) -> DocDir:
+        """Walk a Doxygen XML output directory and parse the
+        contents/docstrings of each compound XML file
+
+        Args:
+            root (Union[str, bytes, os.PathLike]): XML output directory
+                to walk and parse.
+
+        Returns:
+            DocDir: Collection of DocFile and DocDirs  mapping the
+                provided directory to the doctopi documentation types.
+        """
+        return DirectoryWalker(self).walk(root)
+
+    def accepts(self, path: str) -> bool:
+        """Check if an XML file is a compound documented as a DocFile: a
+        class, file or namespace, but not a private nested class. Only
+        the start of the XML is read, up to its compounddef.
+
+        Args:
+            path (str): path of the file
+
+        Returns:
+            bool: True if the file is parsed and documented
+        """
+        if not super().accepts(path):
+            return False
+
+        try:
+            with open(path, "rb") as stream:
+                return _is_documented(stream)
+        except OSError:
+            return True  # Reported when it's parsed
+
+    def accepts_stream(self, path: str, stream: io.BufferedReader) -> bool:
+        """Check if an XML file read from a stream, e.g. a member of an
+        archive, is a compound documented as a DocFile. Only the start
+        of the stream is peeked at, up to its compounddef.
+
+        Args:
+            path (str): path of the file
+            stream (io.BufferedReader): contents of the file
+
+        Returns:
+            bool: True if the file is parsed and documented
+        """
+        if not super().accepts_stream(path, stream):
+            return False
+        return _is_documented(io.BytesIO(stream.peek(PEEK_SIZE)))
+
+    def configuration(self) -> str:
+        """Describe the configuration of this parser, including the
+        docstring style
+
+        Returns:
+            str: parser configuration
+        """
+        return f"{super().configuration()}:{self.docstring_style}"
+
+    def _parse(self, source: Union[BinaryIO, TextIO], path: str) -> DocFile:
+        """Read the compounds of Doxygen XML into a DocFile, as the XML is
+        parsed. Members are converted when their memberdef ends, and
+        compounds when their compounddef ends. Each element is then
+        cleared, and removed from its parent, along with everything
+        skipped.
+
+        Args:
+            source (Union[BinaryIO, TextIO]): Doxygen XML
+            path (str): Path of the XML, used to name the file
+
+        Returns:
+            DocFile: Representation of the compounds and their docstrings
+        """
+        doc_file = DocFile(name=os.path.splitext(os.path.basename(os.fsdecode(path)))[0],
+                           path=path,
+                           docstring=Docstring())
+        named, compound = False, None
+        stack: List[ElementTree.Element] = []
+        for event, element in ElementTree.iterparse(source, events=("start", "end")):
+            if event == "start":
+                if element.tag == "compounddef" and len(stack) == 1:
+                    compound = _Compound(element.get("kind", ""),
+                                         _ACCESS.get(element.get("prot"), AccessType.PUBLIC),
+                                         element.get("final") == "yes")
+                stack.append(element)
+                continue
+
+            stack.pop()
+            kept = False
+            if compound is not None and len(stack) == 3 and element.tag == "memberdef":
+                self._member(compound, element)
+            elif compound is not None and len(stack) == 2:
+                kept = compound.read(element)
+            elif compound is not None and len(stack) == 1:
+                # Files of several compounds are named after the first one
+                compound.write(doc_file, rename=not named)
+                named, compound = True, None
+
+            # Keep the children of elements which aren't converted yet
+            if len(stack) > 2 and (stack[2].tag in _KEPT or stack[3:4]
+                                   and stack[3].tag == "memberdef"):
+                continue
+            if not kept:
+                element.clear()
+            if stack:
+                stack[-1].clear()
+        return doc_file
+
+    def _member(self, compound: "_Compound", element: ElementTree.Element):
+        """Convert a memberdef into a member of its compound
+
+        Args:
+            compound (_Compound): compound declaring the member
+            element (ElementTree.Element): memberdef
+        """
+        kind = element.get("kind")
+        access = _ACCESS.get(element.get("prot"), AccessType.PUBLIC)
+        static = element.get("static") == "yes"
+        scope = compound.kind not in CLASS_KINDS
+        if kind in _FUNCTIONS:
+            # Static functions of a file or namespace have internal linkage
+            self._function(compound, element, AccessType.PRIVATE if scope and static else access)
+        elif kind == "enum" and access != AccessType.PRIVATE:
+            compound.declaration.subclasses.append(_enum(element))
+        elif kind == "variable" and not scope and access != AccessType.PRIVATE:
+            variable = NameDescriptionType(name=_plain(element.find("name")),
+                                           type=_plain(element.find("type")),
+                                           description=_summary(element))
+            declaration = compound.declaration
+            (declaration.class_variables if static else declaration.member_variables) \
+                .append(variable)
+
+    def _function(self, compound: "_Compound", element: ElementTree.Element,
+                  access: AccessType):
+        """Convert a function's memberdef into a method, constructor or
+        function of its compound
+
+        Args:
+            compound (_Compound): compound declaring the function
+            element (ElementTree.Element): function's memberdef
+            access (AccessType): function's access
+        """
+        name = _plain(element.find("name"))
+        returns = _plain(element.find("type"))
+        keywords = [keyword for keyword, declared in (
+            ("explicit", element.get("explicit") == "yes"),
+            ("static", element.get("static") == "yes"),
+            ("constexpr", element.get("constexpr") == "yes"),
+            ("virtual", element.get("virt") in ("virtual", "pure-virtual"))) if declared]
+        signature = " ".join(filter(None, [_template(element.find("templateparamlist"))]
+                                    + keywords + [returns, name]))
+        params = {_plain(param.find("declname")): _plain(param.find("type"))
+                  for param in element.iter("param") if param.find("declname") is not None}
+        function = FunctionDeclaration(
+            name=name,
+            signature=signature + " ".join(_plain(element.find("argsstring")).split()),
+            access=access,
+            docstring=_docstring(_descriptions(element), params,
+                                 "" if returns == "void" else returns)
+        )
+
+        declaration = compound.declaration
+        if compound.kind in CLASS_KINDS and name == declaration.name \
+                and declaration.constructor is None:
+            declaration.constructor = function
+        else:
+            declaration.methods.append(function)
+
+
+@dataclass
+class _Compound:  # pylint: disable = too-many-instance-attributes
+    """A compound as it's read, with its members collected like the
+    members of a class
+
+    Attributes:
+        kind (str): kind of compound, e.g. "class" or "file"
+        name (str): qualified name of the compound, e.g. "geo::Shape"
+        access (AccessType): access of the compound, in its outer class
+        final (bool): whether the class is final
+        declaration (ClassDeclaration): compound and its members
+        template (str): template parameters of the class, or ""
+        bases (List[str]): base classes of the class
+        descriptions (List[ElementTree.Element]): brief and detailed
+            descriptions of the compound
+    """
+    kind: str
+    access: AccessType
+    final: bool
+    name: str = ""
+    declaration: ClassDeclaration = field(default_factory=lambda: ClassDeclaration(
+        name="", signature="", docstring=Docstring()))
+    template: str = ""
+    bases: List[str] = field(default_factory=list)
+    descriptions: List[ElementTree.Element] = field(default_factory=list)
+
+    def read(self, element: ElementTree.Element) -> bool:
+        """Read a child of the compounddef, other than its members
+
+        Args:
+            element (ElementTree.Element): child of the compounddef
+
+        Returns:
+            bool: True if the element is kept until the compound is
+                written, rather than cleared once it's read
+        """
+        if element.tag == "compoundname":
+            # Classes are named without the namespaces and classes declaring them
+            self.name = _plain(element)
+            self.declaration.name = self.name.rpartition("::")[2] \
+                if self.kind in CLASS_KINDS else self.name
+        elif element.tag == "basecompoundref":
+            virtual = " virtual" if element.get("virt", "non-virtual") != "non-virtual" else ""
+            self.bases.append(f"{element.get('prot', 'public')}{virtual} {_plain(element)}")
+        elif element.tag == "templateparamlist":
+            self.template = _template(element)
+        elif element.tag in ("briefdescription", "detaileddescription"):
+            self.descriptions.append(element)
+            return True
+        return False
+
+    def write(self, doc_file: DocFile, rename: bool):
+        """Add the compound to the DocFile of its XML file
+
+        Args:
+            doc_file (DocFile): DocFile of the XML file
+            rename (bool): name the DocFile after the compound
+        """
+        declaration = self.declaration
+        docstring = _docstring(self.descriptions)
+        for description in self.descriptions:
+            description.clear()
+        if rename and self.name:
+            doc_file.name = os.path.splitext(self.name)[0] if self.kind == "file" else self.name
+
+        if self.kind in CLASS_KINDS and self.access != AccessType.PRIVATE:
+            declaration.signature = " ".join(filter(None, [
+                self.template, self.kind, declaration.name, "final" * self.final]))
+            if self.bases:
+                declaration.signature += f" : {', '.join(self.bases)}"
+            declaration.docstring = docstring
+            doc_file.classes.append(declaration)
+        elif self.kind in SCOPE_KINDS:
+            doc_file.docstring = doc_file.docstring if doc_file.docstring.summary else docstring
+            doc_file.classes.extend(declaration.subclasses)
+            doc_file.functions.extend(declaration.methods)
+
+
+def _is_documented(stream: BinaryIO) -> bool:
+    """Read the start of Doxygen XML, up to its compounddef, to check if
+    it's a class, file or namespace, but not a private nested class
+
+    Args:
+        stream (BinaryIO): Doxygen XML
+
+    Returns:
+        bool: True if the compound is documented as a DocFile, or if the
+            XML can't be read, so the error is reported when it's parsed
+    """
+    try:
+        for _, element in ElementTree.iterparse(stream, events=("start",)):
+            if element.tag == "compounddef":
+                return element.get("kind") in CLASS_KINDS | SCOPE_KINDS \
+                    and element.get("prot") != "private"
+            # e.g. the index, whose root is doxygenindex
+            if element.tag != "doxygen":
+                return False
+    except ElementTree.ParseError:
+        return True
+    return False
+
+
+def _enum(element: ElementTree.Element) -> ClassDeclaration:
+    """Convert an enum's memberdef into a ClassDeclaration, with its
+    enumerators as class variables
+
+    Args:
+        element (ElementTree.Element): enum's memberdef
+
+    Returns:
+        ClassDeclaration: the enum
+    """
+    name = _plain(element.find("name"))
+    underlying = _plain(element.find("type"))
+    signature = "enum class" if element.get("strong") == "yes" else "enum"
+    return ClassDeclaration(
+        name=name,
+        signature=f"{signature} {name} : {underlying}" if underlying else f"{signature} {name}",
+        docstring=_docstring(_descriptions(element)),
+        class_variables=[NameDescriptionType(name=_plain(value.find("name")),
+                                             type=name,
+                                             description=_summary(value))
+                         for value in element.iter("enumvalue")]
+    )
+
+
+def _template(element: Optional[ElementTree.Element]) -> str:
+    """Get the template declaration of a templateparamlist
+
+    Args:
+        element (Optional[ElementTree.Element]): templateparamlist, or
+            None
+
+    Returns:
+        str: the template declaration, e.g. "template <typename T>", or
+            "" if it isn't a template
+    """
+    if element is None:
+        return ""
+    params = []
+    for param in element.iter("param"):
+        text = " ".join(filter(None, [_plain(param.find("type")), _plain(param.find("declname"))]))
+        default = _plain(param.find("defval"))
+        params.append(f"{text} = {default}" if default else text)
+    return f"template <{', '.join(params)}>"
+
+
+def _docstring(descriptions: List[Optional[ElementTree.Element]],
+               params: Dict[str, str] = None, returns: str = "") -> Docstring:
+    """Convert the brief and detailed descriptions of a compound or
+    member. Their paragraphs are the summary, and their `\\param`,
+    `\\return` and `\\throws` sections are the arguments, returns and
+    raises.
+
+    Args:
+        descriptions (List[Optional[ElementTree.Element]]):
+            briefdescription and detaileddescription, or None if missing
+        params (Dict[str, str], optional): type of each parameter of the
+            documented declaration. Defaults to None.
+        returns (str, optional): return type of the documented
+            declaration. Defaults to "".
+
+    Returns:
+        Docstring: doctopi representation of the descriptions
+    """
+    params = params or {}
+    blocks: List[str] = []
+    sections: List[ElementTree.Element] = []
+    for description in descriptions:
+        if description is not None:
+            _markdown(description, blocks, sections)
+
+    docstring = Docstring(summary="\n\n".join(blocks))
+    retvals = []
+    for section in sections:
+        kind = section.get("kind")
+        if section.tag == "simplesect":
+            if kind == "return":
+                docstring.returns = NameDescriptionType(type=returns, description=_line(section))
+            continue
+        for item in section.iter("parameteritem"):
+            text = _line(item.find("parameterdescription"))
+            for name in map(_plain, item.iter("parametername")):
+                if kind == "param":
+                    docstring.args.append(NameDescriptionType(
+                        name=name, type=params.get(name, ""), description=text))
+                elif kind == "templateparam":
+                    docstring.args.append(NameDescriptionType(name=f"<{name}>", description=text))
+                elif kind == "exception":
+                    docstring.raises.append(NameDescriptionType(type=name, description=text))
+                elif kind == "retval":
+                    retvals.append(f"`{name}` {text}".strip())
+
+    # Return values extend the description of the returns
+    if retvals:
+        docstring.returns = docstring.returns or NameDescriptionType(type=returns)
+        docstring.returns.description = "; ".join(
+            filter(None, [docstring.returns.description] + retvals))
+    return docstring
+
+
+def _descriptions(element: ElementTree.Element) -> List[Optional[ElementTree.Element]]:
+    """Get the brief and detailed descriptions of a member"""
+    return [element.find("briefdescription"), element.find("detaileddescription")]
+
+
+def _summary(element: ElementTree.Element) -> str:
+    """Get the summary of a member, e.g. a variable or enumerator"""
+    return _docstring(_descriptions(element)).summary
+
+
+def _markdown(element: ElementTree.Element, blocks: List[str],
+              sections: List[ElementTree.Element]):
+    """Convert the markup of the contents of a description, or of a
+    section of it, to Markdown blocks: a block
+    for each paragraph, list item and code block. Inline markup is
+    converted to Markdown, and parameter lists and sections, e.g.
+    `\\return`, are collected rather than converted.
+
+    Args:
+        element (ElementTree.Element): description, or a section of it
+        blocks (List[str]): Markdown blocks, to add to
+        sections (List[ElementTree.Element]): parameterlist and
+            simplesect elements, to add to
+    """
+    inline: List[str] = []
+
+    def flush():
+        """End the block of the inline text read so far"""
+        text = " ".join("".join(inline).split())
+        if text:
+            blocks.append(text)
+        inline.clear()
+
+    def convert(node: ElementTree.Element):
+        """Convert an element and its children"""
+        if node.tag in ("parameterlist", "simplesect"):
+            sections.append(node)
+            return
+        if node.tag == "programlisting":
+            flush()
+            blocks.append("\n".join(f"    {_text(line)}".rstrip()
+                                    for line in node.iter("codeline")))
+            return
+        if node.tag == "listitem":
+            flush()
+            inline.append("- ")
+        opening, closing = _INLINE.get(node.tag, ("[", f"]({node.get('url')})")
+                                       if node.tag == "ulink" else ("", ""))
+        inline.append(opening + (node.text or ""))
+        for child in node:
+            convert(child)
+            inline.append(child.tail or "")
+        inline.append(closing)
+        if node.tag in ("para", "listitem"):
+            flush()
+
+    inline.append(element.text or "")
+    for child in element:
+        convert(child)
+        inline.append(child.tail or "")
+    flush()
+
+
+def _line(element: Optional[ElementTree.Element]) -> str:
+    """Convert a description on a single line, e.g. of a parameter"""
+    if element is None:
+        return ""
+    blocks: List[str] = []
+    _markdown(element, blocks, [])
+    return " ".join(" ".join(blocks).split())
+
+
+def _plain(element: Optional[ElementTree.Element]) -> str:
+    """Get the text of an element and its children, e.g. of a type with
+    references, without surrounding whitespace"""
+    return _text(element).strip() if element is not None else ""
+
+
+def _text(element: ElementTree.Element) -> str:
+    """Get the text of an element and its children, with a space for
+    each <sp/>, e.g. of a line of code"""
+    return (element.text or "") + "".join(
+        (" " if child.tag == "sp" else "") + _text(child) + (child.tail or "")
+        for child in element)
@@ -0,0 +1,40 @@
+"""Single-pass tokenizer of C and C++ source code. The source is scanned
+once by a single regular expression. Whitespace, comments and
+preprocessor directives are dropped, while Doxygen comments are kept:
+`/** */` and `/*! */` blocks, and runs of consecutive `///` or `//!`
+lines. Literals, including raw strings, are kept whole so the brackets
+and semicolons inside them are never mistaken for the structure of the
+code.
+"""
+# Built-in imports
+import re
+from typing import Iterator
+
+# This package imports
+from doctopi.parser.scanner import Token
+
+_TOKENS = re.compile(r"""
+    (?P<doc>/\*[*!](?!/).*?\*/|(?:[ \t]*//[/!](?!/)[^\n]*(?:\n|$))+)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<directive>^[ \t]*\#(?:\\.|/\*.*?\*/|[^\n\\])*)
+  | (?P<literal>(?:u8|[uUL])?R"(?P<delimiter>[^(\s"\\]*)\(.*?\)(?P=delimiter)"
+        |(?:u8|[uUL])?"(?:\\.|[^"\\\n])*"|(?:u8|[uUL])?'(?:\\.|[^'\\\n])*'
+        |\.?\d(?:[eEpP][+-]|[\w.'])*)
+  | (?P<word>(?:::)?~?[^\W\d]\w*(?:::~?[^\W\d]\w*)*)
+  | (?P<symbol>\S)
+""", re.DOTALL | re.MULTILINE | re.VERBOSE)
+
+
+def tokenize(source: str) -> Iterator[Token]:
+    """Split C or C++ source code into tokens, as they're scanned
+
+    Args:
+        source (str): C or C++ source code
+
+    Yields:
+        Token: each token, in order, other than comments and
+            preprocessor directives
+    """
+    for match in _TOKENS.finditer(source):
+        if match.lastgroup not in ("comment", "directive"):
+            yield Token(match.lastgroup, match.group().strip(), match.start(), match.end())
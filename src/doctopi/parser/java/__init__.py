@@ -0,0 +1,4 @@
+"""Parser of Java source code and Javadoc comments."""
+from doctopi.parser.java.java_parser import JAVADOC, JavaParser, parse_javadoc
+
+__all__ = ["JAVADOC", "JavaParser", "parse_javadoc"]
@@ -0,0 +1,543 @@
+"""Parser of Java source code and its Javadoc comments. Rather than a Java
+grammar, the tokens of a file are read in a single pass and only its
+declarations are parsed: classes, interfaces, enums, records and
+annotation types, with their fields, constructors and methods. Method
+bodies, initializers and field values are skipped by matching brackets,
+so large source trees are parsed about as fast as they're read.
+"""
+# Built-in imports
+import html
+import os
+import re
+import textwrap
+from typing import (Dict, List, NamedTuple, Optional, TextIO, Tuple, Union)
+
+# This package imports
+from doctopi.parser import Parser
+from doctopi.parser.java.tokenizer import tokenize
+from doctopi.parser.scanner import CLOSING, Token, TokenReader
+from doctopi.parser.walker import DirectoryWalker
+from doctopi.types import (AccessType, ClassDeclaration, DocDir, DocFile, Docstring,
+                           FunctionDeclaration, NameDescriptionType)
+
+JAVADOC = "javadoc"
+"""Docstring style of Java source code"""
+
+TYPE_KEYWORDS = ("class", "interface", "enum", "record")
+"""Keywords declaring a type"""
+
+MODIFIERS = frozenset(["public", "protected", "private", "static", "final", "abstract",
+                       "default", "synchronized", "native", "transient", "volatile",
+                       "strictfp", "sealed"])
+"""Modifiers of a declaration, preceding its type"""
+
+ACCESS = {"public": AccessType.PUBLIC, "protected": AccessType.PROTECTED,
+          "private": AccessType.PRIVATE}
+"""Access type of each access modifier"""
+
+_MARGIN = re.compile(r"^[ \t]*(?:\*(?!/)[ \t]?)?", re.MULTILINE)
+_BLOCK_TAG = re.compile(r"^@(\w+)(?:\s+|$)(.*)$")
+_INLINE_TAG = re.compile(r"\{@(\w+)\s*([^{}]*)\}")
+_PRE = re.compile(r"<pre>\s*(?:\{@code\s(.*?)\}\s*|(.*?))</pre>", re.DOTALL | re.IGNORECASE)
+_CODE = re.compile(r"<code>(.*?)</code>", re.DOTALL | re.IGNORECASE)
+_BREAK = re.compile(r"</?p\s*>|<br\s*/?>", re.IGNORECASE)
+_LIST_ITEM = re.compile(r"<li>", re.IGNORECASE)
+_HTML_TAG = re.compile(r"</?[A-Za-z][^>]*>")
+_BLANK_LINES = re.compile(r"\n[ \t]*\n(?:[ \t]*\n)+")
+_ANNOTATION = re.compile(r"@(?!interface\b)[\w$.]+(?:\s*\([^()]*\))?")
+_COMMENT = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+
+
+class JavaParser(Parser):
+    """Parser of Java source code and its Javadoc comments.
+
+    Types are converted to ClassDeclarations, with inner types as
+    subclasses. The first constructor is the class's constructor, and any
+    other constructors are listed with its methods. Static fields and
+    enum constants are class variables, and instance fields and record
+    components are member variables. Package-private members are
+    protected, and members of interfaces are public unless they're
+    declared otherwise. Private fields and types are left out, as by
+    Javadoc, since variables and classes have no access type. The
+    Javadoc of a package-info.java file is the file's docstring.
+
+    Attributes:
+        docstring_style (str): docstring style, JAVADOC
+    """
+    extensions = (".java",)
+
+    def __init__(self, docstring_style: str = JAVADOC):
+        """Constructor
+
+        Args:
+            docstring_style (str, optional): docstring style. Defaults
+                to JAVADOC, the only style of Java source code.
+        """
+        self.docstring_style = docstring_style
+
+    def parse_file(self, file: Union[str, bytes, os.PathLike]) -> DocFile:
+        """Parse a Java file and return a doctopi.DocFile object
+        representing the contents/docstrings.
+
+        Args:
+            file (Union[str, bytes, os.PathLike]): File to parse
+
+        Returns:
+            DocFile: Representation of the file contents and docstrings
+        """
+        with open(file, encoding="utf-8", errors="replace") as stream:
+            return self.parse_stream(stream, os.path.abspath(file))
+
+    def parse_stream(self, stream: TextIO, path: str) -> DocFile:
+        """Parse Java source code read from a stream, e.g. a member of an
+        archive, and return a doctopi.DocFile object representing the
+        contents/docstrings.
+
+        Args:
+            stream (TextIO): Java source code
+            path (str): Path of the source code, used to name the file
+
+        Returns:
+            DocFile: Representation of the file contents and docstrings
+        """
+        # The top-level types are collected like the inner types of a class
+        reader = _Reader(stream.read())
+        package = ClassDeclaration(name="", signature="", docstring=Docstring())
+        self._members(reader, package, "")
+
+        return DocFile(
+            name=os.path.splitext(os.path.basename(os.fsdecode(path)))[0],
+            path=path,
+            docstring=package.docstring,
+            classes=package.subclasses,
+            functions=[]
+        )
+
+    def parse_dir(self, root: Union[str, bytes, os.PathLike]) -> DocDir:
+        """Walk a directory and parse the contents/docstrings of each
+        Java file
+
+        Args:
+            root (Union[str, bytes, os.PathLike]): Source directory to
+                walk and parse.
+
+        Returns:
+            DocDir: Collection of DocFile and DocDirs  mapping the
+                provided directory to the doctopi documentation types.
+        """
+        return DirectoryWalker(self).walk(root)
+
+    def configuration(self) -> str:
+        """Describe the configuration of this parser, including the
+        docstring style
+
+        Returns:
+            str: parser configuration
+        """
+        return f"{super().configuration()}:{self.docstring_style}"
+
+    def _members(self, reader: "_Reader", owner: ClassDeclaration, kind: str):
+        """Read the declarations of a class body, up to its closing brace,
+        into the class
+
+        Args:
+            reader (_Reader): tokens following the opening brace
+            owner (ClassDeclaration): class declaring the members, or a
+                placeholder collecting the types of a file
+            kind (str): keyword declaring the class, e.g. "interface" or
+                "@interface", or "" for a file
+        """
+        doc = None
+        while (token := reader.take()) is not None:
+            if token.kind == "doc":
+                doc = token
+                continue
+
+            if token.text == "}":
+                return
+            if token.text == "{":
+                # Instance initializer
+                reader.skip(token)
+            elif token.text != ";":
+                tokens, end = reader.header(token)
+                if not self._member(reader, owner, _Header(tokens, end, doc, kind)):
+                    return
+            doc = None
+
+    def _member(self, reader: "_Reader", owner: ClassDeclaration, header: "_Header") -> bool:
+        """Read a declaration into the class declaring it
+
+        Args:
+            reader (_Reader): tokens following the declaration's header
+            owner (ClassDeclaration): class declaring the member
+            header (_Header): declaration's header
+
+        Returns:
+            bool: False if the class body ended
+        """
+        tokens, end = header.tokens, header.end
+        if end is None or end.text == "}":
+            return False
+
+        words = [token.text for token in tokens if token.kind == "word"]
+        keyword = _type_keyword(tokens, end)
+        if keyword is not None:
+            declaration, ended = self._type(reader, header, keyword)
+            if declaration is not None and "private" not in words:
+                owner.subclasses.append(declaration)
+            return not ended
+        if end.text == "(" and tokens and tokens[-1].kind == "word":
+            return self._function(reader, owner, header)
+        if words[:1] == ["package"]:
+            owner.docstring = parse_javadoc(header.doc.text) if header.doc else Docstring()
+        elif end.text in ("=", ";") and len(words) > 1 and words[0] != "import":
+            return self._fields(reader, owner, header)
+        elif end.text in CLOSING:
+            # Static initializer, or a declaration that isn't understood
+            reader.skip(end)
+        elif end.text == "=":
+            reader.expression()
+        return True
+
+    def _type(self, reader: "_Reader", header: "_Header",
+              keyword: Tuple[int, str]) -> Tuple[Optional[ClassDeclaration], bool]:
+        """Read a class, interface, enum, record or annotation type
+
+        Args:
+            reader (_Reader): tokens following the type's header
+            header (_Header): type's header, up to the { of its body or
+                the ( of a record's components
+            keyword (Tuple[int, str]): index of the type's name in the
+                header, and the keyword declaring it
+
+        Returns:
+            Tuple[Optional[ClassDeclaration], bool]: the type, or None if
+                it has no body, and True if the body of the class
+                declaring it ended instead
+        """
+        tokens, end = header.tokens, header.end
+        index, kind = keyword
+        last, components = tokens[-1], []
+        if end.text == "(":
+            closing = reader.skip(end)
+            components = _parameters(reader.source[end.end:closing.start])
+            more, end = reader.header(reader.take())
+            last = more[-1] if more else closing
+        if end is None or end.text != "{":
+            return None, end is not None and end.text == "}"
+
+        types = {name: type_name for type_name, name in components}
+        docstring = parse_javadoc(header.doc.text, types) if header.doc else Docstring()
+        declaration = ClassDeclaration(
+            name=tokens[index].text,
+            signature=reader.text(tokens[0].start, last.end),
+            docstring=docstring,
+            member_variables=[
+                NameDescriptionType(name=name, type=type_name, description=next(
+                    (arg.description for arg in docstring.args if arg.name == name), ""))
+                for type_name, name in components
+            ]
+        )
+        if kind != "enum" or self._constants(reader, declaration):
+            self._members(reader, declaration, kind)
+        return declaration, False
+
+    def _constants(self, reader: "_Reader", owner: ClassDeclaration) -> bool:
+        """Read the constants of an enum as class variables
+
+        Args:
+            reader (_Reader): tokens following the { of the enum's body
+            owner (ClassDeclaration): enum
+
+        Returns:
+            bool: True if the enum declares other members after its
+                constants
+        """
+        doc = None
+        while (token := reader.take()) is not None:
+            if token.text in (";", "}"):
+                return token.text == ";"
+            if token.kind == "doc":
+                doc = token
+            elif token.text == "@":
+                reader.annotation()
+            elif token.kind == "word":
+                owner.class_variables.append(NameDescriptionType(
+                    name=token.text,
+                    type=owner.name,
+                    description=parse_javadoc(doc.text).summary if doc else ""
+                ))
+                doc = None
+            elif token.text in CLOSING:
+                # Arguments or body of the constant
+                reader.skip(token)
+        return False
+
+    def _function(self, reader: "_Reader", owner: ClassDeclaration, header: "_Header") -> bool:
+        """Read a constructor, method or annotation element
+
+        Args:
+            reader (_Reader): tokens following the ( of the parameters
+            owner (ClassDeclaration): class declaring the function
+            header (_Header): function's header, up to its parameters
+
+        Returns:
+            bool: False if the class body ended
+        """
+        tokens, end = header.tokens, header.end
+        closing = reader.skip(end)
+        parameters = _parameters(reader.source[end.end:closing.start])
+
+        # The throws clause is part of the signature, the default value
+        # of an annotation element and the body aren't
+        last, token = closing, reader.take()
+        while token is not None and token.text not in ("{", ";", "}"):
+            if token.text == "default":
+                token = reader.expression()
+                break
+            last, token = token, reader.take()
+        if token is not None and token.text == "{":
+            reader.skip(token)
+
+        name = tokens[-1].text
+        returns = _type_name(reader, tokens[:-1])
+        docstring = Docstring()
+        if header.doc:
+            docstring = parse_javadoc(header.doc.text,
+                                      {name: type_name for type_name, name in parameters},
+                                      "" if returns == "void" else returns)
+        function = FunctionDeclaration(
+            name=name,
+            signature=reader.text(tokens[0].start, last.end),
+            access=_access(tokens, header.kind),
+            docstring=docstring
+        )
+
+        # A constructor is named after its class, and has no return type
+        if header.kind and name == owner.name and not returns and owner.constructor is None:
+            owner.constructor = function
+        else:
+            owner.methods.append(function)
+        return token is None or token.text != "}"
+
+    def _fields(self, reader: "_Reader", owner: ClassDeclaration, header: "_Header") -> bool:
+        """Read a field declaration, declaring one or more fields
+
+        Args:
+            reader (_Reader): tokens following the field's header
+            owner (ClassDeclaration): class declaring the fields
+            header (_Header): field's header, up to its first value or ;
+
+        Returns:
+            bool: False if the class body ended
+        """
+        tokens, end = header.tokens, header.end
+        names = _declarators(tokens)
+        type_name = _type_name(reader, tokens[:tokens.index(names[0])])
+        while end is not None and end.text == "=":
+            end = reader.expression()
+            if end is not None and end.text == ",":
+                more, end = reader.header(reader.take())
+                names.extend(_declarators(more))
+
+        words = [token.text for token in tokens if token.kind == "word"]
+        if "private" not in words:
+            static = "static" in words or header.kind in ("interface", "@interface")
+            description = parse_javadoc(header.doc.text).summary if header.doc else ""
+            for name in names:
+                (owner.class_variables if static else owner.member_variables).append(
+                    NameDescriptionType(name=name.text, type=type_name, description=description))
+        return end is None or end.text != "}"
+
+
+def parse_javadoc(comment: str, params: Dict[str, str] = None, returns: str = "") -> Docstring:
+    """Parse a Javadoc comment. Its description is the summary, and its
+    @param, @return and @throws (or @exception) tags are the arguments,
+    returns and raises. HTML and inline tags are converted to text, with
+    code as inline code and preformatted text as indented code blocks.
+
+    Args:
+        comment (str): Javadoc comment, including the /** and */
+        params (Dict[str, str], optional): type of each parameter of the
+            documented declaration. Defaults to None.
+        returns (str, optional): return type of the documented
+            declaration. Defaults to "".
+
+    Returns:
+        Docstring: doctopi representation of the comment
+    """
+    params = params or {}
+    description, tags = [], []
+    for line in _MARGIN.sub("", comment[3:-2]).splitlines():
+        match = _BLOCK_TAG.match(line)
+        if match:
+            tags.append([match.group(1), match.group(2)])
+        elif tags:
+            tags[-1][1] += f"\n{line}"
+        else:
+            description.append(line)
+
+    docstring = Docstring(summary=_text("\n".join(description)))
+    for tag, text in tags:
+        name, text = ("", text) if tag == "return" else (text.split(None, 1) + ["", ""])[:2]
+        text = " ".join(_text(text).split())
+        if tag == "param":
+            docstring.args.append(NameDescriptionType(name=name, type=params.get(name, ""),
+                                                      description=text))
+        elif tag == "return":
+            docstring.returns = NameDescriptionType(type=returns, description=text)
+        elif tag in ("throws", "exception"):
+            docstring.raises.append(NameDescriptionType(type=name, description=text))
+    return docstring
+
+
+class _Header(NamedTuple):
+    """Tokens of a declaration up to its parameters, body, value or ;,
+    the token ending them, its Javadoc and the kind of class declaring
+    it"""
+    tokens: List[Token]
+    end: Optional[Token]
+    doc: Optional[Token]
+    kind: str
+
+
+class _Reader(TokenReader):
+    """Cursor over the tokens of Java source code, as they're scanned"""
+
+    def __init__(self, source: str):
+        """Constructor"""
+        super().__init__(source, tokenize(source))
+
+    def annotation(self):
+        """Skip the name and arguments of an annotation, following its @"""
+        self.take()
+        if self.peek() is not None and self.peek().text == "(":
+            self.skip(self.take())
+
+    def header(self, token: Optional[Token]) -> Tuple[List[Token], Optional[Token]]:
+        """Read the tokens of a declaration up to the first bracket, = or
+        ; outside type arguments. Annotations are skipped.
+
+        Returns:
+            Tuple[List[Token], Optional[Token]]: the tokens, from `token`,
+                and the token ending them, or None at the end
+        """
+        tokens, angles = [], 0
+        while token is not None:
+            if token.text == "@" and (self.peek() is None or self.peek().text != "interface"):
+                self.annotation()
+            elif angles == 0 and token.text in ("(", "{", "}", ";", "="):
+                return tokens, token
+            elif token.kind != "doc":
+                angles = max(angles + (token.text == "<") - (token.text == ">"), 0)
+                tokens.append(token)
+            token = self.take()
+        return tokens, None
+
+
+def _type_keyword(tokens: List[Token], end: Token) -> Optional[Tuple[int, str]]:
+    """Find the keyword declaring a type, and the index of the type's name"""
+    for index, token in enumerate(tokens[:-1]):
+        if token.text in TYPE_KEYWORDS and tokens[index + 1].kind == "word" \
+                and (token.text != "record" or end.text == "("):
+            kind = "@interface" if index and tokens[index - 1].text == "@" else token.text
+            return index + 1, kind
+    return None
+
+
+def _access(tokens: List[Token], kind: str) -> AccessType:
+    """Get the access type of a member of a kind of class"""
+    for token in tokens:
+        if token.text in ACCESS:
+            return ACCESS[token.text]
+    return AccessType.PUBLIC if kind in ("interface", "@interface") else AccessType.PROTECTED
+
+
+def _type_name(reader: _Reader, tokens: List[Token]) -> str:
+    """Get the type preceding a name, following the modifiers and type
+    parameters"""
+    index = 0
+    while index < len(tokens):
+        if tokens[index].text in MODIFIERS:
+            index += 1
+        elif tokens[index].text == "<":
+            depth = 0
+            while index < len(tokens):
+                depth += (tokens[index].text == "<") - (tokens[index].text == ">")
+                index += 1
+                if not depth:
+                    break
+        else:
+            break
+    return reader.text(tokens[index].start, tokens[-1].end) if index < len(tokens) else ""
+
+
+def _declarators(tokens: List[Token]) -> List[Token]:
+    """Get the name of each field of a field declaration"""
+    names, name, angles = [], None, 0
+    for token in tokens:
+        if token.text == "," and not angles:
+            names.append(name)
+        elif token.kind == "word":
+            name = token
+        angles = max(angles + (token.text == "<") - (token.text == ">"), 0)
+    return [token for token in names + [name] if token is not None]
+
+
+def _parameters(text: str) -> List[Tuple[str, str]]:
+    """Split a parameter list into the type and name of each parameter"""
+    text = _ANNOTATION.sub(" ", _COMMENT.sub(" ", text))
+    parameters, depth, start = [], 0, 0
+    for index, char in enumerate(f"{text},"):
+        if char in "<([":
+            depth += 1
+        elif char in ">)]":
+            depth -= 1
+        elif char == "," and depth <= 0:
+            words = [word for word in text[start:index].split() if word != "final"]
+            if len(words) > 1 and words[-1] != "this":
+                parameters.append((" ".join(words[:-1]), words[-1].rstrip("[]")))
+            start = index + 1
+    return parameters
+
+
+def _text(text: str) -> str:
+    """Convert Javadoc text to plain text, keeping code and preformatted
+    text"""
+    pieces, start = [], 0
+    for match in _PRE.finditer(text):
+        code = match.group(1) if match.group(1) is not None else match.group(2)
+        code = textwrap.dedent(html.unescape(_HTML_TAG.sub("", code))).strip("\n")
+        pieces.extend([_inline(text[start:match.start()]),
+                       "\n\n" + textwrap.indent(code, "    ") + "\n\n"])
+        start = match.end()
+    pieces.append(_inline(text[start:]))
+    return _BLANK_LINES.sub("\n\n", "".join(pieces)).strip()
+
+
+def _inline(text: str) -> str:
+    """Convert the HTML and inline tags of Javadoc text"""
+    pieces, start = [], 0
+    for match in _INLINE_TAG.finditer(text):
+        pieces.extend([_html(text[start:match.start()]), _inline_tag(*match.groups())])
+        start = match.end()
+    pieces.append(_html(text[start:]))
+    return "".join(pieces)
+
+
+def _inline_tag(tag: str, text: str) -> str:
+    """Convert an inline tag, e.g. {@code x} or {@link Type#member label}"""
+    text = " ".join(text.split())
+    if tag in ("link", "linkplain"):
+        target, _, label = text.partition(" ")
+        return label or f"`{target.lstrip('#').replace('#', '.')}`"
+    if tag in ("code", "value") and text:
+        return f"`{text}`"
+    return text if tag == "literal" else ""
+
+
+def _html(text: str) -> str:
+    """Convert the HTML of Javadoc text"""
+    text = _CODE.sub(lambda match: f"`{match.group(1)}`", text)
+    text = _BREAK.sub("\n\n", _LIST_ITEM.sub("\n- ", text))
+    return html.unescape(_HTML_TAG.sub("", text))
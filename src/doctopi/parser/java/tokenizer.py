@@ -0,0 +1,34 @@
+"""Single-pass tokenizer of Java source code. The whole source is scanned
+once by a single regular expression: whitespace and comments are
+dropped, Javadoc comments are kept, and literals are kept whole so the
+braces, parentheses and semicolons inside them are never mistaken for
+the structure of the code.
+"""
+# Built-in imports
+import re
+from typing import Iterator
+
+# This package imports
+from doctopi.parser.scanner import Token
+
+_TOKENS = re.compile(r"""
+    (?P<doc>/\*\*(?!/).*?\*/)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<literal>\"\"\".*?(?<!\\)\"\"\"|"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'|\.?\d[\w.]*)
+  | (?P<word>(?:[^\W\d]|\$)[\w$]*(?:\.(?:[^\W\d]|\$)[\w$]*)*)
+  | (?P<symbol>\S)
+""", re.DOTALL | re.VERBOSE)
+
+
+def tokenize(source: str) -> Iterator[Token]:
+    """Split Java source code into tokens, as they're scanned
+
+    Args:
+        source (str): Java source code
+
+    Yields:
+        Token: each token, in order, other than comments
+    """
+    for match in _TOKENS.finditer(source):
+        if match.lastgroup != "comment":
+            yield Token(match.lastgroup, match.group(), match.start(), match.end())
@@ -7,17 +7,15 @@ needing to see the details of the doctopi.parser package or any
 configuration packages like docstring_parser.common.DocstringStyle.
 """
 
-# Third-party imports
-from docstring_parser.common import DocstringStyle
-
 # This package imports
-from doctopi.parser.python import DocspecAdapter
 from doctopi.parser import Parser
 
 
 # pylint: disable-next = invalid-name
 def ParserFactory(language: str = "python", style: str = "google") -> Parser:
-    """Factory Method to get a source code parser.
+    """Factory Method to get a source code parser. Parsers are plugins
+    from the doctopi.registry, created on first use and shared per
+    language and style.
 
     Args:
         language (str, optional): programming language.
@@ -25,25 +23,14 @@ def ParserFactory(language: str = "python", style: str = "google") -> Parser:
         style (str, optional): source code docstring style/flavor.
             Defaults to "google".
 
+    Raises:
+        ValueError: If there's no parser for the language and style
+
     Returns:
         Parser: Parser subclass specific to the provided language and
         parser type.
     """
+    # The registry reads package metadata, so only import it when a parser is needed
+    from doctopi.registry import registry  # pylint: disable = import-outside-toplevel
 
-    parsers = {
-        "cpp": {},
-        "java": {},
-        "python": {
-            "auto": DocspecAdapter(DocstringStyle.AUTO),
-            "epydoc": DocspecAdapter(DocstringStyle.EPYDOC),
-            "google": DocspecAdapter(DocstringStyle.GOOGLE),
-            "numpy": DocspecAdapter(DocstringStyle.NUMPYDOC),
-            "rest": DocspecAdapter(DocstringStyle.REST),
-            "sphinx": DocspecAdapter(DocstringStyle.REST),
-        }
-    }
-
-    try:
-        return parsers[language][style]
-    except KeyError as exc:
-        raise ValueError(f"No matching parser for language={language}, style={style}") from exc
+    return registry().parser(language, style)
@@ -5,7 +5,7 @@ docstrings.
 # Built-in imports
 import logging
 import os
-from typing import (Callable, List, Union)
+from typing import (Callable, List, TextIO, Union)
 
 # Third-party imports
 import docspec
@@ -16,6 +16,7 @@ from docstring_parser import parse
 
 # This package imports
 from doctopi.parser import Parser
+from doctopi.parser.walker import DirectoryWalker
 from doctopi.types import (ClassDeclaration, DocDir, DocFile, Docstring,
                            FunctionDeclaration, NameDescriptionType, AccessType)
 
@@ -87,6 +88,7 @@ class DocspecAdapter(Parser):
             Use the DocstringStyle enum to toggle which type of
             docstring format to parse.
     """
+    extensions = (".py",)
 
     def __init__(self, docstring_style: DocstringStyle):
         """Constructor
@@ -109,17 +111,41 @@ class DocspecAdapter(Parser):
             DocFile: Representation of the file contents and docstrings
         """
         # Parse the module
-        module: Module = parse_python_module(file)
+        return self._to_doc_file(parse_python_module(file), os.path.abspath(file))
 
+    def parse_stream(self, stream: TextIO, path: str) -> DocFile:
+        """Parse Python source code read from a stream, e.g. a member of
+        an archive, and return a doctopi.DocFile object representing the
+        contents/docstrings.
+
+        Args:
+            stream (TextIO): Python source code
+            path (str): Path of the source code, used to name the module
+
+        Returns:
+            DocFile: Representation of the file contents and docstrings
+        """
+        return self._to_doc_file(parse_python_module(stream, filename=path), path)
+
+    def _to_doc_file(self, module: Module, path: str) -> DocFile:
+        """Convert a module parsed by docspec to a doctopi.DocFile
+
+        Args:
+            module (Module): Python module
+            path (str): Path of the module
+
+        Returns:
+            DocFile: Representation of the file contents and docstrings
+        """
         # docspec_python converts __init__ files to the name of the
         # package, which makes sense but doesn't work for this adapter
-        if file.endswith("__init__.py"):
+        if path.endswith("__init__.py"):
             module.name = "__init__"
 
         # Instantiate and return a DocFile using helper methods
         return DocFile(
             name=module.name,
-            path=os.path.abspath(file),
+            path=path,
             docstring=self._get_module_docstring(module),
             classes=self._get_module_classes(module),
             functions=self._get_module_functions(module)
@@ -137,32 +163,16 @@ class DocspecAdapter(Parser):
             DocDir: Collection of DocFile and DocDirs  mapping the
                 provided directory to the doctopi documentation types.
         """
-        # Get all of the items in the root directory
-        entries = os.listdir(root)
-
-        # Initialize lists of DocDir (subdirectories) and DocFiles (modules)
-        dirs = []
-        modules = []
-
-        # Check the type of each item in the root directory
-        for entry in entries:
-            full_path = os.path.join(root, entry)
-
-            # Recursively parse the subdirectory
-            if os.path.isdir(full_path):
-                dirs.append(self.parse_dir(full_path))
-
-            # Parse Python modules
-            elif os.path.isfile(full_path) and full_path.endswith(".py"):
-                modules.append(self.parse_file(full_path))
-
-        # Instantiate and return a DocDir representing the root
-        return DocDir(
-            name=os.path.basename(os.path.normpath(root)),
-            path=os.path.abspath(root),
-            files=modules,
-            subdirs=dirs
-        )
+        return DirectoryWalker(self).walk(root)
+
+    def configuration(self) -> str:
+        """Describe the configuration of this parser, including the
+        docstring style.
+
+        Returns:
+            str: parser configuration
+        """
+        return f"{super().configuration()}:{self.docstring_style.name}"
 
     def get_module_docstring(self, file: Union[str, bytes, os.PathLike]) -> Docstring:
         """Use the docspec adapter to parse a Python module and return
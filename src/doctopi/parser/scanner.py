@@ -0,0 +1,126 @@
+"""Tokens of source code, and a cursor reading them as they're scanned.
+Parsers which scan source code themselves, rather than adapting a
+third-party parser, read declarations through a TokenReader and skip
+everything else, e.g. function bodies, by matching brackets.
+"""
+# Built-in imports
+from typing import (Iterator, NamedTuple, Optional)
+
+CLOSING = {"(": ")", "[": "]", "{": "}"}
+"""Closing bracket of each opening bracket"""
+
+
+class Token(NamedTuple):
+    """A token of source code
+
+    Attributes:
+        kind (str): "doc" for a documentation comment, "word" for a
+            keyword or a possibly qualified identifier, "literal" for a
+            string, character or number literal, or "symbol" for any
+            other character
+        text (str): source text of the token
+        start (int): offset of the token in the source
+        end (int): offset following the token in the source
+    """
+    kind: str
+    text: str
+    start: int
+    end: int
+
+
+class TokenReader:
+    """Cursor over the tokens of source code, with one token of lookahead
+
+    Attributes:
+        source (str): source code
+    """
+
+    def __init__(self, source: str, tokens: Iterator[Token]):
+        """Constructor
+
+        Args:
+            source (str): source code
+            tokens (Iterator[Token]): tokens of the source code, e.g.
+                from a generator scanning it
+        """
+        self.source = source
+        self._tokens = tokens
+        self._peeked: Optional[Token] = None
+
+    def peek(self) -> Optional[Token]:
+        """Get the next token without reading it
+
+        Returns:
+            Optional[Token]: the next token, or None at the end
+        """
+        if self._peeked is None:
+            self._peeked = next(self._tokens, None)
+        return self._peeked
+
+    def take(self) -> Optional[Token]:
+        """Read the next token
+
+        Returns:
+            Optional[Token]: the next token, or None at the end
+        """
+        token = self.peek()
+        self._peeked = None
+        return token
+
+    def skip(self, opening: Token) -> Token:
+        """Skip to the bracket closing an opening bracket
+
+        Args:
+            opening (Token): (, [ or {, already read
+
+        Returns:
+            Token: the closing bracket, or the last token if it isn't
+                closed
+        """
+        closing, depth, last = CLOSING[opening.text], 1, opening
+        while (token := self.take()) is not None:
+            last = token
+            if token.text == opening.text:
+                depth += 1
+            elif token.text == closing:
+                depth -= 1
+                if not depth:
+                    break
+        return last
+
+    def expression(self, generics: bool = True) -> Optional[Token]:
+        """Skip a value, e.g. of a field, up to the , or ; following it.
+        The } closing the body containing it is left to be read.
+
+        Args:
+            generics (bool, optional): A , between < and > is part of
+                type arguments, rather than following the value. Defaults
+                to True.
+
+        Returns:
+            Optional[Token]: the , or ;, or None at a } or the end
+        """
+        depth = angles = 0
+        while (token := self.peek()) is not None:
+            if not depth and (token.text in (";", "}") or token.text == "," and not angles):
+                return self.take() if token.text != "}" else None
+            self.take()
+            if token.text in CLOSING:
+                depth += 1
+            elif token.text in (")", "]", "}"):
+                depth -= 1
+            elif generics and token.text in ("<", ">"):
+                angles = max(angles + (1 if token.text == "<" else -1), 0)
+        return None
+
+    def text(self, start: int, end: int) -> str:
+        """Get source code on a single line, e.g. a signature
+
+        Args:
+            start (int): offset of the code
+            end (int): offset following the code
+
+        Returns:
+            str: the code, with each run of whitespace replaced by a space
+        """
+        return " ".join(self.source[start:end].split())
@@ -0,0 +1,384 @@
+"""Parse source files in parallel worker processes, scheduling the most
+expensive files first so one large module at the end of a walk doesn't
+keep a worker busy long after the others are done. The cost of each
+file is estimated from its size, and from how long it took to parse in
+previous runs when a CostHistory is kept. Tiny files are parsed in
+chunks to cut the overhead of handing tasks to the workers.
+"""
+# Built-in imports
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+import io
+import json
+import logging
+import os
+import threading
+import time
+from typing import (Any, Dict, List, Optional, Sequence, Tuple, Union)
+
+# This package imports
+from doctopi.parser import Parser
+from doctopi.types import DocFile
+
+CHUNKS_PER_WORKER = 8
+"""Files estimated to cost less than 1/CHUNKS_PER_WORKER of a worker's
+share are parsed together in chunks"""
+
+DEFAULT_RATE = 1e-6
+"""Estimated seconds to parse a byte of source code, before any history"""
+
+
+class CostHistory:
+    """Parse timings of source files from previous runs, stored in a
+    small JSON file
+
+    Attributes:
+        path (Union[str, bytes, os.PathLike]): history file, or None to
+            keep the history in memory
+        timings (Dict[str, Tuple[int, float]]): map of absolute source
+            file path to its size and parse time in seconds
+    """
+
+    def __init__(self, path: Union[str, bytes, os.PathLike] = None):
+        """Constructor. Reads the history file, if it exists.
+
+        Args:
+            path (Union[str, bytes, os.PathLike], optional): history
+                file. Defaults to None.
+        """
+        self.path = path
+        self.timings: Dict[str, Tuple[int, float]] = {}
+
+        if path is not None and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as history_file:
+                    self.timings = {file: (int(size), float(seconds)) for file, (size, seconds)
+                                    in json.load(history_file)["files"].items()}
+            except (OSError, ValueError, KeyError, TypeError):
+                logging.warning("Ignoring unreadable parse history '%s'", path)
+
+    def rate(self) -> float:
+        """Estimate the seconds it takes to parse a byte of source code
+
+        Returns:
+            float: seconds per byte, averaged over the history
+        """
+        size = sum(size for size, _ in self.timings.values())
+        seconds = sum(seconds for _, seconds in self.timings.values())
+        return seconds / size if size and seconds else DEFAULT_RATE
+
+    def estimate(self, path: str, size: int, rate: float = None) -> float:
+        """Estimate how long a file will take to parse
+
+        Args:
+            path (str): absolute path of the source file
+            size (int): size of the source file, in bytes
+            rate (float, optional): seconds per byte for files without a
+                history. Defaults to None, averaging the history.
+
+        Returns:
+            float: estimated seconds
+        """
+        if path in self.timings:
+            recorded_size, seconds = self.timings[path]
+            # Scale the recorded time if the file has grown or shrunk
+            return seconds * size / recorded_size if recorded_size else seconds
+        return size * (self.rate() if rate is None else rate)
+
+    def record(self, path: str, size: int, seconds: float):
+        """Record how long a file took to parse
+
+        Args:
+            path (str): absolute path of the source file
+            size (int): size of the source file, in bytes
+            seconds (float): parse time
+        """
+        self.timings[path] = (size, seconds)
+
+    def save(self):
+        """Write the history file, if there is one"""
+        if self.path is None:
+            return
+
+        temp_path = f"{os.fsdecode(self.path)}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as history_file:
+            json.dump({"files": {path: list(timing) for path, timing
+                                 in sorted(self.timings.items())}}, history_file)
+        os.replace(temp_path, self.path)
+
+
+@dataclass
+class SchedulerStats:
+    """Worker utilization of a parallel parse
+
+    Attributes:
+        files (int): number of files parsed
+        tasks (int): number of tasks handed to the workers
+        workers (int): number of worker processes
+        seconds (float): wall time of the parse
+        busy (Dict[int, float]): seconds each worker, by process ID,
+            spent parsing
+    """
+    files: int = 0
+    tasks: int = 0
+    workers: int = 0
+    seconds: float = 0.0
+    busy: Dict[int, float] = field(default_factory=dict)
+
+    def utilization(self) -> float:
+        """Get the share of the workers' time spent parsing
+
+        Returns:
+            float: 0 to 1
+        """
+        if not self.seconds or not self.workers:
+            return 0.0
+        return min(1.0, sum(self.busy.values()) / (self.seconds * self.workers))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the metrics to JSON-serializable data, e.g. for a
+        profile
+
+        Returns:
+            Dict[str, Any]: the "seconds" of the parse, the number of
+                "files", "tasks" and "workers", the "utilization" of the
+                workers, and the "busy" seconds of each worker
+        """
+        return {"seconds": round(self.seconds, 6),
+                "files": self.files,
+                "tasks": self.tasks,
+                "workers": self.workers,
+                "utilization": round(self.utilization(), 3),
+                "busy": sorted(round(seconds, 6) for seconds in self.busy.values())}
+
+
+def plan(costs: Dict[str, float], workers: int) -> List[List[str]]:
+    """Group files into tasks, most expensive first. Files estimated to
+    cost less than a small share of a worker's time are chunked together.
+
+    Args:
+        costs (Dict[str, float]): estimated cost of each file
+        workers (int): number of worker processes
+
+    Returns:
+        List[List[str]]: the files of each task, in the order to start
+            the tasks
+    """
+    chunk_cost = sum(costs.values()) / (max(workers, 1) * CHUNKS_PER_WORKER)
+    tasks: List[Tuple[float, List[str]]] = []
+    chunk: List[str] = []
+    chunk_total = 0.0
+
+    for path in sorted(costs, key=lambda path: (-costs[path], path)):
+        if costs[path] >= chunk_cost:
+            tasks.append((costs[path], [path]))
+            continue
+
+        chunk.append(path)
+        chunk_total += costs[path]
+        if chunk_total >= chunk_cost:
+            tasks.append((chunk_total, chunk))
+            chunk, chunk_total = [], 0.0
+
+    if chunk:
+        tasks.append((chunk_total, chunk))
+
+    # Sorting is stable, so the order of equally expensive tasks is kept
+    return [files for _, files in sorted(tasks, key=lambda task: -task[0])]
+
+
+class ParallelParser:  # pylint: disable = too-few-public-methods
+    """Parse source files in worker processes, most expensive first
+
+    Attributes:
+        parser (Parser): Parser used by each worker. It must be
+            picklable.
+        workers (int): number of worker processes
+        history (CostHistory): parse timings from previous runs, updated
+            with the timings of each parse
+        stats (SchedulerStats): worker utilization of the last parse
+    """
+
+    def __init__(self, parser: Parser, workers: int, history: CostHistory = None):
+        """Constructor
+
+        Args:
+            parser (Parser): Parser used by each worker.
+            workers (int): number of worker processes
+            history (CostHistory, optional): parse timings from previous
+                runs. Defaults to None, estimating costs from file sizes.
+        """
+        self.parser = parser
+        self.workers = workers
+        self.history = CostHistory() if history is None else history
+        self.stats = SchedulerStats()
+
+    def parse_files(self, paths: Sequence[str]) -> Dict[str, DocFile]:
+        """Parse source files in the worker processes, and record their
+        timings in the history
+
+        Args:
+            paths (Sequence[str]): absolute paths of the source files
+
+        Returns:
+            Dict[str, DocFile]: map of path to parsed file
+        """
+        sizes = {path: os.path.getsize(path) for path in paths}
+        rate = self.history.rate()
+        tasks = plan({path: self.history.estimate(path, size, rate)
+                      for path, size in sizes.items()}, self.workers)
+
+        self.stats = SchedulerStats(files=len(sizes), tasks=len(tasks), workers=self.workers)
+        start = time.perf_counter()
+        parsed: Dict[str, DocFile] = {}
+
+        with worker_pool(self.parser, self.workers) as pool:
+            # The pool hands out the tasks in the order they're submitted
+            for pid, results in pool.map(_parse_task, tasks):
+                for path, doc_file, seconds in results:
+                    parsed[path] = doc_file
+                    self.history.record(path, sizes[path], seconds)
+                    self.stats.busy[pid] = self.stats.busy.get(pid, 0.0) + seconds
+
+        self.stats.seconds = time.perf_counter() - start
+        self.history.save()
+        logging.info("Parsed %d files in %d tasks on %d workers in %.2fs, %.0f%% utilization",
+                     self.stats.files, self.stats.tasks, self.workers, self.stats.seconds,
+                     100 * self.stats.utilization())
+        return parsed
+
+
+def worker_pool(parser: Parser, workers: int) -> ProcessPoolExecutor:
+    """Start worker processes which parse source files with a parser
+
+    Args:
+        parser (Parser): Parser used by each worker. It must be
+            picklable.
+        workers (int): number of worker processes
+
+    Returns:
+        ProcessPoolExecutor: the workers, to run parse_source() or the
+            tasks of a ParallelParser
+    """
+    if WorkerPools.active is not None:
+        return WorkerPools.active.get(parser, workers)
+    return ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(parser,))
+
+
+class WorkerPools:
+    """Worker processes kept alive between parses, so a long running
+    process such as the daemon starts them once rather than for every
+    request. While a WorkerPools is entered, worker_pool() hands out its
+    pools, one per parser configuration and number of workers, and
+    shutting them down is left to the WorkerPools.
+
+    Attributes:
+        active (WorkerPools): the entered WorkerPools, or None
+        pools (Dict[Tuple[str, int], ProcessPoolExecutor]): map of
+            parser configuration and number of workers to their pool
+    """
+    active: Optional[WorkerPools] = None
+
+    def __init__(self):
+        """Constructor"""
+        self.pools: Dict[Tuple[str, int], ProcessPoolExecutor] = {}
+        self._lock = threading.Lock()
+
+    def get(self, parser: Parser, workers: int) -> ProcessPoolExecutor:
+        """Get the pool of a parser, starting it on first use
+
+        Args:
+            parser (Parser): Parser used by each worker. It must be
+                picklable.
+            workers (int): number of worker processes
+
+        Returns:
+            ProcessPoolExecutor: the workers. Shutting them down has no
+                effect until the WorkerPools is exited.
+        """
+        key = (parser.configuration(), workers)
+        with self._lock:
+            if key not in self.pools:
+                self.pools[key] = _KeptPool(workers, initializer=_init_worker,
+                                            initargs=(parser,))
+            return self.pools[key]
+
+    def __enter__(self) -> WorkerPools:
+        WorkerPools.active = self
+        return self
+
+    def __exit__(self, *exc_info):
+        WorkerPools.active = None
+        with self._lock:
+            for pool in self.pools.values():
+                pool.close()
+            self.pools = {}
+
+
+class _KeptPool(ProcessPoolExecutor):
+    """A pool of WorkerPools, shared by concurrent parses. Its users
+    shutting it down, including leaving a `with` block, is ignored, as
+    cancelling futures would cancel those of the other parses."""
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        """Ignored, see close()"""
+
+    def close(self):
+        """Shut the workers down, once the WorkerPools is exited"""
+        super().shutdown(wait=True)
+
+
+def parse_source(path: str, data: bytes, parser: Parser = None) -> Tuple[DocFile, float]:
+    """Parse the contents of a source file which were already read.
+    Parsers which can't parse streams read the file again.
+
+    Args:
+        path (str): absolute path of the source file
+        data (bytes): contents of the source file
+        parser (Parser, optional): Parser to use. Defaults to None, the
+            parser of a worker_pool() process.
+
+    Returns:
+        Tuple[DocFile, float]: the parsed file and its parse time
+    """
+    parser = _WORKER_PARSER if parser is None else parser
+    start = time.perf_counter()
+    try:
+        doc_file = parser.parse_stream(io.StringIO(data.decode("utf-8")), path)
+    except NotImplementedError:
+        doc_file = parser.parse_file(path)
+    return doc_file, time.perf_counter() - start
+
+
+_WORKER_PARSER: Parser = None
+"""The parser of a worker process, sent once when the worker starts"""
+
+
+def _init_worker(parser: Parser):
+    """Keep the parser of a worker process
+
+    Args:
+        parser (Parser): Parser used by the worker
+    """
+    global _WORKER_PARSER  # pylint: disable = global-statement
+    _WORKER_PARSER = parser
+
+
+def _parse_task(paths: List[str]) -> Tuple[int, List[Tuple[str, DocFile, float]]]:
+    """Parse the files of a task in a worker process
+
+    Args:
+        paths (List[str]): absolute paths of the source files
+
+    Returns:
+        Tuple[int, List[Tuple[str, DocFile, float]]]: the worker's
+            process ID, and the path, parsed file and parse time of each
+            file
+    """
+    results = []
+    for path in paths:
+        start = time.perf_counter()
+        doc_file = _WORKER_PARSER.parse_file(path)
+        results.append((path, doc_file, time.perf_counter() - start))
+    return os.getpid(), results
@@ -0,0 +1,201 @@
+"""The DirectoryWalker walks source code directories for a Parser,
+parsing each source file the Parser supports and reusing previously
+parsed files from a ParseCache. Directories are walked in sorted order,
+so the same tree produces the same documentation on every machine.
+"""
+# Built-in imports
+from __future__ import annotations
+import os
+from typing import (Callable, Dict, Iterator, Union, TYPE_CHECKING)
+
+# This package imports
+from doctopi.parser import Parser
+from doctopi.parser.archive import ArchiveReader, is_archive
+from doctopi.parser.cache import ParseCache, file_digest
+from doctopi.types import (DocDir, DocFile, Docstring)
+
+if TYPE_CHECKING:
+    from doctopi.parser.scheduler import ParallelParser
+
+
+class DirectoryWalker:
+    """Walk source code directories and parse each source file with a
+    Parser, reusing previously parsed files from a ParseCache.
+
+    Attributes:
+        parser (Parser): Parser used for each source file.
+        cache (ParseCache): Cache of parsed source files. If None,
+            every file is parsed.
+        select (Callable[[str], bool]): Filter of absolute source file
+            paths to parse. Files that aren't selected are replaced by
+            an empty DocFile. If None, every file is parsed.
+        pool (ParallelParser): Worker processes to parse the files of a
+            directory in before walking it. If None, files are parsed as
+            they're walked.
+    """
+
+    def __init__(self, parser: Parser, cache: ParseCache = None,
+                 select: Callable[[str], bool] = None, pool: ParallelParser = None):
+        """Constructor
+
+        Args:
+            parser (Parser): Parser used for each source file.
+            cache (ParseCache, optional): Cache of parsed source files.
+                Defaults to None.
+            select (Callable[[str], bool], optional): Filter of absolute
+                source file paths to parse. Defaults to None.
+            pool (ParallelParser, optional): Worker processes to parse
+                the files of a directory in. Defaults to None.
+        """
+        self.parser = parser
+        self.cache = cache
+        self.select = select
+        self.pool = pool
+        self._digests: Dict[str, str] = {}
+        self._parsed: Dict[str, DocFile] = {}
+
+    def parse(self, src: Union[str, bytes, os.PathLike]) -> Union[DocFile, DocDir]:
+        """Parse a source file, walk and parse a source directory, or
+        parse an archive or installed distribution with an ArchiveReader
+
+        Args:
+            src (Union[str, bytes, os.PathLike]): Source file or
+                directory, archive, or installed distribution name
+
+        Returns:
+            Union[DocFile, DocDir]: parsed source file or directory
+        """
+        if is_archive(src):
+            return ArchiveReader(self.parser, self.cache).parse(src)
+        if os.path.isfile(src):
+            return self.parse_file(src)
+
+        if self.pool is not None:
+            self.prefetch(src)
+        return self.walk(src)
+
+    def prefetch(self, src: Union[str, bytes, os.PathLike]):
+        """Parse the files a walk would parse in the worker pool, most
+        expensive first. Selected files which aren't cached are parsed.
+
+        Args:
+            src (Union[str, bytes, os.PathLike]): Source file or
+                directory
+        """
+        pending = []
+        for path in self.iter_sources(src):
+            if self.select is not None and not self.select(path):
+                continue
+            if self.cache is not None:
+                # Keep the digest until the walk reaches the file
+                self._digests[path] = self._digest(path)
+                if self.cache.get(path, self._digests[path]) is not None:
+                    continue
+            pending.append(path)
+
+        # Not worth starting the workers for a single file
+        if len(pending) > 1:
+            self._parsed.update(self.pool.parse_files(pending))
+
+    def parse_file(self, file: Union[str, bytes, os.PathLike]) -> DocFile:
+        """Parse a source file, unless it is cached and unchanged
+
+        Args:
+            file (Union[str, bytes, os.PathLike]): File to parse.
+
+        Returns:
+            DocFile: Representation of the file contents and docstrings.
+        """
+        path = os.path.abspath(file)
+
+        # Leave a placeholder for files that weren't selected
+        if self.select is not None and not self.select(path):
+            return DocFile(name=os.path.splitext(os.path.basename(path))[0],
+                           path=path,
+                           docstring=Docstring())
+
+        if self.cache is None:
+            return self._parsed.pop(path) if path in self._parsed else self.parser.parse_file(file)
+
+        digest = self._digest(path)
+        doc_file = self.cache.get(path, digest)
+        if doc_file is None:
+            doc_file = self._parsed.pop(path) if path in self._parsed \
+                else self.parser.parse_file(file)
+            self.cache.put(path, digest, doc_file)
+
+        return doc_file
+
+    def _digest(self, path: str) -> str:
+        """Get the digest of a source file, reusing the digest taken when
+        it was prefetched
+
+        Args:
+            path (str): absolute path of the source file
+
+        Returns:
+            str: digest of the parser configuration and file contents
+        """
+        if path in self._digests:
+            return self._digests.pop(path)
+        return file_digest(path, salt=self.parser.configuration())
+
+    def walk(self, root: Union[str, bytes, os.PathLike]) -> DocDir:
+        """Walk a directory and parse each source file the parser
+        accepts.
+
+        Args:
+            root (Union[str, bytes, os.PathLike]): Source directory to
+                walk and parse.
+
+        Returns:
+            DocDir: Collection of DocFile and DocDirs mapping the
+                provided directory to the doctopi documentation types.
+        """
+        # Initialize lists of DocDir (subdirectories) and DocFiles (modules)
+        dirs = []
+        modules = []
+
+        # Check the type of each item in the root directory
+        for entry in sorted(os.listdir(root)):
+            full_path = os.path.join(root, entry)
+
+            # Recursively parse the subdirectory
+            if os.path.isdir(full_path):
+                dirs.append(self.walk(full_path))
+
+            # Parse source files
+            elif os.path.isfile(full_path) and self.parser.accepts(full_path):
+                modules.append(self.parse_file(full_path))
+
+        # Instantiate and return a DocDir representing the root
+        return DocDir(
+            name=os.path.basename(os.path.normpath(root)),
+            path=os.path.abspath(root),
+            files=modules,
+            subdirs=dirs
+        )
+
+    def iter_sources(self, src: Union[str, bytes, os.PathLike]) -> Iterator[str]:
+        """List the source files the parser accepts, in the order they
+        are walked, without parsing them.
+
+        Args:
+            src (Union[str, bytes, os.PathLike]): Source file or
+                directory
+
+        Yields:
+            str: absolute path of each source file
+        """
+        if os.path.isfile(src):
+            yield os.path.abspath(src)
+            return
+
+        for entry in sorted(os.listdir(src)):
+            full_path = os.path.join(src, entry)
+
+            if os.path.isdir(full_path):
+                yield from self.iter_sources(full_path)
+
+            elif os.path.isfile(full_path) and self.parser.accepts(full_path):
+                yield os.path.abspath(full_path)
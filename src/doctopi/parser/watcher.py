@@ -0,0 +1,112 @@
+"""The SourceWatcher polls source code directories, and other files such
+as the INI config, for changes. Bursts of changes, e.g. an editor saving
+several files, are collected until the files stop changing.
+"""
+# Built-in imports
+import os
+import time
+from typing import (Callable, Dict, Iterable, Set, Tuple, Union)
+
+
+class SourceWatcher:
+    """Poll source files and other files for changes. A file has
+    changed when it is created, deleted, or its modification time or
+    size changes.
+
+    Attributes:
+        src (Union[str, bytes, os.PathLike]): Source file or directory
+            to watch.
+        extensions (Tuple[str, ...]): Extensions of the source files to
+            watch in `src`.
+        files (Tuple[str, ...]): Other files to watch, e.g. the INI
+            config. They don't need to exist.
+        interval (float): Seconds between polls.
+        debounce (float): Seconds the files must stop changing before
+            the changes are reported.
+        state (Dict[str, Tuple[int, int]]): map of watched file path to
+            modification time and size when it was last polled
+    """
+
+    # pylint: disable-next = too-many-arguments, too-many-positional-arguments
+    def __init__(self, src: Union[str, bytes, os.PathLike], extensions: Tuple[str, ...],
+                 files: Iterable[str] = (), interval: float = 0.5, debounce: float = 0.2):
+        """Constructor. Takes the first poll of the watched files.
+
+        Args:
+            src (Union[str, bytes, os.PathLike]): Source file or
+                directory to watch.
+            extensions (Tuple[str, ...]): Extensions of the source files
+                to watch in `src`.
+            files (Iterable[str], optional): Other files to watch.
+                Defaults to ().
+            interval (float, optional): Seconds between polls.
+                Defaults to 0.5.
+            debounce (float, optional): Seconds the files must stop
+                changing before the changes are reported. Defaults to
+                0.2.
+        """
+        self.src = src
+        self.extensions = extensions
+        self.files = tuple(os.path.abspath(file) for file in files)
+        self.interval = interval
+        self.debounce = debounce
+        self.state: Dict[str, Tuple[int, int]] = self.scan()
+
+    def scan(self) -> Dict[str, Tuple[int, int]]:
+        """Get the modification time and size of every watched file
+
+        Returns:
+            Dict[str, Tuple[int, int]]: map of absolute file path to
+                modification time (ns) and size
+        """
+        paths = list(self.files)
+        if os.path.isdir(self.src):
+            for dirpath, _, filenames in os.walk(self.src):
+                paths.extend(os.path.join(dirpath, filename) for filename in filenames
+                             if filename.endswith(self.extensions))
+        else:
+            paths.append(self.src)
+
+        state = {}
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            state[os.path.abspath(path)] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def poll(self) -> Set[str]:
+        """Poll the watched files once
+
+        Returns:
+            Set[str]: absolute paths of the files created, deleted or
+                changed since the last poll
+        """
+        state = self.scan()
+        changed = {path for path in state.keys() | self.state.keys()
+                   if state.get(path) != self.state.get(path)}
+        self.state = state
+        return changed
+
+    def wait(self, stop: Callable[[], bool] = None) -> Set[str]:
+        """Block until watched files change, and then stop changing for
+        the debounce period
+
+        Args:
+            stop (Callable[[], bool], optional): Checked between polls.
+                Stop waiting when it returns True. Defaults to None.
+
+        Returns:
+            Set[str]: absolute paths of the changed files. Empty if
+                stopped before anything changed.
+        """
+        changed: Set[str] = set()
+        while True:
+            time.sleep(self.debounce if changed else self.interval)
+            new_changes = self.poll()
+
+            if new_changes:
+                changed |= new_changes
+            elif changed or (stop is not None and stop()):
+                return changed
@@ -0,0 +1,218 @@
+"""Registry of DoctoPi plugins: source code parsers, docstring styles and
+Markdown commands. Plugins are discovered from package entry points, so
+other packages can add parsers or commands without changing DoctoPi:
+
+    [project.entry-points."doctopi.parsers"]
+    kotlin = "my_package.kotlin:KotlinParser"
+
+    [project.entry-points."doctopi.docstring_styles"]
+    "kotlin.kdoc" = "my_package.kotlin:KDOC"
+
+    [project.entry-points."doctopi.markdown_commands"]
+    examples = "my_package.markdown:MarkdownExamplesCommand"
+
+A parser entry point is called with the object loaded from a docstring
+style entry point named "<language>.<style>" to create the Parser. The
+entry point metadata is read when the registry is created, but a
+plugin's module is only imported when the plugin is first used.
+"""
+# Built-in imports
+import functools
+from importlib.metadata import EntryPoint, entry_points
+import threading
+from typing import (Any, Dict, Iterable, List, Tuple, Type)
+
+# This package imports
+from doctopi.parser import Parser
+
+PARSERS = "doctopi.parsers"
+"""Entry point group of Parser types, named by language"""
+
+DOCSTRING_STYLES = "doctopi.docstring_styles"
+"""Entry point group of docstring styles, named "<language>.<style>"."""
+
+MARKDOWN_COMMANDS = "doctopi.markdown_commands"
+"""Entry point group of Markdown commands, named as in the INI config"""
+
+BUILTINS: Dict[str, Dict[str, str]] = {
+    PARSERS: {
+        "cpp": "doctopi.parser.cpp:CppParser",
+        "doxygen_xml": "doctopi.parser.cpp:DoxygenXmlAdapter",
+        "java": "doctopi.parser.java:JavaParser",
+        "python": "doctopi.parser.python:DocspecAdapter",
+    },
+    DOCSTRING_STYLES: {
+        "cpp.auto": "doctopi.parser.cpp:DOXYGEN",
+        "cpp.doxygen": "doctopi.parser.cpp:DOXYGEN",
+        "doxygen_xml.auto": "doctopi.parser.cpp:DOXYGEN",
+        "doxygen_xml.doxygen": "doctopi.parser.cpp:DOXYGEN",
+        "java.auto": "doctopi.parser.java:JAVADOC",
+        "java.javadoc": "doctopi.parser.java:JAVADOC",
+        "python.auto": "docstring_parser.common:DocstringStyle.AUTO",
+        "python.epydoc": "docstring_parser.common:DocstringStyle.EPYDOC",
+        "python.google": "docstring_parser.common:DocstringStyle.GOOGLE",
+        "python.numpy": "docstring_parser.common:DocstringStyle.NUMPYDOC",
+        "python.rest": "docstring_parser.common:DocstringStyle.REST",
+        "python.sphinx": "docstring_parser.common:DocstringStyle.REST",
+    },
+    MARKDOWN_COMMANDS: {
+        "classes": "doctopi.formatter.markdown.cmd.class_command:MarkdownClassCommand",
+        "functions": "doctopi.formatter.markdown.cmd.function_command:MarkdownFunctionCommand",
+        "constructor":
+            "doctopi.formatter.markdown.cmd.class_attr_commands:MarkdownConstructorCommand",
+        "inner_classes":
+            "doctopi.formatter.markdown.cmd.class_command:MarkdownInnerClassCommand",
+        "class_variables":
+            "doctopi.formatter.markdown.cmd.class_attr_commands:MarkdownClassVarCommand",
+        "instance_variables":
+            "doctopi.formatter.markdown.cmd.class_attr_commands:MarkdownInstanceVarCommand",
+        "methods": "doctopi.formatter.markdown.cmd.class_attr_commands:MarkdownMethodsCommand",
+        "arguments": "doctopi.formatter.markdown.cmd.docstring_commands:MarkdownArgsCommand",
+        "raises": "doctopi.formatter.markdown.cmd.docstring_commands:MarkdownRaisesCommand",
+        "returns": "doctopi.formatter.markdown.cmd.docstring_commands:MarkdownReturnsCommand",
+    },
+}
+"""DoctoPi's own plugins, available even when DoctoPi isn't installed"""
+
+
+class Registry:
+    """Plugins by entry point group and name. Entry point metadata is
+    read eagerly, plugins are loaded on first use, and parsers are
+    created once per language and docstring style.
+
+    Attributes:
+        entries (Dict[str, Dict[str, EntryPoint]]): entry points of each
+            group by name
+    """
+
+    def __init__(self, discover: bool = True):
+        """Constructor
+
+        Args:
+            discover (bool, optional): Add the plugins of installed
+                packages to the built-in plugins. Defaults to True.
+        """
+        self.entries: Dict[str, Dict[str, EntryPoint]] = {
+            group: {name: EntryPoint(name, value, group) for name, value in plugins.items()}
+            for group, plugins in BUILTINS.items()
+        }
+        self._loaded: Dict[Tuple[str, str], Any] = {}
+        self._parsers: Dict[Tuple[str, str], Parser] = {}
+        self._lock = threading.Lock()
+
+        if discover:
+            for group, plugins in self.entries.items():
+                plugins.update({entry.name: entry for entry in _installed(group)})
+
+    def register(self, group: str, name: str, value: str):
+        """Add or replace a plugin
+
+        Args:
+            group (str): entry point group, e.g. PARSERS
+            name (str): plugin name
+            value (str): entry point value, "module:attribute"
+        """
+        with self._lock:
+            self.entries.setdefault(group, {})[name] = EntryPoint(name, value, group)
+            self._loaded.pop((group, name), None)
+            self._parsers.clear()
+
+    def names(self, group: str) -> List[str]:
+        """List the plugins of a group without loading them
+
+        Args:
+            group (str): entry point group, e.g. PARSERS
+
+        Returns:
+            List[str]: sorted plugin names
+        """
+        return sorted(self.entries.get(group, {}))
+
+    def load(self, group: str, name: str) -> Any:
+        """Load a plugin, importing its module on first use
+
+        Args:
+            group (str): entry point group, e.g. PARSERS
+            name (str): plugin name
+
+        Raises:
+            KeyError: If there's no such plugin
+
+        Returns:
+            Any: the object the entry point refers to
+        """
+        key = (group, name)
+        if key not in self._loaded:
+            entry = self.entries.get(group, {}).get(name)
+            if entry is None:
+                raise KeyError(f"No {group} plugin named '{name}'")
+            self._loaded[key] = entry.load()
+        return self._loaded[key]
+
+    def parser(self, language: str, style: str) -> Parser:
+        """Get the parser of a language and docstring style, creating it
+        on first use
+
+        Args:
+            language (str): programming language, e.g. "python"
+            style (str): docstring style, e.g. "google"
+
+        Raises:
+            ValueError: If there's no parser for the language and style
+
+        Returns:
+            Parser: the shared parser
+        """
+        key = (language, style)
+        with self._lock:
+            if key not in self._parsers:
+                try:
+                    parser_type = self.load(PARSERS, language)
+                    docstring_style = self.load(DOCSTRING_STYLES, f"{language}.{style}")
+                except KeyError as exc:
+                    raise ValueError(f"No matching parser for language={language}, "
+                                     f"style={style}") from exc
+                self._parsers[key] = parser_type(docstring_style)
+            return self._parsers[key]
+
+    def markdown_command(self, name: str) -> Type:
+        """Get a Markdown command type
+
+        Args:
+            name (str): command name, as in the INI config
+
+        Raises:
+            KeyError: If there's no such command
+
+        Returns:
+            Type: the command type
+        """
+        return self.load(MARKDOWN_COMMANDS, name)
+
+
+@functools.lru_cache(maxsize=None)
+def registry() -> Registry:
+    """Get the registry of built-in and installed plugins, created on
+    first use
+
+    Returns:
+        Registry: the shared registry
+    """
+    return Registry()
+
+
+def _installed(group: str) -> Iterable[EntryPoint]:
+    """List the entry points installed packages declare in a group.
+    Python 3.9 can't select entry points by group, so they're looked up
+    in the dict it returns instead.
+
+    Args:
+        group (str): entry point group, e.g. PARSERS
+
+    Returns:
+        Iterable[EntryPoint]: the group's entry points
+    """
+    installed = entry_points()
+    if hasattr(installed, "select"):
+        return installed.select(group=group)
+    return installed.get(group, ())
@@ -7,7 +7,10 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
 import os
-from typing import (List, Union)
+from typing import (List, Union, TYPE_CHECKING)
+
+if TYPE_CHECKING:
+    from doctopi.formatter.markdown.symbol_index import SymbolIndex
 
 
 class AccessType(Enum):
@@ -120,3 +123,12 @@ class MarkdownSettings:
     methods: bool = True
     file_overview: bool = True
     public_only: bool = True
+    inherited_members: bool = False
+
+    # Symbol links. The scope is the qualified name of the module or
+    # class being documented, and the page is the Markdown file. Class
+    # and function headings are anchored by qualified name if enabled.
+    symbols: SymbolIndex = None
+    anchors: bool = False
+    scope: str = ""
+    page: str = ""
@@ -0,0 +1,127 @@
+"""Tests for doctopi.cli.batch"""
+# Built-in imports
+import json
+import os
+import shutil
+
+# Third-party imports
+import pytest
+
+# This package imports
+from doctopi.__main__ import main
+from doctopi.cli.batch import BatchError, load_manifest, run_batch
+from doctopi.parser.scheduler import _KeptPool
+
+
+def write_manifest(path, text):
+    """Write a manifest file"""
+    path.write_text(text)
+    return str(path)
+
+
+class TestBatch:
+    """Tests for doctopi.cli.batch"""
+
+    def test_batch(self, python_nominal, tmp_path, monkeypatch):
+        """Verify each job matches running the markdown command alone,
+        and a failing job is reported without stopping the others"""
+        for repo in ["a", "b"]:
+            shutil.copytree(python_nominal, tmp_path / repo / "src")
+        (tmp_path / "a" / "doctopi.ini").write_text("[TABLE_OF_CONTENTS]\nenabled = no\n")
+        manifest = write_manifest(tmp_path / "manifest.toml", """
+[defaults]
+public-only = true
+
+[[job]]
+name = "a"
+input = "a/src"
+output = "a/README.md"
+config = "a/doctopi.ini"
+
+[[job]]
+input = "b/src"
+output = "b/README.md"
+title = "B"
+
+[[job]]
+name = "missing"
+input = "missing/src"
+""")
+        monkeypatch.chdir(tmp_path)
+        with pytest.raises(BatchError):
+            main(["batch", manifest, "--workers", "2", "--report", "report.json"])
+
+        main(["markdown", "-i", "a/src", "-o", "a.md", "-c", "a/doctopi.ini", "--public-only"])
+        main(["markdown", "-i", "b/src", "-o", "b.md", "-c", "none.ini", "--public-only",
+              "-t", "B"])
+        for repo in ["a", "b"]:
+            with open(f"{repo}.md", encoding="utf-8") as expected, \
+                    open(os.path.join(repo, "README.md"), encoding="utf-8") as actual:
+                assert actual.read() == expected.read()
+
+        with open("report.json", encoding="utf-8") as report_file:
+            report = json.load(report_file)
+        assert report["failed"] == 1
+        assert [job["name"] for job in report["jobs"]] == ["a", "b/src", "missing"]
+        assert [job["ok"] for job in report["jobs"]] == [True, True, False]
+        assert "does not exist" in report["jobs"][2]["error"]
+        assert report["jobs"][0]["size"] > 0 and report["jobs"][2]["size"] == 0
+        assert report["jobs"][2]["output"] == str(tmp_path / "README.md")
+
+    def test_largest_first(self, python_nominal, tmp_path):
+        """Verify the largest jobs are started first"""
+        for repo, copies in [("small", 1), ("large", 3), ("medium", 2)]:
+            os.makedirs(tmp_path / repo)
+            for index in range(copies):
+                shutil.copy(os.path.join(python_nominal, "example_google.py"),
+                            tmp_path / repo / f"module_{index}.py")
+        manifest = write_manifest(tmp_path / "manifest.toml", "".join(
+            f'[[job]]\nname = "{repo}"\ninput = "{repo}"\n' for repo in ["small", "large", "medium"]))
+
+        started = []
+        report = run_batch(load_manifest(manifest), lambda args: started.append(args.input),
+                           workers=1)
+        assert [os.path.basename(path) for path in started] == ["large", "medium", "small"]
+        assert [job["name"] for job in report["jobs"]] == ["small", "large", "medium"]
+        assert not report["failed"]
+
+    def test_shared_workers(self, python_nominal, tmp_path, mocker):
+        """Verify jobs with the same --jobs share their worker processes"""
+        for repo in ["a", "b"]:
+            shutil.copytree(python_nominal, tmp_path / repo)
+        manifest = write_manifest(tmp_path / "manifest.toml", """
+[defaults]
+jobs = 2
+
+[[job]]
+input = "a"
+output = "a.md"
+
+[[job]]
+input = "b"
+output = "b.md"
+""")
+        kept_pool = mocker.patch("doctopi.parser.scheduler._KeptPool", wraps=_KeptPool)
+        main(["batch", manifest, "--report", str(tmp_path / "report.json")])
+        assert kept_pool.call_count == 1
+        assert os.path.exists(tmp_path / "a.md") and os.path.exists(tmp_path / "b.md")
+
+    def test_distribution(self, tmp_path):
+        """Verify an input which isn't a path next to the manifest is an
+        installed distribution"""
+        os.makedirs(tmp_path / "src")
+        manifest = write_manifest(tmp_path / "manifest.toml",
+                                  '[[job]]\ninput = "src"\n\n'
+                                  '[[job]]\ninput = "docstring_parser"\noutput = "dist.md"\n')
+        jobs = load_manifest(manifest)
+        assert jobs[0].args.input == str(tmp_path / "src")
+        assert jobs[1].args.input == "docstring_parser"
+        assert jobs[1].args.output == str(tmp_path / "dist.md")
+
+    @pytest.mark.parametrize("text", ["", '[[job]]\ninput = "src"\nwatch = true\n',
+                                      '[[job]]\ninput = "src"\ncolour = "blue"\n',
+                                      '[[job]]\noutput = "README.md"\n', "[[job]\n"])
+    def test_invalid_manifest(self, text, tmp_path):
+        """Verify invalid manifests are rejected"""
+        with pytest.raises(BatchError):
+            load_manifest(write_manifest(tmp_path / "manifest.toml", text))
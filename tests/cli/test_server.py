@@ -0,0 +1,191 @@
+"""Test the doctopi.cli.server package"""
+# Built-in imports
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+
+# Third-party imports
+import pytest
+
+# This package imports
+import doctopi.__main__
+from doctopi.__main__ import main
+from doctopi.cli.server import DocServer, ServerError, default_socket, send_request
+
+
+@pytest.fixture(name="socket_path")
+def fixture_socket_path():
+    """Short Unix socket path, since they are limited to ~100 characters"""
+    directory = tempfile.mkdtemp(prefix="doctopi")
+    yield os.path.join(directory, "d.sock")
+    shutil.rmtree(directory)
+
+
+def start(server):
+    """Serve in a background thread"""
+    thread = threading.Thread(target=server.serve, args=(0.05,))
+    thread.start()
+    return thread
+
+
+class TestDocServer:
+    """Test the doctopi.cli.server package"""
+
+    def test_requests(self, socket_path, tmp_path):
+        """Verify requests are handled, and errors are returned to the
+        client"""
+        handled = []
+
+        def handler(args, cwd):
+            if args == ["fail"]:
+                raise ValueError("Bad request")
+            handled.append((args, cwd))
+
+        server = DocServer(socket_path, handler, idle_timeout=0)
+        thread = start(server)
+        try:
+            send_request(socket_path, ["markdown", "-i", "src"], cwd=str(tmp_path))
+            assert handled == [(["markdown", "-i", "src"], str(tmp_path))]
+
+            with pytest.raises(ServerError, match="Bad request"):
+                send_request(socket_path, ["fail"])
+
+            # Only one daemon can listen on a socket
+            with pytest.raises(ServerError):
+                DocServer(socket_path, handler)
+        finally:
+            server.shutdown()
+            thread.join()
+
+        assert not os.path.exists(socket_path)
+
+    def test_private_socket(self, socket_path, tmp_path, monkeypatch, mocker):
+        """Verify the default socket is private to the user, and sockets
+        of other users are refused"""
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+        assert default_socket() == str(tmp_path / "doctopi.sock")
+        monkeypatch.delenv("XDG_RUNTIME_DIR")
+        assert os.path.basename(os.path.dirname(default_socket())) == f"doctopi-{os.getuid()}"
+
+        # The daemon creates the socket's directory, only accessible by the user
+        nested = os.path.join(os.path.dirname(socket_path), "run", "d.sock")
+        server = DocServer(nested, lambda args, cwd: None, idle_timeout=0)
+        server.server_close()
+        assert os.stat(os.path.dirname(nested)).st_mode & 0o777 == 0o700
+        assert os.stat(nested).st_mode & 0o777 == 0o600
+
+        mocker.patch("os.getuid", return_value=os.getuid() + 1)
+        with pytest.raises(ServerError, match="belongs to another user"):
+            send_request(nested, [])
+        with pytest.raises(ServerError, match="belongs to another user"):
+            DocServer(socket_path, lambda args, cwd: None)
+
+    def test_concurrency_limit(self, socket_path):
+        """Verify no more than max_requests are handled at once"""
+        lock = threading.Lock()
+        running, peak = [0], [0]
+
+        def handler(args, cwd):  # pylint: disable = unused-argument
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.1)
+            with lock:
+                running[0] -= 1
+
+        server = DocServer(socket_path, handler, max_requests=2, idle_timeout=0)
+        thread = start(server)
+        try:
+            clients = [threading.Thread(target=send_request, args=(socket_path, [str(index)]))
+                       for index in range(6)]
+            for client in clients:
+                client.start()
+            for client in clients:
+                client.join()
+        finally:
+            server.shutdown()
+            thread.join()
+
+        assert peak[0] == 2
+
+    def test_idle_shutdown(self, socket_path):
+        """Verify the daemon shuts down when idle, and a stale socket
+        file is replaced"""
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(socket_path)
+        stale.close()
+
+        server = DocServer(socket_path, lambda args, cwd: None, idle_timeout=0.2)
+        thread = start(server)
+        send_request(socket_path, [])
+        thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        assert not os.path.exists(socket_path)
+        with pytest.raises(OSError):
+            send_request(socket_path, [])
+
+    def test_forward_markdown(self, python_examples, socket_path, tmp_path, monkeypatch, mocker):
+        """Verify markdown requests are forwarded to the daemon, and run
+        locally when no daemon is listening"""
+        shutil.copytree(python_examples, tmp_path / "src")
+        monkeypatch.chdir(tmp_path)
+
+        main(["markdown", "-i", "src", "-o", "local.md"])
+        main(["markdown", "-i", "src", "-o", "fallback.md", f"--server={socket_path}"])
+        with open("local.md", encoding="utf-8") as local, \
+                open("fallback.md", encoding="utf-8") as fallback:
+            assert local.read() == fallback.read()
+
+        thread = threading.Thread(target=main, args=(["serve", "-s", socket_path,
+                                                      "--idle-timeout=0.5"],))
+        thread.start()
+        for _ in range(100):
+            if os.path.exists(socket_path):
+                break
+            time.sleep(0.01)
+
+        run_markdown = mocker.spy(doctopi.__main__, "run_markdown")
+        main(["markdown", "-i", "src", "-o", "served.md", f"--server={socket_path}"])
+        assert run_markdown.call_count == 1
+        assert run_markdown.call_args.args[0].output == str(tmp_path / "served.md")
+        with open("local.md", encoding="utf-8") as local, \
+                open("served.md", encoding="utf-8") as served:
+            assert local.read() == served.read()
+
+        # An input which isn't a path in the client's directory is an installed distribution
+        main(["markdown", "-i", "docstring_parser", "-o", "dist.md", f"--server={socket_path}"])
+        assert run_markdown.call_args.args[0].input == "docstring_parser"
+        assert os.path.exists("dist.md")
+
+        with pytest.raises(ServerError):
+            main(["markdown", "-i", "src", "--watch", f"--server={socket_path}"])
+
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+
+    def test_served_shard(self, python_examples, socket_path, tmp_path, monkeypatch):
+        """Verify a served shard writes its default artifact in the
+        client's directory, rather than the daemon's"""
+        shutil.copytree(python_examples, tmp_path / "client" / "src")
+        os.makedirs(tmp_path / "daemon")
+        monkeypatch.chdir(tmp_path / "daemon")
+
+        thread = threading.Thread(target=main, args=(["serve", "-s", socket_path,
+                                                      "--idle-timeout=0.5"],))
+        thread.start()
+        for _ in range(100):
+            if os.path.exists(socket_path):
+                break
+            time.sleep(0.01)
+
+        send_request(socket_path, ["markdown", "-i", "src", "--shard", "1/2", "-c", "none.ini"],
+                     cwd=str(tmp_path / "client"))
+        assert os.path.exists(tmp_path / "client" / "doctopi-shard-1-of-2.json")
+        assert not os.listdir(tmp_path / "daemon")
+
+        thread.join(timeout=5)
+        assert not thread.is_alive()
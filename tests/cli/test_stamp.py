@@ -0,0 +1,116 @@
+"""Tests for doctopi.cli.stamp"""
+# Built-in imports
+import os
+import shutil
+
+# Third-party imports
+import pytest
+
+# This package imports
+from doctopi.__main__ import main
+from doctopi.cli import cli, parse_settings
+from doctopi.cli.stamp import STAMP, StaleDocsError, stamp, strip_stamp
+from doctopi.formatter.markdown.markdown_builder import MarkdownBuilder
+from doctopi.parser.parser_factory import ParserFactory
+
+PARSER = ParserFactory("python", "google")
+
+
+def append(path, text):
+    """Append text to a source file"""
+    with open(path, "a", encoding="utf-8") as source:
+        source.write(text)
+
+
+class TestStamp:
+    """Tests for doctopi.cli.stamp"""
+
+    def test_check(self, python_examples, tmp_path, monkeypatch, mocker):
+        """Verify up-to-date files pass without rendering, and changed
+        docs fail without being written"""
+        shutil.copytree(python_examples, tmp_path / "src")
+        monkeypatch.chdir(tmp_path)
+        main(["markdown", "-i", "src", "-r"])
+        with open("src/nominal/README.md", encoding="utf-8") as md_file:
+            assert STAMP.match(md_file.read())
+
+        render = mocker.spy(MarkdownBuilder, "render")
+        main(["markdown", "-i", "src", "-r", "--check"])
+        assert not render.called
+
+        # A change which doesn't reach the docs is rendered, but not stale
+        append("src/nominal/example_google.py", "\n# A comment\n")
+        main(["markdown", "-i", "src", "-r", "--check"])
+        assert render.call_count == 1
+
+        append("src/nominal/example_google.py", "\ndef new_function():\n    \"\"\"New\"\"\"\n")
+        before = os.stat("src/nominal/README.md").st_mtime_ns
+        with pytest.raises(StaleDocsError, match="nominal"):
+            main(["markdown", "-i", "src", "-r", "--check"])
+        assert os.stat("src/nominal/README.md").st_mtime_ns == before
+
+        main(["markdown", "-i", "src", "-r"])
+        main(["markdown", "-i", "src", "-r", "--check"])
+
+    def test_check_skips_source_less_dirs(self, tmp_path, monkeypatch):
+        """Verify directories without source files, like __pycache__,
+        don't need a README"""
+        os.makedirs(tmp_path / "src" / "__pycache__")
+        append(tmp_path / "src" / "shapes.py", 'class Shape:\n    """A shape"""\n')
+        append(tmp_path / "src" / "__pycache__" / "shapes.cpython-39.pyc", "")
+        monkeypatch.chdir(tmp_path)
+
+        main(["markdown", "-i", "src", "-r"])
+        main(["markdown", "-i", "src", "-r", "--check"])
+        assert os.path.exists("src/README.md")
+        assert not os.path.exists("src/__pycache__/README.md")
+
+    def test_check_links(self, tmp_path, monkeypatch):
+        """Verify a file linking to another directory's class is stale
+        when only the other directory changes"""
+        os.makedirs(tmp_path / "src" / "base")
+        os.makedirs(tmp_path / "src" / "child")
+        append(tmp_path / "src" / "base" / "shapes.py",
+               'class Shape:\n    """A shape"""\n')
+        append(tmp_path / "src" / "child" / "circle.py",
+               'class Circle(Shape):\n    """A circle"""\n')
+        monkeypatch.chdir(tmp_path)
+
+        main(["markdown", "-i", "src", "-r", "--link-symbols"])
+        main(["markdown", "-i", "src", "-r", "--link-symbols", "--check"])
+
+        with open("src/base/shapes.py", "w", encoding="utf-8") as source:
+            source.write('class Polygon:\n    """A polygon"""\n')
+        with pytest.raises(StaleDocsError, match="child"):
+            main(["markdown", "-i", "src", "-r", "--link-symbols", "--check"])
+
+    def test_check_settings(self, python_examples, tmp_path, monkeypatch):
+        """Verify changed settings and missing files are stale"""
+        shutil.copytree(python_examples, tmp_path / "src")
+        monkeypatch.chdir(tmp_path)
+        with pytest.raises(StaleDocsError):
+            main(["markdown", "-i", "src", "--recursive-all-in-one", "--check"])
+
+        main(["markdown", "-i", "src", "--recursive-all-in-one"])
+        main(["markdown", "-i", "src", "--recursive-all-in-one", "--check", "--jobs", "2"])
+        with pytest.raises(StaleDocsError):
+            main(["markdown", "-i", "src", "--recursive-all-in-one", "--check", "--title", "New"])
+
+    def test_stamp(self, python_examples, tmp_path):
+        """Verify stamps don't depend on where the tree is, or on options
+        which don't change the Markdown"""
+        for copy in ["a", "b"]:
+            shutil.copytree(python_examples, tmp_path / copy)
+        stamps = [stamp(parse_settings(cli(["markdown", "-i", str(tmp_path / copy),
+                                            "-c", "none.ini"] + options)), PARSER)
+                  for copy, options in [("a", []), ("b", ["--jobs", "4", "-o", "DOCS.md"])]]
+        assert stamps[0] == stamps[1]
+
+        # Only whether a search index is written changes the Markdown
+        indexed = [stamp(parse_settings(cli(["markdown", "-i", str(tmp_path / "a"), "-c",
+                                             "none.ini", "--search-index", index])), PARSER)
+                   for index in ["a", "b"]]
+        assert indexed[0] == indexed[1] != stamps[0]
+        assert strip_stamp(stamps[0] + "# Title\n") == "# Title\n"
+        assert stamp(parse_settings(cli(["markdown", "-i", "docstring_parser",
+                                         "-c", "none.ini"])), PARSER) == ""
@@ -0,0 +1,101 @@
+"""Fixtures shared by the doctopi tests"""
+# Built-in imports
+import os
+
+# Third party imports
+import pytest
+
+# This package imports
+from doctopi.formatter.markdown.cmd import (MarkdownArgsCommand, MarkdownClassCommand,
+                                            MarkdownFunctionCommand, MarkdownMethodsCommand,
+                                            MarkdownReturnsCommand)
+from doctopi.types import (AccessType, ClassDeclaration, DocDir, DocFile, Docstring,
+                           FunctionDeclaration)
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), "examples", "src")
+
+
+@pytest.fixture(name="python_examples")
+def fixture_python_examples():
+    """Directory of the Python example sources"""
+    return os.path.join(EXAMPLES, "python")
+
+
+@pytest.fixture(name="python_nominal")
+def fixture_python_nominal(python_examples):
+    """Directory of the nominal Python example sources"""
+    return os.path.join(python_examples, "nominal")
+
+
+@pytest.fixture(name="cpp_examples")
+def fixture_cpp_examples():
+    """Directory of the nominal C++ example sources"""
+    return os.path.join(EXAMPLES, "cpp", "nominal")
+
+
+@pytest.fixture(name="java_examples")
+def fixture_java_examples():
+    """Directory of the nominal Java example sources"""
+    return os.path.join(EXAMPLES, "java", "nominal")
+
+
+@pytest.fixture(name="doxygen_xml_examples")
+def fixture_doxygen_xml_examples():
+    """Directory of the Doxygen XML examples"""
+    return os.path.join(EXAMPLES, "cpp", "doxygen_xml")
+
+
+@pytest.fixture(name="configure")
+def fixture_configure():
+    """Function configuring a builder with the same commands as the
+    default INI"""
+    def configure(builder):
+        return builder.configure_src("python", "google") \
+            .add_file_command(MarkdownClassCommand) \
+            .add_file_command(MarkdownFunctionCommand) \
+            .add_class_commands(MarkdownMethodsCommand) \
+            .add_function_commands(MarkdownArgsCommand) \
+            .add_function_commands(MarkdownReturnsCommand)
+    return configure
+
+
+@pytest.fixture(name="make_function")
+def fixture_make_function():
+    """Function creating a parsed function or method, a method without
+    docstring by default"""
+    def make_function(name, signature=None, docstring=None, access=AccessType.PUBLIC):
+        return FunctionDeclaration(name, signature or f"def {name}(self):", access, docstring)
+    return make_function
+
+
+@pytest.fixture(name="parser_docs")
+def fixture_parser_docs(make_function):
+    """Parsed documentation with a class and functions"""
+    parser = DocFile("parser", "pkg/parser.py", Docstring(summary="Parse source code"), classes=[
+        ClassDeclaration("SourceParser", "class SourceParser:", Docstring(summary="Parses files"),
+                         methods=[make_function("parse_file", "def parse_file(self, path: str):",
+                                                Docstring(summary="Parse a source file")),
+                                  make_function("_reset", docstring=Docstring(summary="Reset"),
+                                                access=AccessType.PROTECTED)])],
+        functions=[make_function("load_dump", "def load_dump(path: str) -> DocDir:",
+                                 Docstring(summary="Load a dump"))])
+    return DocDir("pkg", "pkg", files=[parser])
+
+
+@pytest.fixture(name="inheritance_docs")
+def fixture_inheritance_docs(make_function):
+    """Parsed documentation with classes inheriting across modules"""
+    def method(name, access=AccessType.PUBLIC):
+        return make_function(name, docstring=Docstring(), access=access)
+
+    base = DocFile("base", "pkg/base.py", Docstring(), classes=[
+        ClassDeclaration("Base", "class Base:", Docstring(),
+                         methods=[method("run"), method("stop"), method("_hidden",
+                                                                        AccessType.PROTECTED)]),
+        ClassDeclaration("Mixin", "class Mixin:", Docstring(),
+                         methods=[method("mix"), method("run")])])
+    child = DocFile("child", "pkg/sub/child.py", Docstring(), classes=[
+        ClassDeclaration("Child", "@dataclass\nclass Child(base.Base, Mixin, Generic[T]):",
+                         Docstring(), methods=[method("stop")]),
+        ClassDeclaration("Base", "class Base(Child):", Docstring())])
+    return DocDir("pkg", "pkg", files=[base], subdirs=[DocDir("sub", "pkg/sub", files=[child])])
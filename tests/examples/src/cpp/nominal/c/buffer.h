@@ -0,0 +1,36 @@
+/*! \file buffer.h
+ *  Byte buffers for C.
+ */
+#ifndef BUFFER_H
+#define BUFFER_H
+
+#include <stddef.h>
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/** A growable byte buffer. */
+typedef struct {
+    unsigned char* data;  /**< Bytes of the buffer. */
+    size_t size;          /**< Number of bytes. */
+} buffer_t;
+
+/**
+ * Append bytes to a buffer.
+ *
+ * @param buffer buffer to append to
+ * @param bytes bytes to append
+ * @param count number of bytes
+ * @return 0 on success, or a negative error code
+ */
+int buffer_append(buffer_t* buffer, const unsigned char* bytes, size_t count);
+
+/// Free a buffer.
+void buffer_free(buffer_t*);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif
@@ -0,0 +1,45 @@
+#include "shapes.hpp"
+
+#include <stdexcept>
+
+namespace geometry {
+namespace shapes {
+
+// A plain comment, not documentation: { }
+static const char* kBraces = R"raw(}{)raw";
+
+/// Count the shapes created.
+static int counter = 0;
+
+Shape::~Shape() {}
+
+int Shape::next() {
+    return ++counter;
+}
+
+bool Shape::operator<(const Shape& other) const {
+    return area() < other.area();
+}
+
+/// Check an area.
+/// \param area area to check
+static void check(double area) {
+    if (area < 0) {
+        throw std::domain_error("{");
+    }
+}
+
+double total_area(const std::vector<Shape*>& shapes, void (*callback)(double)) {
+    double total = 0;
+    for (const auto* shape : shapes) {
+        total += shape->area();
+    }
+    return total;
+}
+
+}  // namespace shapes
+}  // namespace geometry
+
+TEST(Shapes, Area) {
+    int unused = 0;
+}
@@ -0,0 +1,108 @@
+/**
+ * \file shapes.hpp
+ * \brief Shapes and their areas.
+ */
+#ifndef SHAPES_HPP
+#define SHAPES_HPP
+
+#include <string>
+#include <vector>
+
+#define SHAPES_API __attribute__((visibility("default")))
+
+namespace geometry {
+namespace shapes {
+
+/// Kinds of shapes.
+enum class Kind : unsigned char {
+    Round = 1 << 0,  ///< A round shape.
+    /** A shape with corners. */
+    Square = 1 << 1,
+};
+
+/**
+ * @brief A shape.
+ *
+ * Shapes have an area, and a name with a "}" in it.
+ */
+class SHAPES_API Shape {
+public:
+    /// Sides of a circle.
+    static constexpr int kCircleSides = 0;
+
+    std::string name{"shape}"};  ///< Name of the shape.
+
+    /**
+     * \brief Construct a shape.
+     * \param[in] name name of the shape
+     */
+    explicit Shape(const std::string& name = "") : name{name}, id_(next()) {}
+
+    /// Copy a shape.
+    /// \param other shape to copy
+    Shape(const Shape& other) = default;
+
+    /// Destroy the shape.
+    virtual ~Shape();
+
+    /**
+     * Get the area of the shape.
+     *
+     * \code{.cpp}
+     * double area = shape.area();
+     * \endcode
+     *
+     * @return area in square \c units
+     * @throws std::domain_error if the shape is degenerate
+     */
+    [[nodiscard]] virtual double area() const noexcept(false) = 0;
+
+    /**
+     * Compare shapes by area.
+     * @param other shape to compare
+     * @retval true if this shape is smaller
+     * @retval false otherwise
+     */
+    bool operator<(const Shape& other) const;
+
+protected:
+    /// Next identifier.
+    static int next();
+
+private:
+    int id_;
+
+    /// Never documented.
+    void hidden();
+};
+
+/**
+ * A point.
+ *
+ * @tparam T type of the coordinates
+ */
+template <typename T = double, int N = (2 > 1)>
+struct Point final {
+    T x;  ///< Horizontal coordinate.
+    T y, z : 4;
+
+    /// Scale the point.
+    /// \param factor scale factor
+    /// \return the scaled point
+    template <typename U>
+    Point<T> scale(U factor) const { return Point<T>{x * factor, y * factor}; }
+};
+
+/**
+ * Sum the areas of shapes.
+ *
+ * @param shapes shapes to sum
+ * @param callback called for each area
+ * @return total area
+ */
+double total_area(const std::vector<Shape*>& shapes, void (*callback)(double) = nullptr);
+
+}  // namespace shapes
+}  // namespace geometry
+
+#endif  // SHAPES_HPP
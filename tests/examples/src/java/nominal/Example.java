@@ -0,0 +1,111 @@
+/*
+ * A license header, which isn't Javadoc.
+ */
+package com.example;
+
+import java.io.IOException;
+import java.util.List;
+import java.util.Map;
+
+/**
+ * This is an example Java class.
+ *
+ * <p>It has {@code static} and instance fields, a {@link List} of
+ * <b>things</b>, and an inner class.</p>
+ *
+ * @param <T> type of the things
+ * @author Jane Doe
+ */
+@SuppressWarnings("unchecked")
+public class Example<T extends Comparable<T>> implements Comparable<Example<T>> {
+
+    /** Greeting of every example, with a "}" in it. */
+    public static final String GREETING = "Hello {world}";
+
+    /** Number of examples, and a limit. */
+    protected static int count = 0, limit = 10;
+
+    /** Things, by name. */
+    public Map<String, List<T>> things = new java.util.HashMap<String, List<T>>();
+
+    private int secret = '}';
+
+    /**
+     * Constructor
+     *
+     * @param name name of the example
+     */
+    public Example(String name) {
+        this(name, 0);
+    }
+
+    /**
+     * Constructor with a count
+     *
+     * @param name name of the example
+     * @param count initial count
+     */
+    Example(final String name, int count) {
+        Runnable runnable = () -> { System.out.println("{"); };
+    }
+
+    /**
+     * Add two numbers.
+     * The result may overflow.
+     *
+     * <pre>{@code
+     * int sum = example.add(1, 2);
+     * }</pre>
+     *
+     * @param a the first number
+     * @param b the second
+     *          number
+     * @return the sum of {@code a} and {@code b}
+     * @throws IllegalArgumentException if a number is negative
+     * @throws IOException never
+     */
+    @Override
+    public int add(int a, @Deprecated int b) throws IllegalArgumentException, IOException {
+        String text = """
+            A text block with } and { and "quotes".
+            """;
+        return a + b; // }
+    }
+
+    /**
+     * Find things.
+     *
+     * @param <R> type of the result
+     * @param filters names of the things
+     * @return the things, or &lt;none&gt;
+     */
+    public static <R extends List<T>, T> R find(Map<String, ? extends T> map, String... filters) {
+        return null;
+    }
+
+    private void hidden() {
+    }
+
+    int packagePrivate(int[] values) {
+        return values.length;
+    }
+
+    @Override
+    public int compareTo(Example<T> other) {
+        return 0;
+    }
+
+    /** An inner class. */
+    public static class Inner {
+
+        /** Value of the inner class. */
+        public long value;
+
+        /** Make the inner class. */
+        public Inner() {
+        }
+    }
+
+    private static class Hidden {
+    }
+}
@@ -0,0 +1,76 @@
+package com.example.shapes;
+
+/**
+ * A shape.
+ */
+public interface Shape {
+
+    /** Sides of a circle. */
+    int CIRCLE_SIDES = 0;
+
+    /**
+     * Get the area of the shape.
+     *
+     * @return area in square units
+     */
+    double area();
+
+    /**
+     * Kinds of shapes.
+     */
+    enum Kind {
+        /** A round shape. */
+        ROUND("round") {
+            @Override
+            public String toString() {
+                return "(";
+            }
+        },
+        /** A shape with corners. */
+        @Deprecated
+        SQUARE("square");
+
+        private final String label;
+
+        Kind(String label) {
+            this.label = label;
+        }
+
+        /**
+         * Get the label of the kind.
+         *
+         * @return the label
+         */
+        public String label() {
+            return label;
+        }
+    }
+
+    /**
+     * A point.
+     *
+     * @param x horizontal coordinate
+     * @param y vertical coordinate
+     */
+    record Point(double x, double y) implements Shape {
+
+        /** Origin of the plane. */
+        public static final Point ORIGIN = new Point(0, 0);
+
+        @Override
+        public double area() {
+            return 0;
+        }
+    }
+
+    /** Describes a shape. */
+    @interface Described {
+
+        /**
+         * Description of the shape.
+         *
+         * @return the description
+         */
+        String value() default "{}";
+    }
+}
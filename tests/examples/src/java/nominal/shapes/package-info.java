@@ -0,0 +1,4 @@
+/**
+ * Shapes and their areas.
+ */
+package com.example.shapes;
@@ -86,3 +86,18 @@ class TestMarkdownClassAttrCommand:
         if isinstance(cmd, MarkdownConstructorCommand):
             cmd.settings.constructors = False
             cmd.execute()
+
+    def test_generic_types(self):
+        """Verify generic types and template parameters aren't read as
+        HTML"""
+        class_ = ClassDeclaration("Cache", "class Cache:", Docstring(), member_variables=[
+            NameDescriptionType(name="<T>", description="type of the values", type="typename"),
+            NameDescriptionType(name="entries", description="cached values",
+                                type="Map<String, List<T>>")])
+        md_utils = MdUtils(file_name="")
+
+        MarkdownInstanceVarCommand(md_utils=md_utils, settings=MarkdownSettings(), level=1,
+                                   class_=class_, class_cmds=[], function_cmds=[]).execute()
+        markdown = md_utils.get_md_text()
+        assert "|\\<T\\>|typename|type of the values|" in markdown
+        assert "|entries|Map\\<String, List\\<T\\>\\>|cached values|" in markdown
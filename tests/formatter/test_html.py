@@ -0,0 +1,118 @@
+"""Test doctopi.formatter.html package"""
+# Built-in imports
+from html.parser import HTMLParser
+import os
+import shutil
+
+# Third party imports
+import pytest
+
+# This package imports
+from doctopi.__main__ import main
+from doctopi.cli import DoctoPiConfigError
+from doctopi.formatter.html import HtmlBuilder, HtmlDocument, inline
+
+
+class AssetParser(HTMLParser):
+    """Collect the IDs of a page, and any external assets it loads"""
+
+    def __init__(self):
+        super().__init__()
+        self.ids = []
+        self.assets = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if "id" in attrs:
+            self.ids.append(attrs["id"])
+        if tag in ("script", "link", "img") or (tag == "a" and "//" in attrs.get("href", "")):
+            self.assets.append(tag)
+
+
+class TestHtml:
+    """Test doctopi.formatter.html package"""
+
+    def test_document(self):
+        """Verify the MdUtils methods generate escaped HTML, with IDs from
+        the path of titles"""
+        document = HtmlDocument("index.html", title="A & B")
+        assert "<title>A &amp; B</title>" in document.head()
+
+        document.new_header(level=1, title="parser")
+        document.new_header(level=2, title="Functions")
+        document.new_header(level=3, title="load\\_dump")
+        document.new_paragraph("Load a `<dump>`:\n\n    load_dump(path)")
+        document.new_table(columns=2, rows=2, text=["Type", "Description", "str", "a < b"],
+                           text_align="left")
+        document.new_header(level=3, title="load\\_dump")
+        assert document.file_data_text == (
+            '<h1 id="parser">parser</h1>\n'
+            '<h2 id="parser.Functions">Functions</h2>\n'
+            '<h3 id="parser.Functions.load_dump">load_dump</h3>\n'
+            "<p>Load a <code>&lt;dump&gt;</code>:</p>\n"
+            "<pre><code>load_dump(path)</code></pre>\n"
+            '<table class="left">\n<thead><tr><th>Type</th><th>Description</th></tr></thead>\n'
+            "<tbody>\n<tr><td>str</td><td>a &lt; b</td></tr>\n</tbody>\n</table>\n"
+            '<h3 id="parser.Functions.load_dump-2">load_dump</h3>\n')
+        assert inline("a\\_b `c_d`") == "a_b <code>c_d</code>"
+        assert inline("List\\<T\\>") == "List&lt;T&gt;"
+
+        # The navigation nests the headers up to the depth
+        assert document.tail(2) == (
+            '</main>\n<nav>\n<ul>\n<li><a href="#parser">parser</a><ul>\n'
+            '<li><a href="#parser.Functions">Functions</a></li>\n</ul>\n</li>\n</ul>\n'
+            "</nav>\n</body>\n</html>\n")
+        assert document.tail() == "</main>\n</body>\n</html>\n"
+
+    def test_streaming(self, configure, python_nominal, tmp_path, mocker):
+        """Verify each file is parsed just before it's generated, and the
+        navigation follows the main content"""
+        builder = configure(HtmlBuilder()).configure_io(python_nominal,
+                                                        str(tmp_path / "index")) \
+            .enable_toc(2)
+        parse_file = mocker.spy(builder.parser, "parse_file")
+
+        chunks = builder.iter_render()
+        assert next(chunks).startswith("<!DOCTYPE html>")
+        assert parse_file.call_count == 0
+        assert next(chunks).startswith('<h1 id="example_epydoc">example_epydoc</h1>\n')
+        assert parse_file.call_count == 1
+        assert list(chunks)[-1].endswith("</nav>\n</body>\n</html>\n")
+        assert not hasattr(builder, "build_document")
+
+        builder.build()
+        assert os.listdir(tmp_path) == ["index.html"]
+        page = AssetParser()
+        with open(tmp_path / "index.html", encoding="utf-8") as html_file:
+            page.feed(html_file.read())
+        assert not page.assets
+        assert len(page.ids) == len(set(page.ids))
+        assert "example_google.Classes.ExampleGoogle.Methods.example_foo" in page.ids
+
+        # Anchors are the same when the page is generated again
+        first = builder.render()
+        assert builder.render() == first
+
+    def test_pages(self, python_examples, tmp_path):
+        """Verify a page is written for each module, with an index page
+        linking them"""
+        shutil.copytree(python_examples, tmp_path / "src")
+        main(["html", "-i", str(tmp_path / "src"), "-o", str(tmp_path / "site" / "index.html"),
+              "--pages", "-t", "Examples", "-c", "none.ini"])
+
+        pages = sorted(os.listdir(tmp_path / "site"))
+        assert pages == ["index.html", "src.nominal.example_epydoc.html",
+                         "src.nominal.example_google.html", "src.nominal.example_numpy.html",
+                         "src.nominal.example_rest.html"]
+        with open(tmp_path / "site" / "index.html", encoding="utf-8") as html_file:
+            index = html_file.read()
+        assert '<dt><a href="src.nominal.example_google.html">src.nominal.example_google</a>' \
+            in index
+        with open(tmp_path / "site" / pages[2], encoding="utf-8") as html_file:
+            module = html_file.read()
+        assert '<li class="current"><a href="src.nominal.example_google.html">' in module
+        assert '<a href="#ExampleGoogle">ExampleGoogle</a>' not in module
+        assert '<h3 id="Classes.ExampleGoogle">ExampleGoogle</h3>' in module
+
+        with pytest.raises(DoctoPiConfigError):
+            main(["html", "-i", str(tmp_path / "src"), "--pages", "-r", "-c", "none.ini"])
@@ -50,3 +50,63 @@ class TestMarkdownBuilder:
         # Verify configuring the IO fails is the path is fake
         with pytest.raises(ValueError):
             builder.configure_io("some/fake/path", "README.md", recursive=True)
+
+    @pytest.mark.parametrize("toc", [True, False])
+    @pytest.mark.parametrize("src", ["examples/src/python/nominal",
+                                     "examples/src/python/nominal/example_google.py"])
+    def test_render(self, toc, src, tmp_path, monkeypatch):
+        """Verify rendering in memory matches the Markdown file, without
+        writing anything, and the builder can render repeatedly"""
+        src = os.path.join(os.path.dirname(__file__), "..", src)
+        builder = MarkdownBuilder() \
+            .add_file_command(MarkdownClassCommand) \
+            .add_file_command(MarkdownFunctionCommand) \
+            .add_class_commands(MarkdownConstructorCommand) \
+            .add_class_commands(MarkdownMethodsCommand) \
+            .add_function_commands(MarkdownArgsCommand) \
+            .configure_metadata("My Title") \
+            .configure_src(language="python", style="auto") \
+            .configure_io(src, str(tmp_path / "README.md"), recursive=True)
+        if toc:
+            builder.enable_toc(3)
+
+        monkeypatch.chdir(tmp_path)
+        docs = builder.parse()
+        rendered = builder.render()
+        assert not os.listdir(tmp_path)
+
+        builder.build()
+        with open(tmp_path / "README.md", encoding="utf-8") as md_file:
+            assert rendered == md_file.read()
+
+        # Render again, from the parsed docs, and as chunks
+        assert builder.render(docs) == rendered
+        assert builder.parse() == docs
+        chunks = list(builder.iter_render(src))
+        assert "".join(chunks) == rendered
+        assert len(chunks) > 2
+
+    def test_iter_render_streaming(self, mocker):
+        """Verify each file is parsed just before its chunk, unless the
+        directory's symbols are indexed for links"""
+        src = os.path.join(os.path.dirname(__file__), "../examples/src/python/nominal")
+        builder = MarkdownBuilder() \
+            .add_file_command(MarkdownClassCommand) \
+            .add_class_commands(MarkdownMethodsCommand) \
+            .configure_src(language="python", style="auto") \
+            .configure_io(src)
+        parse = mocker.spy(builder, "parse")
+        parse_file = mocker.spy(builder.parser, "parse_file")
+
+        chunks = builder.iter_render()
+        next(chunks)
+        next(chunks)
+        assert parse_file.call_count == 1
+        streamed = list(chunks)
+        assert parse_file.call_count == 4
+        assert parse.call_count == 0
+
+        builder.configure_symbols()
+        chunks = list(builder.iter_render())
+        assert parse.call_count == 1
+        assert len(chunks) == len(streamed) + 2
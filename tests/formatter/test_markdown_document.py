@@ -0,0 +1,57 @@
+"""Test the doctopi.formatter.markdown.markdown_document package"""
+# Third-party imports
+from mdutils import MdUtils
+
+# This package imports
+from doctopi.formatter.markdown.markdown_document import MarkdownDocument
+
+HEADERS = [(1, "pkg/"), (2, "module"), (3, "Overview"), (3, "Classes"), (4, "Example"),
+           (2, "other"), (3, "Functions"), (1, "subpkg/")]
+
+
+def write(md_utils: MdUtils, headers):
+    """Add headers and paragraphs to a Markdown file generator"""
+    for level, title in headers:
+        md_utils.new_header(level=level, title=title)
+        md_utils.new_paragraph(f"About {title}")
+
+
+class TestMarkdownDocument:
+    """Test the doctopi.formatter.markdown.markdown_document package"""
+
+    def test_matches_mdutils(self):
+        """Verify the document and table of contents match MdUtils"""
+        md_utils = MdUtils(file_name="README.md", title="Title")
+        document = MarkdownDocument(file_name="README.md", title="Title")
+        write(md_utils, HEADERS)
+        write(document, HEADERS)
+        md_utils.new_table_of_contents(table_title="Contents", depth=3)
+        document.new_table_of_contents(table_title="Contents", depth=3)
+
+        assert document.headers == HEADERS
+        assert document.get_md_text() == md_utils.get_md_text()
+
+    def test_split_and_append(self):
+        """Verify a document split into sections can be stitched back
+        together"""
+        document = MarkdownDocument(file_name="README.md")
+        write(document, HEADERS[:1])
+        with document.section("module.py"):
+            write(document, HEADERS[1:5])
+        with document.section("other.py"):
+            write(document, HEADERS[5:7])
+        write(document, HEADERS[7:])
+
+        frames, sections = document.split()
+        assert len(frames) == 3
+        assert [key for key, _, _ in sections] == ["module.py", "other.py"]
+        assert sections[1][2] == HEADERS[5:7]
+
+        stitched = MarkdownDocument(file_name="README.md")
+        stitched.append(*frames[0])
+        for (_, text, headers), frame in zip(sections, frames[1:]):
+            stitched.append(text, headers)
+            stitched.append(*frame)
+
+        assert stitched.file_data_text == document.file_data_text
+        assert stitched.headers == document.headers
@@ -0,0 +1,90 @@
+"""Test the doctopi.formatter.markdown.pipeline package"""
+# Built-in imports
+import json
+import os
+import shutil
+
+# Third-party imports
+import pytest
+
+# This package imports
+from doctopi.__main__ import main
+from doctopi.cli import DoctoPiConfigError
+from doctopi.formatter.markdown.markdown_builder import MarkdownBuilder
+from doctopi.formatter.markdown.pipeline import MarkdownPipeline, StageStats
+from doctopi.parser.cache import MemoryParseCache
+
+
+def read(path):
+    """Read a generated Markdown file"""
+    with open(path, encoding="utf-8") as md_file:
+        return md_file.read()
+
+
+class TestPipeline:
+    """Test the doctopi.formatter.markdown.pipeline package"""
+
+    @pytest.mark.parametrize("options", [["--recursive-all-in-one", "--no-table-of-contents"],
+                                         ["--recursive-all-in-one"],
+                                         ["--recursive-all-in-one", "--jobs", "2"],
+                                         ["--no-table-of-contents"]])
+    def test_markdown(self, python_examples, options, tmp_path, monkeypatch):
+        """Verify the markdown command's output doesn't change with
+        --pipeline, and the stages are profiled"""
+        shutil.copytree(python_examples, tmp_path / "src")
+        monkeypatch.chdir(tmp_path)
+        main(["markdown", "-i", "src", "-o", "serial.md", "-c", "none.ini"] + options)
+        main(["markdown", "-i", "src", "-o", "pipeline.md", "-c", "none.ini", "--pipeline",
+              "--profile", "profile.json"] + options)
+        assert read("pipeline.md") == read("serial.md")
+        assert not os.path.exists("pipeline.md.tmp")
+
+        with open("profile.json", encoding="utf-8") as profile_file:
+            stages = json.load(profile_file)["outputs"]["pipeline.md"]["stages"]
+        recursive = "--recursive-all-in-one" in options
+        files = sum(name.endswith(".py") for dirpath, _, names in os.walk("src")
+                    if recursive or dirpath == "src" for name in names)
+        assert stages["read"]["items"] == stages["parse"]["items"] == files
+        assert stages["render"]["items"] == files
+        assert stages["write"]["items"] == (files + 2 if "--no-table-of-contents" in options else 1)
+
+        # Without a pipeline or worker processes, there's nothing to profile
+        if "--jobs" not in options:
+            with pytest.raises(DoctoPiConfigError, match="--profile"):
+                main(["markdown", "-i", "src", "-c", "none.ini", "--profile", "profile.json"]
+                     + options)
+
+    def test_backpressure(self, python_examples, tmp_path):
+        """Verify the queues never hold more than their capacity, and
+        cached files are reused rather than parsed again"""
+        builder = MarkdownBuilder().configure_src("python", "google") \
+            .configure_io(python_examples, str(tmp_path / "README.md"), recursive=True) \
+            .configure_cache(MemoryParseCache()) \
+            .configure_pipeline(readers=2, queue_depth=1)
+        builder.build()
+        first = read(tmp_path / "README.md")
+        assert all(stats.max_depth <= 1 for stats in builder.pipeline_stats.stages.values())
+
+        builder.build()
+        assert read(tmp_path / "README.md") == first
+        assert builder.pipeline_stats.stages["parse"].items == 0
+
+    def test_failure(self, python_examples, tmp_path, mocker):
+        """Verify a failing stage stops the pipeline, and the partial
+        output is discarded"""
+        builder = MarkdownBuilder().configure_src("python", "google") \
+            .configure_io(python_examples, str(tmp_path / "README.md"), recursive=True) \
+            .configure_pipeline(queue_depth=1)
+        mocker.patch.object(MarkdownPipeline, "_read", side_effect=OSError("unreadable"))
+
+        with pytest.raises(OSError, match="unreadable"):
+            builder.build()
+        assert not os.listdir(tmp_path)
+
+    def test_stage_stats(self):
+        """Verify the mean queue depth is averaged over the samples"""
+        stats = StageStats()
+        assert stats.mean_depth() == 0.0
+        for depth in [0, 2, 4]:
+            stats.sample(depth)
+        assert (stats.mean_depth(), stats.max_depth) == (2.0, 4)
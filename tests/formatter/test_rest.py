@@ -0,0 +1,94 @@
+"""Test doctopi.formatter.rest package"""
+# Built-in imports
+import os
+import re
+import shutil
+
+# Third party imports
+import pytest
+
+# This package imports
+from doctopi.__main__ import main
+from doctopi.cli import DoctoPiConfigError
+from doctopi.formatter.markdown.markdown_builder import MarkdownBuilder
+from doctopi.formatter.rest import RestBuilder, RestDocument, escape
+from doctopi.parser.parser_factory import ParserFactory
+from doctopi.parser.python.docspec_adapter import DocspecAdapter
+
+
+class TestRest:
+    """Test doctopi.formatter.rest package"""
+
+    def test_escape(self):
+        """Verify Markdown escapes and inline code are converted"""
+        assert escape("parse\\_file(*args)") == "parse\\_file(\\*args)"
+        assert escape("See `__init__` or |x|") == "See ``__init__`` or \\|x\\|"
+        assert escape("Map\\<String, List\\<T\\>\\>") == "Map<String, List<T>>"
+
+    def test_document(self):
+        """Verify the MdUtils methods generate reST"""
+        document = RestDocument("index.rst", title="API", author="me")
+        assert document.title == "===\nAPI\n===\n\n:Author: me\n"
+
+        document.new_header(level=2, title="load\\_dump")
+        document.insert_code("def load_dump():", language="python")
+        document.new_paragraph("Load a dump:\n\n    load_dump(path)\n  continued\n  ---")
+        document.new_table(columns=2, rows=2, text=["Type", "Description", "str", "two\nlines"])
+        assert document.file_data_text == (
+            "\nload\\_dump\n----------\n"
+            "\n.. code-block:: python\n\n   def load_dump():\n"
+            "\nLoad a dump:\n\n::\n\n    load_dump(path)\n\ncontinued\n\\---\n"
+            "\n.. list-table::\n   :header-rows: 1\n\n"
+            "   * - Type\n     - Description\n   * - str\n     - two\n       lines\n")
+
+    def test_same_order(self, configure, python_nominal):
+        """Verify files, classes and functions are documented in the same
+        order as in Markdown"""
+        docs = ParserFactory("python", "google").parse_dir(python_nominal)
+        markdown = configure(MarkdownBuilder()).render(docs)
+        rest = configure(RestBuilder()).render(docs)
+
+        md_titles = [title.replace("\\_", "_")
+                     for title in re.findall(r"^#+ (.*)$", markdown, re.MULTILINE)]
+        rest_titles = [title.replace("\\_", "_")
+                       for title in re.findall(r"^(.+)\n[=\-~^\"']+$", rest, re.MULTILINE)]
+        assert rest_titles == md_titles
+
+    def test_streaming(self, configure, python_nominal, tmp_path, mocker):
+        """Verify each file is parsed just before it's generated, and
+        written as soon as it's generated"""
+        builder = configure(RestBuilder()).configure_io(python_nominal,
+                                                        str(tmp_path / "index"))
+        parse_file = mocker.spy(builder.parser, "parse_file")
+
+        chunks = builder.iter_render()
+        assert next(chunks) == ""
+        assert parse_file.call_count == 0
+        assert next(chunks).startswith("\nexample\\_epydoc\n===============\n")
+        assert parse_file.call_count == 1
+        assert len(list(chunks)) == 4
+        assert parse_file.call_count == 4
+
+        assert not hasattr(builder, "build_document")
+
+        builder.build()
+        assert os.listdir(tmp_path) == ["index.rst"]
+
+    def test_cli(self, python_examples, tmp_path, mocker):
+        """Verify the rest command writes a file for each directory, and
+        reuses the files parsed by the markdown command"""
+        shutil.copytree(python_examples, tmp_path / "src")
+        cache = str(tmp_path / "cache.snapshot")
+        main(["markdown", "-i", str(tmp_path / "src"), "-r", "--cache", cache, "-c", "none.ini"])
+
+        parse_file = mocker.spy(DocspecAdapter, "parse_file")
+        main(["rest", "-i", str(tmp_path / "src"), "-r", "--cache", cache, "-c", "none.ini"])
+        assert parse_file.call_count == 0
+
+        with open(tmp_path / "src" / "nominal" / "index.rst", encoding="utf-8") as rst_file:
+            rest = rst_file.read()
+        assert rest.startswith("=======\nnominal\n=======\n\n.. contents:: Contents\n")
+        assert "\nExampleGoogle\n~~~~~~~~~~~~~\n" in rest
+
+        with pytest.raises(DoctoPiConfigError):
+            main(["rest", "-i", cache, "--from-dump", "-r", "-c", "none.ini"])
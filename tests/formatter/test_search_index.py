@@ -0,0 +1,107 @@
+"""Test doctopi.formatter.markdown.search_index package"""
+# Built-in imports
+import json
+import os
+import shutil
+
+# Third party imports
+import pytest
+
+# This package imports
+from doctopi.__main__ import main
+from doctopi.cli import DoctoPiConfigError
+from doctopi.formatter.markdown.cmd import (MarkdownClassCommand, MarkdownFunctionCommand,
+                                            MarkdownMethodsCommand)
+from doctopi.formatter.markdown.markdown_builder import MarkdownBuilder
+from doctopi.formatter.markdown.search_index import SearchIndex, tokenize
+
+
+class TestSearchIndex:
+    """Test doctopi.formatter.markdown.search_index package"""
+
+    def test_tokenize(self):
+        """Verify identifiers are indexed whole and by word, without stop
+        words"""
+        assert list(tokenize("def parse_file(self, HTTPServer)")) \
+            == ["parse_file", "parse", "file", "httpserver", "http", "server"]
+        assert list(tokenize("Parse the __init__ file")) == ["parse", "init", "file"]
+
+    def test_search(self, parser_docs):
+        """Verify public symbols are indexed, and queries match every word
+        by prefix, best matches first"""
+        index = SearchIndex().add(parser_docs, "docs/README.md")
+
+        assert [document.qualname for document in index.documents] \
+            == ["pkg.parser", "pkg.parser.SourceParser", "pkg.parser.SourceParser.parse_file",
+                "pkg.parser.load_dump"]
+        assert [document.qualname for document in index.search("pars")] \
+            == ["pkg.parser.SourceParser.parse_file", "pkg.parser.SourceParser", "pkg.parser"]
+        assert [document.qualname for document in index.search("parse source")] \
+            == ["pkg.parser.SourceParser", "pkg.parser.SourceParser.parse_file", "pkg.parser"]
+        assert index.search("path dump")[0].href("docs") == "README.md#pkg.parser.load_dump"
+        assert not index.search("reset")
+
+        # Adding a page again replaces its symbols
+        index.add(parser_docs, "docs/README.md", public_only=False)
+        assert len(index.documents) == 5
+        assert index.search("reset")[0].kind == "method"
+
+    def test_write(self, parser_docs, tmp_path):
+        """Verify postings are sharded by prefix and delta-encoded, and
+        shards left from a previous index are removed"""
+        os.makedirs(tmp_path / "search" / "terms")
+        (tmp_path / "search" / "terms" / "zz.json").write_text("{}", encoding="utf-8")
+        index = SearchIndex(shard_size=3).add(parser_docs, str(tmp_path / "README.md"))
+        index.write(tmp_path / "search")
+
+        with open(tmp_path / "search" / "index.json", encoding="utf-8") as manifest_file:
+            manifest = json.load(manifest_file)
+        assert manifest["documents"] == 4
+        assert "pa" in manifest["shards"]
+        assert sorted(os.listdir(tmp_path / "search" / "terms")) \
+            == sorted(f"{prefix}.json" for prefix in manifest["shards"])
+        assert sorted(os.listdir(tmp_path / "search" / "docs")) == ["0.json", "1.json"]
+
+        with open(tmp_path / "search" / "terms" / "pa.json", encoding="utf-8") as shard_file:
+            shard = json.load(shard_file)
+        # The module's summary, and the method's name, signature and summary
+        assert shard["parse_file"] == [2, 6]
+        assert shard["parse"] == [0, 1, 2, 7]
+        with open(tmp_path / "search" / "docs" / "1.json", encoding="utf-8") as docs_file:
+            assert json.load(docs_file) == [["pkg.parser.load_dump", "function",
+                                             "../README.md#pkg.parser.load_dump",
+                                             "Load a dump"]]
+
+    def test_builder(self, parser_docs, tmp_path):
+        """Verify the builder anchors the headings the index links to"""
+        search = SearchIndex()
+        builder = MarkdownBuilder().configure_io(str(tmp_path), "README.md") \
+            .add_file_command(MarkdownClassCommand) \
+            .add_file_command(MarkdownFunctionCommand) \
+            .add_class_commands(MarkdownMethodsCommand)
+
+        assert '<a name="' not in builder.render(parser_docs)
+        markdown = builder.configure_search(search).render(parser_docs)
+        for document in search.documents[1:]:
+            assert f'<a name="{document.anchor}"></a>' in markdown
+        assert search.documents[0].href() == "README.md"
+
+    def test_cli(self, python_examples, tmp_path):
+        """Verify a recursive run indexes every directory's symbols with
+        links to their Markdown file, and --check still passes"""
+        shutil.copytree(python_examples, tmp_path / "src")
+        args = ["markdown", "-i", str(tmp_path / "src"), "-r",
+                "--search-index", str(tmp_path / "search"), "-c", "none.ini"]
+        main(args)
+        main(args + ["--check"])
+
+        with open(tmp_path / "search" / "docs" / "0.json", encoding="utf-8") as docs_file:
+            documents = json.load(docs_file)
+        page, anchor = [href for qualname, _, href, _ in documents
+                        if qualname.endswith("ExampleGoogle")][0].split("#")
+        assert page == "../src/nominal/README.md"
+        with open(tmp_path / "search" / page, encoding="utf-8") as md_file:
+            assert f'<a name="{anchor}"></a>' in md_file.read()
+
+        with pytest.raises(DoctoPiConfigError):
+            main(args + ["--shard", "1/2"])
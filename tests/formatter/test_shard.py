@@ -0,0 +1,113 @@
+"""Test the doctopi.formatter.markdown.shard package"""
+# Built-in imports
+import os
+import shutil
+
+# Third-party imports
+import pytest
+
+# This package imports
+from doctopi.__main__ import main
+from doctopi.cli import DoctoPiConfigError
+from doctopi.formatter.markdown.shard import (ShardArtifact, ShardError, merge, parse_shard,
+                                              partition)
+
+
+class TestShard:
+    """Test the doctopi.formatter.markdown.shard package"""
+
+    def test_parse_shard(self):
+        """Verify shard specifications are parsed and validated"""
+        assert parse_shard("2/3") == (2, 3)
+
+        for spec in ["0/3", "4/3", "2", "a/b"]:
+            with pytest.raises(ShardError):
+                parse_shard(spec)
+
+    @pytest.mark.parametrize("strategy", ["hash", "size"])
+    def test_partition(self, strategy, tmp_path):
+        """Verify every file is in exactly one shard, regardless of
+        where the tree is"""
+        files = []
+        for size in range(10):
+            files.append(str(tmp_path / f"module_{size}.py"))
+            with open(files[-1], "w", encoding="utf-8") as source:
+                source.write("#" * size * 100)
+
+        shards = partition(files, 3, root=str(tmp_path), strategy=strategy)
+        assert sorted(file for shard in shards for file in shard) == sorted(files)
+        assert all(shard == sorted(shard, key=files.index) for shard in shards)
+
+        # The same relative paths are split the same way elsewhere
+        moved = tmp_path / "moved"
+        shutil.copytree(tmp_path, moved, ignore=shutil.ignore_patterns("moved"))
+        moved_files = [str(moved / os.path.basename(file)) for file in files]
+        assert [[os.path.basename(file) for file in shard] for shard in shards] == \
+            [[os.path.basename(file) for file in shard]
+             for shard in partition(moved_files, 3, root=str(moved), strategy=strategy)]
+
+        with pytest.raises(ShardError):
+            partition(files, 3, strategy="random")
+
+    @pytest.mark.parametrize("options", [
+        ["-o", "README.md"],
+        ["-o", "README.md", "--recursive-all-in-one", "--shard-strategy=size"],
+        ["-r"]
+    ])
+    def test_merge_matches_single_run(self, python_examples, options, tmp_path, monkeypatch):
+        """Verify merging every shard creates the same Markdown as a
+        single run"""
+        shutil.copytree(python_examples, tmp_path / "single" / "src")
+        shutil.copytree(python_examples, tmp_path / "sharded" / "src")
+
+        monkeypatch.chdir(tmp_path / "single")
+        main(["markdown", "-i", "src"] + options)
+
+        monkeypatch.chdir(tmp_path / "sharded")
+        for index in range(1, 4):
+            main(["markdown", "-i", "src", f"--shard={index}/3"] + options)
+        main(["merge"] + [f"doctopi-shard-{index}-of-3.json" for index in (3, 1, 2)])
+
+        outputs = []
+        for dirpath, _, files in os.walk(tmp_path / "single"):
+            outputs.extend(os.path.relpath(os.path.join(dirpath, file), tmp_path / "single")
+                           for file in files if file.endswith(".md"))
+        assert outputs
+
+        for output in outputs:
+            with open(tmp_path / "single" / output, encoding="utf-8") as single, \
+                    open(tmp_path / "sharded" / output, encoding="utf-8") as sharded:
+                assert single.read() == sharded.read()
+
+    def test_merge_off_nominal(self, python_examples, tmp_path, monkeypatch):
+        """Verify missing, duplicated or mismatched shards aren't
+        merged"""
+        shutil.copytree(python_examples, tmp_path / "src")
+        monkeypatch.chdir(tmp_path)
+        for index in range(1, 3):
+            main(["markdown", "-i", "src", "--recursive-all-in-one", f"--shard={index}/2"])
+
+        first = ShardArtifact.load("doctopi-shard-1-of-2.json")
+        second = ShardArtifact.load("doctopi-shard-2-of-2.json")
+        assert merge([first, second])
+
+        with pytest.raises(ShardError):
+            merge([first])
+        with pytest.raises(ShardError):
+            merge([first, first])
+        with pytest.raises(ShardError):
+            merge([])
+
+        second.documents[0]["title"] = "Other title"
+        with pytest.raises(ShardError):
+            merge([first, second])
+
+        with open("not_an_artifact.json", "w", encoding="utf-8") as artifact_file:
+            artifact_file.write("{}")
+        with pytest.raises(ShardError):
+            ShardArtifact.load("not_an_artifact.json")
+
+        # A shard can't link to the symbols of the other shards' files
+        for option in ("--link-symbols", "--inherited-members"):
+            with pytest.raises(DoctoPiConfigError):
+                main(["markdown", "-i", "src", "--recursive-all-in-one", "--shard=1/2", option])
@@ -0,0 +1,142 @@
+"""Test doctopi.formatter.markdown.symbol_index package"""
+# Built-in imports
+import os
+
+# This package imports
+from doctopi.__main__ import main
+from doctopi.formatter.markdown.cmd import (MarkdownClassCommand, MarkdownMethodsCommand,
+                                            MarkdownReturnsCommand)
+from doctopi.formatter.markdown.markdown_builder import MarkdownBuilder
+from doctopi.formatter.markdown.symbol_index import SymbolIndex
+from doctopi.types import Docstring, NameDescriptionType
+
+BASE_SOURCE = '''"""Base module"""
+
+
+class Base:
+    """A base class"""
+
+    def run(self, helper):
+        """Run the base
+
+        Args:
+            helper (Helper): the helper to run with
+        """
+
+    def stop(self):
+        """Stop the base"""
+
+
+class Helper:
+    """Helps the base"""
+'''
+
+CHILD_SOURCE = '''"""Child module"""
+
+
+class Child(Base, metaclass=type):
+    """A child class"""
+
+    def stop(self):
+        """Stop the child"""
+'''
+
+
+class TestSymbolIndex:
+    """Test doctopi.formatter.markdown.symbol_index package"""
+
+    def test_resolve(self, inheritance_docs):
+        """Verify names resolve by qualified name, enclosing scope, or
+        unique class name"""
+        index = SymbolIndex().add(inheritance_docs)
+
+        assert index.module("pkg/sub/child.py") == "pkg.sub.child"
+        assert index.resolve("pkg.base.Base.run").qualname == "pkg.base.Base.run"
+        assert index.resolve("Base", "pkg.sub.child").qualname == "pkg.sub.child.Base"
+        assert index.resolve("Base", "pkg.base.Mixin").qualname == "pkg.base.Base"
+        assert index.resolve("base.Base", "pkg.sub.child").qualname == "pkg.base.Base"
+        assert index.resolve("Mixin").qualname == "pkg.base.Mixin"
+        assert index.resolve("Base") is None  # Declared twice
+        assert index.resolve("other.Mixin") is None
+
+    def test_inherited(self, inheritance_docs):
+        """Verify base classes resolve and overridden methods aren't
+        inherited"""
+        index = SymbolIndex().add(inheritance_docs)
+
+        assert [(base, entry.qualname if entry else None)
+                for base, entry in index.bases("pkg.sub.child.Child")] \
+            == [("base.Base", "pkg.base.Base"), ("Mixin", "pkg.base.Mixin"),
+                ("Generic[T]", None)]
+        assert [(base.name, [method.name for method in methods])
+                for base, methods in index.inherited("pkg.sub.child.Child")] \
+            == [("Base", ["run", "_hidden"]), ("Mixin", ["mix"])]
+
+        # Inheriting from a subclass doesn't loop
+        assert [base.name for base, _ in index.inherited("pkg.sub.child.Base")] \
+            == ["Child", "Base", "Mixin"]
+
+    def test_links(self, inheritance_docs):
+        """Verify types link to classes, relative to the page linking"""
+        index = SymbolIndex().add(inheritance_docs,
+                                  page=lambda doc_file: os.path.join(
+                                      os.path.dirname(os.path.abspath(doc_file.path)),
+                                      "README.md"))
+        page = os.path.abspath("pkg/sub/README.md")
+
+        assert index.link_types("Optional[Mixin]", "pkg.sub.child", page) \
+            == "Optional[[Mixin](../README.md#pkg.base.Mixin)]"
+        assert index.link_types("Base", "pkg.sub.child", page) \
+            == "[Base](#pkg.sub.child.Base)"
+        assert index.link_types("run or str", "pkg.base.Base", page) == "run or str"
+
+    def test_builder(self, inheritance_docs, tmp_path):
+        """Verify the builder anchors headings and links base classes,
+        types and inherited methods"""
+        docs = inheritance_docs
+        docs.subdirs[0].files[0].classes[0].methods[0].docstring = Docstring(
+            summary="Stop the child", returns=NameDescriptionType(type="List[Mixin]"))
+        builder = MarkdownBuilder().configure_io(str(tmp_path), "README.md", recursive=True) \
+            .add_file_command(MarkdownClassCommand) \
+            .add_class_commands(MarkdownMethodsCommand) \
+            .add_function_commands(MarkdownReturnsCommand)
+
+        assert "](#" not in builder.render(docs)
+
+        markdown = builder.configure_symbols(inherited_members=True).render(docs)
+        assert '<a name="pkg.sub.child.Child.stop"></a>' in markdown
+        assert "Bases: [Base](#pkg.base.Base), [Mixin](#pkg.base.Mixin), `Generic[T]`" \
+            in markdown
+        assert "|List[[Mixin](#pkg.base.Mixin)]|" in markdown
+        assert "- [run](#pkg.base.Base.run)" in markdown
+        assert "[\\_hidden]" not in markdown  # Not documented with public_only
+
+    def test_cli(self, tmp_path, monkeypatch):
+        """Verify a recursive run links between directories' Markdown
+        files"""
+        os.makedirs(tmp_path / "pkg" / "sub")
+        (tmp_path / "pkg" / "base.py").write_text(BASE_SOURCE, encoding="utf-8")
+        (tmp_path / "pkg" / "sub" / "child.py").write_text(CHILD_SOURCE, encoding="utf-8")
+        monkeypatch.chdir(tmp_path)
+
+        main(["markdown", "-i", "pkg", "-r", "--inherited-members", "-c", "none.ini"])
+        main(["markdown", "-i", "pkg", "-r", "--inherited-members", "-c", "none.ini",
+              "--check"])
+
+        child = (tmp_path / "pkg" / "sub" / "README.md").read_text(encoding="utf-8")
+        assert "Bases: [Base](../README.md#pkg.base.Base)" in child
+        assert "- [run](../README.md#pkg.base.Base.run)" in child
+        base = (tmp_path / "pkg" / "README.md").read_text(encoding="utf-8")
+        assert "|helper|[Helper](#pkg.base.Helper)|the helper to run with|" in base
+
+    def test_dependents(self, inheritance_docs):
+        """Verify the pages linking to a module's symbols are found"""
+        docs = inheritance_docs
+        docs.files[0].classes[1].member_variables = [
+            NameDescriptionType("child", type="List[Child]")]
+        index = SymbolIndex().add(docs, page=lambda doc_file: os.path.dirname(doc_file.path))
+
+        assert index.get("pkg.base.Mixin").module == "pkg.base"
+        assert index.dependents({"pkg.base"}) == {"pkg/sub"}
+        assert index.dependents({"pkg.sub.child"}) == {"pkg", "pkg/sub"}
+        assert not index.dependents({"pkg.other"})
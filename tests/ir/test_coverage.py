@@ -0,0 +1,79 @@
+"""Test doctopi.ir.coverage package"""
+# Built-in imports
+import json
+import shutil
+
+# Third party imports
+import pytest
+
+# This package imports
+from doctopi.__main__ import main
+from doctopi.cli import DoctoPiConfigError
+from doctopi.formatter.markdown.markdown_builder import MarkdownBuilder
+from doctopi.ir.coverage import CoverageIssue, CoverageReport
+from doctopi.types import AccessType, ClassDeclaration, DocFile, Docstring, NameDescriptionType
+
+
+class TestCoverage:
+    """Test doctopi.ir.coverage package"""
+
+    def test_report(self, make_function):
+        """Verify public symbols are counted, and docstrings compared
+        with their signatures"""
+        documented = Docstring(summary="Documented", args=[NameDescriptionType(name="a"),
+                                                           NameDescriptionType(name="*rest"),
+                                                           NameDescriptionType(name="b")])
+        doc_file = DocFile("module", "pkg/module.py", Docstring(summary="Module"), classes=[
+            ClassDeclaration("Public", "class Public:", Docstring(summary="Public"), methods=[
+                make_function("method", "def method(self, a, *rest) -> int:", documented),
+                make_function("_hidden", "def _hidden(self):", access=AccessType.PROTECTED)]),
+            ClassDeclaration("_Private", "class _Private:", Docstring(), methods=[
+                make_function("method", "def method(self):")])
+        ], functions=[make_function("undocumented", "def undocumented(c):", Docstring()),
+                      make_function("other", "public Other(int c)", Docstring(summary="Java"))])
+
+        coverage = CoverageReport().add(doc_file, "pkg").files["pkg/module.py"]
+        assert coverage.symbols == {"module": 1, "class": 1, "function": 2, "method": 1}
+        assert coverage.documented == {"module": 1, "class": 1, "function": 1, "method": 1}
+        assert [(issue.symbol, issue.issue, issue.detail) for issue in coverage.issues] == [
+            ("pkg.module.Public.method", "unknown", "b"),
+            ("pkg.module.Public.method", "returns", "int"),
+            ("pkg.module.undocumented", "missing", "")]
+
+    def test_builder(self, python_examples, tmp_path):
+        """Verify the builder measures the files it parses"""
+        report = CoverageReport()
+        builder = MarkdownBuilder().configure_src("python", "google") \
+            .configure_io(python_examples, str(tmp_path / "README.md"), recursive=True) \
+            .configure_coverage(report)
+        builder.render()
+
+        assert len(report.files) == 4
+        assert report.packages() == {"python.nominal": {"documented": 43, "symbols": 52}}
+        assert report.totals()["method"] == {"documented": 19, "symbols": 28}
+        [google] = [coverage for coverage in report.files.values()
+                    if coverage.module == "python.nominal.example_google"]
+        assert CoverageIssue("python.nominal.example_google.ExampleGoogle.example_bar",
+                             "args", "args, kwargs") in google.issues
+
+    def test_cli(self, python_examples, tmp_path):
+        """Verify the markdown command writes JSON and Markdown reports"""
+        shutil.copytree(python_examples, tmp_path / "src")
+        main(["markdown", "-i", str(tmp_path / "src"), "-r",
+              "--coverage", str(tmp_path / "coverage.json"), "-c", "none.ini"])
+
+        with open(tmp_path / "coverage.json", encoding="utf-8") as report_file:
+            report = json.load(report_file)
+        assert report["packages"]["nominal"]["coverage"] == round(43 / 52, 4)
+        assert len(report["files"]) == 4
+
+        main(["markdown", "-i", str(tmp_path / "src"), "-r",
+              "--coverage", str(tmp_path / "coverage.md"), "-c", "none.ini"])
+        with open(tmp_path / "coverage.md", encoding="utf-8") as report_file:
+            assert report_file.read().startswith("# Documentation Coverage\n")
+
+        # The report would only cover the files rendered by the run
+        for options in [["--shard", "1/2"], ["--changed-since", "HEAD"]]:
+            with pytest.raises(DoctoPiConfigError, match="--coverage"):
+                main(["markdown", "-i", str(tmp_path / "src"), "-r", "--coverage",
+                      str(tmp_path / "coverage.md"), "-c", "none.ini"] + options)
@@ -0,0 +1,126 @@
+"""Test doctopi.ir.database package"""
+# Built-in imports
+import os
+import shutil
+
+# Third-party imports
+import pytest
+
+# This package imports
+from doctopi.__main__ import main
+from doctopi.cli import DoctoPiConfigError
+from doctopi.ir.database import SymbolDatabase
+from doctopi.parser.parser_factory import ParserFactory
+
+
+class TestSymbolDatabase:
+    """Test doctopi.ir.database package"""
+
+    def test_find(self, python_examples, tmp_path):
+        """Verify symbols are found by name, kind, access, file and
+        missing docstring sections"""
+        with SymbolDatabase(str(tmp_path / "symbols.db")) as database:
+            assert database.update(python_examples, ParserFactory("python", "google")) == (4, 0)
+
+            [symbol] = database.find("ExampleGoogle.example_foo")
+            assert symbol.qualname == "python.nominal.example_google.ExampleGoogle.example_foo"
+            assert (symbol.kind, symbol.access) == ("method", "public")
+            assert symbol.path == os.path.abspath(os.path.join(python_examples, "nominal",
+                                                               "example_google.py"))
+
+            functions = list(database.find(kind="function", path=symbol.path))
+            assert [function.qualname.rsplit(".", 1)[-1] for function in functions] \
+                == ["example_function"]
+            assert all(found.kind == "module" for found in database.find("*.example_google"))
+
+            lacking = {found.qualname for found in database.find(access="public",
+                                                                 missing="returns")}
+            assert symbol.qualname not in lacking
+            assert "python.nominal.example_google.ExampleGoogle.__init__" not in lacking
+
+            with pytest.raises(ValueError):
+                list(database.find(missing="examples"))
+
+    def test_missing_signature(self, tmp_path):
+        """Verify arguments and returns are only missing when the
+        signature has them, like in a coverage report"""
+        source = tmp_path / "src" / "module.py"
+        os.makedirs(source.parent)
+        source.write_text('''"""Module"""
+
+
+def procedure(a):
+    """Procedure
+
+    Args:
+        a: documented
+    """
+
+
+def no_args() -> int:
+    """No arguments"""
+
+
+def unknown(*args, b: int = 0) -> None:
+    """Unknown
+
+    Args:
+        *args: documented
+    """
+
+
+class Shape:
+    """Shape"""
+
+    def area(self, scale: float) -> float:
+        """Area
+
+        Returns:
+            float: the area
+        """
+''')
+        with SymbolDatabase(str(tmp_path / "symbols.db")) as database:
+            database.update(str(tmp_path / "src"), ParserFactory("python", "google"))
+
+            def missing(section):
+                return [found.qualname.rsplit(".", 1)[-1]
+                        for found in database.find(missing=section)]
+
+            assert missing("returns") == ["no_args"]
+            assert missing("args") == ["area", "unknown"]
+
+    def test_incremental(self, python_examples, tmp_path, mocker):
+        """Verify only changed files are parsed again, and deleted files
+        are removed"""
+        shutil.copytree(python_examples, tmp_path / "src")
+        parser = ParserFactory("python", "google")
+        parse_file = mocker.spy(parser, "parse_file")
+
+        with SymbolDatabase(str(tmp_path / "symbols.db")) as database:
+            database.update(str(tmp_path / "src"), parser)
+            count = len(list(database.find()))
+            assert database.update(str(tmp_path / "src"), parser) == (0, 0)
+            assert parse_file.call_count == 4
+
+            with open(tmp_path / "src" / "nominal" / "example_rest.py", "a",
+                      encoding="utf-8") as source:
+                source.write('\n\ndef added():\n    """Added"""\n')
+            os.remove(tmp_path / "src" / "nominal" / "example_numpy.py")
+
+            assert database.update(str(tmp_path / "src"), parser) == (1, 1)
+            assert list(database.find("added"))
+            assert not list(database.find("*example_numpy*"))
+            assert len(list(database.find())) < count
+
+    def test_cli(self, python_examples, tmp_path, capsys):
+        """Verify dump writes a database the query command reads"""
+        database = str(tmp_path / "symbols.db")
+        main(["dump", "-i", python_examples, "-o", database, "-f", "sqlite", "-c", "missing.ini"])
+        main(["query", database, "example_function", "--kind", "function"])
+
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 4
+        assert all(line.split("\t")[1] == "function" for line in lines)
+
+        with pytest.raises(DoctoPiConfigError):
+            main(["query", str(tmp_path / "missing.db")])
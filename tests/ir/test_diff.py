@@ -0,0 +1,209 @@
+"""Test doctopi.ir.diff package"""
+# Built-in imports
+import json
+import os
+import shutil
+import subprocess
+
+# Third party imports
+import pytest
+
+# This package imports
+from doctopi.__main__ import main
+from doctopi.cli import DoctoPiConfigError
+from doctopi.ir.diff import (WORKTREE, ApiChange, DumpTree, GitTree, SourceTree, diff_trees,
+                             open_tree)
+from doctopi.ir.symbols import module_path_name
+from doctopi.parser.parser_factory import ParserFactory
+
+
+OLD_SOURCE = '''"""Module"""
+
+
+def run(a):
+    """Run"""
+
+
+def stop():
+    """Stop"""
+
+
+def _hidden():
+    """Hidden"""
+
+
+class Runner:
+    """Runner"""
+
+    def start(self):
+        """Start"""
+'''
+
+NEW_SOURCE = '''"""Module"""
+
+
+def run(a, b):
+    """Run"""
+
+
+def _hidden(c):
+    """Hidden"""
+
+
+class Runner:
+    """Runs things"""
+
+    def start(self):
+        """Start"""
+
+    def pause(self):
+        """Pause"""
+'''
+
+UNCHANGED_SOURCE = '''"""Unchanged module"""
+
+
+def helper():
+    """Help"""
+'''
+
+
+def write_tree(root, module_source):
+    """Write a package with a changing and an unchanged module"""
+    os.makedirs(root / "pkg", exist_ok=True)
+    (root / "pkg" / "__init__.py").write_text('"""Package"""\n', encoding="utf-8")
+    (root / "pkg" / "module.py").write_text(module_source, encoding="utf-8")
+    (root / "pkg" / "unchanged.py").write_text(UNCHANGED_SOURCE, encoding="utf-8")
+
+
+class TestDiff:
+    """Test doctopi.ir.diff package"""
+
+    def test_module_path_name(self):
+        """Verify modules are named after their relative path"""
+        assert module_path_name("pkg/sub/module.py") == "pkg.sub.module"
+        assert module_path_name("pkg/__init__.py") == "pkg"
+        assert module_path_name("__init__.py") == "__init__"
+
+    def test_source_trees(self, tmp_path, mocker):
+        """Verify public symbols are compared, and unchanged files aren't
+        parsed"""
+        write_tree(tmp_path / "old", OLD_SOURCE)
+        write_tree(tmp_path / "new", NEW_SOURCE)
+        parser = ParserFactory("python", "google")
+        parse_file = mocker.spy(parser, "parse_file")
+
+        api_diff = diff_trees(SourceTree(tmp_path / "old", parser),
+                              SourceTree(tmp_path / "new", parser))
+
+        assert (api_diff.compared, api_diff.skipped) == (1, 2)
+        assert parse_file.call_count == 2
+        assert api_diff.changes == [
+            ApiChange("pkg.module.Runner", "class", "changed", "class Runner:", "class Runner:",
+                      ["docstring"]),
+            ApiChange("pkg.module.run", "function", "changed", "def run(a):", "def run(a, b):",
+                      ["signature"]),
+            ApiChange("pkg.module.stop", "function", "removed", before="def stop():"),
+            ApiChange("pkg.module.Runner.pause", "method", "added", after="def pause(self):")]
+
+        markdown = api_diff.to_markdown()
+        assert "## Added\n\n- `pkg.module.Runner.pause` (method)\n" in markdown
+        assert "  - def run(a):\n  + def run(a, b):\n" in markdown
+        assert "- `pkg.module.Runner` (class): docstring changed" in markdown
+        assert "_hidden" not in markdown
+
+    def test_dumps(self, tmp_path):
+        """Verify dumps compare with source trees, and snapshots written
+        by the cache skip unchanged files"""
+        write_tree(tmp_path / "old", OLD_SOURCE)
+        write_tree(tmp_path / "new", NEW_SOURCE)
+        main(["dump", "-i", str(tmp_path / "old"), "-o", str(tmp_path / "old.json"),
+              "-c", "none.ini"])
+        parser = ParserFactory("python", "google")
+
+        api_diff = diff_trees(DumpTree(tmp_path / "old.json"),
+                              SourceTree(tmp_path / "new", parser))
+        assert api_diff.compared == 3
+        assert [change.symbol for change in api_diff.changes] \
+            == ["pkg.module.Runner", "pkg.module.run", "pkg.module.stop",
+                "pkg.module.Runner.pause"]
+
+        # Each tree's files are cached with the digest of their contents
+        main(["markdown", "-i", str(tmp_path / "old"), "-o", str(tmp_path / "old.md"),
+              "--cache", str(tmp_path / "old.snapshot"), "-c", "none.ini"])
+        main(["markdown", "-i", str(tmp_path / "new"), "-o", str(tmp_path / "new.md"),
+              "--cache", str(tmp_path / "new.snapshot"), "-c", "none.ini"])
+        api_diff = diff_trees(DumpTree(tmp_path / "old.snapshot"),
+                              DumpTree(tmp_path / "new.snapshot"))
+        assert (api_diff.compared, api_diff.skipped) == (1, 2)
+        assert len(api_diff.changes) == 4
+
+    @pytest.mark.skipif(shutil.which("git") is None, reason="git isn't installed")
+    def test_git(self, tmp_path, monkeypatch, mocker):
+        """Verify git refs are compared without checking them out, and
+        unchanged files in the working tree aren't parsed"""
+        write_tree(tmp_path, OLD_SOURCE)
+        monkeypatch.chdir(tmp_path)
+        for command in (["init", "-q"], ["add", "."],
+                        ["-c", "user.name=test", "-c", "user.email=test@example.com",
+                         "commit", "-q", "-m", "old"], ["tag", "v1"]):
+            subprocess.run(["git", *command], check=True)
+        write_tree(tmp_path, NEW_SOURCE)
+        parser = ParserFactory("python", "google")
+
+        api_diff = diff_trees(GitTree("v1", "pkg", parser), SourceTree("pkg", parser))
+        assert (api_diff.compared, api_diff.skipped) == (1, 2)
+        assert len(api_diff.changes) == 4
+
+        main(["diff", "v1", "HEAD", "--git", "pkg", "-f", "json", "-o", "diff.json",
+              "-c", "none.ini"])
+        with open("diff.json", encoding="utf-8") as report_file:
+            report = json.load(report_file)
+        assert (report["compared"], report["skipped"], report["changed"]) == (0, 3, [])
+
+        # The ref is compared with the working tree it's read from
+        parse_file = mocker.spy(parser, "parse_file")
+        api_diff = diff_trees(open_tree("v1", parser, "pkg"), open_tree(WORKTREE, parser, "pkg"))
+        assert (api_diff.compared, api_diff.skipped, parse_file.call_count) == (1, 2, 1)
+        assert len(api_diff.changes) == 4
+
+        main(["diff", "v1", "--git", "pkg", "-f", "json", "-o", "diff.json", "-c", "none.ini"])
+        with open("diff.json", encoding="utf-8") as report_file:
+            report = json.load(report_file)
+        assert (report["compared"], report["skipped"]) == (1, 2)
+        assert [change["symbol"] for change in report["added"]] == ["module.Runner.pause"]
+
+    def test_git_accepts(self, doxygen_xml_examples, tmp_path, monkeypatch):
+        """Verify files at a git ref are filtered like a directory's, by
+        their contents when the parser needs to"""
+        shutil.copytree(doxygen_xml_examples, tmp_path / "xml")
+        monkeypatch.chdir(tmp_path)
+        for command in (["init", "-q"], ["add", "."],
+                        ["-c", "user.name=test", "-c", "user.email=test@example.com",
+                         "commit", "-q", "-m", "xml"]):
+            subprocess.run(["git", *command], check=True)
+        parser = ParserFactory("doxygen_xml", "auto")
+
+        assert sorted(GitTree("HEAD", "xml", parser).digests()) == \
+            sorted(SourceTree("xml", parser).digests())
+        assert "index.xml" not in GitTree("HEAD", "xml", parser).digests()
+
+    def test_cli(self, tmp_path, capsys):
+        """Verify the diff command writes JSON and Markdown reports"""
+        write_tree(tmp_path / "old", OLD_SOURCE)
+        write_tree(tmp_path / "new", NEW_SOURCE)
+
+        main(["diff", str(tmp_path / "old"), str(tmp_path / "new"), "-c", "none.ini"])
+        assert capsys.readouterr().out.startswith("# API Changes\n\n1 files compared, 2 unchanged")
+
+        main(["diff", str(tmp_path / "old"), str(tmp_path / "new"), "-f", "json",
+              "-o", str(tmp_path / "diff.json"), "-c", "none.ini"])
+        with open(tmp_path / "diff.json", encoding="utf-8") as report_file:
+            report = json.load(report_file)
+        assert report["removed"] == [{"symbol": "pkg.module.stop", "kind": "function",
+                                      "before": "def stop():", "after": "", "fields": []}]
+        assert [change["symbol"] for change in report["added"]] == ["pkg.module.Runner.pause"]
+
+        # Only --git has a working tree to compare with
+        with pytest.raises(DoctoPiConfigError):
+            main(["diff", str(tmp_path / "old"), "-c", "none.ini"])
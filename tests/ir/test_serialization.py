@@ -0,0 +1,92 @@
+"""Test doctopi.ir.serialization package"""
+# Built-in imports
+import io
+import json
+import os
+
+# Third-party imports
+import pytest
+
+# This package imports
+from doctopi.__main__ import main
+from doctopi.formatter.markdown.markdown_builder import MarkdownBuilder
+from doctopi.formatter.markdown.cmd import *
+from doctopi.ir import DumpFormatError, dump_json, dump_jsonl, from_dict, load, to_dict
+from doctopi.ir.serialization import load_fp
+from doctopi.parser.parser_factory import ParserFactory
+from doctopi.types import DocDir
+
+
+class TestSerialization:
+    """Test doctopi.ir.serialization package"""
+
+    @pytest.mark.parametrize("style", ["google", "rest", "numpy", "epydoc"])
+    def test_file_round_trip(self, python_nominal, style):
+        """Verify a DocFile is unchanged by converting to and from a dict"""
+        doc_file = ParserFactory("python", style).parse_file(
+            os.path.join(python_nominal, f"example_{style}.py"))
+
+        data = to_dict(doc_file)
+
+        # Verify the dict can be written as JSON
+        assert from_dict(json.loads(json.dumps(data))) == doc_file
+
+    @pytest.mark.parametrize("dump", [dump_json, dump_jsonl])
+    def test_dir_round_trip(self, python_nominal, dump):
+        """Verify a DocDir is unchanged by dumping and loading it"""
+        doc_dir = ParserFactory("python", "auto").parse_dir(os.path.dirname(python_nominal))
+
+        stream = io.StringIO()
+        dump(doc_dir, stream)
+        stream.seek(0)
+
+        loaded = load_fp(stream)
+        assert isinstance(loaded, DocDir)
+        assert loaded == doc_dir
+
+    def test_jsonl_one_record_per_file(self, python_nominal):
+        """Verify JSON Lines dumps write a header, then a record per
+        directory and file"""
+        doc_dir = ParserFactory("python", "auto").parse_dir(python_nominal)
+
+        stream = io.StringIO()
+        dump_jsonl(doc_dir, stream)
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+
+        assert records[0]["kind"] == "header"
+        assert records[1]["kind"] == "dir" and records[1]["parent"] is None
+        assert len([record for record in records if record["kind"] == "file"]) == 4
+
+    @pytest.mark.parametrize("contents", ["", "not json", '{"doctopi": 1}', '{"doctopi": 99, "root": {}}',
+                                          '{"kind": "header", "doctopi": 1}\n'])
+    def test_load_off_nominal(self, contents):
+        """Verify loading something that isn't a dump fails"""
+        with pytest.raises(DumpFormatError):
+            load_fp(io.StringIO(contents))
+
+    @pytest.mark.parametrize("fmt", ["json", "jsonl"])
+    def test_render_from_dump(self, python_nominal, tmp_path, fmt):
+        """Verify Markdown rendered from a dump matches Markdown rendered
+        from the source code"""
+        dump_path = str(tmp_path / f"docs.{fmt}")
+        main(["dump", "-i", python_nominal, "-o", dump_path, "-f", fmt, "-c", "missing.ini"])
+
+        outputs = []
+        for docs in [None, load(dump_path)]:
+            output = str(tmp_path / f"README_{len(outputs)}.md")
+            builder = MarkdownBuilder() \
+                .add_file_command(MarkdownClassCommand) \
+                .add_file_command(MarkdownFunctionCommand) \
+                .add_class_commands(MarkdownMethodsCommand) \
+                .add_function_commands(MarkdownArgsCommand) \
+                .configure_src(language="python", style="auto") \
+                .configure_io(python_nominal, output)
+            if docs:
+                builder.configure_docs(docs)
+            builder.build()
+
+            with open(output, encoding="utf-8") as md_file:
+                outputs.append(md_file.read())
+
+        assert outputs[0] == outputs[1]
+
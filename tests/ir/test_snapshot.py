@@ -0,0 +1,152 @@
+"""Test doctopi.ir.snapshot package"""
+# Built-in imports
+import os
+import shutil
+
+# Third-party imports
+import pytest
+
+# This package imports
+from doctopi.__main__ import main
+from doctopi.cli.stamp import strip_stamp
+from doctopi.ir import DumpFormatError, Snapshot, SnapshotCache, dump_snapshot, load
+from doctopi.parser.parser_factory import ParserFactory
+from doctopi.parser.walker import DirectoryWalker
+from doctopi.types import DocDir
+
+
+class TestSnapshot:
+    """Test doctopi.ir.snapshot package"""
+
+    @pytest.fixture
+    def doc_dir(self, python_examples) -> DocDir:
+        """Parse the python examples"""
+        return ParserFactory("python", "auto").parse_dir(python_examples)
+
+    @pytest.fixture
+    def snapshot_path(self, tmp_path, doc_dir) -> str:
+        """Write the parsed python examples as a snapshot"""
+        path = str(tmp_path / "docs.snapshot")
+        with open(path, "wb") as snapshot_file:
+            dump_snapshot(doc_dir, snapshot_file)
+        return path
+
+    def test_round_trip(self, doc_dir, snapshot_path):
+        """Verify a DocDir is unchanged by writing and loading a
+        snapshot"""
+        with Snapshot(snapshot_path) as snapshot:
+            assert len(snapshot) == 4
+            assert snapshot.root() == doc_dir
+
+    def test_lazy_decoding(self, python_nominal, doc_dir, snapshot_path):
+        """Verify files are only decoded when they are accessed"""
+        with Snapshot(snapshot_path) as snapshot:
+            root = snapshot.root()
+            # pylint: disable = protected-access
+            assert not snapshot._doc_files
+
+            nominal = snapshot.subtree(python_nominal)
+            assert nominal.files[1] == doc_dir.subdirs[0].files[1]
+            assert len(snapshot._doc_files) == 1
+            assert root.subdirs[0] is nominal
+
+    def test_lookup(self, doc_dir, snapshot_path):
+        """Verify files can be found by path and qualified name"""
+        doc_file = doc_dir.subdirs[0].files[0]
+
+        with Snapshot(snapshot_path) as snapshot:
+            assert snapshot.get_file(doc_file.path) == doc_file
+            assert snapshot.get_file("some/fake/path.py") is None
+
+            name = f"python.nominal.{doc_file.name}.{doc_file.classes[0].name}"
+            assert snapshot.find_symbol(name) == doc_file
+            assert snapshot.find_symbol(f"{name}.fake_method") is None
+
+    def test_load(self, doc_dir, snapshot_path):
+        """Verify doctopi.ir.load detects snapshots"""
+        assert load(snapshot_path) == doc_dir
+
+    @pytest.mark.parametrize("contents", [b"", b"DOCTOPIS", b"not a snapshot at all, no way"])
+    def test_load_off_nominal(self, tmp_path, contents):
+        """Verify loading something that isn't a snapshot fails"""
+        path = tmp_path / "bad.snapshot"
+        path.write_bytes(contents)
+
+        with pytest.raises(DumpFormatError):
+            Snapshot(str(path))
+
+    def test_cache(self, python_examples, mocker, tmp_path):
+        """Verify a snapshot can be used as a persistent parse cache"""
+        cache_path = str(tmp_path / "cache.snapshot")
+        parser = ParserFactory("python", "auto")
+        parse_file = mocker.spy(parser, "parse_file")
+
+        # Parse everything and save the cache
+        cache = SnapshotCache(cache_path)
+        expected = DirectoryWalker(parser, cache).walk(python_examples)
+        cache.save()
+        assert parse_file.call_count == 4
+
+        # Reuse everything from the saved cache
+        cache = SnapshotCache(cache_path)
+        assert DirectoryWalker(parser, cache).walk(python_examples) == expected
+        assert parse_file.call_count == 4
+
+        # A parser with a different configuration can't reuse the cache
+        other_parser = ParserFactory("python", "google")
+        other_parse_file = mocker.spy(other_parser, "parse_file")
+        DirectoryWalker(other_parser, cache).walk(python_examples)
+        assert other_parse_file.call_count == 4
+
+    def test_cache_prune(self, python_examples, tmp_path):
+        """Verify files whose source was deleted or renamed are dropped
+        from the cache when it's saved, and others are kept"""
+        src = tmp_path / "src"
+        shutil.copytree(python_examples, src)
+        cache_path = str(tmp_path / "cache.snapshot")
+        parser = ParserFactory("python", "auto")
+
+        cache = SnapshotCache(cache_path)
+        DirectoryWalker(parser, cache).walk(str(src))
+        cache.save()
+        paths = set(cache.snapshot.paths())
+        assert len(paths) == 4
+
+        # A file that isn't looked up is kept while it exists
+        renamed, deleted, *_ = sorted(paths)
+        os.rename(renamed, f"{renamed[:-3]}_renamed.py")
+        os.remove(deleted)
+        cache = SnapshotCache(cache_path)
+        cache.save()
+        assert set(cache.snapshot.paths()) == paths - {renamed, deleted}
+
+        # Members of an archive are kept while the archive exists
+        member = str(tmp_path / "pkg.whl" / "pkg" / "module.py")
+        doc_file = parser.parse_file(sorted(paths)[-1])
+        doc_file.path = member
+        cache.put(member, "digest", doc_file)
+        cache.save()
+        (tmp_path / "pkg.whl").write_bytes(b"")
+        SnapshotCache(cache_path).save()
+        assert member in SnapshotCache(cache_path).snapshot.paths()
+
+    def test_cli(self, python_examples, tmp_path):
+        """Verify the CLI can dump snapshots, render them, and cache
+        parsed files in them"""
+        snapshot_path = str(tmp_path / "docs.snapshot")
+        cache_path = str(tmp_path / "cache.snapshot")
+        outputs = [str(tmp_path / "from_source.md"), str(tmp_path / "from_snapshot.md")]
+
+        main(["dump", "-i", python_examples, "-o", snapshot_path, "-f", "snapshot"])
+        main(["markdown", "-i", python_examples, "-o", outputs[0], "--recursive-all-in-one",
+              "--cache", cache_path])
+        main(["markdown", "-i", snapshot_path, "-o", outputs[1], "--recursive-all-in-one",
+              "--from-dump"])
+
+        with Snapshot(cache_path) as cache:
+            assert len(cache) == 4
+
+        with open(outputs[0], encoding="utf-8") as from_source, \
+                open(outputs[1], encoding="utf-8") as from_snapshot:
+            # Only the stamps of their sources differ
+            assert strip_stamp(from_source.read()) == strip_stamp(from_snapshot.read())
@@ -0,0 +1,104 @@
+"""Test doctopi.parser.archive package"""
+# Built-in imports
+import dataclasses
+import os
+import tarfile
+import zipfile
+
+# Third-party imports
+import pytest
+
+# This package imports
+from doctopi.__main__ import main
+from doctopi.cli import DoctoPiConfigError
+from doctopi.parser.archive import ArchiveReader, is_archive
+from doctopi.parser.cache import MemoryParseCache
+from doctopi.parser.parser_factory import ParserFactory
+
+
+def without_paths(doc_dir):
+    """Strip the paths from a parsed directory tree, to compare trees
+    parsed from different places"""
+    return dataclasses.replace(
+        doc_dir, path="",
+        files=[dataclasses.replace(doc_file, path="") for doc_file in doc_dir.files],
+        subdirs=[without_paths(subdir) for subdir in doc_dir.subdirs])
+
+
+@pytest.fixture(name="make_archive")
+def fixture_make_archive(python_nominal):
+    """Function archiving the examples as the pkg package"""
+    def make_archive(path, prefix=""):
+        sources = sorted(name for name in os.listdir(python_nominal) if name.endswith(".py"))
+        if path.endswith(".whl"):
+            with zipfile.ZipFile(path, "w") as archive:
+                for name in sources:
+                    archive.write(os.path.join(python_nominal, name), f"{prefix}pkg/{name}")
+                archive.writestr("pkg-1.0.dist-info/METADATA", "Name: pkg\n")
+        else:
+            with tarfile.open(path, "w:gz") as archive:
+                for name in sources:
+                    archive.add(os.path.join(python_nominal, name), f"{prefix}pkg/{name}")
+    return make_archive
+
+
+class TestArchiveReader:
+    """Test doctopi.parser.archive package"""
+
+    @pytest.mark.parametrize("archive,prefix", [("pkg-1.0-py3-none-any.whl", ""),
+                                                ("pkg-1.0.tar.gz", "pkg-1.0/")])
+    def test_parse(self, make_archive, python_nominal, archive, prefix, tmp_path):
+        """Verify an archive is parsed like the extracted directory"""
+        path = str(tmp_path / archive)
+        make_archive(path, prefix)
+        parser = ParserFactory("python", "google")
+        assert is_archive(path)
+
+        doc_dir = ArchiveReader(parser).parse(path)
+        assert doc_dir.name == archive.rsplit(".", 2 if prefix else 1)[0]
+        assert [subdir.name for subdir in doc_dir.subdirs] == ["pkg"]
+        assert doc_dir.subdirs[0].files[0].path == \
+            os.path.join(path, prefix, "pkg", doc_dir.subdirs[0].files[0].name + ".py")
+        assert without_paths(doc_dir.subdirs[0]).files == \
+            without_paths(parser.parse_dir(python_nominal)).files
+
+    def test_cache(self, make_archive, mocker, tmp_path):
+        """Verify members are only parsed again when the archive changes"""
+        path = str(tmp_path / "pkg-1.0-py3-none-any.whl")
+        make_archive(path)
+        parser = ParserFactory("python", "google")
+        parse_stream = mocker.spy(parser, "parse_stream")
+        reader = ArchiveReader(parser, MemoryParseCache())
+
+        first = reader.parse(path)
+        assert parse_stream.call_count == 4
+        assert reader.parse(path) == first
+        assert parse_stream.call_count == 4
+
+        with zipfile.ZipFile(path, "a") as archive:
+            archive.writestr("pkg/new.py", '"""A new module"""\n')
+        assert len(reader.parse(path).subdirs[0].files) == 5
+        assert parse_stream.call_count == 9
+
+    def test_distribution(self, python_nominal):
+        """Verify an installed distribution is parsed from its files"""
+        assert is_archive("docstring_parser")
+        assert not is_archive("no-such-distribution")
+        assert not is_archive(python_nominal)
+
+        # The distribution's files are in a package named like it
+        doc_dir = ArchiveReader(ParserFactory("python", "google")).parse("docstring-parser")
+        assert "google" in [doc_file.name for doc_file in doc_dir.subdirs[0].files]
+        assert all(os.path.isfile(doc_file.path) for doc_file in doc_dir.subdirs[0].files)
+
+    def test_markdown(self, make_archive, tmp_path, monkeypatch):
+        """Verify the markdown command renders an archive, but not
+        recursively"""
+        monkeypatch.chdir(tmp_path)
+        make_archive("pkg.whl")
+        main(["markdown", "-i", "pkg.whl", "--recursive-all-in-one"])
+        with open("README.md", encoding="utf-8") as md_file:
+            assert "example\\_google" in md_file.read()
+
+        with pytest.raises(DoctoPiConfigError):
+            main(["markdown", "-i", "pkg.whl", "-r"])
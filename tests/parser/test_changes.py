@@ -0,0 +1,150 @@
+"""Test doctopi.parser.changes package"""
+# Built-in imports
+import os
+import shutil
+import subprocess
+
+# Third-party imports
+import pytest
+
+# This package imports
+from doctopi.__main__ import main
+from doctopi.parser.changes import GitError, changed_since, list_blobs
+from doctopi.parser.python import DocspecAdapter
+
+
+def git(repo, *args):
+    """Run a git command in a test repository"""
+    subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+                   cwd=repo, check=True, capture_output=True)
+
+
+@pytest.fixture(name="repo")
+def fixture_repo(python_examples, tmp_path):
+    """Git repository with a committed copy of the examples"""
+    shutil.copytree(python_examples, tmp_path / "src")
+    (tmp_path / "src" / "top.py").write_text('"""Top module"""\n')
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "Initial commit")
+    return tmp_path
+
+
+class TestChangedSince:
+    """Test doctopi.parser.changes package"""
+
+    def test_changed_since(self, repo):
+        """Verify modified, added, renamed and deleted files are listed,
+        committed or not"""
+        src = repo / "src"
+        assert not changed_since("HEAD", str(src))
+
+        with open(src / "nominal" / "example_google.py", "a", encoding="utf-8") as source:
+            source.write("\n# A change\n")
+        git(repo, "mv", "src/nominal/example_rest.py", "src/renamed.py")
+        git(repo, "commit", "-q", "-m", "Rename")
+        os.remove(src / "top.py")
+        (src / "new.py").write_text("")
+        (repo / "outside.py").write_text("")
+
+        assert changed_since("HEAD~1", str(src)) == {
+            str(src / "nominal" / "example_google.py"),
+            str(src / "nominal" / "example_rest.py"),
+            str(src / "renamed.py"),
+            str(src / "top.py"),
+            str(src / "new.py"),
+        }
+        assert changed_since("HEAD", str(src / "new.py")) == {str(src / "new.py")}
+
+    def test_git_error(self, repo, tmp_path_factory):
+        """Verify git failures are raised"""
+        with pytest.raises(GitError):
+            changed_since("no-such-ref", str(repo / "src"))
+        with pytest.raises(GitError):
+            changed_since("HEAD", str(tmp_path_factory.mktemp("not_a_repo")))
+
+        # Refs are never read as options, e.g. writing the diff to a file
+        output = tmp_path_factory.mktemp("output") / "diff.txt"
+        with pytest.raises(GitError, match="isn't a git commit"):
+            changed_since(f"--output={output}", str(repo / "src"))
+        with pytest.raises(GitError, match="isn't a git commit"):
+            list_blobs("--output=x", str(repo / "src"))
+        assert not output.exists()
+
+    def test_markdown_changed_since(self, repo, mocker, monkeypatch):
+        """Verify only changed files are parsed, and only the affected
+        Markdown files are regenerated"""
+        monkeypatch.chdir(repo)
+        args = ["markdown", "-i", "src", "-r", "--cache", "doctopi.snapshot"]
+        main(args)
+
+        with open(repo / "src" / "nominal" / "example_google.py", "a", encoding="utf-8") as source:
+            source.write('\n\ndef new_function():\n    """A new function"""\n')
+        with open(repo / "src" / "README.md", encoding="utf-8") as md_file:
+            expected = md_file.read()
+        os.remove(repo / "src" / "README.md")
+
+        parse_file = mocker.spy(DocspecAdapter, "parse_file")
+        main(args + ["--changed-since", "HEAD"])
+        assert [call.args[1] for call in parse_file.call_args_list] == \
+            [os.path.join("src", "nominal", "example_google.py")]
+
+        # The missing Markdown file is regenerated too
+        with open(repo / "src" / "README.md", encoding="utf-8") as md_file:
+            assert md_file.read() == expected
+        with open(repo / "src" / "nominal" / "README.md", encoding="utf-8") as md_file:
+            assert "new_function" in md_file.read()
+
+    def test_markdown_changed_links(self, tmp_path, monkeypatch):
+        """Verify the Markdown files linking to the symbols of changed
+        files are regenerated, whether the link is added or removed"""
+        os.makedirs(tmp_path / "pkg" / "sub")
+        os.makedirs(tmp_path / "pkg" / "other")
+        (tmp_path / "pkg" / "base.py").write_text('"""Base"""\n\n\nclass Base:\n    """Base"""\n')
+        (tmp_path / "pkg" / "sub" / "child.py").write_text(
+            '"""Child"""\n\n\nclass Child(Base):\n    """Child"""\n')
+        (tmp_path / "pkg" / "other" / "other.py").write_text('"""Other"""\n')
+        git(tmp_path, "init", "-q")
+        git(tmp_path, "add", ".")
+        git(tmp_path, "commit", "-q", "-m", "Initial commit")
+        monkeypatch.chdir(tmp_path)
+
+        args = ["markdown", "-i", "pkg", "-r", "--link-symbols", "-c", "none.ini",
+                "--changed-since", "HEAD"]
+        main(args)
+        child = tmp_path / "pkg" / "sub" / "README.md"
+        other = tmp_path / "pkg" / "other" / "README.md"
+        assert "Bases: [Base](../README.md#pkg.base.Base)" in child.read_text()
+        other_mtime = os.stat(other).st_mtime_ns
+
+        # The link to a removed class is written in the old Markdown file
+        (tmp_path / "pkg" / "base.py").write_text('"""Base"""\n\n\nclass Root:\n    """Root"""\n')
+        main(args)
+        assert "Bases: `Base`" in child.read_text()
+
+        # The link to an added class is found in the sources
+        with open(tmp_path / "pkg" / "base.py", "a", encoding="utf-8") as source:
+            source.write('\n\nclass Base:\n    """Base"""\n')
+        main(args)
+        assert "Bases: [Base](../README.md#pkg.base.Base)" in child.read_text()
+        assert os.stat(other).st_mtime_ns == other_mtime
+
+    def test_markdown_stale_snapshot(self, repo, monkeypatch):
+        """Verify files changed since the snapshot was saved are parsed
+        again, even if they didn't change since the ref"""
+        monkeypatch.chdir(repo)
+        args = ["markdown", "-i", "src", "-r", "--cache", "doctopi.snapshot"]
+        (repo / "src" / "top.py").write_text(
+            '"""Top module"""\n\n\ndef old_name():\n    """A function"""\n')
+        main(args)
+
+        # Committed after the snapshot was saved
+        (repo / "src" / "top.py").write_text(
+            '"""Top module"""\n\n\ndef new_name():\n    """A function"""\n')
+        git(repo, "commit", "-q", "-a", "-m", "Rename")
+        (repo / "src" / "sibling.py").write_text('"""Sibling module"""\n')
+
+        main(args + ["--changed-since", "HEAD"])
+        with open(repo / "src" / "README.md", encoding="utf-8") as md_file:
+            markdown = md_file.read()
+        assert "new_name" in markdown and "old_name" not in markdown
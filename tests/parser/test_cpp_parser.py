@@ -0,0 +1,134 @@
+"""Test doctopi.parser.cpp package"""
+# Built-in imports
+import io
+import os
+
+# This package imports
+from doctopi.formatter.markdown.markdown_builder import MarkdownBuilder
+from doctopi.parser.cache import MemoryParseCache
+from doctopi.parser.cpp import CppParser, parse_doxygen
+from doctopi.parser.cpp.tokenizer import tokenize
+from doctopi.parser.parser_factory import ParserFactory
+from doctopi.parser.scheduler import ParallelParser
+from doctopi.parser.walker import DirectoryWalker
+from doctopi.types import (AccessType, Docstring, FunctionDeclaration, NameDescriptionType)
+
+
+class TestCppParser:
+    """Test doctopi.parser.cpp package"""
+
+    def test_tokenize(self):
+        """Verify comments and directives are dropped, and brackets in
+        literals and comments aren't tokens"""
+        source = ('#define BLOCK {\\\n  }\n/// Doc {\n/// more }\n//// rule {\nint a = "{";\n'
+                  "/* } */ char b = '}'; auto c = R\"x(}\")x\"; std::vector<int> d;")
+        tokens = list(tokenize(source))
+        assert [token.text for token in tokens if token.text in ("{", "}")] == []
+        assert tokens[0].kind == "doc" and tokens[0].text == "/// Doc {\n/// more }"
+        assert [token.text for token in tokens if token.kind == "literal"] == \
+            ['"{"', "'}'", 'R"x(}")x"']
+        assert "std::vector" in [token.text for token in tokens if token.kind == "word"]
+
+    def test_parse_doxygen(self):
+        """Verify backslash and at-sign commands are parsed, with code
+        blocks and inline commands converted"""
+        docstring = parse_doxygen(
+            "/**\n * \\brief Read a file.\n *\n * Reads \\c path with \\a mode:\n"
+            " * @code\n *   read(\"a\");\n * @endcode\n * \\param[in] path  where\n"
+            " *            to read\n * \\param mode \\p r or \\p w\n\n * \\return the text\n"
+            " * \\throw std::io_error if it can't\n * \\note Slow.\n */",
+            params={"path": "const char*"}, returns="std::string")
+        assert docstring == Docstring(
+            summary="Read a file.\n\nReads `path` with mode:\n\n      read(\"a\");",
+            args=[NameDescriptionType(name="path", type="const char*", description="where to read"),
+                  NameDescriptionType(name="mode", description="`r` or `w`")],
+            returns=NameDescriptionType(type="std::string", description="the text"),
+            raises=[NameDescriptionType(type="std::io_error", description="if it can't")])
+        assert parse_doxygen("//! Flags.\n//! \\retval 0 none").returns.description == "`0` none"
+
+    def test_parse_header(self, cpp_examples):
+        """Verify classes, enums, fields, constructors and methods are
+        parsed from a header with their Doxygen comments"""
+        doc_file = ParserFactory("cpp", "auto").parse_file(
+            os.path.join(cpp_examples, "shapes.hpp"))
+        assert doc_file.name == "shapes.hpp"
+        assert doc_file.docstring.summary == "Shapes and their areas."
+
+        kind, shape, point = doc_file.classes
+        assert kind.signature == "enum class Kind : unsigned char"
+        assert kind.class_variables == [
+            NameDescriptionType(name="Round", type="Kind", description="A round shape."),
+            NameDescriptionType(name="Square", type="Kind", description="A shape with corners.")]
+
+        # Members follow the access specifiers, and private fields are left out
+        assert shape.signature == "class SHAPES_API Shape"
+        assert shape.constructor.signature == 'explicit Shape(const std::string& name = "")'
+        assert shape.constructor.docstring.args[0].type == "const std::string&"
+        assert [(variable.name, variable.description) for variable in shape.class_variables] \
+            == [("kCircleSides", "Sides of a circle.")]
+        assert shape.member_variables == [NameDescriptionType(
+            name="name", type="std::string", description="Name of the shape.")]
+        assert [(method.name, method.access) for method in shape.methods] == [
+            ("Shape", AccessType.PUBLIC), ("~Shape", AccessType.PUBLIC),
+            ("area", AccessType.PUBLIC), ("operator<", AccessType.PUBLIC),
+            ("next", AccessType.PROTECTED), ("hidden", AccessType.PRIVATE)]
+        assert shape.methods[2] == FunctionDeclaration(
+            name="area",
+            signature="virtual double area() const noexcept(false) = 0",
+            access=AccessType.PUBLIC,
+            docstring=Docstring(
+                summary="Get the area of the shape.\n\n    double area = shape.area();",
+                returns=NameDescriptionType(type="double", description="area in square `units`"),
+                raises=[NameDescriptionType(type="std::domain_error",
+                                            description="if the shape is degenerate")]))
+        assert shape.methods[3].docstring.returns.description == \
+            "`true` if this shape is smaller; `false` otherwise"
+
+        assert point.signature == "template <typename T = double, int N = (2 > 1)> struct Point final"
+        assert [(variable.name, variable.type) for variable in point.member_variables] == \
+            [("x", "T"), ("y", "T"), ("z", "T")]
+        assert point.methods[0].docstring.returns.type == "Point<T>"
+
+        total_area, = doc_file.functions
+        assert total_area.docstring.args[0] == NameDescriptionType(
+            name="shapes", type="const std::vector<Shape*>&", description="shapes to sum")
+
+    def test_parse_sources(self, cpp_examples):
+        """Verify definitions of members declared elsewhere, macros and a
+        file's variables are skipped, and C typedefs are parsed"""
+        parser = CppParser()
+        doc_file = parser.parse_file(os.path.join(cpp_examples, "shapes.cpp"))
+        assert not doc_file.classes
+        assert [(function.name, function.access) for function in doc_file.functions] == \
+            [("check", AccessType.PRIVATE), ("total_area", AccessType.PUBLIC)]
+
+        with open(os.path.join(cpp_examples, "c", "buffer.h"), encoding="utf-8") as header:
+            doc_file = parser.parse_stream(io.StringIO(header.read()), "c/buffer.h")
+        assert doc_file.docstring.summary == "Byte buffers for C."
+        buffer, = doc_file.classes
+        assert (buffer.name, buffer.docstring.summary) == ("buffer_t", "A growable byte buffer.")
+        assert buffer.member_variables[0] == NameDescriptionType(
+            name="data", type="unsigned char*", description="Bytes of the buffer.")
+        assert [function.name for function in doc_file.functions] == ["buffer_append",
+                                                                      "buffer_free"]
+        assert doc_file.functions[0].docstring.returns.type == "int"
+
+    def test_walk(self, cpp_examples, mocker):
+        """Verify the parser works with the parallel and cached directory
+        walk"""
+        parser = ParserFactory("cpp", "doxygen")
+        assert parser.configuration() == "CppParser:doxygen"
+        expected = parser.parse_dir(cpp_examples)
+        assert [doc_file.name for doc_file in expected.files] == ["shapes.cpp", "shapes.hpp"]
+        assert [doc_file.name for doc_file in expected.subdirs[0].files] == ["buffer.h"]
+
+        # A header and its source are told apart
+        markdown = MarkdownBuilder().render(expected)
+        assert "# shapes.cpp" in markdown and "# shapes.hpp" in markdown
+
+        walker = DirectoryWalker(parser, MemoryParseCache(), pool=ParallelParser(parser, 2))
+        assert walker.parse(cpp_examples) == expected
+
+        parse_file = mocker.spy(parser, "parse_file")
+        assert DirectoryWalker(parser, walker.cache).walk(cpp_examples) == expected
+        assert parse_file.call_count == 0
@@ -0,0 +1,159 @@
+"""Test doctopi.parser.cpp.doxygen_xml_adapter module"""
+# Built-in imports
+import io
+import os
+import tarfile
+from xml.etree import ElementTree
+import zipfile
+
+# Third-party imports
+import pytest
+
+# This package imports
+from doctopi.parser.archive import ArchiveReader
+from doctopi.parser.cache import MemoryParseCache
+from doctopi.parser.cpp import DoxygenXmlAdapter
+from doctopi.parser.parser_factory import ParserFactory
+from doctopi.parser.scheduler import ParallelParser
+from doctopi.parser.walker import DirectoryWalker
+from doctopi.types import (AccessType, Docstring, FunctionDeclaration, NameDescriptionType)
+
+
+class TestDoxygenXmlAdapter:
+    """Test doctopi.parser.cpp.doxygen_xml_adapter module"""
+
+    def test_parse_class(self, doxygen_xml_examples):
+        """Verify a class compound is parsed with its members, and its
+        descriptions are converted to Markdown"""
+        doc_file = DoxygenXmlAdapter().parse_file(
+            os.path.join(doxygen_xml_examples, "classgeo_1_1_shape.xml"))
+        assert doc_file.name == "geo::Shape"
+
+        shape, = doc_file.classes
+        assert (shape.name, shape.signature) == ("Shape", "class Shape : public Named")
+        assert shape.docstring.summary == (
+            "A shape, e.g. a Circle.\n\nShapes are **immutable**:\n\n- their area never changes"
+            "\n\n- see [the guide](https://example.com/shapes)")
+        assert shape.constructor.signature == 'explicit Shape(const std::string &name="")'
+        assert shape.constructor.docstring.args == [NameDescriptionType(
+            name="name", type="const std::string &", description="name of the shape")]
+
+        # Private fields and friends are left out
+        assert shape.class_variables == [NameDescriptionType(
+            name="kCircleSides", type="constexpr int", description="Sides of a circle.")]
+        assert shape.member_variables == [NameDescriptionType(
+            name="name", type="std::string", description="Name of the shape.")]
+        assert [(method.name, method.access) for method in shape.methods] == [
+            ("area", AccessType.PUBLIC), ("operator<", AccessType.PUBLIC),
+            ("convert", AccessType.PUBLIC), ("next", AccessType.PROTECTED)]
+        assert shape.methods[0] == FunctionDeclaration(
+            name="area",
+            signature="virtual double area() const noexcept(false)=0",
+            access=AccessType.PUBLIC,
+            docstring=Docstring(
+                summary="Get the area of the shape.\n\nShapes with no *extent* have no area:"
+                        "\n\n    double area = shape.area();\n    assert(area >= 0);",
+                returns=NameDescriptionType(type="double", description="area in square `units`"),
+                raises=[NameDescriptionType(type="std::domain_error",
+                                            description="if the shape is degenerate")]))
+        assert shape.methods[1].docstring.returns.description == \
+            "`true` if this shape is smaller; `false` otherwise"
+        assert shape.methods[2].signature == \
+            "template <typename T> static T convert(const Shape &shape)"
+        assert shape.methods[2].docstring.args[0] == NameDescriptionType(
+            name="<T>", description="type to convert to")
+
+        kind, = shape.subclasses
+        assert kind.signature == "enum class Kind : unsigned char"
+        assert kind.class_variables == [
+            NameDescriptionType(name="Round", type="Kind", description="A round shape."),
+            NameDescriptionType(name="Square", type="Kind", description="A shape with corners.")]
+
+    def test_parse_scopes(self, doxygen_xml_examples):
+        """Verify namespaces and files are parsed with their functions and
+        enums, and other compounds aren't documented"""
+        parser = DoxygenXmlAdapter()
+        doc_file = parser.parse_file(os.path.join(doxygen_xml_examples, "namespacegeo.xml"))
+        assert (doc_file.name, doc_file.docstring.summary) == ("geo", "Geometry.")
+        assert [enum.signature for enum in doc_file.classes] == ["enum Unit"]
+        assert [(function.name, function.access) for function in doc_file.functions] == \
+            [("total_area", AccessType.PUBLIC), ("check", AccessType.PRIVATE)]
+        assert doc_file.functions[0].docstring.returns == NameDescriptionType(
+            type="double", description="the total area")
+
+        with open(os.path.join(doxygen_xml_examples, "shapes_8hpp.xml"), encoding="utf-8") as xml:
+            doc_file = parser.parse_stream(io.StringIO(xml.read()), "xml/shapes_8hpp.xml")
+        assert (doc_file.name, doc_file.docstring.summary) == ("shapes", "Shapes and their areas.")
+        assert [function.signature for function in doc_file.functions] == \
+            ["int shapes_version(void)"]
+
+        point = parser.parse_file(
+            os.path.join(doxygen_xml_examples, "structgeo_1_1_point.xml")).classes[0]
+        assert point.signature == "template <typename T = double, int N = 2> struct Point final"
+        assert [variable.name for variable in point.member_variables] == ["x", "y"]
+
+        # Compounds with nothing to document are left out of a walk
+        for name in ("classgeo_1_1_shape_1_1_impl.xml", "dir_a1b2c3.xml", "index.xml"):
+            assert not parser.accepts(os.path.join(doxygen_xml_examples, name))
+        assert parser.accepts(os.path.join(doxygen_xml_examples, "shapes_8hpp.xml"))
+        assert not parser.accepts(os.path.join(doxygen_xml_examples, "../nominal/shapes.hpp"))
+
+    def test_clear(self, doxygen_xml_examples, mocker):
+        """Verify compounds, members and skipped elements are cleared as
+        they're read, rather than kept until the whole file is parsed"""
+        elements = []
+        iterparse = ElementTree.iterparse
+
+        def record(source, events):
+            for event, element in iterparse(source, events):
+                elements.append(element)
+                yield event, element
+        mocker.patch.object(ElementTree, "iterparse", side_effect=record)
+
+        parser = DoxygenXmlAdapter()
+        for name in ("classgeo_1_1_shape.xml", "shapes_8hpp.xml"):
+            parser.parse_file(os.path.join(doxygen_xml_examples, name))
+        tags = {"doxygen", "compounddef", "sectiondef", "memberdef", "listofallmembers",
+                "incdepgraph", "node"}
+        assert tags <= {element.tag for element in elements}
+        assert all(len(element) == 0 for element in elements if element.tag in tags)
+
+        # Code is cleared line by line, unless it's part of a description
+        *_, listing = (element for element in elements if element.tag == "programlisting")
+        assert len(listing) == 0 and listing.text is None
+
+    def test_walk(self, doxygen_xml_examples, mocker):
+        """Verify the adapter works with the parallel and cached directory
+        walk"""
+        parser = ParserFactory("doxygen_xml", "auto")
+        assert parser.configuration() == "DoxygenXmlAdapter:doxygen"
+        expected = parser.parse_dir(doxygen_xml_examples)
+        assert [doc_file.name for doc_file in expected.files] == [
+            "geo::Shape", "geo", "shapes", "geo::Point"]
+
+        walker = DirectoryWalker(parser, MemoryParseCache(), pool=ParallelParser(parser, 2))
+        assert walker.parse(doxygen_xml_examples) == expected
+
+        parse_file = mocker.spy(parser, "parse_file")
+        assert DirectoryWalker(parser, walker.cache).walk(doxygen_xml_examples) == expected
+        assert parse_file.call_count == 0
+
+    @pytest.mark.parametrize("archive", ["xml.zip", "xml.tar.gz"])
+    def test_archive(self, doxygen_xml_examples, archive, tmp_path):
+        """Verify compounds with nothing to document are left out of an
+        archive too"""
+        path = str(tmp_path / archive)
+        names = sorted(os.listdir(doxygen_xml_examples))
+        if archive.endswith(".zip"):
+            with zipfile.ZipFile(path, "w") as zip_file:
+                for name in names:
+                    zip_file.write(os.path.join(doxygen_xml_examples, name), name)
+        else:
+            with tarfile.open(path, "w:gz") as tar_file:
+                for name in names:
+                    tar_file.add(os.path.join(doxygen_xml_examples, name), name)
+
+        parser = ParserFactory("doxygen_xml", "auto")
+        doc_dir = ArchiveReader(parser).parse(path)
+        assert sorted(doc_file.name for doc_file in doc_dir.files) == \
+            sorted(doc_file.name for doc_file in parser.parse_dir(doxygen_xml_examples).files)
@@ -0,0 +1,133 @@
+"""Test doctopi.parser.java package"""
+# Built-in imports
+import io
+import os
+
+# This package imports
+from doctopi.parser.java import JavaParser, parse_javadoc
+from doctopi.parser.java.tokenizer import tokenize
+from doctopi.parser.parser_factory import ParserFactory
+from doctopi.types import (AccessType, Docstring, FunctionDeclaration, NameDescriptionType)
+
+
+class TestJavaParser:
+    """Test doctopi.parser.java package"""
+
+    def test_tokenize(self):
+        """Verify comments are dropped, and brackets in literals and
+        comments aren't tokens"""
+        source = ('/** Doc {@code }} */ // }\nint a = "{"; /* } */ char b = \'}\';\n'
+                  'String c = """\n  } "\n  """; java.util.List<T> d;')
+        tokens = list(tokenize(source))
+        assert [token.kind for token in tokens if token.text in ("{", "}")] == []
+        assert tokens[0].text == "/** Doc {@code }} */" and tokens[0].kind == "doc"
+        assert [token.text for token in tokens if token.kind == "literal"] == \
+            ['"{"', "'}'", '"""\n  } "\n  """']
+        assert "java.util.List" in [token.text for token in tokens if token.kind == "word"]
+        assert source[tokens[-1].start:tokens[-1].end] == ";"
+
+    def test_parse_javadoc(self):
+        """Verify the description and tags are parsed, and HTML and inline
+        tags are converted"""
+        docstring = parse_javadoc(
+            "/**\n * Read a {@link java.io.File file} with {@code <T>} &amp; a\n"
+            " * {@link #close()}.<p>\n * Example:\n * <pre>{@code\n * read(\"a\");\n"
+            " * }</pre>\n *\n * @param path\n *        where to read\n"
+            " * @return the <code>text</code>\n * @exception IOException if it can't\n"
+            " * @since 1.2\n */", params={"path": "String"}, returns="String")
+        assert docstring == Docstring(
+            summary="Read a file with `<T>` & a\n`close()`.\n\nExample:\n\n    read(\"a\");",
+            args=[NameDescriptionType(name="path", type="String", description="where to read")],
+            returns=NameDescriptionType(type="String", description="the `text`"),
+            raises=[NameDescriptionType(type="IOException", description="if it can't")])
+
+    def test_parse_file(self, java_examples):
+        """Verify classes, inner classes, fields, constructors and methods
+        are parsed with their Javadoc"""
+        doc_file = ParserFactory("java", "auto").parse_file(
+            os.path.join(java_examples, "Example.java"))
+        assert doc_file.name == "Example" and doc_file.path == os.path.join(
+            os.path.abspath(java_examples), "Example.java")
+        assert not doc_file.functions and not doc_file.docstring.summary
+
+        example, = doc_file.classes
+        assert example.signature == \
+            "public class Example<T extends Comparable<T>> implements Comparable<Example<T>>"
+        assert example.docstring.summary == ("This is an example Java class.\n\nIt has `static` "
+                                             "and instance fields, a `List` of\nthings, and an "
+                                             "inner class.")
+        assert example.constructor.signature == "public Example(String name)"
+        assert [(variable.name, variable.type) for variable in example.class_variables] == \
+            [("GREETING", "String"), ("count", "int"), ("limit", "int")]
+        assert example.member_variables == [NameDescriptionType(
+            name="things", type="Map<String, List<T>>", description="Things, by name.")]
+
+        # Other constructors are methods, and methods' access is from their modifiers
+        assert [(method.name, method.access) for method in example.methods] == [
+            ("Example", AccessType.PROTECTED), ("add", AccessType.PUBLIC),
+            ("find", AccessType.PUBLIC), ("hidden", AccessType.PRIVATE),
+            ("packagePrivate", AccessType.PROTECTED), ("compareTo", AccessType.PUBLIC)]
+        assert example.methods[1] == FunctionDeclaration(
+            name="add",
+            signature="public int add(int a, @Deprecated int b) "
+                      "throws IllegalArgumentException, IOException",
+            access=AccessType.PUBLIC,
+            docstring=Docstring(
+                summary="Add two numbers.\nThe result may overflow.\n\n"
+                        "    int sum = example.add(1, 2);",
+                args=[NameDescriptionType(name="a", type="int", description="the first number"),
+                      NameDescriptionType(name="b", type="int", description="the second number")],
+                returns=NameDescriptionType(type="int", description="the sum of `a` and `b`"),
+                raises=[NameDescriptionType(type="IllegalArgumentException",
+                                            description="if a number is negative"),
+                        NameDescriptionType(type="IOException", description="never")]))
+        assert example.methods[2].signature == "public static <R extends List<T>, T> R " \
+            "find(Map<String, ? extends T> map, String... filters)"
+        assert example.methods[2].docstring.returns.type == "R"
+
+        # Private types are left out
+        inner, = example.subclasses
+        assert (inner.name, inner.constructor.docstring.summary) == ("Inner", "Make the inner class.")
+        assert inner.member_variables[0].type == "long"
+
+    def test_parse_types(self, java_examples):
+        """Verify interfaces, enums, records and annotation types are
+        parsed, and the package's Javadoc is the docstring of
+        package-info.java"""
+        parser = JavaParser()
+        with open(os.path.join(java_examples, "shapes", "Shape.java"),
+                  encoding="utf-8") as java_file:
+            doc_file = parser.parse_stream(io.StringIO(java_file.read()), "shapes/Shape.java")
+        assert doc_file.name == "Shape"
+
+        shape, = doc_file.classes
+        assert shape.signature == "public interface Shape"
+        assert shape.class_variables[0].name == "CIRCLE_SIDES"
+        assert shape.methods[0].access == AccessType.PUBLIC
+        assert shape.methods[0].docstring.returns.description == "area in square units"
+
+        kind, point, described = shape.subclasses
+        assert [(constant.name, constant.type, constant.description)
+                for constant in kind.class_variables] == [("ROUND", "Kind", "A round shape."),
+                                                          ("SQUARE", "Kind", "A shape with corners.")]
+        assert kind.constructor.name == "Kind" and kind.methods[0].name == "label"
+        assert point.signature == "record Point(double x, double y) implements Shape"
+        assert point.member_variables == [
+            NameDescriptionType(name="x", type="double", description="horizontal coordinate"),
+            NameDescriptionType(name="y", type="double", description="vertical coordinate")]
+        assert [variable.name for variable in point.class_variables] == ["ORIGIN"]
+        assert described.signature == "@interface Described"
+        assert described.methods[0].signature == "String value()"
+
+        package = parser.parse_file(os.path.join(java_examples, "shapes", "package-info.java"))
+        assert package.docstring.summary == "Shapes and their areas." and not package.classes
+
+    def test_parse_dir(self, java_examples):
+        """Verify only Java files are parsed from a directory"""
+        parser = ParserFactory("java", "javadoc")
+        assert parser.configuration() == "JavaParser:javadoc"
+
+        doc_dir = parser.parse_dir(java_examples)
+        assert [doc_file.name for doc_file in doc_dir.files] == ["Example"]
+        assert [doc_file.name for doc_file in doc_dir.subdirs[0].files] == \
+            ["Shape", "package-info"]
@@ -24,13 +24,15 @@ class TestParserFactory:
             assert parser.docstring_style == docstring_style
 
     @pytest.mark.parametrize("language,good_language", [
-        ("python", True), ("Python", False), ("java", False), ("cpp", False), ("random", False)])
-    @pytest.mark.parametrize("style,good_style", [
-        ("auto", True), ("automatic", False), ("javadoc", False), ("doxygen", False), ("random", False)])
-    def test_parser_factory_off_nominal(self, language, style, good_language, good_style):
+        ("python", True), ("Python", False), ("java", True), ("cpp", True),
+        ("doxygen_xml", True), ("random", False)])
+    @pytest.mark.parametrize("style,good_languages", [
+        ("auto", ("python", "java", "cpp", "doxygen_xml")), ("automatic", ()),
+        ("javadoc", ("java",)), ("doxygen", ("cpp", "doxygen_xml")), ("random", ())])
+    def test_parser_factory_off_nominal(self, language, style, good_language, good_languages):
 
         # Some overlap with params will test a nominal case, just skip those
-        if good_language and good_style:
+        if good_language and language in good_languages:
             return
 
         with pytest.raises(ValueError):
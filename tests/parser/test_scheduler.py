@@ -0,0 +1,125 @@
+"""Test doctopi.parser.scheduler package"""
+# Built-in imports
+import json
+import os
+import shutil
+
+# Third-party imports
+import pytest
+
+# This package imports
+from doctopi.__main__ import main
+from doctopi.parser.cache import MemoryParseCache
+from doctopi.parser.parser_factory import ParserFactory
+from doctopi.parser.scheduler import (CostHistory, ParallelParser, SchedulerStats, WorkerPools,
+                                      plan, worker_pool)
+from doctopi.parser.walker import DirectoryWalker
+
+
+class TestScheduler:
+    """Test doctopi.parser.scheduler package"""
+
+    def test_plan(self):
+        """Verify expensive files are scheduled first, and cheap files are
+        chunked together"""
+        costs = {"large.py": 100.0, "medium.py": 40.0, "small.py": 30.0}
+        costs.update({f"tiny_{index}.py": 1.0 for index in range(20)})
+
+        tasks = plan(costs, workers=2)
+        assert tasks[:3] == [["large.py"], ["medium.py"], ["small.py"]]
+        assert sorted(path for task in tasks for path in task) == sorted(costs)
+        assert all(len(task) > 1 for task in tasks[3:])
+        assert len(tasks) < len(costs)
+
+    def test_history(self, tmp_path):
+        """Verify costs are estimated from sizes, then from the history"""
+        path = tmp_path / "history.json"
+        history = CostHistory(str(path))
+        assert history.estimate("a.py", 1000) == pytest.approx(history.estimate("b.py", 10) * 100)
+
+        history.record("a.py", 1000, 0.5)
+        history.record("b.py", 1000, 1.5)
+        history.save()
+
+        history = CostHistory(str(path))
+        assert history.estimate("b.py", 500) == pytest.approx(0.75)
+        assert history.estimate("c.py", 1000) == pytest.approx(1.0)
+        assert history.estimate("c.py", 1000, rate=0.0) == 0.0
+
+        path.write_text("not json")
+        assert not CostHistory(str(path)).timings
+
+    def test_utilization(self):
+        """Verify utilization is the share of the workers' time spent
+        parsing"""
+        assert SchedulerStats().utilization() == 0.0
+        stats = SchedulerStats(files=3, tasks=2, workers=2, seconds=2.0, busy={1: 2.0, 2: 1.0})
+        assert stats.utilization() == 0.75
+        assert stats.to_dict() == {"seconds": 2.0, "files": 3, "tasks": 2, "workers": 2,
+                                   "utilization": 0.75, "busy": [1.0, 2.0]}
+
+    def test_parallel_parser(self, python_examples, tmp_path):
+        """Verify files parsed by the workers match parsing them in turn,
+        and their timings are recorded"""
+        parser = ParserFactory("python", "auto")
+        sources = list(DirectoryWalker(parser).iter_sources(python_examples))
+        pool = ParallelParser(parser, 2, CostHistory(str(tmp_path / "history.json")))
+
+        parsed = pool.parse_files(sources)
+        assert parsed == {path: parser.parse_file(path) for path in sources}
+        assert pool.stats.files == len(sources)
+        assert 0.0 < pool.stats.utilization() <= 1.0
+        assert sorted(CostHistory(str(tmp_path / "history.json")).timings) == sorted(sources)
+
+    def test_worker_pools(self, python_examples):
+        """Verify the pools of an entered WorkerPools outlive each parse,
+        and are shut down when it's exited"""
+        parser = ParserFactory("python", "auto")
+        sources = list(DirectoryWalker(parser).iter_sources(python_examples))
+
+        with WorkerPools() as pools:
+            first = ParallelParser(parser, 2).parse_files(sources)
+            pool = worker_pool(parser, 2)
+            assert pools.pools == {(parser.configuration(), 2): pool}
+            assert ParallelParser(parser, 2).parse_files(sources) == first
+            assert worker_pool(parser, 2) is pool
+            assert worker_pool(parser, 3) is not pool
+
+        assert WorkerPools.active is None and not pools.pools
+        with pytest.raises(RuntimeError):
+            pool.submit(os.getpid)
+        with worker_pool(parser, 2) as own_pool:
+            assert own_pool is not pool
+
+    def test_walker_prefetch(self, python_examples, mocker):
+        """Verify a walker only sends uncached files to the workers, and
+        the walk matches a walk without workers"""
+        parser = ParserFactory("python", "auto")
+        pool = ParallelParser(parser, 2)
+        parse_files = mocker.spy(pool, "parse_files")
+        cache = MemoryParseCache()
+        sources = list(DirectoryWalker(parser).iter_sources(python_examples))
+        DirectoryWalker(parser, cache).parse_file(sources[0])
+
+        doc_dir = DirectoryWalker(parser, cache, pool=pool).parse(python_examples)
+        assert parse_files.call_args.args[0] == sources[1:]
+        assert doc_dir == DirectoryWalker(parser).parse(python_examples)
+
+    def test_markdown_jobs(self, python_examples, tmp_path, monkeypatch):
+        """Verify the markdown command's output doesn't change with --jobs,
+        and the workers' utilization is profiled"""
+        shutil.copytree(python_examples, tmp_path / "src")
+        monkeypatch.chdir(tmp_path)
+        main(["markdown", "-i", "src", "-o", "serial.md", "--recursive-all-in-one"])
+        main(["markdown", "-i", "src", "-o", "parallel.md", "--recursive-all-in-one",
+              "--jobs", "2", "--parse-history", "history.json", "--profile", "profile.json"])
+
+        with open("serial.md", encoding="utf-8") as serial, \
+                open("parallel.md", encoding="utf-8") as parallel:
+            assert parallel.read() == serial.read()
+        assert os.path.exists("history.json")
+
+        with open("profile.json", encoding="utf-8") as profile_file:
+            scheduler = json.load(profile_file)["outputs"]["parallel.md"]["scheduler"]
+        assert scheduler["workers"] == 2
+        assert scheduler["files"] > 0
@@ -0,0 +1,60 @@
+"""Test doctopi.parser.walker package"""
+# Built-in imports
+import os
+import shutil
+
+# This package imports
+from doctopi.parser.cache import MemoryParseCache
+from doctopi.parser.parser_factory import ParserFactory
+from doctopi.parser.walker import DirectoryWalker
+
+
+class TestDirectoryWalker:
+    """Test doctopi.parser.walker package"""
+
+    def test_walk(self, python_nominal):
+        """Verify walking a directory matches the parser"""
+        parser = ParserFactory("python", "auto")
+        assert DirectoryWalker(parser).walk(python_nominal) == parser.parse_dir(python_nominal)
+
+    def test_cache(self, python_nominal, mocker, tmp_path):
+        """Verify only new and changed files are parsed when a cache is
+        used"""
+        src = tmp_path / "src"
+        shutil.copytree(python_nominal, src)
+
+        parser = ParserFactory("python", "auto")
+        parse_file = mocker.spy(parser, "parse_file")
+        walker = DirectoryWalker(parser, MemoryParseCache())
+
+        walker.walk(str(src))
+        assert parse_file.call_count == 4
+
+        # Nothing changed
+        walker.walk(str(src))
+        assert parse_file.call_count == 4
+
+        # Change one file
+        with open(src / "example_google.py", "a", encoding="utf-8") as source:
+            source.write("\n\ndef new_function():\n    \"\"\"A new function\"\"\"\n")
+
+        doc_dir = walker.walk(str(src))
+        assert parse_file.call_count == 5
+        assert any(function.name == "new_function"
+                   for doc_file in doc_dir.files for function in doc_file.functions)
+
+    def test_select(self, python_nominal, mocker):
+        """Verify only selected files are parsed, and the rest are left
+        as empty placeholders"""
+        parser = ParserFactory("python", "auto")
+        parse_file = mocker.spy(parser, "parse_file")
+        sources = list(DirectoryWalker(parser).iter_sources(python_nominal))
+        assert sources == sorted(sources)
+        assert len(sources) == 4
+
+        doc_dir = DirectoryWalker(parser, select={sources[0]}.__contains__).walk(python_nominal)
+        assert parse_file.call_count == 1
+        assert [doc_file.name for doc_file in doc_dir.files] == \
+            [os.path.splitext(os.path.basename(source))[0] for source in sources]
+        assert doc_dir.files[0].classes
+        assert not any(doc_file.classes or doc_file.functions for doc_file in doc_dir.files[1:])
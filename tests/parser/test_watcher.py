@@ -0,0 +1,103 @@
+"""Test doctopi.parser.watcher package"""
+# Built-in imports
+import argparse
+import os
+import shutil
+import threading
+import time
+
+# This package imports
+from doctopi.__main__ import watch_markdown
+from doctopi.cli import cli, parse_settings
+from doctopi.parser.cache import MemoryParseCache
+from doctopi.parser.watcher import SourceWatcher
+
+
+def wait_for(condition, timeout=10.0):
+    """Wait for a condition to become True"""
+    end = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < end, "Timed out"
+        time.sleep(0.02)
+
+
+def read(path):
+    """Read a text file"""
+    with open(path, "r", encoding="utf-8") as text_file:
+        return text_file.read()
+
+
+class TestSourceWatcher:
+    """Test doctopi.parser.watcher package"""
+
+    def test_poll(self, python_examples, tmp_path):
+        """Verify created, changed and deleted files are detected"""
+        shutil.copytree(python_examples, tmp_path / "src")
+        config = tmp_path / "doctopi.ini"
+        watcher = SourceWatcher(str(tmp_path / "src"), (".py",), files=[str(config)])
+        assert len(watcher.state) == 4
+        assert not watcher.poll()
+
+        module = tmp_path / "src" / "nominal" / "example_google.py"
+        with open(module, "a", encoding="utf-8") as source:
+            source.write("\n# A change\n")
+        (tmp_path / "src" / "notes.txt").write_text("Not watched")
+        (tmp_path / "src" / "new.py").write_text("")
+        config.write_text("[MAIN]\n")
+        os.remove(tmp_path / "src" / "nominal" / "example_rest.py")
+
+        assert watcher.poll() == {str(module), str(config), str(tmp_path / "src" / "new.py"),
+                                  str(tmp_path / "src" / "nominal" / "example_rest.py")}
+        assert not watcher.poll()
+
+    def test_wait_debounce(self, tmp_path):
+        """Verify a burst of changes is reported once, and waiting can
+        be stopped"""
+        module = tmp_path / "module.py"
+        module.write_text("")
+        watcher = SourceWatcher(str(module), (".py",), interval=0.01, debounce=0.2)
+
+        def burst():
+            for index in range(5):
+                module.write_text("#" * (index + 1))
+                time.sleep(0.05)
+
+        thread = threading.Thread(target=burst)
+        thread.start()
+        assert watcher.wait() == {str(module)}
+        thread.join()
+
+        assert not watcher.poll()
+        assert watcher.wait(stop=lambda: True) == set()
+
+    def test_watch_markdown(self, python_examples, tmp_path, monkeypatch):
+        """Verify only the affected Markdown files are regenerated when
+        source files or the ini config change"""
+        shutil.copytree(python_examples, tmp_path / "src")
+        (tmp_path / "src" / "top.py").write_text('"""Top module"""\n')
+        monkeypatch.chdir(tmp_path)
+
+        cli_args = cli(["markdown", "-i", "src", "-r", "--watch", "--watch-interval=0.02"])
+        args = parse_settings(argparse.Namespace(**vars(cli_args)))
+        stopped = threading.Event()
+        thread = threading.Thread(target=watch_markdown,
+                                  args=(cli_args, args, MemoryParseCache(), stopped.is_set))
+        thread.start()
+
+        try:
+            top, nominal = tmp_path / "src" / "README.md", tmp_path / "src" / "nominal" / "README.md"
+            wait_for(lambda: top.exists() and nominal.exists())
+            nominal_mtime = os.stat(nominal).st_mtime_ns
+
+            # Edit a module at the top level
+            (tmp_path / "src" / "top.py").write_text(
+                '"""Top module"""\n\ndef added():\n    """Added function"""\n')
+            wait_for(lambda: "added" in read(top))
+            assert os.stat(nominal).st_mtime_ns == nominal_mtime
+
+            # Change the ini config, which regenerates everything
+            (tmp_path / "doctopi.ini").write_text("[TABLE_OF_CONTENTS]\nenabled = no\n")
+            wait_for(lambda: "Contents" not in read(nominal))
+        finally:
+            stopped.set()
+            thread.join()
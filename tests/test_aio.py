@@ -0,0 +1,94 @@
+"""Tests for the doctopi.aio asyncio API"""
+# Built-in imports
+import asyncio
+import threading
+
+# Third-party imports
+import pytest
+
+# This package imports
+import doctopi
+import doctopi.aio
+
+
+class TestAio:
+    """Tests for doctopi.aio"""
+
+    @pytest.mark.parametrize("options", [{}, {"table_of_contents": False}])
+    def test_generate(self, python_nominal, options):
+        """Verify the async API matches doctopi.generate"""
+        expected = doctopi.generate(python_nominal, **options)
+
+        async def generate():
+            chunks = [chunk async for chunk in doctopi.aio.stream(python_nominal, **options)]
+            markdown = await doctopi.aio.generate(python_nominal, **options)
+            readmes = await doctopi.aio.generate_all([python_nominal] * 3, limit=2, **options)
+            return chunks, markdown, readmes
+
+        chunks, markdown, readmes = asyncio.run(generate())
+        assert "".join(chunks) == expected
+        assert markdown == expected
+        assert readmes == [expected] * 3
+
+    def test_generate_all_limit(self, mocker):
+        """Verify no more than `limit` sources are generated at once"""
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def render(src, *_, **__):
+            with lock:
+                running.append(src)
+                peak.append(len(running))
+            yield src
+            with lock:
+                running.remove(src)
+
+        mocker.patch("doctopi.generate", side_effect=render)
+        readmes = asyncio.run(doctopi.aio.generate_all(["a", "b", "c", "d", "e"], limit=2))
+        assert readmes == ["a", "b", "c", "d", "e"]
+        assert max(peak) <= 2
+
+    def test_cancel(self, python_nominal, mocker):
+        """Verify a cancelled stream closes its generator once the
+        executor is done with it"""
+        rendering = threading.Event()
+        release = threading.Event()
+        closed = threading.Event()
+
+        def render(*_, **__):
+            try:
+                yield "first"
+                rendering.set()
+                release.wait(5)
+                yield "second"
+                yield "never"
+            finally:
+                closed.set()
+
+        mocker.patch("doctopi.generate", side_effect=render)
+
+        async def consume(chunks):
+            async for chunk in doctopi.aio.stream(python_nominal):
+                chunks.append(chunk)
+
+        async def cancel():
+            chunks = []
+            task = asyncio.ensure_future(consume(chunks))
+            await asyncio.get_running_loop().run_in_executor(None, rendering.wait, 5)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert not closed.is_set()
+
+            release.set()
+            await asyncio.get_running_loop().run_in_executor(None, closed.wait, 5)
+            return chunks
+
+        assert asyncio.run(cancel()) == ["first"]
+        assert closed.is_set()
+
+    def test_generate_all_error(self, python_nominal):
+        """Verify invalid options are raised"""
+        with pytest.raises(TypeError):
+            asyncio.run(doctopi.aio.generate_all([python_nominal, python_nominal], colour="blue"))
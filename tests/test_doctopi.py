@@ -6,7 +6,11 @@ import os
 import pytest
 
 # This package imports
+import doctopi
+from doctopi.__main__ import main
 from doctopi.cli import cli, ini_to_bool, parse_settings, DoctoPiConfigError
+from doctopi.cli.stamp import strip_stamp
+from doctopi.parser.parser_factory import ParserFactory
 
 
 class TestCLI:
@@ -73,3 +77,40 @@ class TestCLI:
             ini_to_bool("false")
             ini_to_bool("random")
             ini_to_bool("")
+
+
+class TestGenerate:
+    """Tests for doctopi.generate"""
+
+    @pytest.mark.parametrize("options,cli_args", [
+        ({}, []),
+        ({"title": "Examples", "public_only": True, "recursive_all_in_one": True},
+         ["--title=Examples", "--public-only", "--recursive-all-in-one"]),
+    ])
+    def test_generate(self, python_nominal, options, cli_args, tmp_path, monkeypatch):
+        """Verify generate() matches the markdown command"""
+        monkeypatch.chdir(tmp_path)
+        markdown = doctopi.generate(python_nominal, **options)
+        assert not os.listdir(tmp_path)
+
+        main(["markdown", "-i", python_nominal] + cli_args)
+        with open("README.md", encoding="utf-8") as md_file:
+            # Markdown generated in memory isn't stamped with its sources
+            assert markdown == strip_stamp(md_file.read())
+
+        parsed = ParserFactory("python", "auto").parse_dir(python_nominal)
+        assert doctopi.generate(parsed, **options) == markdown
+        assert "".join(doctopi.generate(python_nominal, stream=True, **options)) == markdown
+
+    def test_generate_config(self, python_nominal, tmp_path):
+        """Verify generate() reads the provided config, and rejects
+        unknown options"""
+        config = tmp_path / "doctopi.ini"
+        config.write_text("[TABLE_OF_CONTENTS]\nenabled = no\n")
+        assert "Contents" in doctopi.generate(python_nominal)
+        assert "Contents" not in doctopi.generate(python_nominal, config=str(config))
+
+        with pytest.raises(TypeError):
+            doctopi.generate(python_nominal, colour="blue")
+        with pytest.raises(TypeError):
+            doctopi.generate(python_nominal, output="README.md")
@@ -0,0 +1,109 @@
+"""Test the doctopi.registry package"""
+# Built-in imports
+from importlib.metadata import EntryPoint
+import os
+import sys
+
+# Third-party imports
+import pytest
+
+# This package imports
+from doctopi.__main__ import main
+from doctopi.parser.parser_factory import ParserFactory
+from doctopi.registry import (BUILTINS, DOCSTRING_STYLES, MARKDOWN_COMMANDS, PARSERS, Registry)
+
+
+PLUGIN = '''
+from doctopi.formatter.markdown.cmd.function_command import MarkdownFunctionCommand
+from doctopi.parser.python import DocspecAdapter
+
+STYLE = "plugin style"
+
+
+class PluginParser(DocspecAdapter):
+    """Parser added by a plugin"""
+    def __init__(self, style):
+        from docstring_parser.common import DocstringStyle
+        super().__init__(DocstringStyle.GOOGLE)
+        self.style = style
+
+
+class PluginCommand(MarkdownFunctionCommand):
+    """Markdown command added by a plugin"""
+    def execute(self):
+        self.md_utils.new_paragraph(f"Plugin: {self.func.name}")
+'''
+
+
+@pytest.fixture(name="plugin")
+def fixture_plugin(tmp_path, monkeypatch):
+    """Importable plugin module, which hasn't been imported yet"""
+    (tmp_path / "doctopi_test_plugin.py").write_text(PLUGIN)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "doctopi_test_plugin"
+    sys.modules.pop("doctopi_test_plugin", None)
+
+
+class TestRegistry:
+    """Test the doctopi.registry package"""
+
+    def test_builtins(self):
+        """Verify the built-in plugins are available without discovery"""
+        plugins = Registry(discover=False)
+        for group, names in BUILTINS.items():
+            assert plugins.names(group) == sorted(names)
+
+        assert plugins.parser("python", "google") is plugins.parser("python", "google")
+        assert plugins.parser("python", "rest") is not plugins.parser("python", "google")
+        assert plugins.markdown_command("classes").__name__ == "MarkdownClassCommand"
+
+        with pytest.raises(ValueError):
+            plugins.parser("python", "javadoc")
+        with pytest.raises(ValueError):
+            plugins.parser("kotlin", "google")
+        with pytest.raises(KeyError):
+            plugins.markdown_command("examples")
+
+    @pytest.mark.parametrize("selectable", [True, False])
+    def test_discover_lazily(self, plugin, mocker, selectable):
+        """Verify installed plugins are discovered from entry points, and
+        only imported when used, whether entry points are selected by
+        group or, on Python 3.9, looked up in a dict"""
+        installed = installed_groups = {
+            PARSERS: [EntryPoint("kotlin", f"{plugin}:PluginParser", PARSERS)],
+            DOCSTRING_STYLES: [EntryPoint("kotlin.kdoc", f"{plugin}:STYLE", DOCSTRING_STYLES)],
+            MARKDOWN_COMMANDS: [EntryPoint("examples", f"{plugin}:PluginCommand",
+                                           MARKDOWN_COMMANDS)],
+        }
+        if selectable:
+            installed = mocker.Mock(select=lambda group: installed_groups[group])
+        mocker.patch("doctopi.registry.entry_points", return_value=installed)
+
+        plugins = Registry()
+        assert "kotlin" in plugins.names(PARSERS)
+        assert "examples" in plugins.names(MARKDOWN_COMMANDS)
+        assert "python" in plugins.names(PARSERS)
+        assert plugin not in sys.modules
+
+        parser = plugins.parser("kotlin", "kdoc")
+        assert plugin in sys.modules
+        assert parser.style == "plugin style"
+        assert plugins.parser("kotlin", "kdoc") is parser
+
+    def test_markdown_plugin(self, python_nominal, plugin, mocker, tmp_path, monkeypatch):
+        """Verify a Markdown command plugin can be used from the INI
+        config"""
+        plugins = Registry(discover=False)
+        plugins.register(MARKDOWN_COMMANDS, "examples", f"{plugin}:PluginCommand")
+        mocker.patch("doctopi.registry.registry", return_value=plugins)
+
+        (tmp_path / "doctopi.ini").write_text("[ORGANIZATION]\nfile_docs = examples\n")
+        monkeypatch.chdir(tmp_path)
+        main(["markdown", "-i", os.path.join(python_nominal, "example_google.py")])
+
+        assert "Plugin: " in (tmp_path / "README.md").read_text()
+
+    def test_parser_factory_shared(self):
+        """Verify the ParserFactory shares one parser per language and
+        style"""
+        assert ParserFactory("python", "numpy") is ParserFactory("python", "numpy")
@@ -0,0 +1,67 @@
+"""Startup benchmark for the doctopi CLI, measured with -X importtime"""
+# Built-in imports
+import os
+import subprocess
+import sys
+from typing import Dict
+
+# Third-party imports
+import pytest
+
+SRC = os.path.join(os.path.dirname(__file__), "../src")
+
+HEAVY_MODULES = ["docspec", "docspec_python", "docstring_parser", "mdutils"]
+"""Third-party modules only the subcommands which need them import"""
+
+STARTUP_BUDGET_US = 150_000
+"""Budget for importing doctopi's modules when the CLI starts, in
+microseconds"""
+
+
+def import_times(*args: str, cwd: str = None) -> Dict[str, int]:
+    """Run the doctopi CLI with -X importtime
+
+    Returns:
+        Dict[str, int]: cumulative import time in microseconds of each
+            module imported directly by the CLI (not by another module)
+            or by any module, keyed by "top:<module>" and "<module>"
+    """
+    env = dict(os.environ, PYTHONPATH=os.path.abspath(SRC))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-m", "doctopi", *args],
+                            capture_output=True, text=True, env=env, cwd=cwd, check=False)
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative)
+        if not module.startswith("  "):
+            times[f"top:{module.strip()}"] = int(cumulative)
+    return times
+
+
+class TestStartup:
+    """Startup benchmark for the doctopi CLI"""
+
+    @pytest.mark.parametrize("args", [["--help"], ["generate-ini", "-o", "doctopi.ini"],
+                                      ["merge", "--help"], ["serve", "--help"]])
+    def test_lazy_imports(self, args, tmp_path):
+        """Verify heavy dependencies aren't imported by subcommands that
+        don't need them, and doctopi starts within budget"""
+        times = import_times(*args, cwd=str(tmp_path))
+        assert "top:doctopi" in times
+
+        assert not [module for module in HEAVY_MODULES if module in times]
+
+        startup = sum(cumulative for module, cumulative in times.items()
+                      if module.startswith("top:doctopi"))
+        assert startup < STARTUP_BUDGET_US
+
+    def test_markdown_imports(self, python_nominal, tmp_path):
+        """Verify the markdown subcommand still imports what it needs"""
+        times = import_times("markdown", "-i",
+                             os.path.abspath(os.path.join(python_nominal, "example_google.py")),
+                             cwd=str(tmp_path))
+        assert all(module in times for module in HEAVY_MODULES)
+        assert (tmp_path / "README.md").exists()